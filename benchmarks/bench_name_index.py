@@ -0,0 +1,43 @@
+"""
+Typo-tolerant name lookup over the full card database: a difflib.SequenceMatcher
+scan (the former Cardmarket import fallback) versus the trigram NameIndex.
+
+    python -m benchmarks.bench_name_index [--synthetic 13000]
+"""
+import difflib
+import random
+
+from src.services.name_index import NameIndex
+from benchmarks.common import parse_args, load_cards, measure, report
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Swaps two neighbouring letters, like "Whtie" for "White"."""
+    i = rng.randrange(1, max(2, len(name) - 2))
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+def main():
+    args = parse_args(__doc__)
+    cards = load_cards(args)
+    rng = random.Random(7)
+    queries = [misspell(c.name, rng) for c in rng.sample(cards, 20)]
+
+    build_ms = measure(lambda: NameIndex((c, c.name) for c in cards), 1)
+    index = NameIndex((c, c.name) for c in cards)
+    print(f"{len(cards)} cards, index build: {build_ms:.0f} ms\n")
+
+    def scan(query):
+        return max(cards, key=lambda c: difflib.SequenceMatcher(None, query, c.name).ratio())
+
+    rows = []
+    for query in queries[:5]:
+        found = index.best(query, min_score=0.0)
+        scan_ms = measure(lambda: scan(query), 1)
+        index_ms = measure(lambda: index.search(query), args.repeat)
+        rows.append((query, found[0].name if found else '-', f"{scan_ms:.1f}", f"{index_ms:.2f}"))
+    hits = sum(1 for q in queries if index.best(q) is not None)
+
+    report(rows, ('query', 'best match', 'difflib scan ms', 'index ms'))
+    print(f"\n{hits}/{len(queries)} misspelled names found")
+
+if __name__ == '__main__':
+    main()
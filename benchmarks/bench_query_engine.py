@@ -0,0 +1,141 @@
+"""
+Filter + sort latency of the collection grid over the full card database:
+the former chain of per-filter list copies versus the compiled Query
+(card-level filters and sorts evaluated on the columnar card store, search
+answered by the inverted full-text index).
+
+The search scenarios are not compared row for row: the legacy filter matched
+substrings, the index matches word prefixes and also covers set names.
+
+    python -m benchmarks.bench_query_engine [--synthetic 13000]
+"""
+import statistics
+import time
+
+from src.services.card_columns import card_columns
+from src.services.query_engine import Query, card_printings, card_rarities
+from src.services.search_index import CardSearchIndex
+from src.ui.collection import build_consolidated_vms
+from benchmarks.common import parse_args, load_cards, measure, report
+
+PAGE_SIZE = 48
+
+DEFAULT_STATE = {
+    'search_text': '', 'filter_attr': '', 'filter_card_type': ['Monster', 'Spell', 'Trap'],
+    'filter_monster_race': '', 'filter_st_race': '', 'filter_archetype': '',
+    'filter_monster_category': [], 'filter_level': None, 'filter_set': '', 'filter_rarity': '',
+    'filter_atk_min': 0, 'filter_atk_max': 5000, 'filter_def_min': 0, 'filter_def_max': 5000,
+    'filter_ownership_min': 0, 'filter_ownership_max': 100,
+    'filter_price_min': 0.0, 'filter_price_max': 1000.0,
+}
+
+
+SCENARIOS = {
+    'no filter, sort by name': {},
+    'search "dragon"': {'search_text': 'dragon'},
+    'DARK level 4': {'filter_attr': 'DARK', 'filter_level': 4},
+    'set LOB': {'filter_set': 'Legend of Blue Eyes White Dragon | LOB'},
+    'search + ATK >= 2000 + effect': {'search_text': 'destroy', 'filter_atk_min': 2000,
+                                      'filter_monster_category': ['Effect']},
+}
+
+def legacy_filter(source, s):
+    """The filtering previously done by CollectionPage.apply_filters (consolidated view)."""
+    res = list(source)
+    txt = s['search_text'].lower()
+    if txt:
+        def matches_search(item):
+            if txt in item.api_card.name.lower() or txt in item.api_card.type.lower() or txt in item.api_card.desc.lower():
+                return True
+            return any(txt in cs.set_code.lower() for cs in item.api_card.card_sets)
+        res = [c for c in res if matches_search(c)]
+    res = [c for c in res if s['filter_ownership_min'] <= c.owned_quantity <= s['filter_ownership_max']]
+    res = [c for c in res if s['filter_price_min'] <= c.lowest_price <= s['filter_price_max']]
+    if s['filter_attr']:
+        res = [c for c in res if c.api_card.attribute == s['filter_attr']]
+    if s['filter_card_type']:
+        res = [c for c in res if any(t in c.api_card.type for t in s['filter_card_type'])]
+    if s['filter_monster_category']:
+        res = [c for c in res if all(c.api_card.matches_category(cat) for cat in s['filter_monster_category'])]
+    if s['filter_level']:
+        res = [c for c in res if c.api_card.level == int(s['filter_level'])]
+    if s['filter_atk_min'] > 0 or s['filter_atk_max'] < 5000:
+        res = [c for c in res if c.api_card.atk is not None and s['filter_atk_min'] <= c.api_card.atk <= s['filter_atk_max']]
+    if s['filter_set']:
+        prefix = s['filter_set'].split('|')[-1].strip().lower()
+        res = [c for c in res if any(cs.set_code.split('-')[0].lower() == prefix for cs in c.api_card.card_sets)]
+    res.sort(key=lambda x: x.api_card.name)
+    return res
+
+def engine_filter(source, s):
+    query = Query()
+    query.search(s['search_text'])
+    query.value_range('owned_quantity', s['filter_ownership_min'], s['filter_ownership_max'])
+    query.value_range('lowest_price', s['filter_price_min'], s['filter_price_max'], selectivity=0.9, column='price')
+    query.printings(s['filter_set'], lambda c: card_printings(c.api_card))
+    query.rarity(s['filter_rarity'], lambda c: card_rarities(c.api_card))
+    query.card_filters(s)
+    query.sort('Name')
+    result = query.run(source, page=1, page_size=PAGE_SIZE)
+    result.page_items  # rows are only mapped back for the visible page
+    return result
+
+def main():
+    args = parse_args(__doc__)
+    cards = load_cards(args)
+    source = build_consolidated_vms(cards, {})
+    print(f"{len(source)} cards")
+    build_ms = measure(lambda: CardSearchIndex().ensure(cards), 1)
+    print(f"search index build: {build_ms:.0f} ms\n")
+
+    rows = []
+    for name, overrides in SCENARIOS.items():
+        state = dict(DEFAULT_STATE)
+        state.update(overrides)
+        result = engine_filter(source, state)
+        if not state['search_text']:
+            assert [c.api_card.id for c in result.items] == [c.api_card.id for c in legacy_filter(source, state)]
+        columns = card_columns.get(source)[1]  # built once per loaded list, like the search index
+
+        def uncached():
+            columns.query_results.clear()
+            columns.results.clear()
+            return engine_filter(source, state)
+
+        legacy_ms = measure(lambda: legacy_filter(source, state), args.repeat)
+        engine_ms = measure(uncached, args.repeat)
+        cached_ms = measure(lambda: engine_filter(source, state), args.repeat)
+        rows.append((name, result.total, f"{legacy_ms:.1f}", f"{engine_ms:.1f}", f"{legacy_ms / engine_ms:.2f}x",
+                     f"{cached_ms:.2f}"))
+
+    report(rows, ('scenario', 'matches', 'legacy ms', 'engine ms', 'speedup', 'cached ms'))
+    print()
+    bench_typing(source, args)
+
+def bench_typing(source, args):
+    """A card name typed key by key: each query refines the previous result, or starts over."""
+    columns = card_columns.get(source)[1]
+    name = source[len(source) // 2].api_card.name
+    typing = [name[:i] for i in range(1, min(len(name), 14) + 1) if not name[i - 1].isspace()]
+    timings = {refine: [[] for _ in typing] for refine in (False, True)}
+    counts = []
+    for _ in range(args.repeat):
+        for refine in (False, True):
+            columns.results.clear()
+            for i, text in enumerate(typing):
+                columns.query_results.clear()
+                if not refine:
+                    columns.results.clear()
+                state = dict(DEFAULT_STATE, search_text=text)
+                start = time.perf_counter()
+                result = engine_filter(source, state)
+                timings[refine][i].append((time.perf_counter() - start) * 1000)
+                if len(counts) < len(typing):
+                    counts.append(result.total)
+
+    rows = [(repr(text), counts[i], f"{statistics.median(timings[False][i]):.2f}", f"{statistics.median(timings[True][i]):.2f}")
+            for i, text in enumerate(typing)]
+    report(rows, ('typed', 'matches', 'from source ms', 'refined ms'))
+
+if __name__ == '__main__':
+    main()
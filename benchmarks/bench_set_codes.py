@@ -0,0 +1,78 @@
+"""
+The set-code helpers (normalize_set_code, extract_language_code, is_set_code_compatible,
+transform_set_code) over every set code in the card database: the former parser, which
+tried each known region with startswith, versus the compiled regex, and the memoized
+helpers once their caches are warm (the steady state of the page row builders).
+
+    python -m benchmarks.bench_set_codes [--synthetic 13000]
+"""
+from unittest.mock import patch
+
+from src.core import utils
+from benchmarks.common import parse_args, load_cards, measure, report
+
+HELPERS = (utils.normalize_set_code, utils.extract_language_code,
+           utils.is_set_code_compatible, utils.transform_set_code)
+
+def legacy_parse_set_code(set_code: str):
+    """utils._parse_set_code before it used the compiled regex."""
+    if '-' not in set_code:
+        return None
+    prefix, rest = set_code.split('-', 1)
+    for r in utils._SORTED_REGION_KEYS:
+        if rest.startswith(r):
+            if rest[len(r):]:
+                return prefix, r, rest[len(r):]
+            break
+    return prefix, None, rest
+
+def workload(codes, normalize, extract, compatible, transform):
+    """The calls a collector row build makes per printing, roughly."""
+    for code in codes:
+        normalize(code)
+        extract(code)
+        compatible(code, 'EN')
+        transform(code, 'DE')
+
+def clear_caches():
+    utils._parse_set_code.cache_clear()
+    for helper in HELPERS:
+        helper.cache_clear()
+
+def main():
+    args = parse_args(__doc__)
+    cards = load_cards(args)
+    codes = [s.set_code for c in cards for s in c.card_sets]
+    distinct = set(codes)
+    assert all(legacy_parse_set_code(c) == utils._parse_set_code.__wrapped__(c) for c in distinct)
+    print(f"{len(codes)} set codes, {len(distinct)} distinct\n")
+
+    uncached = [h.__wrapped__ for h in HELPERS]
+    with patch.object(utils, '_parse_set_code', legacy_parse_set_code):
+        legacy_ms = measure(lambda: workload(codes, *uncached), args.repeat)
+    with patch.object(utils, '_parse_set_code', utils._parse_set_code.__wrapped__):
+        regex_ms = measure(lambda: workload(codes, *uncached), args.repeat)
+
+    def cold():
+        clear_caches()
+        workload(codes, *HELPERS)
+
+    cold_ms = measure(cold, args.repeat)
+    workload(codes, *HELPERS)
+    warm_ms = measure(lambda: workload(codes, *HELPERS), args.repeat)
+
+    parse_legacy_ms = measure(lambda: [legacy_parse_set_code(c) for c in codes], args.repeat)
+    parse_regex_ms = measure(lambda: [utils._parse_set_code.__wrapped__(c) for c in codes], args.repeat)
+
+    report([('parse only, startswith loop', f"{parse_legacy_ms:.1f}", '1.00x'),
+            ('parse only, compiled regex', f"{parse_regex_ms:.1f}", f"{parse_legacy_ms / parse_regex_ms:.2f}x"),
+            ('helpers, startswith loop', f"{legacy_ms:.1f}", '1.00x'),
+            ('helpers, compiled regex', f"{regex_ms:.1f}", f"{legacy_ms / regex_ms:.2f}x"),
+            ('helpers, memoized (cold)', f"{cold_ms:.1f}", f"{legacy_ms / cold_ms:.2f}x"),
+            ('helpers, memoized (warm)', f"{warm_ms:.1f}", f"{legacy_ms / warm_ms:.2f}x")],
+           ('variant', 'ms', 'speedup'))
+    info = utils._parse_set_code.cache_info()
+    print(f"\nparse cache: {info.currsize}/{info.maxsize} entries")
+
+if __name__ == '__main__':
+    main()
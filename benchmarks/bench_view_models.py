@@ -0,0 +1,113 @@
+"""
+Memory held by each page's view rows over the full card database: the slotted
+row dataclasses versus the same fields in regular (per-instance __dict__) dataclasses.
+A synthetic collection owns roughly one printing in four, in a few languages and
+conditions, so the collection-backed pages have owned rows to show.
+
+    python -m benchmarks.bench_view_models [--synthetic 13000]
+"""
+import dataclasses
+import gc
+import random
+import tracemalloc
+
+from src.core.models import Collection, CollectionCard, CollectionVariant, CollectionEntry
+from src.ui.collection import build_consolidated_vms, build_collector_rows
+from src.ui.bulk_add import LibraryEntry, _build_collection_entries
+from src.ui.storage import StorageRow
+from src.ui.db_editor import build_db_rows
+from benchmarks.common import parse_args, load_cards, report
+
+LANGUAGES = ["EN", "DE", "FR", "IT"]
+CONDITIONS = ["Near Mint", "Excellent", "Played"]
+
+def synthetic_collection(cards, seed: int = 11) -> Collection:
+    rng = random.Random(seed)
+    owned = []
+    for card in cards:
+        variants = []
+        for s in card.card_sets:
+            if rng.random() < 0.25:
+                entries = [CollectionEntry(language=rng.choice(LANGUAGES), condition=rng.choice(CONDITIONS),
+                                           quantity=rng.randint(1, 3),
+                                           storage_location=rng.choice([None, "Box A", "Binder 1"]))
+                           for _ in range(rng.randint(1, 3))]
+                variants.append(CollectionVariant(variant_id=s.variant_id or f"{card.id}_{s.set_code}",
+                                                  set_code=s.set_code, rarity=s.set_rarity, entries=entries))
+        if variants:
+            owned.append(CollectionCard(card_id=card.id, name=card.name, variants=variants))
+    return Collection(name="Benchmark", cards=owned)
+
+def library_rows(cards):
+    # One row per printing, as the bulk add library lists them
+    return [LibraryEntry(id=f"{c.id}_{s.set_code}_{s.set_rarity}", api_card=c, set_code=s.set_code,
+                         set_name=s.set_name, rarity=s.set_rarity,
+                         image_url=c.card_images[0].image_url_small if c.card_images else None,
+                         image_id=c.card_images[0].id if c.card_images else c.id)
+            for c in cards for s in c.card_sets]
+
+def storage_rows(collection, card_map):
+    # One row per owned entry, as the storage page lists unassigned copies
+    rows = []
+    for cc in collection.cards:
+        card = card_map[cc.card_id]
+        for v in cc.variants:
+            for e in v.entries:
+                rows.append(StorageRow(api_card=card, set_code=v.set_code, set_name="", rarity=v.rarity,
+                                       image_url=None, quantity=e.quantity, language=e.language,
+                                       condition=e.condition, first_edition=e.first_edition,
+                                       image_id=v.image_id, variant_id=v.variant_id,
+                                       storage_location=e.storage_location))
+    return rows
+
+def copied(rows, dict_backed: bool):
+    """
+    The rows rebuilt from their field values, so only the row objects themselves are
+    allocated; dict_backed uses an unslotted copy of their dataclass.
+    """
+    cls = type(rows[0])
+    names = [f.name for f in dataclasses.fields(cls)]
+    if dict_backed:
+        cls = dataclasses.make_dataclass(cls.__name__, names)
+    return [cls(*(getattr(r, n) for n in names)) for r in rows]
+
+def allocated(build):
+    """Returns (result, bytes the result still holds once build returned)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    args = parse_args(__doc__)
+    cards = load_cards(args)
+    card_map = {c.id: c for c in cards}
+    collection = synthetic_collection(cards)
+    owned = {c.card_id: c for c in collection.cards}
+
+    pages = {
+        'collection (consolidated)': lambda: build_consolidated_vms(cards, owned),
+        'collection (collectors)': lambda: build_collector_rows(cards, owned, 'EN'),
+        'bulk add (library)': lambda: library_rows(cards),
+        'bulk add (collection)': lambda: _build_collection_entries(collection, card_map),
+        'storage': lambda: storage_rows(collection, card_map),
+        'db editor': lambda: build_db_rows(cards),
+    }
+
+    rows = []
+    for name, build in pages.items():
+        items = build()
+        _, plain = allocated(lambda: copied(items, dict_backed=True))
+        _, slotted = allocated(lambda: copied(items, dict_backed=False))
+        per_row = max(len(items), 1)
+        rows.append((name, len(items), f"{plain / 2**20:.1f}", f"{slotted / 2**20:.1f}",
+                     f"{plain / per_row:.0f}", f"{slotted / per_row:.0f}"))
+        del items
+
+    print(f"{len(cards)} cards, {sum(len(c.variants) for c in collection.cards)} owned printings\n")
+    report(rows, ('page', 'rows', 'dict MiB', 'slotted MiB', 'dict B/row', 'slotted B/row'))
+
+if __name__ == '__main__':
+    main()
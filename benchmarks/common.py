@@ -0,0 +1,83 @@
+"""
+Helpers shared by the benchmark scripts. Run them from the repository root, e.g.
+
+    python -m benchmarks.bench_query_engine
+
+They use the local card database (data/db/card_db.json), downloading it first if
+it is missing. Pass --synthetic N to benchmark N generated cards instead.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Callable, List, Optional
+
+from src.core.models import ApiCard, ApiCardSet, ApiCardImage, ApiCardPrice
+from src.services.ygo_api import ygo_service
+
+ATTRIBUTES = ["DARK", "LIGHT", "EARTH", "WATER", "FIRE", "WIND", "DIVINE"]
+RACES = ["Dragon", "Spellcaster", "Warrior", "Fiend", "Machine", "Zombie", "Beast", "Fairy"]
+TYPES = ["Normal Monster", "Effect Monster", "Fusion Monster", "Synchro Monster", "XYZ Monster",
+         "Link Monster", "Spell Card", "Trap Card"]
+RARITIES = ["Common", "Rare", "Super Rare", "Ultra Rare", "Secret Rare"]
+
+def parse_args(description: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--synthetic', type=int, default=None, metavar='N',
+                        help="Benchmark N generated cards instead of the local database")
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+def synthetic_cards(count: int, seed: int = 42) -> List[ApiCard]:
+    rng = random.Random(seed)
+    sets = [(f"S{i:03d}", f"Synthetic Set {i}") for i in range(max(1, count // 40))]
+    cards = []
+    for i in range(count):
+        card_type = rng.choice(TYPES)
+        is_monster = "Monster" in card_type
+        printings = []
+        for _ in range(rng.randint(1, 4)):
+            code, name = rng.choice(sets)
+            printings.append(ApiCardSet(set_name=name, set_code=f"{code}-EN{rng.randint(1, 120):03d}",
+                                        set_rarity=rng.choice(RARITIES),
+                                        set_price=f"{rng.uniform(0.1, 50):.2f}"))
+        cards.append(ApiCard(
+            id=10000 + i,
+            name=f"Card {i} {rng.choice(RACES)}",
+            type=card_type,
+            frameType="effect",
+            desc=" ".join(rng.choice(RACES + ATTRIBUTES + ["destroy", "draw", "special", "summon"]) for _ in range(30)),
+            race=rng.choice(RACES) if is_monster else rng.choice(["Normal", "Continuous", "Quick-Play"]),
+            atk=rng.randrange(0, 5000, 50) if is_monster else None,
+            **{'def': rng.randrange(0, 5000, 50) if is_monster else None},
+            level=rng.randint(1, 12) if is_monster else None,
+            attribute=rng.choice(ATTRIBUTES) if is_monster else None,
+            archetype=f"Archetype {rng.randint(0, 400)}" if rng.random() < 0.6 else None,
+            card_images=[ApiCardImage(id=10000 + i, image_url="", image_url_small="")],
+            card_sets=printings,
+            card_prices=[ApiCardPrice(cardmarket_price=f"{rng.uniform(0.1, 20):.2f}",
+                                      tcgplayer_price=f"{rng.uniform(0.1, 20):.2f}")],
+        ))
+    return cards
+
+def load_cards(args: argparse.Namespace) -> List[ApiCard]:
+    if args.synthetic:
+        return synthetic_cards(args.synthetic)
+    return asyncio.run(ygo_service.load_card_database(args.language))
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Median wall time of func in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def report(rows: List[tuple], headers: tuple):
+    widths = [max(len(str(r[i])) for r in rows + [headers]) for i in range(len(headers))]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for r in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(r, widths)))
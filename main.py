@@ -19,6 +19,9 @@ from src.ui.bulk_add import bulk_add_page
 from src.ui.scan import scan_page
 from src.ui.db_editor import db_editor_page
 from src.ui.storage import storage_page
+from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler
+from src.core.static_files import add_cached_static_files
 
 @ui.page('/')
 def home():
@@ -61,13 +64,20 @@ os.makedirs('data/images', exist_ok=True)
 os.makedirs('data/img', exist_ok=True)
 os.makedirs('data/collections/storage', exist_ok=True)
 os.makedirs('data/flags', exist_ok=True)
-app.add_static_files('/images', 'data/images')
+# Images revalidate via ETag unless versioned (?v=); card image URLs carry their content hash
+add_cached_static_files(app, '/images', 'data/images')
 app.add_static_files('/data/img', 'data/img') # Serve data/img for Art Match if used
-app.add_static_files('/sets', 'data/sets')
-app.add_static_files('/storage', 'data/collections/storage')
-app.add_static_files('/flags', 'data/flags')
+add_cached_static_files(app, '/sets', 'data/sets')
+add_cached_static_files(app, '/storage', 'data/collections/storage')
+add_cached_static_files(app, '/flags', 'data/flags')
 app.add_static_files('/debug', 'debug')
 
+# Index images cached before the metadata sidecar existed, then trim the cache to the configured disk budgets
+app.on_startup(image_manager.prepare_cache)
+# Continue image downloads interrupted by the last shutdown
+app.on_startup(download_scheduler.resume)
+app.on_shutdown(download_scheduler.shutdown)
+
 # Handle Chrome DevTools probe to prevent 404 warnings
 @app.get('/.well-known/appspecific/com.chrome.devtools.json')
 def chrome_devtools_probe():
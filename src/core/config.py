@@ -4,6 +4,15 @@ from typing import Dict, Any
 
 CONFIG_FILE = "config.json"
 
+# Disk budget per image cache class in MB. 0 disables eviction for that class.
+# High res images are mostly fetched on purpose (Download All High Res Images), so their budget is opt-in.
+DEFAULT_IMAGE_CACHE_BUDGETS_MB = {
+    "small": 1024,
+    "high_res": 0,
+    "sets": 512,
+    "flags": 16,
+}
+
 class ConfigManager:
     def __init__(self, config_file: str = CONFIG_FILE):
         self.config_file = config_file
@@ -24,7 +33,9 @@ class ConfigManager:
             "language": "en",
             "theme": "dark",
             "deck_builder_page_size": 9,
-            "bulk_add_page_size": 50
+            "bulk_add_page_size": 50,
+            "image_cache_budgets_mb": dict(DEFAULT_IMAGE_CACHE_BUDGETS_MB),
+            "atlas_mode": False
         }
 
     def save_config(self):
@@ -52,4 +63,20 @@ class ConfigManager:
         self.config["bulk_add_page_size"] = size
         self.save_config()
 
+    def get_image_cache_budget_mb(self, cache_class: str) -> int:
+        budgets = self.config.get("image_cache_budgets_mb", {})
+        return budgets.get(cache_class, DEFAULT_IMAGE_CACHE_BUDGETS_MB.get(cache_class, 0))
+
+    def set_image_cache_budget_mb(self, cache_class: str, size_mb: int):
+        budgets = self.config.setdefault("image_cache_budgets_mb", dict(DEFAULT_IMAGE_CACHE_BUDGETS_MB))
+        budgets[cache_class] = size_mb
+        self.save_config()
+
+    def get_atlas_mode(self) -> bool:
+        return self.config.get("atlas_mode", False)
+
+    def set_atlas_mode(self, enabled: bool):
+        self.config["atlas_mode"] = enabled
+        self.save_config()
+
 config_manager = ConfigManager()
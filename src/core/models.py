@@ -1,12 +1,27 @@
-from typing import List, Optional, Literal
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Literal, Tuple
+from pydantic import AfterValidator, BaseModel, Field, PrivateAttr
+from src.core.constants import MONSTER_CATEGORIES
+import sys
 import uuid
 
+# Strings repeated across thousands of rows (languages, rarities, set names) are interned
+# at parse time, so every entry, printing and view row shares one copy of each value.
+InternedStr = Annotated[str, AfterValidator(sys.intern)]
+
+def parse_price(value: Optional[str]) -> Optional[float]:
+    """A price string from the API as a number, None if it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
 # --- Collection Models ---
 
 class CollectionEntry(BaseModel):
     condition: Literal["Mint", "Near Mint", "Excellent", "Good", "Light Played", "Played", "Poor", "Damaged"] = "Near Mint"
-    language: str = "EN"
+    language: InternedStr = "EN"
     first_edition: bool = False
     quantity: int = 1
     storage_location: Optional[str] = Field(None, description="e.g., Box A, Row 2")
@@ -24,7 +39,7 @@ class StorageDefinition(BaseModel):
 class CollectionVariant(BaseModel):
     variant_id: str
     set_code: str
-    rarity: str
+    rarity: InternedStr
     image_id: Optional[int] = None
     entries: List[CollectionEntry] = []
 
@@ -86,6 +101,64 @@ class Card(BaseModel):
 
 # --- API/Database Models ---
 
+def _matches_category(card_type: str, typeline: Optional[List[str]], category: str) -> bool:
+    """ApiCard.matches_category for a card of this type and typeline."""
+    # Use typeline if available
+    if typeline is not None:
+        if category == "Effect":
+            return "Effect" in typeline
+        elif category == "Normal":
+            if "Normal" in typeline:
+                return True
+            # Check for Non-Effect Extra Deck / Ritual
+            # Synchro/Fusion/XYZ/Link/Ritual without "Effect" in typeline are "Normal" (Non-Effect).
+            is_extra_or_ritual = any(t in card_type for t in ["Synchro", "Fusion", "XYZ", "Link", "Ritual"])
+            if is_extra_or_ritual and "Effect" not in typeline:
+                return True
+            return False
+        else:
+            return category in card_type or category in typeline
+
+    # Fallback Legacy Logic
+    if category == "Effect":
+        # Special logic for Effect:
+        # 1. Explicitly in type string
+        if "Effect" in card_type: return True
+        # 2. Implied by Extra Deck / Ritual / Pendulum types (unless Normal is present)
+        implied_types = ["Synchro", "Fusion", "XYZ", "Link", "Ritual", "Pendulum"]
+        if any(t in card_type for t in implied_types) and "Normal" not in card_type:
+            return True
+        return False
+    else:
+        return category in card_type
+
+# Card types placed in the Extra Deck
+EXTRA_DECK_TYPES = ("Fusion", "Synchro", "XYZ", "Link")
+
+# Bit of each MONSTER_CATEGORIES entry in ApiCard.categories
+CATEGORY_BITS: Dict[str, int] = {category: 1 << i for i, category in enumerate(MONSTER_CATEGORIES)}
+
+# (type, typeline) -> categories bitmask; a few hundred combinations cover the whole database
+_category_masks: Dict[Tuple[str, Optional[Tuple[str, ...]]], int] = {}
+
+def category_mask(categories: Iterable[str]) -> int:
+    """The ApiCard.categories bits of categories (all of them in MONSTER_CATEGORIES)."""
+    mask = 0
+    for category in categories:
+        mask |= CATEGORY_BITS[category]
+    return mask
+
+def _categories_of(card_type: str, typeline: Optional[List[str]]) -> int:
+    key = (card_type, tuple(typeline) if typeline is not None else None)
+    mask = _category_masks.get(key)
+    if mask is None:
+        mask = 0
+        for category, bit in CATEGORY_BITS.items():
+            if _matches_category(card_type, typeline, category):
+                mask |= bit
+        _category_masks[key] = mask
+    return mask
+
 class ApiCardImage(BaseModel):
     id: int
     image_url: str
@@ -94,17 +167,32 @@ class ApiCardImage(BaseModel):
 
 class ApiCardSet(BaseModel):
     variant_id: Optional[str] = None
-    set_name: str
+    set_name: InternedStr
     set_code: str
-    set_rarity: str
+    set_rarity: InternedStr
     set_rarity_code: Optional[str] = None
     set_price: Optional[str] = None
     image_id: Optional[int] = Field(None, alias='card_image_id')
 
+    # (set_price it was parsed from, value); parsed at load, again only if set_price is replaced
+    _price: Tuple[Optional[str], float] = PrivateAttr((None, 0.0))
+
     model_config = {
         "populate_by_name": True
     }
 
+    def model_post_init(self, __context: Any) -> None:
+        self._price = (self.set_price, parse_price(self.set_price) or 0.0)
+
+    @property
+    def price(self) -> float:
+        """set_price as a number, 0.0 if unknown."""
+        source, value = self.__pydantic_private__['_price']  # direct: BaseModel.__getattr__ is slow
+        if source is not self.set_price:
+            value = parse_price(self.set_price) or 0.0
+            self._price = (self.set_price, value)
+        return value
+
 class ApiCardPrice(BaseModel):
     cardmarket_price: Optional[str] = None
     tcgplayer_price: Optional[str] = None
@@ -132,21 +220,85 @@ class ApiCard(BaseModel):
     card_sets: List[ApiCardSet] = []
     card_prices: List[ApiCardPrice] = []
 
+    # (card_prices they were parsed from, lowest price, TCGplayer price); see _parse_prices
+    _prices: Tuple[Optional[list], float, float] = PrivateAttr((None, 0.0, 0.0))
+
+    # (type, typeline, name, card_images they were derived from, extra deck flag, categories
+    # bitmask, first card image id or None, lowercase name); see _derive
+    _derived: Optional[tuple] = PrivateAttr(None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._parse_prices()
+        self._derive()
+
+    def _derive(self) -> tuple:
+        card_type, typeline, name, images = self.type, self.typeline, self.name, self.card_images
+        extra_deck = any(t in card_type for t in EXTRA_DECK_TYPES)
+        self._derived = (card_type, typeline, name, images, extra_deck, _categories_of(card_type, typeline),
+                         images[0].id if images else None, name.lower())
+        return self._derived
+
+    def _current(self) -> tuple:
+        derived = self.__pydantic_private__['_derived']  # direct: BaseModel.__getattr__ is slow
+        if derived is None or derived[0] is not self.type or derived[1] is not self.typeline \
+                or derived[2] is not self.name or derived[3] is not self.card_images:
+            derived = self._derive()
+        return derived
+
+    def _parse_prices(self) -> Tuple[Optional[list], float, float]:
+        lowest = tcg = 0.0
+        if self.card_prices:
+            p = self.card_prices[0]
+            known = [v for v in map(parse_price, (p.cardmarket_price, p.tcgplayer_price, p.coolstuffinc_price))
+                     if v is not None]
+            lowest = min(known) if known else 0.0
+            tcg = parse_price(p.tcgplayer_price) or 0.0
+        self._prices = (self.card_prices, lowest, tcg)
+        return self._prices
+
+    @property
+    def lowest_price(self) -> float:
+        """Lowest of the Cardmarket, TCGplayer and CoolStuffInc prices, 0.0 if none is known."""
+        prices = self.__pydantic_private__['_prices']  # direct: BaseModel.__getattr__ is slow
+        if prices[0] is not self.card_prices:
+            prices = self._parse_prices()
+        return prices[1]
+
+    @property
+    def tcg_price(self) -> float:
+        """TCGplayer price, 0.0 if unknown."""
+        prices = self.__pydantic_private__['_prices']  # direct: BaseModel.__getattr__ is slow
+        if prices[0] is not self.card_prices:
+            prices = self._parse_prices()
+        return prices[2]
+
     @property
     def is_extra_deck(self) -> bool:
         """
         Determines if the card belongs in the Extra Deck.
         Checks for Fusion, Synchro, XYZ, or Link in the card type.
         """
-        extra_types = ["Fusion", "Synchro", "XYZ", "Link"]
-        return any(t in self.type for t in extra_types)
+        return self._current()[4]
+
+    @property
+    def categories(self) -> int:
+        """Bitmask of the MONSTER_CATEGORIES the card matches (see CATEGORY_BITS)."""
+        return self._current()[5]
+
+    @property
+    def name_lower(self) -> str:
+        return self._current()[7]
 
     def get_best_image_id(self) -> int:
         """
         Returns the best available image ID for the card.
         Prioritizes official images, then custom variant images, then falls back to card ID.
         """
+        image_id = self._current()[6]
+        if image_id is not None:
+            return image_id
         if self.card_images:
+            # An image added to the list in place since it was derived
             return self.card_images[0].id
 
         # Check variants for custom images (e.g. imported cards)
@@ -162,32 +314,7 @@ class ApiCard(BaseModel):
         Checks if the card belongs to the specified monster category (e.g., 'Normal', 'Effect', 'Synchro').
         Handles special logic for 'Normal' vs 'Effect' distinction for Extra Deck monsters.
         """
-        # Use typeline if available
-        if self.typeline is not None:
-            if category == "Effect":
-                return "Effect" in self.typeline
-            elif category == "Normal":
-                if "Normal" in self.typeline:
-                    return True
-                # Check for Non-Effect Extra Deck / Ritual
-                # Synchro/Fusion/XYZ/Link/Ritual without "Effect" in typeline are "Normal" (Non-Effect).
-                is_extra_or_ritual = any(t in self.type for t in ["Synchro", "Fusion", "XYZ", "Link", "Ritual"])
-                if is_extra_or_ritual and "Effect" not in self.typeline:
-                    return True
-                return False
-            else:
-                return category in self.type or category in self.typeline
-
-        # Fallback Legacy Logic
-        card_type = self.type
-        if category == "Effect":
-            # Special logic for Effect:
-            # 1. Explicitly in type string
-            if "Effect" in card_type: return True
-            # 2. Implied by Extra Deck / Ritual / Pendulum types (unless Normal is present)
-            implied_types = ["Synchro", "Fusion", "XYZ", "Link", "Ritual", "Pendulum"]
-            if any(t in card_type for t in implied_types) and "Normal" not in card_type:
-                return True
-            return False
-        else:
-            return category in card_type
+        bit = CATEGORY_BITS.get(category)
+        if bit is not None:
+            return bool(self.categories & bit)
+        return _matches_category(self.type, self.typeline, category)
@@ -16,16 +16,26 @@ class PersistenceManager:
     def __init__(self, data_dir: str = COLLECTIONS_DIR, decks_dir: str = DECKS_DIR):
         self.data_dir = data_dir
         self.decks_dir = decks_dir
+        # Bumped whenever collection data is loaded or changed; keys cached query results
+        self.collection_version = 0
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.decks_dir, exist_ok=True)
 
+    def mark_collections_changed(self):
+        """Call after changing collection data (or rows derived from it) in place."""
+        self.collection_version += 1
+
     def list_collections(self) -> List[str]:
         """Returns a list of available collection filenames."""
         files = [f for f in os.listdir(self.data_dir) if f.endswith(('.json', '.yaml', '.yml'))]
         return files
 
-    def load_collection(self, filename: str) -> Collection:
-        """Loads a collection from a JSON or YAML file."""
+    def load_collection(self, filename: str, mark: bool = True) -> Collection:
+        """
+        Loads a collection from a JSON or YAML file.
+        mark=False leaves the collection version alone, for read-only callers that do not
+        replace the collection data the pages query.
+        """
         logger.info(f"Loading collection: {filename}")
         filepath = os.path.join(self.data_dir, filename)
         if not os.path.exists(filepath):
@@ -41,7 +51,10 @@ class PersistenceManager:
                 else:
                     raise ValueError("Unsupported file format")
 
-            return Collection(**data)
+            collection = Collection(**data)
+            if mark:
+                self.mark_collections_changed()
+            return collection
         except Exception as e:
             logger.error(f"Error loading collection {filename}: {e}")
             raise
@@ -51,6 +64,7 @@ class PersistenceManager:
         logger.info(f"Saving collection: {filename}")
         filepath = os.path.join(self.data_dir, filename)
         data = collection.model_dump(mode='json')
+        self.mark_collections_changed()
         # Use UUID to prevent collisions if multiple saves run concurrently
         temp_filepath = filepath + f".{uuid.uuid4()}.tmp"
 
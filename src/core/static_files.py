@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Union
+from urllib.parse import parse_qs
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# Content never changes for a given URL (versioned URLs carry a content hash or version)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Browsers keep the file but revalidate it with its ETag / Last-Modified, getting a 304 when unchanged
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with an explicit caching policy. Starlette already answers
+    If-None-Match / If-Modified-Since with 304 using ETag and Last-Modified.
+    Requests carrying a version query parameter (?v=...) are always immutable,
+    since a replaced file is served under a new version.
+    """
+
+    def __init__(self, *args, immutable: bool = False, **kwargs) -> None:
+        self.immutable = immutable
+        super().__init__(*args, **kwargs)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            versioned = 'v' in parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if (self.immutable or versioned) else REVALIDATE_CACHE_CONTROL
+        return response
+
+def add_cached_static_files(app, url_path: str, local_directory: Union[str, Path], immutable: bool = False):
+    """Drop-in replacement for app.add_static_files with the caching policy of CachedStaticFiles."""
+    handler = CachedStaticFiles(directory=local_directory, immutable=immutable, check_dir=False)
+
+    @app.get(url_path.rstrip('/') + '/{path:path}', include_in_schema=False)
+    async def static_file(request: Request, path: str = '') -> Response:
+        return await handler.get_response(path, request.scope)
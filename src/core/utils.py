@@ -1,5 +1,6 @@
 import re
 import hashlib
+from functools import lru_cache
 from typing import Optional
 
 # Region Code Mapping
@@ -84,46 +85,32 @@ LANGUAGE_COUNTRY_MAP = {
 # Pre-calculate sorted region keys by length (descending) to match longest first
 _SORTED_REGION_KEYS = sorted(REGION_TO_LANGUAGE_MAP.keys(), key=len, reverse=True)
 
+# Prefix, then the longest known region the rest starts with (alternatives are tried in
+# order), then the suffix. A region without a suffix after it is not a region (see below).
+_SET_CODE_RE = re.compile(r'([^-]*)-(' + '|'.join(map(re.escape, _SORTED_REGION_KEYS)) + r')?(.*)', re.DOTALL)
+
+# Distinct set codes kept by the memoized helpers below; the card database has ~40k
+SET_CODE_CACHE_SIZE = 1 << 16
+
+@lru_cache(maxsize=SET_CODE_CACHE_SIZE)
 def _parse_set_code(set_code: str):
     """
     Parses a set code into (Prefix, Region, Suffix)
     Region is matched against known valid region codes.
     Returns (prefix, region, suffix) or None if format doesn't match expected pattern.
     """
-    if '-' not in set_code:
+    match = _SET_CODE_RE.fullmatch(set_code)
+    if match is None:
         return None
 
-    parts = set_code.split('-', 1)
-    prefix = parts[0]
-    rest = parts[1]
-
-    # Try to match start of 'rest' with a known region
-    best_region = None
-
-    for r in _SORTED_REGION_KEYS:
-        if rest.startswith(r):
-            # Potential match. Check if what follows is likely the number/suffix.
-            # Usually suffix starts with a digit OR could be letter-digit mix.
-            # But the region must be the *prefix* of 'rest'.
-            # Also, we should prefer 'EN' over 'E' if rest is 'EN001'.
-            # Since _SORTED_REGION_KEYS is sorted by length descending, 'EN' comes first.
-            best_region = r
-            break
-
-    if best_region:
-        suffix = rest[len(best_region):]
-        # Only consider it a valid region match if there is a suffix
-        # (e.g. LOB-EN is weird, usually LOB-EN001. But even LOB-EN could imply suffix is empty?)
-        # Let's assume suffix must exist, but could be anything (digits, letters+digits)
-        # Note: Some codes might be just Prefix-Region? Unlikely for card codes.
-        if suffix:
-            return prefix, best_region, suffix
-
-    # If no region matched, check if it looks like Prefix-Number (No Region)
-    # e.g. SDY-006. rest="006". No region starts with '0'.
-    # So if no region matched, we treat region as None.
-    return prefix, None, rest
+    prefix, region, suffix = match.groups()
+    # Only consider it a valid region match if there is a suffix (LOB-EN001, not LOB-EN).
+    # If no region matched, it looks like Prefix-Number (e.g. SDY-006): region is None.
+    if region and not suffix:
+        return prefix, None, region
+    return prefix, region, suffix
 
+@lru_cache(maxsize=SET_CODE_CACHE_SIZE)
 def transform_set_code(set_code: str, language: str) -> str:
     """
     Transforms a set code based on the language.
@@ -155,6 +142,7 @@ def transform_set_code(set_code: str, language: str) -> str:
     # Fallback to original if parsing completely failed (no hyphen?)
     return set_code
 
+@lru_cache(maxsize=SET_CODE_CACHE_SIZE)
 def normalize_set_code(set_code: str) -> str:
     """
     Normalizes a set code to Prefix-Number format, stripping the region code.
@@ -171,6 +159,7 @@ def normalize_set_code(set_code: str) -> str:
         return set_code # No region, so Prefix-Suffix is just set_code
     return set_code
 
+@lru_cache(maxsize=SET_CODE_CACHE_SIZE)
 def extract_language_code(set_code: str) -> str:
     """
     Extracts the language code from a set code.
@@ -186,6 +175,7 @@ def extract_language_code(set_code: str) -> str:
     # Case 2: No region code (e.g. SDY-006) -> Usually EN (NA print)
     return 'EN'
 
+@lru_cache(maxsize=SET_CODE_CACHE_SIZE)
 def is_set_code_compatible(set_code: str, language: str) -> bool:
     """
     Checks if a set code is compatible with the target language.
@@ -0,0 +1,223 @@
+import logging
+import operator
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.ygo_api import ygo_service
+
+logger = logging.getLogger(__name__)
+
+MISSING = -1          # Stored for absent ATK/DEF/level/link values
+COLUMN_CACHE_SIZE = 8 # Sources (page lists) whose columns are kept
+
+def _int_column(values, count: int) -> np.ndarray:
+    return np.fromiter((MISSING if v is None else v for v in values), dtype=np.int32, count=count)
+
+class _Categorical:
+    """Codes for a low-cardinality string column; the vocabulary maps value -> code."""
+
+    def __init__(self, values: List[Optional[str]]):
+        self.vocab: Dict[Optional[str], int] = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, v in enumerate(values):
+            code = self.vocab.get(v)
+            if code is None:
+                code = self.vocab[v] = len(self.vocab)
+            codes[i] = code
+        self.codes = codes
+
+    def take(self, positions: np.ndarray) -> '_Categorical':
+        subset = object.__new__(_Categorical)
+        subset.vocab = self.vocab
+        subset.codes = self.codes[positions]
+        return subset
+
+    def equals(self, value: Optional[str]) -> np.ndarray:
+        code = self.vocab.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def matching(self, predicate) -> np.ndarray:
+        """Rows whose value satisfies predicate, evaluated once per distinct value."""
+        codes = [code for value, code in self.vocab.items() if value is not None and predicate(value)]
+        return np.isin(self.codes, codes)
+
+class CardColumns:
+    """
+    Column arrays over the cards of a page's rows, aligned with the rows by position:
+    ints for ATK/DEF/level/link rating (MISSING when absent), floats for parsed prices,
+    categorical codes for attribute/race/archetype/frame type/type and a bitmask of
+    MONSTER_CATEGORIES. Filters become boolean masks and sorts become argsorts.
+    """
+
+    def __init__(self, cards: List[Any]):
+        n = len(cards)
+        self.size = n
+        self.ids = np.fromiter((c.id for c in cards), dtype=np.int64, count=n)
+        self.atk = _int_column((c.atk for c in cards), n)
+        self.def_ = _int_column((c.def_ for c in cards), n)
+        self.level = _int_column((c.level for c in cards), n)
+        self.linkval = _int_column((c.linkval for c in cards), n)
+
+        # Prices are parsed once when the card database is loaded
+        self.price = np.fromiter((c.lowest_price for c in cards), dtype=np.float64, count=n)
+        self.tcg_price = np.fromiter((c.tcg_price for c in cards), dtype=np.float64, count=n)
+
+        self.attribute = _Categorical([c.attribute for c in cards])
+        self.race = _Categorical([c.race for c in cards])
+        self.archetype = _Categorical([c.archetype for c in cards])
+        self.frame_type = _Categorical([c.frameType for c in cards])
+        self.type = _Categorical([c.type for c in cards])
+
+        # Derived once per card when the database is loaded
+        self.categories = np.fromiter((c.categories for c in cards), dtype=np.uint32, count=n)
+
+        # Ties share a rank, so a stable argsort keeps equal names in row order
+        _, self.name_rank = np.unique(np.array([c.name for c in cards], dtype=str), return_inverse=True)
+
+        # The search index these cards were last added to (see Query.search)
+        self.search_index = None
+        # Recent card-level filter results: filter state -> (state, row positions)
+        self.results: 'OrderedDict[frozenset, Tuple[Dict, np.ndarray]]' = OrderedDict()
+        # Recent complete query results (see Query._cache_key)
+        self.query_results: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        # Sort permutations of all rows: (sort key, reverse) -> row positions
+        self._permutations: Dict[Tuple, np.ndarray] = {}
+
+    def take(self, positions: np.ndarray) -> 'CardColumns':
+        """The columns of the rows at positions, so masks cost only as much as the subset."""
+        subset = object.__new__(CardColumns)
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                value = value[positions]
+            elif isinstance(value, _Categorical):
+                value = value.take(positions)
+            setattr(subset, name, value)
+        subset.size = len(positions)
+        subset.results = OrderedDict()
+        subset.query_results = OrderedDict()
+        subset._permutations = {}
+        return subset
+
+    def type_contains(self, text: str) -> np.ndarray:
+        return self.type.matching(lambda t: text in t)
+
+    def with_categories(self, mask: int, require_all: bool) -> np.ndarray:
+        """Rows with all (or any) of the category bits in mask (see models.category_mask)."""
+        bits = self.categories & np.uint32(mask)
+        return bits == mask if require_all else bits != 0
+
+    def in_range(self, column: str, low: float, high: float) -> np.ndarray:
+        values = getattr(self, column)
+        mask = (values >= low) & (values <= high)
+        if values.dtype.kind == 'i' and low <= MISSING:
+            mask &= values != MISSING
+        return mask
+
+    def sort_key(self, sort_by: str) -> Optional[np.ndarray]:
+        """Array equivalent of query_engine.card_sort_key for the card-level sorts."""
+        if sort_by == 'Name':
+            return self.name_rank
+        if sort_by == 'Newest':
+            return self.ids
+        column = {'ATK': self.atk, 'DEF': self.def_, 'Level': self.level}.get(sort_by)
+        if column is not None:
+            # Same order as the "value or -1" keys: 0 and missing sort together
+            return np.where(column == 0, -1, column)
+        if sort_by == 'Price':
+            return self.price
+        if sort_by == 'TCG Price':
+            return self.tcg_price
+        return None
+
+    def permutation(self, key: Any, reverse: bool, values: Callable[[], Any]) -> np.ndarray:
+        """
+        All row positions ordered by values() (an array or a list of row keys), computed once
+        per key. The order is stable in both directions like list.sort(reverse=...).
+        """
+        perm = self._permutations.get((key, reverse))
+        if perm is None:
+            v = values()
+            if isinstance(v, np.ndarray):
+                perm = np.argsort(-v if reverse else v, kind='stable')
+            else:
+                perm = np.array(sorted(range(len(v)), key=v.__getitem__, reverse=reverse), dtype=np.int64)
+            self._permutations[(key, reverse)] = perm
+        return perm
+
+    def ordered(self, permutation: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """positions in permutation order, by a linear pass instead of a sort."""
+        selected = np.zeros(self.size, dtype=bool)
+        selected[positions] = True
+        return permutation[selected[permutation]]
+
+class RowView(Sequence):
+    """
+    A query result as positions into a snapshot of the source rows. Rows are only
+    looked up when accessed, so a page render touches just the visible window.
+    """
+
+    def __init__(self, rows: List[Any], indices: np.ndarray):
+        self._rows = rows
+        self._indices = indices
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = self._rows
+            return [rows[i] for i in self._indices[index].tolist()]
+        return self._rows[int(self._indices[index])]
+
+    def __iter__(self):
+        rows = self._rows
+        for i in self._indices.tolist():
+            yield rows[i]
+
+    def __repr__(self) -> str:
+        return f"RowView({len(self)} rows)"
+
+class CardColumnCache:
+    """
+    Columns per source list. An entry stays valid while the source holds the same row
+    objects in the same order (checked against a snapshot, an identity scan) and the
+    card database has not been reloaded or saved.
+    """
+
+    def __init__(self, max_entries: int = COLUMN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[int, str], Tuple[List[Any], Any, CardColumns]]' = OrderedDict()
+
+    def get(self, source: List[Any], card: str = 'api_card') -> Tuple[List[Any], CardColumns]:
+        """Returns (snapshot of source, columns aligned with it)."""
+        key = (id(source), card)
+        entry = self._entries.get(key)
+        version = ygo_service.db_version
+        if entry is not None:
+            snapshot, entry_version, columns = entry
+            if entry_version == version and len(snapshot) == len(source) and all(map(operator.is_, snapshot, source)):
+                self._entries.move_to_end(key)
+                return snapshot, columns
+
+        snapshot = list(source)
+        cards = [getattr(row, card) for row in snapshot] if card else snapshot
+        columns = CardColumns(cards)
+        self._entries[key] = (snapshot, version, columns)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return snapshot, columns
+
+    def clear(self):
+        self._entries.clear()
+
+card_columns = CardColumnCache()
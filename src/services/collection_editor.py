@@ -1,5 +1,6 @@
 from src.core.models import Collection, CollectionCard, CollectionVariant, CollectionEntry, ApiCard
 from src.core.utils import generate_variant_id
+from src.core.persistence import persistence
 from typing import Optional
 
 class CollectionEditor:
@@ -199,6 +200,8 @@ class CollectionEditor:
                 collection.cards.remove(target_card)
                 modified = True
 
+        if modified:
+            persistence.mark_collections_changed()
         return modified
 
     @staticmethod
@@ -264,4 +267,6 @@ class CollectionEditor:
                         entry.storage_location = new_name
                         modified = True
 
+        if modified:
+            persistence.mark_collections_changed()
         return modified
@@ -0,0 +1,353 @@
+import os
+import json
+import uuid
+import time
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+from enum import IntEnum
+from urllib.parse import urlparse
+from typing import Dict, List, Optional, Callable, Set, Tuple
+
+import aiohttp
+from nicegui import run
+
+from src.services.image_manager import image_manager, DownloadError, DATA_DIR
+
+DOWNLOAD_QUEUE_FILE = os.path.join(DATA_DIR, "download_queue.json")
+
+logger = logging.getLogger(__name__)
+
+class DownloadPriority(IntEnum):
+    """Lower values are downloaded first."""
+    VISIBLE = 0    # Images on the page the user is looking at
+    PREFETCH = 1   # Next/previous page prefetch
+    TOOLTIP = 2    # High-res images requested by a hover
+    BULK = 3       # Background bulk downloads (settings jobs)
+
+JobKey = Tuple[int, bool]  # (image id, high_res)
+
+class DownloadJob:
+    __slots__ = ('card_id', 'url', 'high_res', 'priority', 'attempts', 'groups', 'batches', 'entry_seq', 'running')
+
+    def __init__(self, card_id: int, url: str, high_res: bool, priority: int):
+        self.card_id = card_id
+        self.url = url
+        self.high_res = high_res
+        self.priority = priority
+        self.attempts = 0
+        self.groups: Set[str] = set()
+        self.batches: List['DownloadBatch'] = []
+        self.entry_seq = -1  # Sequence of the live heap entry; older entries are stale
+        self.running = False
+
+    @property
+    def key(self) -> JobKey:
+        return (self.card_id, self.high_res)
+
+class DownloadBatch:
+    """A set of jobs submitted together. Await wait() for completion."""
+
+    def __init__(self, keys: Set[JobKey], progress_callback: Optional[Callable[[float], None]] = None):
+        self.total = len(keys)
+        self.pending = set(keys)
+        self.succeeded = 0
+        self.progress_callback = progress_callback
+        self._done = asyncio.Event()
+        if not self.pending:
+            self._finish()
+
+    def _finish(self):
+        if self.progress_callback:
+            self.progress_callback(1.0)
+        self._done.set()
+
+    def _resolve(self, key: JobKey, success: bool):
+        if key not in self.pending:
+            return
+        self.pending.discard(key)
+        if success:
+            self.succeeded += 1
+        if not self.pending:
+            self._finish()
+        elif self.progress_callback:
+            self.progress_callback((self.total - len(self.pending)) / self.total)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    async def wait(self) -> int:
+        """Waits until every job is downloaded, failed or cancelled. Returns the number downloaded."""
+        await self._done.wait()
+        return self.succeeded
+
+class DownloadScheduler:
+    """
+    Prioritized image download queue shared by all pages.
+    Jobs are deduplicated by (image id, resolution), retried with exponential backoff,
+    rate limited per host and persisted so interrupted bulk downloads resume on restart.
+    """
+
+    def __init__(self, queue_file: str = DOWNLOAD_QUEUE_FILE, concurrency: int = 10,
+                 host_rate: float = 15.0, max_attempts: int = 5, backoff_base: float = 1.0):
+        self.queue_file = queue_file
+        self.concurrency = concurrency
+        self.host_rate = host_rate  # Requests per second per host
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+
+        self._jobs: Dict[JobKey, DownloadJob] = {}
+        self._heap: List[Tuple[int, int, JobKey]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_next_slot: Dict[str, float] = {}
+        self._save_task: Optional[asyncio.Task] = None
+
+    # --- Public API ---
+
+    def submit(self, url_map: Dict[int, str], priority: int = DownloadPriority.VISIBLE, high_res: bool = False,
+               group: Optional[str] = None, progress_callback: Optional[Callable[[float], None]] = None) -> DownloadBatch:
+        """
+        Queues downloads for {image_id: url}. Images that already exist locally are skipped.
+        Jobs already queued are promoted to the higher of both priorities.
+        group tags jobs so they can be cancelled together (e.g. when a page changes its filter).
+        """
+        keys = set()
+        for card_id, url in url_map.items():
+            if not url or image_manager.image_exists(card_id, high_res):
+                continue
+            keys.add(self._enqueue(card_id, url, high_res, priority, group))
+
+        batch = DownloadBatch(keys, progress_callback)
+        for key in keys:
+            self._jobs[key].batches.append(batch)
+
+        if keys:
+            self._ensure_workers()
+            self._wakeup.set()
+            self._schedule_save()
+        return batch
+
+    async def download(self, url_map: Dict[int, str], priority: int = DownloadPriority.VISIBLE, high_res: bool = False,
+                       group: Optional[str] = None, progress_callback: Optional[Callable[[float], None]] = None) -> int:
+        """Submits and waits for the batch. Returns the number of images downloaded."""
+        return await self.submit(url_map, priority, high_res, group, progress_callback).wait()
+
+    def cancel(self, group: str) -> int:
+        """
+        Drops queued jobs tagged with group. Jobs also requested by another group, and
+        downloads already in flight, are kept. Returns the number of jobs cancelled.
+        """
+        cancelled = 0
+        for key, job in list(self._jobs.items()):
+            if group not in job.groups:
+                continue
+            job.groups.discard(group)
+            if job.groups or job.running:
+                continue
+            self._finish_job(job, success=False)
+            cancelled += 1
+        if cancelled:
+            self._schedule_save()
+        return cancelled
+
+    def pending_count(self, priority: Optional[int] = None) -> int:
+        if priority is None:
+            return len(self._jobs)
+        return sum(1 for job in self._jobs.values() if job.priority == priority)
+
+    async def resume(self):
+        """Re-queues jobs persisted by a previous session as background downloads."""
+        try:
+            data = await run.io_bound(self._read_queue_file)
+        except RuntimeError:
+            data = await asyncio.to_thread(self._read_queue_file)
+        if not data:
+            return
+        url_maps: Dict[bool, Dict[int, str]] = {False: {}, True: {}}
+        for item in data:
+            try:
+                url_maps[bool(item['high_res'])][int(item['id'])] = item['url']
+            except (KeyError, TypeError, ValueError):
+                continue
+        for high_res, url_map in url_maps.items():
+            if url_map:
+                self.submit(url_map, DownloadPriority.BULK, high_res=high_res)
+        logger.info(f"Resumed {self.pending_count()} queued image downloads.")
+
+    async def shutdown(self):
+        """Persists the queue and stops the workers."""
+        self._save()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    # --- Queue internals ---
+
+    def _enqueue(self, card_id: int, url: str, high_res: bool, priority: int, group: Optional[str]) -> JobKey:
+        key = (card_id, high_res)
+        job = self._jobs.get(key)
+        if job is None:
+            job = DownloadJob(card_id, url, high_res, int(priority))
+            self._jobs[key] = job
+            self._push(job)
+        elif priority < job.priority:
+            job.priority = int(priority)
+            if not job.running:
+                self._push(job)
+        if group:
+            job.groups.add(group)
+        return key
+
+    def _push(self, job: DownloadJob):
+        job.entry_seq = next(self._seq)
+        heapq.heappush(self._heap, (job.priority, job.entry_seq, job.key))
+
+    def _pop(self) -> Optional[DownloadJob]:
+        while self._heap:
+            _, seq, key = heapq.heappop(self._heap)
+            job = self._jobs.get(key)
+            # Skip entries superseded by a re-prioritization or belonging to finished jobs
+            if job is None or job.entry_seq != seq or job.running:
+                continue
+            return job
+        return None
+
+    def _finish_job(self, job: DownloadJob, success: bool):
+        self._jobs.pop(job.key, None)
+        job.entry_seq = -1
+        for batch in job.batches:
+            batch._resolve(job.key, success)
+
+    def _ensure_workers(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._workers = [w for w in self._workers if not w.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._worker()))
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _wait_for_host(self, url: str):
+        """Spaces requests to the same host at least 1/host_rate seconds apart."""
+        if self.host_rate <= 0:
+            return
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._host_next_slot.get(host, now))
+        self._host_next_slot[host] = slot + 1.0 / self.host_rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _worker(self):
+        while True:
+            job = self._pop()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job.running = True
+            success = False
+            retry_in = None
+            try:
+                if image_manager.image_exists(job.card_id, job.high_res):
+                    success = True
+                else:
+                    await self._wait_for_host(job.url)
+                    session = await self._get_session()
+                    local_path = image_manager.get_local_path(job.card_id, job.high_res)
+                    await image_manager.fetch_image(session, job.card_id, job.url, local_path)
+                    success = True
+            except asyncio.CancelledError:
+                job.running = False
+                raise
+            except DownloadError as e:
+                job.attempts += 1
+                if e.retryable and job.attempts < self.max_attempts:
+                    retry_in = self.backoff_base * (2 ** (job.attempts - 1)) * (1 + random.random() * 0.25)
+                    logger.warning(f"Download of {job.card_id} failed ({e}), retrying in {retry_in:.1f}s")
+                else:
+                    logger.error(f"Failed to download image for {job.card_id}: {e}")
+            except Exception as e:
+                logger.error(f"Error downloading image for {job.card_id}: {e}")
+            finally:
+                job.running = False
+
+            if retry_in is not None and job.key in self._jobs:
+                asyncio.get_running_loop().call_later(retry_in, self._requeue, job)
+            else:
+                self._finish_job(job, success)
+                if success:
+                    image_manager._schedule_index_save()
+                self._schedule_save()
+
+    def _requeue(self, job: DownloadJob):
+        if self._jobs.get(job.key) is job:
+            self._push(job)
+            self._wakeup.set()
+
+    # --- Persistence ---
+
+    def _read_queue_file(self) -> Optional[list]:
+        if not os.path.exists(self.queue_file):
+            return None
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading download queue: {e}")
+            return None
+
+    def _save(self):
+        """
+        Writes the pending bulk jobs atomically. Blocks.
+        Visible, prefetch and tooltip jobs belong to the session that requested them and are not resumed.
+        """
+        snapshot = [{'id': job.card_id, 'url': job.url, 'high_res': job.high_res}
+                    for job in self._jobs.values() if job.priority == DownloadPriority.BULK]
+        temp_path = self.queue_file + f".{uuid.uuid4()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.queue_file) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(temp_path, self.queue_file)
+        except Exception as e:
+            logger.error(f"Error saving download queue: {e}")
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _schedule_save(self, delay: float = 5.0):
+        """Debounces queue persistence so a busy queue is written at most every few seconds."""
+        if self._save_task and not self._save_task.done():
+            return
+
+        async def delayed_save():
+            await asyncio.sleep(delay)
+            try:
+                await run.io_bound(self._save)
+            except RuntimeError:
+                await asyncio.to_thread(self._save)
+
+        try:
+            self._save_task = asyncio.get_running_loop().create_task(delayed_save())
+        except RuntimeError:
+            self._save()
+
+# Global instance
+download_scheduler = DownloadScheduler()
@@ -0,0 +1,145 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.ygo_api import ygo_service
+
+logger = logging.getLogger(__name__)
+
+FACET_CACHE_SIZE = 4
+
+# Facet name -> the page state key holding its options (see FilterPane)
+FACETS = {
+    'sets': 'available_sets',
+    'monster_races': 'available_monster_races',
+    'st_races': 'available_st_races',
+    'archetypes': 'available_archetypes',
+}
+
+def set_label(set_name: str, set_code: str) -> str:
+    """The option used by the set filters: 'Legend of Blue Eyes White Dragon | LOB'."""
+    return f"{set_name} | {set_code.split('-')[0]}"
+
+def _coded(values: Iterable[Optional[str]], count: int) -> Tuple[List[str], np.ndarray]:
+    """Sorted distinct values and, per position, the value's index in them (-1 for None)."""
+    values = list(values)
+    vocab = sorted({v for v in values if v})
+    index = {v: i for i, v in enumerate(vocab)}
+    codes = np.fromiter((index.get(v, -1) if v else -1 for v in values), dtype=np.int32, count=count)
+    return vocab, codes
+
+class FacetCatalog:
+    """
+    The filter options of a card list (sets, monster/spell/trap types, archetypes), sorted,
+    with each card's option codes kept as arrays so the matches per option can be counted
+    for any query result with a few bincounts.
+    """
+
+    def __init__(self, cards: List[Any]):
+        n = len(cards)
+        ids = np.fromiter((c.id for c in cards), dtype=np.int64, count=n)
+        self._order = np.argsort(ids, kind='stable')
+        self._sorted_ids = ids[self._order]
+        self.size = n
+
+        def kind_race(c, kind):
+            if "Monster" in c.type:
+                return c.race if kind == 'monster' else None
+            if "Spell" in c.type or "Trap" in c.type:
+                return c.race if kind == 'st' else None
+            return None
+
+        self.monster_races, self._monster_race = _coded((kind_race(c, 'monster') for c in cards), n)
+        self.st_races, self._st_race = _coded((kind_race(c, 'st') for c in cards), n)
+        self.archetypes, self._archetype = _coded((c.archetype for c in cards), n)
+
+        # Card -> set incidence: one (card position, set) pair per distinct set of a card
+        labels = set()
+        card_labels = []
+        for c in cards:
+            own = {set_label(s.set_name, s.set_code) for s in c.card_sets} if c.card_sets else set()
+            card_labels.append(own)
+            labels.update(own)
+        self.sets = sorted(labels)
+        index = {label: i for i, label in enumerate(self.sets)}
+        pair_cards, pair_sets = [], []
+        for pos, own in enumerate(card_labels):
+            for label in own:
+                pair_cards.append(pos)
+                pair_sets.append(index[label])
+        self._pair_cards = np.array(pair_cards, dtype=np.int64)
+        self._pair_sets = np.array(pair_sets, dtype=np.int64)
+
+    def options(self) -> Dict[str, List[str]]:
+        """The sorted options as page state entries (available_sets, ...)."""
+        return {key: list(getattr(self, facet)) for facet, key in FACETS.items()}
+
+    def positions(self, card_ids: Iterable[int]) -> np.ndarray:
+        """Catalog positions of card_ids (repeats kept); ids missing from the catalog are dropped."""
+        ids = np.asarray(card_ids if isinstance(card_ids, np.ndarray) else list(card_ids), dtype=np.int64)
+        if not len(ids) or not self.size:
+            return np.empty(0, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self._sorted_ids, ids), self.size - 1)
+        found = self._sorted_ids[at] == ids
+        return self._order[at[found]]
+
+    def counts(self, card_ids: Iterable[int], sets: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        Per facet, the number of result rows per option for the card ids of a query result
+        (a card repeated by several rows counts once per row); options without matches are left out.
+        Set counts go by all printings of a card, so rows standing for one printing pass sets=False.
+        """
+        pos = self.positions(card_ids)
+        per_card = np.bincount(pos, minlength=self.size)
+        result = {}
+        for facet, codes in (('monster_races', self._monster_race), ('st_races', self._st_race),
+                             ('archetypes', self._archetype)):
+            selected = codes[pos]
+            hits = np.bincount(selected[selected >= 0], minlength=len(getattr(self, facet)))
+            result[facet] = self._named(facet, hits)
+        if not sets:
+            return result
+        if len(self._pair_cards):
+            hits = np.bincount(self._pair_sets, weights=per_card[self._pair_cards], minlength=len(self.sets))
+        else:
+            hits = np.zeros(len(self.sets))
+        result['sets'] = self._named('sets', hits)
+        return result
+
+    def present(self, card_ids: Iterable[int]) -> Dict[str, List[str]]:
+        """The options as page state entries, restricted to those some of card_ids have."""
+        counts = self.counts(card_ids)
+        return {key: [v for v in getattr(self, facet) if v in counts[facet]] for facet, key in FACETS.items()}
+
+    def _named(self, facet: str, hits: np.ndarray) -> Dict[str, int]:
+        values = getattr(self, facet)
+        return {values[i]: int(hits[i]) for i in np.flatnonzero(hits).tolist()}
+
+class FacetCatalogCache:
+    """
+    Facet catalogs per card list (the per-language card databases), rebuilt when the
+    database version changes. Entries hold on to their list, so its id stays unique.
+    """
+
+    def __init__(self, max_entries: int = FACET_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[int, Tuple[List[Any], int, Any, FacetCatalog]]' = OrderedDict()
+
+    def get(self, cards: List[Any]) -> FacetCatalog:
+        key = id(cards)
+        version = ygo_service.db_version
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == len(cards) and entry[2] == version:
+            self._entries.move_to_end(key)
+            return entry[3]
+
+        catalog = FacetCatalog(cards)
+        self._entries[key] = (cards, len(cards), version, catalog)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return catalog
+
+facet_catalog = FacetCatalogCache()
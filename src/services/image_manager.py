@@ -1,18 +1,284 @@
 import os
+import io
+import json
+import uuid
+import hashlib
+import time
+import threading
+from collections import OrderedDict
 import aiohttp
 import asyncio
 from nicegui import run
 import logging
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Any, Iterable, Set, Tuple
 from PIL import Image
+from src.core.config import config_manager
+from src.core.persistence import persistence
 
 DATA_DIR = "data"
 IMAGES_DIR = os.path.join(DATA_DIR, "images")
 SETS_DIR = os.path.join(DATA_DIR, "sets")
 FLAGS_DIR = os.path.join(DATA_DIR, "flags")
+IMAGE_INDEX_FILE = os.path.join(DATA_DIR, "image_index.json")
+THUMBS_DIR = os.path.join(IMAGES_DIR, "thumbs")
+ATLAS_DIR = os.path.join(IMAGES_DIR, "atlas")
+
+# Width of the API's small card images (image_url_small is 168x246)
+SMALL_IMAGE_WIDTH = 168
+
+# Fixed thumbnail widths generated for every card image. Widths up to SMALL_IMAGE_WIDTH are
+# made from the small image, larger ones from the high-res image (thumbnails never upscale).
+THUMBNAIL_WIDTHS = (100, 168, 400)
+
+# Best thumbnail width per view. Views not listed here (e.g. 'single') use the full image.
+VIEW_THUMBNAIL_WIDTHS = {
+    'list': 100,
+    'grid': 168,
+    'tooltip': 400,
+}
+
+# Card aspect ratio (height / width) used for atlas cells
+CARD_ASPECT = 614 / 421
+
+# Number of atlas descriptors kept in memory, and atlas files kept on disk
+ATLAS_CACHE_SIZE = 64
+ATLAS_MAX_FILES = 256
+
+# Cache classes with separate disk budgets (see ConfigManager.get_image_cache_budget_mb)
+CACHE_CLASSES = ('small', 'high_res', 'sets', 'flags')
+
+# Eviction stops once a class is below this fraction of its budget, so it does not run on every download
+EVICTION_LOW_WATER = 0.9
+
+# Access times are only refreshed this often (seconds), to keep index writes rare
+ATIME_RESOLUTION = 3600
+
+logger = logging.getLogger(__name__)
+
+def _describe_image_file(path: str, data: bytes, width: int, height: int) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {
+        'width': width,
+        'height': height,
+        'size': st.st_size,
+        'mtime': int(st.st_mtime),
+        'hash': hashlib.sha1(data).hexdigest(),
+    }
+
+def is_decodable_image(data: bytes) -> bool:
+    """Returns True if data is a complete image. Fully decodes, so truncated files are detected."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+        return True
+    except Exception:
+        return False
+
+def find_broken_images(paths: List[str]) -> List[str]:
+    """
+    Returns the paths in the list that are missing, empty or fail to decode.
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    broken = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            broken.append(path)
+            continue
+        if not data or not is_decodable_image(data):
+            broken.append(path)
+    return broken
+
+def build_atlas(sources: List[tuple], cell_width: int, dest_path: str, quality: int = 80) -> Dict[str, Any]:
+    """
+    Composites the (image_id, path) sources into a single WebP sprite sheet at dest_path
+    and writes its coordinate map next to it (dest_path + '.json').
+    Runs in a worker process, so it only takes and returns plain data.
+    Returns the atlas descriptor: sprite dimensions, grid layout and {image_id: [col, row]}.
+    """
+    cell_height = round(cell_width * CARD_ASPECT)
+    cols = max(1, min(len(sources), 8))
+    rows = max(1, -(-len(sources) // cols))
+    sheet = Image.new('RGB', (cols * cell_width, rows * cell_height))
+
+    positions = {}
+    for i, (image_id, path) in enumerate(sources):
+        col, row = i % cols, i // cols
+        try:
+            with Image.open(path) as img:
+                cell = img.convert('RGB').resize((cell_width, cell_height), Image.LANCZOS)
+        except Exception:
+            continue
+        sheet.paste(cell, (col * cell_width, row * cell_height))
+        positions[str(image_id)] = [col, row]
+
+    atlas = {
+        'width': sheet.width,
+        'height': sheet.height,
+        'cell_width': cell_width,
+        'cell_height': cell_height,
+        'cols': cols,
+        'rows': rows,
+        'map': positions,
+    }
+
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    for path, write in ((dest_path, lambda f: sheet.save(f, format='WEBP', quality=quality, method=4)),
+                        (dest_path + '.json', lambda f: f.write(json.dumps(atlas).encode('utf-8')))):
+        temp_path = path + f".{uuid.uuid4()}.tmp"
+        with open(temp_path, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    return atlas
+
+def generate_thumbnails(source_path: str, targets: List[tuple], quality: int = 80) -> Dict[str, Dict[str, Any]]:
+    """
+    Resizes the image at source_path to each (width, dest_path) target and saves it as WebP.
+    Widths larger than the source are skipped (no upscaling).
+    Runs in a worker process, so it only takes and returns plain data.
+    Returns {dest_path: metadata} for every thumbnail written.
+    """
+    written = {}
+    with Image.open(source_path) as img:
+        img = img.convert('RGB')
+        src_w, src_h = img.size
+        for width, dest_path in targets:
+            if width > src_w:
+                continue
+            height = max(1, round(src_h * width / src_w))
+            thumb = img.resize((width, height), Image.LANCZOS)
+            buf = io.BytesIO()
+            thumb.save(buf, format='WEBP', quality=quality, method=4)
+            data = buf.getvalue()
+
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            temp_path = dest_path + f".{uuid.uuid4()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, dest_path)
+            written[dest_path] = _describe_image_file(dest_path, data, width, height)
+    return written
+
+class DownloadError(Exception):
+    """Raised when an image download fails. retryable marks transient failures."""
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+class ImageMetadataIndex:
+    """
+    Persisted sidecar holding metadata (dimensions, byte size, mtime, content hash)
+    for every locally cached image. Entries are keyed by normalized file path and
+    filled when files are written, so lookups never need to decode image headers.
+    """
+    def __init__(self, index_file: str = IMAGE_INDEX_FILE):
+        self.index_file = index_file
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path).replace(os.sep, '/')
+
+    def _load(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except Exception as e:
+            logger.error(f"Error loading image index: {e}")
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached metadata for path, or None if it was never recorded."""
+        return self._entries.get(self._key(path))
+
+    def is_current(self, path: str, entry: Dict[str, Any]) -> bool:
+        """Checks via stat (no decoding) that the file still matches the recorded entry."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == entry.get('size') and int(st.st_mtime) == entry.get('mtime')
+
+    def record(self, path: str, data: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """
+        Computes and stores metadata for the file at path. Blocks.
+        If data is given it is used instead of re-reading the file.
+        """
+        try:
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            with Image.open(io.BytesIO(data)) as img:
+                width, height = img.size
+            entry = _describe_image_file(path, data, width, height)
+        except Exception as e:
+            logger.error(f"Error indexing image {path}: {e}")
+            self.remove(path)
+            return None
+
+        self.put(path, entry)
+        return entry
+
+    def put(self, path: str, entry: Dict[str, Any]):
+        """Stores precomputed metadata for path (e.g. returned from a worker process)."""
+        entry.setdefault('atime', int(time.time()))
+        with self._lock:
+            self._entries[self._key(path)] = entry
+            self._dirty = True
+
+    def touch(self, path: str):
+        """Records an access to path for LRU eviction. Cheap; only updates once per ATIME_RESOLUTION."""
+        entry = self._entries.get(self._key(path))
+        if entry is None:
+            return
+        now = int(time.time())
+        if now - entry.get('atime', 0) >= ATIME_RESOLUTION:
+            entry['atime'] = now
+            self._dirty = True
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._entries)
+
+    def remove(self, path: str):
+        with self._lock:
+            if self._entries.pop(self._key(path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Writes the index to disk if it changed. Blocks."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._entries)
+            self._dirty = False
+
+        temp_path = self.index_file + f".{uuid.uuid4()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving image index: {e}")
+            with self._lock:
+                self._dirty = True
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
 
 class ImageManager:
-    def __init__(self, images_dir: str = IMAGES_DIR):
+    def __init__(self, images_dir: str = IMAGES_DIR, index_file: str = IMAGE_INDEX_FILE):
         self.images_dir = images_dir
         self.sets_dir = SETS_DIR
         self.flags_dir = FLAGS_DIR
@@ -20,6 +286,35 @@ class ImageManager:
         os.makedirs(self.sets_dir, exist_ok=True)
         os.makedirs(self.flags_dir, exist_ok=True)
         self.logger = logging.getLogger(__name__)
+        self.thumbs_dir = os.path.join(self.images_dir, "thumbs")
+        self.index = ImageMetadataIndex(index_file)
+        self._index_save_task: Optional[asyncio.Task] = None
+        self._thumbnail_semaphore = asyncio.Semaphore(4)
+        self._eviction_task: Optional[asyncio.Task] = None
+        self.atlas_dir = os.path.join(self.images_dir, "atlas")
+        self._atlas_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # Callables returning image paths that must never be evicted
+        self._protected_path_providers: List[Callable[[], Iterable[str]]] = []
+
+    def _schedule_index_save(self, delay: float = 2.0):
+        """Debounces index persistence so bursts of writes only save the sidecar once."""
+        if self._index_save_task and not self._index_save_task.done():
+            return
+
+        async def delayed_save():
+            try:
+                await asyncio.sleep(delay)
+                await run.io_bound(self.index.save)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.logger.error(f"Error saving image index: {e}")
+
+        try:
+            self._index_save_task = asyncio.get_running_loop().create_task(delayed_save())
+        except RuntimeError:
+            # No running loop (e.g. scripts); save synchronously
+            self.index.save()
 
     def get_set_image_path(self, set_code: str) -> str:
         """Returns the local file path for a set image."""
@@ -27,22 +322,94 @@ class ImageManager:
         safe_code = "".join(c for c in set_code if c.isalnum() or c in ('-', '_')).strip()
         return os.path.join(self.sets_dir, f"{safe_code}.jpg")
 
+    def get_image_version(self, path: str) -> Optional[str]:
+        """Returns a short content version for cache-busting URLs (?v=...), or None if the file is not indexed."""
+        meta = self.index.get(path)
+        if meta is None:
+            return None
+        return meta.get('hash', '')[:10] or str(meta.get('mtime', ''))
+
+    def _versioned_url(self, url: str, path: str) -> str:
+        version = self.get_image_version(path)
+        return f"{url}?v={version}" if version else url
+
+    def get_set_image_url(self, set_code: str) -> str:
+        """Returns the URL of the local set image, versioned by content so replaced images bypass browser caches."""
+        path = self.get_set_image_path(set_code)
+        return self._versioned_url(f"/sets/{os.path.basename(path)}", path)
+
     def set_image_exists(self, set_code: str) -> bool:
         """Checks if the set image exists locally. Note: Does not verify resolution."""
         return os.path.exists(self.get_set_image_path(set_code))
 
+    def get_image_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """Returns indexed metadata (width, height, size, mtime, hash) for path. O(1), never decodes."""
+        return self.index.get(path)
+
+    def get_set_image_metadata(self, set_code: str) -> Optional[Dict[str, Any]]:
+        """Returns indexed metadata for the set image, or None if it is not cached."""
+        return self.index.get(self.get_set_image_path(set_code))
+
+    def set_image_meets_resolution(self, set_code: str, min_height: int = 240) -> Optional[bool]:
+        """
+        Checks the set image resolution using only the metadata index.
+        Returns None if the image has not been indexed yet (caller should fall back to ensure_set_image).
+        """
+        meta = self.get_set_image_metadata(set_code)
+        if meta is None:
+            return None
+        self.index.touch(self.get_set_image_path(set_code))
+        return meta.get('height', 0) >= min_height
+
     def check_image_resolution(self, path: str, min_height: int = 240) -> bool:
-        """Checks if the image at path meets the minimum resolution requirement."""
+        """
+        Checks if the image at path meets the minimum resolution requirement.
+        Uses the metadata index when it is current, and only decodes the header
+        (recording the result) for files written before the index existed. Blocks.
+        """
+        meta = self.index.get(path)
+        if meta is None or not self.index.is_current(path, meta):
+            meta = self.index.record(path)
+            if meta is None:
+                return False
+        # If height is less than min_height, consider it low res
+        return meta['height'] >= min_height
+
+    def delete_image_file(self, path: str):
+        """Removes a cached image file and its metadata entry."""
         try:
-            with Image.open(path) as img:
-                width, height = img.size
-                # If height is less than min_height, consider it low res
-                if height < min_height:
-                    return False
-            return True
-        except Exception as e:
-            self.logger.error(f"Error checking resolution for {path}: {e}")
-            return False
+            os.remove(path)
+        except OSError:
+            pass
+        self.index.remove(path)
+
+    def delete_card_image(self, card_id: int, high_res: bool = False):
+        """Removes a cached card image together with the thumbnails derived from it."""
+        self.delete_image_file(self.get_local_path(card_id, high_res))
+        for width, path in self._thumbnail_targets(card_id, high_res):
+            self.delete_image_file(path)
+
+    async def verify_set_image(self, set_code: str) -> Optional[str]:
+        """
+        Returns the local path if the set image exists and meets resolution requirements.
+        Low resolution files are deleted. Unindexed files are indexed off the event loop.
+        """
+        local_path = self.get_set_image_path(set_code)
+        if not os.path.exists(local_path):
+            return None
+
+        is_good = self.set_image_meets_resolution(set_code)
+        if is_good is None:
+            is_good = await run.io_bound(self.check_image_resolution, local_path)
+            self._schedule_index_save()
+
+        if is_good:
+            return local_path
+
+        self.logger.info(f"Existing image for {set_code} is low resolution (<240p). Deleting.")
+        self.delete_image_file(local_path)
+        self._schedule_index_save()
+        return None
 
     async def ensure_set_image(self, set_code: str, url: str) -> Optional[str]:
         """Ensures the set image exists locally and meets resolution requirements."""
@@ -50,17 +417,9 @@ class ImageManager:
         local_path = self.get_set_image_path(set_code)
 
         # Check existing
-        if os.path.exists(local_path):
-             # Verify resolution of existing file
-             is_good = await run.io_bound(self.check_image_resolution, local_path)
-             if is_good:
-                 return local_path
-             else:
-                 self.logger.info(f"Existing image for {set_code} is low resolution (<240p). Deleting.")
-                 try:
-                    os.remove(local_path)
-                 except OSError:
-                    pass
+        existing = await self.verify_set_image(set_code)
+        if existing:
+            return existing
 
         # Download
         try:
@@ -68,19 +427,21 @@ class ImageManager:
                 # Reuse the internal downloader logic but with string ID
                 async with session.get(url) as response:
                     if response.status == 200:
-                        data = await response.read()
-                        await run.io_bound(self._write_file, local_path, data)
+                        data = await self._read_verified(response, set_code)
+                        if data is None or not await run.io_bound(self._write_file, local_path, data):
+                            return None
 
                         # Check resolution of new file
                         is_good = await run.io_bound(self.check_image_resolution, local_path)
                         if not is_good:
                             self.logger.warning(f"Downloaded image for {set_code} is low resolution (<240p). Deleting.")
-                            try:
-                                os.remove(local_path)
-                            except OSError:
-                                pass
+                            self.delete_image_file(local_path)
+                            self._schedule_index_save()
                             return None
 
+                        self._schedule_index_save()
+                        self._schedule_eviction()
+
                         return local_path
                     else:
                         self.logger.warning(f"Failed to download set image {set_code}: {response.status}")
@@ -97,6 +458,243 @@ class ImageManager:
     def image_exists(self, card_id: int, high_res: bool = False) -> bool:
         return os.path.exists(self.get_local_path(card_id, high_res))
 
+    async def _run_cpu_bound(self, func: Callable, *args):
+        """Runs func in the process pool, falling back to a thread when no pool is set up (tests, scripts)."""
+        try:
+            return await run.cpu_bound(func, *args)
+        except RuntimeError:
+            return await asyncio.to_thread(func, *args)
+
+    # --- Thumbnails ---
+
+    def get_thumbnail_path(self, card_id: int, width: int) -> str:
+        """Returns the local file path for a card thumbnail of the given width."""
+        return os.path.join(self.thumbs_dir, str(width), f"{card_id}.webp")
+
+    def thumbnail_exists(self, card_id: int, width: int) -> bool:
+        """Checks the metadata index for a thumbnail. Thumbnails are always indexed when written."""
+        return self.index.get(self.get_thumbnail_path(card_id, width)) is not None
+
+    def get_card_image_url(self, card_id: Optional[int], view: str = 'grid', fallback_url: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the best URL to display a card image in the given view
+        ('list', 'grid', 'tooltip' or 'single').
+        Prefers the view's WebP thumbnail, then local full images (high-res first for the
+        tooltip and single views), then fallback_url (remote).
+        Local URLs are versioned by content (?v=...), so browsers may cache them for good:
+        a repaired or regenerated file is served under a new URL.
+        """
+        if not card_id:
+            return fallback_url
+
+        width = VIEW_THUMBNAIL_WIDTHS.get(view)
+        if width and self.thumbnail_exists(card_id, width):
+            # Thumbnails are evicted with their source image, so the source's access time is what counts
+            self.index.touch(self.get_local_path(card_id, high_res=width > SMALL_IMAGE_WIDTH))
+            return self._versioned_url(f"/images/thumbs/{width}/{card_id}.webp",
+                                       self.get_thumbnail_path(card_id, width))
+
+        # The single view is rendered well above 400px, so the original high-res file wins there
+        if view in ('tooltip', 'single') and self.image_exists(card_id, high_res=True):
+            path = self.get_local_path(card_id, high_res=True)
+            self.index.touch(path)
+            return self._versioned_url(f"/images/{card_id}_high.jpg", path)
+
+        if self.image_exists(card_id):
+            path = self.get_local_path(card_id)
+            self.index.touch(path)
+            return self._versioned_url(f"/images/{card_id}.jpg", path)
+
+        return fallback_url
+
+    def _thumbnail_targets(self, card_id: int, high_res: bool) -> List[tuple]:
+        # Small images (168px wide) feed the list/grid sizes, high-res images the larger ones
+        widths = [w for w in THUMBNAIL_WIDTHS if (w > SMALL_IMAGE_WIDTH) == high_res]
+        return [(w, self.get_thumbnail_path(card_id, w)) for w in widths]
+
+    async def generate_card_thumbnails(self, card_id: int, high_res: bool = False, force: bool = False) -> int:
+        """
+        Generates the WebP thumbnails derived from a cached card image in the process pool.
+        Returns the number of thumbnails written.
+        """
+        source = self.get_local_path(card_id, high_res)
+        if not os.path.exists(source):
+            return 0
+
+        targets = self._thumbnail_targets(card_id, high_res)
+        if not force:
+            targets = [(w, p) for w, p in targets if not self.thumbnail_exists(card_id, w)]
+        if not targets:
+            return 0
+
+        async with self._thumbnail_semaphore:
+            try:
+                written = await self._run_cpu_bound(generate_thumbnails, source, targets)
+            except Exception as e:
+                self.logger.error(f"Error generating thumbnails for {card_id}: {e}")
+                return 0
+
+        for path, entry in (written or {}).items():
+            self.index.put(path, entry)
+        if written:
+            self._schedule_index_save()
+        return len(written or {})
+
+    def _queue_thumbnails(self, card_id: int, high_res: bool):
+        """Starts thumbnail generation for a freshly written card image without blocking the caller."""
+        try:
+            asyncio.get_running_loop().create_task(self.generate_card_thumbnails(card_id, high_res, force=True))
+        except RuntimeError:
+            pass
+
+    async def backfill_thumbnails(self, progress_callback: Optional[Callable[[float], None]] = None) -> int:
+        """
+        Generates missing thumbnails for every card image already in the local cache.
+        Returns the number of thumbnails written.
+        """
+        images = await run.io_bound(self._list_card_images)
+        sources = [(card_id, high_res) for card_id, high_res, _ in images]
+
+        total = len(sources)
+        self.logger.info(f"Thumbnail backfill requested for {total} images.")
+        if total == 0:
+            if progress_callback: progress_callback(1.0)
+            return 0
+
+        completed = 0
+        written = 0
+
+        async def _task(card_id, high_res):
+            nonlocal completed, written
+            written += await self.generate_card_thumbnails(card_id, high_res)
+            completed += 1
+            if progress_callback:
+                progress_callback(completed / total)
+
+        await asyncio.gather(*[_task(cid, hr) for cid, hr in sources])
+        await run.io_bound(self.index.save)
+        self.logger.info(f"Thumbnail backfill complete. Generated {written} thumbnails.")
+        return written
+
+    # --- Sprite atlases ---
+
+    def _atlas_sources(self, image_ids: Iterable[int], width: int) -> List[tuple]:
+        """Returns (image_id, path) for ids with a local image, preferring the thumbnail of the given width."""
+        sources = []
+        seen = set()
+        for image_id in image_ids:
+            if not image_id or image_id in seen:
+                continue
+            seen.add(image_id)
+            if self.thumbnail_exists(image_id, width):
+                sources.append((image_id, self.get_thumbnail_path(image_id, width)))
+            elif self.index.get(self.get_local_path(image_id)) is not None:
+                sources.append((image_id, self.get_local_path(image_id)))
+        return sources
+
+    @staticmethod
+    def _atlas_key(image_ids: Iterable[int], width: int) -> str:
+        ids = ",".join(str(i) for i in sorted(image_ids))
+        return hashlib.sha1(f"{ids}:{width}".encode('utf-8')).hexdigest()[:20]
+
+    def _remember_atlas(self, key: str, atlas: Dict[str, Any]):
+        self._atlas_cache[key] = atlas
+        self._atlas_cache.move_to_end(key)
+        while len(self._atlas_cache) > ATLAS_CACHE_SIZE:
+            self._atlas_cache.popitem(last=False)
+
+    def _load_atlas(self, key: str) -> Optional[Dict[str, Any]]:
+        """Loads a previously built atlas descriptor from disk. Blocks."""
+        map_path = os.path.join(self.atlas_dir, f"{key}.webp.json")
+        if not os.path.exists(map_path) or not os.path.exists(map_path[:-5]):
+            return None
+        try:
+            with open(map_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _prune_atlases(self, max_files: int = ATLAS_MAX_FILES):
+        """Keeps only the most recently built atlases on disk. Blocks."""
+        try:
+            names = [n for n in os.listdir(self.atlas_dir) if n.endswith('.webp')]
+        except OSError:
+            return
+        if len(names) <= max_files:
+            return
+        paths = sorted((os.path.join(self.atlas_dir, n) for n in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - max_files]:
+            for p in (path, path + '.json'):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+
+    def get_cached_atlas(self, image_ids: Iterable[int], view: str = 'grid') -> Optional[Dict[str, Any]]:
+        """Returns the in-memory atlas for the locally available images among image_ids, without building one."""
+        width = VIEW_THUMBNAIL_WIDTHS.get(view, VIEW_THUMBNAIL_WIDTHS['grid'])
+        sources = self._atlas_sources(image_ids, width)
+        if not sources:
+            return None
+        return self._atlas_cache.get(self._atlas_key([i for i, _ in sources], width))
+
+    async def get_atlas(self, image_ids: Iterable[int], view: str = 'grid') -> Optional[Dict[str, Any]]:
+        """
+        Returns a sprite atlas covering the locally available images among image_ids (e.g. a result page
+        or a whole set), building it in the process pool if needed. Atlases are keyed by (image ids, size).
+        Images without a local file are not in the atlas; callers render those individually.
+        """
+        width = VIEW_THUMBNAIL_WIDTHS.get(view, VIEW_THUMBNAIL_WIDTHS['grid'])
+        sources = self._atlas_sources(image_ids, width)
+        if not sources:
+            return None
+
+        key = self._atlas_key([i for i, _ in sources], width)
+        if key in self._atlas_cache:
+            self._atlas_cache.move_to_end(key)
+            return self._atlas_cache[key]
+
+        atlas = await run.io_bound(self._load_atlas, key)
+        if atlas is None:
+            try:
+                atlas = await self._run_cpu_bound(build_atlas, sources, width, os.path.join(self.atlas_dir, f"{key}.webp"))
+            except Exception as e:
+                self.logger.error(f"Error building image atlas: {e}")
+                return None
+            if not atlas:
+                return None
+            await run.io_bound(self._prune_atlases)
+
+        atlas['url'] = f"/images/atlas/{key}.webp"
+        self._remember_atlas(key, atlas)
+        return atlas
+
+    @staticmethod
+    def get_atlas_style(atlas: Optional[Dict[str, Any]], image_id: int) -> Optional[str]:
+        """
+        Returns the CSS that shows image_id's cell of the atlas as an element background, or None if the
+        image is not in the atlas. Percent-based, so the element can have any size with the card aspect ratio.
+        """
+        if not atlas:
+            return None
+        pos = atlas['map'].get(str(image_id))
+        if pos is None:
+            return None
+        cols, rows = atlas['cols'], atlas['rows']
+        x = pos[0] * 100 / (cols - 1) if cols > 1 else 0
+        y = pos[1] * 100 / (rows - 1) if rows > 1 else 0
+        return (f"background-image: url('{atlas['url']}'); background-size: {cols * 100}% {rows * 100}%; "
+                f"background-position: {x:.4f}% {y:.4f}%; background-repeat: no-repeat")
+
+    async def store_image(self, card_id: int, data: bytes, high_res: bool = False) -> str:
+        """Writes image bytes for a card (e.g. custom artwork) and generates its thumbnails."""
+        local_path = self.get_local_path(card_id, high_res)
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        await run.io_bound(self._write_file, local_path, data)
+        self._schedule_index_save()
+        await self.generate_card_thumbnails(card_id, high_res, force=True)
+        return local_path
+
     async def ensure_image(self, card_id: int, url: str, high_res: bool = False) -> str:
         """
         Ensures the image exists locally. Downloads if missing.
@@ -109,29 +707,79 @@ class ImageManager:
         # Download
         try:
             async with aiohttp.ClientSession() as session:
-                return await self._download_with_session(session, card_id, url, local_path)
+                path = await self._download_with_session(session, card_id, url, local_path)
+            if path:
+                self._schedule_index_save()
+            return path
         except Exception as e:
             self.logger.error(f"Error downloading image for {card_id}: {e}")
             return None
 
-    async def _download_with_session(self, session: aiohttp.ClientSession, card_id: int, url: str, local_path: str) -> Optional[str]:
+    async def fetch_image(self, session: aiohttp.ClientSession, card_id: int, url: str, local_path: str) -> str:
+        """
+        Downloads a card image to local_path. Returns local_path on success.
+        Raises DownloadError, flagged retryable for transient failures (network, 429, 5xx, truncated body).
+        """
         try:
             async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.read()
-                    # Write file in a separate thread to avoid blocking
-                    await run.io_bound(self._write_file, local_path, data)
-                    return local_path
-                else:
-                    self.logger.error(f"Failed to download image for {card_id}: {response.status}")
-                    return None
+                if response.status != 200:
+                    retryable = response.status == 429 or response.status >= 500
+                    raise DownloadError(f"HTTP {response.status}", retryable=retryable)
+                data = await self._read_verified(response, card_id)
+                if data is None:
+                    raise DownloadError("incomplete body", retryable=True)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise DownloadError(str(e) or type(e).__name__, retryable=True) from e
+
+        # Write file in a separate thread to avoid blocking
+        if not await run.io_bound(self._write_file, local_path, data):
+            raise DownloadError("undecodable image data", retryable=True)
+        self._queue_thumbnails(card_id, local_path.endswith('_high.jpg'))
+        self._schedule_eviction()
+        return local_path
+
+    async def _download_with_session(self, session: aiohttp.ClientSession, card_id: int, url: str, local_path: str) -> Optional[str]:
+        try:
+            return await self.fetch_image(session, card_id, url, local_path)
+        except DownloadError as e:
+            self.logger.error(f"Failed to download image for {card_id}: {e}")
+            return None
         except Exception as e:
              self.logger.error(f"Error downloading image for {card_id} inside session: {e}")
              return None
 
-    def _write_file(self, path: str, data: bytes):
-        with open(path, 'wb') as f:
-            f.write(data)
+    async def _read_verified(self, response: aiohttp.ClientResponse, label: Any) -> Optional[bytes]:
+        """Reads the response body and checks it against Content-Length. Returns None if truncated."""
+        data = await response.read()
+        expected = response.content_length
+        # Content-Length describes the encoded body, so it can only be compared for identity encoding
+        if expected is not None and not response.headers.get('Content-Encoding') and len(data) != expected:
+            self.logger.warning(f"Incomplete download for {label}: got {len(data)} of {expected} bytes")
+            return None
+        return data
+
+    def _write_file(self, path: str, data: bytes) -> bool:
+        """
+        Verifies that data decodes, then writes it atomically (temp file + rename),
+        so a crash or cancellation never leaves a truncated file at path. Blocks.
+        Returns False (writing nothing) if the data is not a complete image.
+        """
+        if not is_decodable_image(data):
+            self.logger.warning(f"Refusing to write undecodable image data to {path}")
+            return False
+
+        temp_path = f"{path}.{uuid.uuid4()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        # Fill the metadata index at write time so readers never have to decode headers
+        self.index.record(path, data)
+        return True
 
     async def download_batch(self, url_map: Dict[int, str], concurrency: int = 20, progress_callback: Optional[Callable[[float], None]] = None, high_res: bool = False):
         """
@@ -164,8 +812,219 @@ class ImageManager:
             tasks = [_task(cid, url) for cid, url in to_download.items()]
             await asyncio.gather(*tasks)
 
+        self._schedule_index_save()
         self.logger.info(f"Batch download complete. Downloaded {total} images.")
 
+    def _index_missing_files(self, directory: str) -> int:
+        """Records metadata for files in directory that are missing from (or stale in) the index. Blocks."""
+        count = 0
+        if not os.path.isdir(directory):
+            return count
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path) or name.endswith('.tmp'):
+                continue
+            meta = self.index.get(path)
+            if meta is None or not self.index.is_current(path, meta):
+                if self.index.record(path):
+                    count += 1
+        return count
+
+    async def rebuild_index(self) -> int:
+        """
+        Indexes all cached card and set images that were written before the
+        metadata index existed (or changed on disk since). Returns the number of updated entries.
+        """
+        count = 0
+        thumb_dirs = [os.path.join(self.thumbs_dir, str(w)) for w in THUMBNAIL_WIDTHS]
+        for directory in (self.images_dir, self.sets_dir, *thumb_dirs):
+            count += await run.io_bound(self._index_missing_files, directory)
+        await run.io_bound(self.index.save)
+        self.logger.info(f"Image index rebuilt. Updated {count} entries.")
+        return count
+
+    def _list_card_images(self) -> List[tuple]:
+        """Returns (card_id, high_res, path) for every cached card image. Blocks."""
+        result = []
+        if not os.path.isdir(self.images_dir):
+            return result
+        for name in os.listdir(self.images_dir):
+            if name.endswith('.tmp'):
+                # Leftover from an interrupted write
+                try:
+                    os.remove(os.path.join(self.images_dir, name))
+                except OSError:
+                    pass
+                continue
+            if not name.endswith('.jpg'):
+                continue
+            stem = name[:-4]
+            high_res = stem.endswith('_high')
+            if high_res:
+                stem = stem[:-5]
+            if stem.isdigit():
+                result.append((int(stem), high_res, os.path.join(self.images_dir, name)))
+        return result
+
+    async def verify_images(self, progress_callback: Optional[Callable[[float], None]] = None, chunk_size: int = 200) -> List[tuple]:
+        """
+        Fully decodes every cached card image in parallel worker processes.
+        Broken files (truncated, empty or corrupt) are deleted together with their thumbnails.
+        Returns the (card_id, high_res) pairs that were removed and need to be downloaded again.
+        """
+        images = await run.io_bound(self._list_card_images)
+        total = len(images)
+        self.logger.info(f"Verifying {total} cached images.")
+        if total == 0:
+            if progress_callback: progress_callback(1.0)
+            return []
+
+        by_path = {path: (card_id, high_res) for card_id, high_res, path in images}
+        paths = list(by_path)
+        chunks = [paths[i:i + chunk_size] for i in range(0, total, chunk_size)]
+        semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+        completed = 0
+        broken: List[str] = []
+
+        async def _task(chunk):
+            nonlocal completed
+            async with semaphore:
+                result = await self._run_cpu_bound(find_broken_images, chunk)
+            broken.extend(result or [])
+            completed += len(chunk)
+            if progress_callback:
+                progress_callback(completed / total)
+
+        await asyncio.gather(*[_task(chunk) for chunk in chunks])
+
+        repaired = []
+        for path in broken:
+            card_id, high_res = by_path[path]
+            self.logger.warning(f"Removing broken image {path}")
+            self.delete_card_image(card_id, high_res)
+            repaired.append((card_id, high_res))
+        self._schedule_index_save()
+
+        self.logger.info(f"Image verification complete. {len(repaired)} broken files removed.")
+        return repaired
+
+    # --- Disk budget ---
+
+    def register_protected_paths(self, provider: Callable[[], Iterable[str]]):
+        """Registers a callable returning image paths that eviction must never remove."""
+        self._protected_path_providers.append(provider)
+
+    def _classify(self, key: str) -> Optional[str]:
+        """Returns the cache class of an index key, or None for files outside the managed directories."""
+        directory, name = os.path.split(key)
+        if directory == self.index._key(self.images_dir):
+            return 'high_res' if name.endswith('_high.jpg') else 'small'
+        if directory == self.index._key(self.sets_dir):
+            return 'sets'
+        if directory == self.index._key(self.flags_dir):
+            return 'flags'
+        parent, width = os.path.split(directory)
+        if parent == self.index._key(self.thumbs_dir) and width.isdigit():
+            return 'high_res' if int(width) > SMALL_IMAGE_WIDTH else 'small'
+        return None
+
+    def _collect_protected(self) -> Set[str]:
+        protected = set()
+        for provider in self._protected_path_providers:
+            try:
+                protected.update(self.index._key(p) for p in provider())
+            except Exception as e:
+                self.logger.error(f"Error collecting protected images: {e}")
+        return protected
+
+    def get_cache_usage(self) -> Dict[str, int]:
+        """Returns the indexed bytes per cache class (thumbnails count towards their source class)."""
+        usage = {cls: 0 for cls in CACHE_CLASSES}
+        for key, entry in self.index.snapshot().items():
+            cls = self._classify(key)
+            if cls:
+                usage[cls] += entry.get('size', 0)
+        return usage
+
+    def _evict(self, protected: Set[str]) -> int:
+        """Deletes least recently used images until every class is within budget. Blocks. Returns bytes freed."""
+        entries = self.index.snapshot()
+        usage = {cls: 0 for cls in CACHE_CLASSES}
+        candidates: Dict[str, List[tuple]] = {cls: [] for cls in CACHE_CLASSES}
+        thumbs_dir = self.index._key(self.thumbs_dir)
+
+        for key, entry in entries.items():
+            cls = self._classify(key)
+            if not cls:
+                continue
+            usage[cls] += entry.get('size', 0)
+            # Thumbnails are removed together with their source, never on their own
+            if key.startswith(thumbs_dir + '/') or key in protected:
+                continue
+            candidates[cls].append((entry.get('atime', entry.get('mtime', 0)), key))
+
+        freed = 0
+        for cls in CACHE_CLASSES:
+            budget = config_manager.get_image_cache_budget_mb(cls) * 1024 * 1024
+            if budget <= 0 or usage[cls] <= budget:
+                continue
+            target = budget * EVICTION_LOW_WATER
+            for _, key in sorted(candidates[cls]):
+                if usage[cls] <= target:
+                    break
+                removed = self._evict_file(key, entries)
+                usage[cls] -= removed
+                freed += removed
+            self.logger.info(f"Evicted '{cls}' images down to {usage[cls] / (1024 * 1024):.1f} MB (budget {budget / (1024 * 1024):.0f} MB).")
+        return freed
+
+    def _evict_file(self, key: str, entries: Dict[str, Dict[str, Any]]) -> int:
+        """Deletes one cached image (and for card images, its thumbnails). Returns bytes freed."""
+        freed = entries.get(key, {}).get('size', 0)
+        name = os.path.basename(key)
+        stem = name[:-4] if name.endswith('.jpg') else ''
+        high_res = stem.endswith('_high')
+        if high_res:
+            stem = stem[:-5]
+        if self._classify(key) in ('small', 'high_res') and stem.isdigit():
+            card_id = int(stem)
+            for _, thumb_path in self._thumbnail_targets(card_id, high_res):
+                freed += entries.get(self.index._key(thumb_path), {}).get('size', 0)
+            self.delete_card_image(card_id, high_res)
+        else:
+            self.delete_image_file(key)
+        return freed
+
+    async def enforce_cache_budget(self) -> int:
+        """Evicts least recently used images from every class over its configured budget. Returns bytes freed."""
+        protected = await run.io_bound(self._collect_protected)
+        freed = await run.io_bound(self._evict, protected)
+        if freed:
+            await run.io_bound(self.index.save)
+        return freed
+
+    async def prepare_cache(self):
+        """Startup: brings the index up to date, then trims the cache to its budgets (eviction reads the index)."""
+        await self.rebuild_index()
+        await self.enforce_cache_budget()
+
+    def _schedule_eviction(self, delay: float = 30.0):
+        """Debounces budget enforcement after downloads."""
+        if self._eviction_task and not self._eviction_task.done():
+            return
+
+        async def delayed_evict():
+            await asyncio.sleep(delay)
+            try:
+                await self.enforce_cache_budget()
+            except Exception as e:
+                self.logger.error(f"Error enforcing image cache budget: {e}")
+
+        try:
+            self._eviction_task = asyncio.get_running_loop().create_task(delayed_evict())
+        except RuntimeError:
+            pass
+
     async def download_images_batch(self, tasks: list):
         """Helper to run a batch of downloads. Deprecated but kept for compatibility."""
         await asyncio.gather(*tasks)
@@ -180,7 +1039,8 @@ class ImageManager:
          if not country_code: return None
          path = self.get_flag_image_path(country_code)
          if os.path.exists(path):
-             return f"/flags/{country_code.lower()}.png"
+             self.index.touch(path)
+             return self._versioned_url(f"/flags/{country_code.lower()}.png", path)
          return None
 
     async def ensure_flag_image(self, country_code: str) -> Optional[str]:
@@ -197,8 +1057,11 @@ class ImageManager:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
-                        data = await response.read()
-                        await run.io_bound(self._write_file, local_path, data)
+                        data = await self._read_verified(response, country_code)
+                        if data is None or not await run.io_bound(self._write_file, local_path, data):
+                            return None
+                        self._schedule_index_save()
+                        self._schedule_eviction()
                         return local_path
                     else:
                         self.logger.warning(f"Failed to download flag {country_code}: {response.status}")
@@ -207,5 +1070,38 @@ class ImageManager:
             self.logger.error(f"Error downloading flag {country_code}: {e}")
             return None
 
+# (collection version, paths) of the last owned_collection_image_paths result
+_owned_paths_cache: Tuple[int, List[str]] = (-1, [])
+
+def owned_collection_image_paths() -> List[str]:
+    """
+    Returns the card image paths (both resolutions) for every card owned in any collection.
+    The collection files are only parsed again once the collection version changed.
+    """
+    global _owned_paths_cache
+    version, paths = _owned_paths_cache
+    if version == persistence.collection_version:
+        return paths
+
+    version = persistence.collection_version
+    paths = []
+    for filename in persistence.list_collections():
+        try:
+            collection = persistence.load_collection(filename, mark=False)
+        except Exception:
+            continue
+        for card in collection.cards:
+            if card.total_quantity <= 0:
+                continue
+            image_ids = {card.card_id}
+            image_ids.update(v.image_id for v in card.variants if v.image_id and v.total_quantity > 0)
+            for image_id in image_ids:
+                paths.append(image_manager.get_local_path(image_id))
+                paths.append(image_manager.get_local_path(image_id, high_res=True))
+
+    _owned_paths_cache = (version, paths)
+    return paths
+
 # Global instance
 image_manager = ImageManager()
+image_manager.register_protected_paths(owned_collection_image_paths)
@@ -0,0 +1,125 @@
+import re
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.services.ygo_api import ygo_service
+
+logger = logging.getLogger(__name__)
+
+NAME_INDEX_CACHE_SIZE = 4
+DEFAULT_MIN_SCORE = 0.5
+
+_STRIP_RE = re.compile(r"[\W_]+")
+
+def normalize_name(text: Optional[str]) -> str:
+    """Lowercase, accents folded to their base letter, spaces and punctuation removed."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text.lower().replace('ß', 'ss'))
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _STRIP_RE.sub("", folded)
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrams of a normalized name, padded so the first letters weigh more ('$$b', '$bl', ...)."""
+    if not normalized:
+        return set()
+    padded = f"$${normalized}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def name_similarity(a: str, b: str) -> float:
+    """Dice coefficient of the trigram sets of two names (1.0 for equal normalized names)."""
+    ga, gb = trigrams(normalize_name(a)), trigrams(normalize_name(b))
+    if not ga or not gb:
+        return 0.0
+    return 2.0 * len(ga & gb) / (len(ga) + len(gb))
+
+class NameIndex:
+    """
+    Ranked fuzzy lookup over names: a trigram -> entry positions index. A lookup counts
+    the trigrams each entry shares with the query in one bincount over the postings and
+    ranks the entries by Dice coefficient, so typos and swapped letters still match.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Any, str]]):
+        self.items: List[Any] = []
+        self._exact: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+        sizes = []
+        for item, name in entries:
+            norm = normalize_name(name)
+            grams = trigrams(norm)
+            if not grams:
+                continue
+            pos = len(self.items)
+            self.items.append(item)
+            self._exact.setdefault(norm, pos)
+            sizes.append(len(grams))
+            for g in grams:
+                lst = postings.get(g)
+                if lst is None:
+                    postings[g] = [pos]
+                else:
+                    lst.append(pos)
+        self._postings = {g: np.array(lst, dtype=np.int32) for g, lst in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def exact(self, name: str) -> Optional[Any]:
+        """The first entry whose normalized name equals name's."""
+        pos = self._exact.get(normalize_name(name))
+        return self.items[pos] if pos is not None else None
+
+    def search(self, name: str, limit: int = 10, min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Any, float]]:
+        """Up to limit (item, score) pairs with score >= min_score, best first."""
+        grams = trigrams(normalize_name(name))
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits or not self.items:
+            return []
+        counts = np.bincount(np.concatenate(hits), minlength=len(self.items))
+        scores = (2.0 * counts) / (len(grams) + self._sizes)
+
+        if limit < len(scores):
+            top = np.argpartition(scores, -limit)[-limit:]
+        else:
+            top = np.arange(len(scores))
+        top = top[scores[top] >= min_score]
+        # Best score first; equal scores keep index order
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.items[i], float(scores[i])) for i in top.tolist()]
+
+    def best(self, name: str, min_score: float = DEFAULT_MIN_SCORE) -> Optional[Tuple[Any, float]]:
+        found = self.search(name, limit=1, min_score=min_score)
+        return found[0] if found else None
+
+class NameIndexCache:
+    """
+    Name indexes over card lists (the per-language card databases), rebuilt when the
+    database version changes. Entries hold on to their list, so its id stays unique.
+    """
+
+    def __init__(self, max_entries: int = NAME_INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[int, Tuple[List[Any], int, Any, NameIndex]]' = OrderedDict()
+
+    def get(self, cards: List[Any]) -> NameIndex:
+        key = id(cards)
+        version = ygo_service.db_version
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == len(cards) and entry[2] == version:
+            self._entries.move_to_end(key)
+            return entry[3]
+
+        index = NameIndex((c, c.name) for c in cards)
+        self._entries[key] = (cards, len(cards), version, index)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return index
+
+name_indexes = NameIndexCache()
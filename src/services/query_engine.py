@@ -0,0 +1,637 @@
+import logging
+import itertools
+from operator import attrgetter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.constants import MONSTER_CATEGORIES
+from src.core.models import category_mask
+from src.core.persistence import persistence
+from src.services.card_columns import card_columns, CardColumns, RowView
+from src.services.search_index import search_index, TextMatch, ALL_GROUPS, GROUP_NAME
+
+logger = logging.getLogger(__name__)
+
+# Relative evaluation costs of a single predicate. Together with the expected
+# pass rate they decide the evaluation order (see Query.compile).
+COST_FLAG = 1       # attribute read / bool check
+COST_EQUALS = 2     # string equality
+COST_RANGE = 2      # numeric comparison
+COST_CONTAINS = 4   # substring test on a short field
+COST_SETS = 8       # loop over a card's printings
+COST_CATEGORY = 10  # ApiCard.matches_category outside MONSTER_CATEGORIES
+COST_TEXT = 20      # token check of a row's own set code/name
+
+STAT_MAX = 5000     # ATK/DEF slider bounds; a full range means "no filter"
+
+# Below this many rows building/looking up card columns costs more than it saves
+VECTOR_MIN_ROWS = 512
+
+RESULT_HISTORY_SIZE = 16  # earlier card-level results kept per source for refinement
+RESULT_CACHE_SIZE = 32    # complete (filtered, transformed, sorted) results kept per source
+
+Predicate = Callable[[Any], bool]
+
+# A row field: either a dotted attribute path relative to the row ("api_card.atk", "" for the
+# row itself), which is inlined into the compiled predicate, or a callable taking the row.
+Field = Union[str, Callable[[Any], Any]]
+
+VectorFilter = Callable[[CardColumns], np.ndarray]
+
+# What a filter tests, as (key, kind, value). Two filters with the same key differ only in
+# value, and kind says how the values compare (see _narrows). None if that is unknown.
+Spec = Tuple[Any, str, Any]
+
+@dataclass
+class QueryResult:
+    items: Sequence[Any]  # a list, or a RowView when the rows were selected through card columns
+    page: int = 1
+    page_size: Optional[int] = None
+    columns: Optional[CardColumns] = None  # the card columns items were selected through
+    card: str = 'api_card'
+
+    @property
+    def total(self) -> int:
+        return len(self.items)
+
+    @property
+    def total_pages(self) -> int:
+        if not self.page_size:
+            return 1
+        return max(1, (self.total + self.page_size - 1) // self.page_size)
+
+    @property
+    def page_items(self) -> List[Any]:
+        """The visible window of the ordered result."""
+        if not self.page_size:
+            return list(self.items)
+        start = (self.page - 1) * self.page_size
+        return self.items[start:start + self.page_size]
+
+    def card_ids(self) -> np.ndarray:
+        """Card ids of the result rows in order, read off the card columns when the rows came through them."""
+        if self.columns is not None and isinstance(self.items, RowView):
+            return self.columns.ids[self.items.indices]
+        get = attrgetter(f"{self.card}.id" if self.card else 'id')
+        return np.fromiter((get(x) for x in self.items), dtype=np.int64, count=len(self.items))
+
+@dataclass
+class _Filter:
+    expr: str
+    cost: float
+    selectivity: float  # expected fraction of rows that pass
+    vector: Optional[VectorFilter] = None  # same test as a mask over card columns
+    spec: Optional[Spec] = None  # used to reuse earlier results
+
+    @property
+    def rank(self) -> float:
+        # Classic ordering for independent predicates: ascending cost per rejected row
+        if self.selectivity >= 1.0:
+            return float('inf')
+        return self.cost / (1.0 - self.selectivity)
+
+def _path(field: str, var: str = "x") -> str:
+    return f"{var}.{field}" if field else var
+
+def _field_key(field: Field) -> Any:
+    """Identifies a field across queries: its path, or the code of a callable without
+    captured state. None for closures, whose result may depend on what they capture."""
+    if not callable(field):
+        return field
+    code = getattr(field, '__code__', None)
+    if code is None or getattr(field, '__closure__', None):
+        return None
+    return code
+
+def _narrows(kind: str, new: Any, old: Any) -> bool:
+    """True if every row passing the filter with value new also passes it with value old."""
+    if new == old:
+        return True
+    if kind == 'range':
+        return new[0] >= old[0] and new[1] <= old[1]
+    if kind == 'any':
+        return new <= old
+    if kind == 'all':
+        return new >= old
+    if kind == 'prefix':
+        # Each old term is covered by a longer (or equal) new term
+        return all(any(n.startswith(o) for n in new) for o in old)
+    return False
+
+def spec_narrows(new: Dict[Any, Tuple[str, Any]], old: Dict[Any, Tuple[str, Any]]) -> bool:
+    """True if the filter state new selects a subset of what old selects."""
+    for key, (kind, value) in old.items():
+        current = new.get(key)
+        if current is None or current[0] != kind or not _narrows(kind, current[1], value):
+            return False
+    return True
+
+def field_getter(field: Field) -> Callable[[Any], Any]:
+    if callable(field):
+        return field
+    return attrgetter(field) if field else (lambda x: x)
+
+class Query:
+    """
+    A filter + sort over a list of view rows (CardViewModel, CollectorRow, LibraryEntry, ...).
+    Pages add the active filters; compile() fuses them into a single generated function
+    that evaluates the cheapest, most selective tests first and stops at the first miss,
+    so the source list is walked exactly once.
+
+    Card-level filters and sorts also have a vectorized form. For large sources run()
+    evaluates them as masks over the cached CardColumns, runs the remaining row-level
+    predicates only on the surviving rows and orders them by a sort permutation of the
+    whole source computed once per key (only Quantity is sorted per query).
+    The rows passing the card-level filters are remembered with the filter state; a later
+    query with the same state reuses them, and a narrower one (longer search, tighter range,
+    extra filter) only narrows them down instead of masking the whole source.
+    card is the attribute path of the ApiCard on the rows ('' if the rows are ApiCards).
+    """
+
+    def __init__(self, card: str = 'api_card'):
+        self._card = card
+        self._filters: List[_Filter] = []
+        self._env: Dict[str, Any] = {}
+        self._names = itertools.count()
+        self._transforms: List[Callable[[Any], Any]] = []
+        self._sort_key: Optional[Callable[[Any], Any]] = None
+        self._sort_column: Optional[str] = None
+        self._reverse = False
+        self._sort_spec: Optional[Tuple] = ()
+        self._sort_static: Optional[Tuple] = None  # identifies a row field sort that can be precomputed
+        self._transform_keys: Optional[List[Any]] = []
+        self._search: Optional[Tuple[str, Tuple[str, ...], Tuple[Field, ...]]] = None
+
+    def _bind(self, value: Any) -> str:
+        """Makes value available to the compiled expression under a fresh name."""
+        name = f"_v{next(self._names)}"
+        self._env[name] = value
+        return name
+
+    def _temp(self) -> str:
+        return f"_t{next(self._names)}"
+
+    def _access(self, field: Field) -> str:
+        if callable(field):
+            return f"{self._bind(field)}(x)"
+        return _path(field)
+
+    def _add(self, expr: str, cost: float, selectivity: float, vector: Optional[VectorFilter] = None,
+             spec: Optional[Spec] = None) -> 'Query':
+        self._filters.append(_Filter(expr, cost, selectivity, vector, spec))
+        return self
+
+    def _field_spec(self, kind: str, field: Field, value: Any, key: Optional[Any] = None) -> Optional[Spec]:
+        field_key = key if key is not None else _field_key(field)
+        return ((kind, field_key), kind, value) if field_key is not None else None
+
+    def where(self, predicate: Predicate, cost: float = COST_EQUALS, selectivity: float = 0.5,
+              key: Optional[Any] = None) -> 'Query':
+        """
+        An arbitrary row predicate. key (hashable) identifies what the predicate tests,
+        including any state it captures; without it the query's results are not cached.
+        """
+        return self._add(f"{self._bind(predicate)}(x)", cost, selectivity, spec=self._field_spec('where', predicate, None, key))
+
+    def transform(self, func: Callable[[Any], Any], key: Optional[Any] = None) -> 'Query':
+        """Map every surviving row through func; returning None drops the row. key as for where()."""
+        self._transforms.append(func)
+        key = key if key is not None else _field_key(func)
+        if key is None or self._transform_keys is None:
+            self._transform_keys = None
+        else:
+            self._transform_keys.append(key)
+        return self
+
+    def order_by(self, key: Optional[Callable[[Any], Any]], reverse: bool = False,
+                 column: Optional[str] = None, spec: Optional[Tuple] = None) -> 'Query':
+        """
+        column names the CardColumns.sort_key equivalent of key, if there is one.
+        spec (hashable) identifies the order for the result cache.
+        """
+        self._sort_key = key
+        self._sort_column = column
+        self._reverse = reverse
+        self._sort_spec = spec if key is not None else ()
+        self._sort_static = None
+        return self
+
+    def sort(self, sort_by: str, reverse: bool = False, price: Optional[Field] = None,
+             quantity: Optional[Field] = None, set_code: Optional[Field] = None,
+             price_column: Optional[str] = None, rarity: Optional[Field] = None) -> 'Query':
+        """
+        Standard sort options. price_column names the card column sort key holding the
+        same value as price ('Price' for the lowest price, 'TCG Price' for TCGplayer).
+        """
+        key = card_sort_key(sort_by, self._card, price=price, quantity=quantity, set_code=set_code, rarity=rarity)
+        column = None
+        if sort_by in ('Name', 'Newest', 'ATK', 'DEF', 'Level'):
+            column = sort_by
+        elif sort_by == 'Price' and price_column:
+            column = price_column
+
+        spec = (sort_by, bool(reverse))
+        field = {'Price': price, 'Quantity': quantity, 'Set Code': set_code, 'Rarity': rarity}.get(sort_by)
+        field_key = _field_key(field) if field is not None else None
+        if field is not None:
+            spec = spec + (field_key,) if field_key is not None else None
+        self.order_by(key, reverse, column, spec)
+        # Prices, set codes and rarities of a row never change; quantities do and are sorted each time
+        if column is None and field_key is not None and sort_by in ('Price', 'Set Code', 'Rarity'):
+            self._sort_static = (sort_by, field_key)
+        return self
+
+    def compile(self, filters: Optional[List[_Filter]] = None) -> Optional[Predicate]:
+        """Returns the fused predicate, or None if no filter is active."""
+        if filters is None:
+            filters = self._filters
+        if not filters:
+            return None
+        filters = sorted(filters, key=lambda f: f.rank)
+        body = " and ".join(f"({f.expr})" for f in filters)
+        return eval(f"lambda x: {body}", dict(self._env))
+
+    def run(self, source: Sequence[Any], page: int = 1, page_size: Optional[int] = None) -> QueryResult:
+        vectorizable = self._sort_column or self._sort_static or self._search or any(f.vector for f in self._filters)
+        if vectorizable and len(source) >= VECTOR_MIN_ROWS:
+            rows, columns = card_columns.get(source, self._card)
+            self._resolve_search(rows, columns)
+            items = self._run_columns(rows, columns)
+            return QueryResult(items, page, page_size, columns, self._card)
+        self._resolve_search(source)
+        items = self._run_rows(source)
+        return QueryResult(items, page, page_size, card=self._card)
+
+    def _apply_transforms(self, item: Any) -> Any:
+        for func in self._transforms:
+            item = func(item)
+            if item is None:
+                break
+        return item
+
+    def _run_rows(self, source: Iterable[Any]) -> List[Any]:
+        predicate = self.compile()
+        if not self._transforms:
+            items = list(filter(predicate, source)) if predicate else list(source)
+        else:
+            items = []
+            for item in source:
+                if predicate and not predicate(item):
+                    continue
+                item = self._apply_transforms(item)
+                if item is not None:
+                    items.append(item)
+
+        if self._sort_key:
+            items.sort(key=self._sort_key, reverse=self._reverse)
+        return items
+
+    def _spec(self) -> Optional[Dict[Any, Tuple[str, Any]]]:
+        """The card-level filter state as key -> (kind, value), None if it cannot be compared."""
+        spec = {}
+        for f in self._filters:
+            if not f.vector:
+                continue
+            if f.spec is None or f.spec[0] in spec:
+                return None
+            key, kind, value = f.spec
+            spec[key] = (kind, value)
+        return spec
+
+    def _cache_key(self) -> Optional[Tuple]:
+        """
+        Identifies the complete result (filters, transforms, order), or None if some part
+        cannot be identified. Results that read row fields, which change along with the
+        collections, also carry the collection version.
+        """
+        if self._sort_spec is None or self._transform_keys is None:
+            return None
+        specs = []
+        card_level = not self._transforms and (not self._sort_key or self._sort_column)
+        for f in self._filters:
+            if f.spec is None:
+                return None
+            specs.append(f.spec)
+            card_level = card_level and f.vector is not None
+        version = None if card_level else persistence.collection_version
+        return (frozenset(specs), tuple(self._transform_keys), self._sort_spec, version)
+
+    def _base_positions(self, columns: CardColumns, spec: Optional[Dict]) -> Tuple[Optional[np.ndarray], bool]:
+        """
+        Looks up earlier card-level results over the same rows: (positions, exact). An exact
+        entry already is the card-level result; otherwise the smallest earlier result of a
+        broader state, which the new masks only narrow down (typing "dra" -> "drag" -> "drago").
+        """
+        if spec is None:
+            return None, False
+        history = columns.results
+        key = frozenset(spec.items())
+        entry = history.get(key)
+        if entry is not None:
+            history.move_to_end(key)
+            return entry[1], True
+
+        base = None
+        for old_spec, positions in history.values():
+            if (base is None or len(positions) < len(base)) and spec_narrows(spec, old_spec):
+                base = positions
+        return base, False
+
+    def _run_columns(self, rows: List[Any], columns: CardColumns) -> Sequence[Any]:
+        cache_key = self._cache_key()
+        if cache_key is not None:
+            cached = columns.query_results.get(cache_key)
+            if cached is not None:
+                columns.query_results.move_to_end(cache_key)
+                return cached if isinstance(cached, RowView) else list(cached)
+
+        items = self._filter_columns(rows, columns)
+
+        if cache_key is not None:
+            columns.query_results[cache_key] = items if isinstance(items, RowView) else tuple(items)
+            while len(columns.query_results) > RESULT_CACHE_SIZE:
+                columns.query_results.popitem(last=False)
+        return items
+
+    def _filter_columns(self, rows: List[Any], columns: CardColumns) -> Sequence[Any]:
+        spec = self._spec()
+        candidates, exact = self._base_positions(columns, spec)
+
+        if not exact:
+            base = candidates
+            # Slicing every column only pays off once the earlier result is clearly smaller
+            subset = base is not None and len(base) * 2 < len(rows)
+            view = columns.take(base) if subset else columns
+            mask = None
+            for f in self._filters:
+                if f.vector:
+                    m = f.vector(view)
+                    if base is not None and not subset:
+                        m = m[base]
+                    mask = m if mask is None else (mask & m)
+            if base is None:
+                candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(rows))
+            elif mask is not None:
+                candidates = base[mask]
+
+            if spec is not None:
+                columns.results[frozenset(spec.items())] = (spec, candidates)
+                while len(columns.results) > RESULT_HISTORY_SIZE:
+                    columns.results.popitem(last=False)
+
+        # Row-level predicates only see the rows the card columns let through. Their fields
+        # (owned quantities, ...) change in place, so they are never taken from the history.
+        predicate = self.compile([f for f in self._filters if not f.vector])
+        if predicate:
+            candidates = np.array([i for i in candidates.tolist() if predicate(rows[i])], dtype=np.int64)
+
+        items = None
+        if self._transforms:
+            keep, items = [], []
+            for i in candidates.tolist():
+                item = self._apply_transforms(rows[i])
+                if item is not None:
+                    keep.append(i)
+                    items.append(item)
+            candidates = np.array(keep, dtype=np.int64)
+
+        permutation = None
+        if self._sort_column and columns.sort_key(self._sort_column) is not None:
+            permutation = columns.permutation(self._sort_column, self._reverse,
+                                              lambda: columns.sort_key(self._sort_column))
+        elif self._sort_static:
+            permutation = columns.permutation(self._sort_static, self._reverse,
+                                              lambda: [self._sort_key(r) for r in rows])
+        if permutation is not None:
+            candidates = columns.ordered(permutation, candidates)
+        elif self._sort_key:
+            items = [rows[i] for i in candidates.tolist()] if items is None else items
+            items.sort(key=self._sort_key, reverse=self._reverse)
+            return items
+
+        if self._transforms:
+            # Transformed rows are new objects; materialize them in the final order
+            by_index = dict(zip(keep, items))
+            return [by_index[i] for i in candidates.tolist()]
+        return RowView(rows, candidates)
+
+    # --- Filter builders shared by the pages ---
+
+    def search(self, text: str, groups: Iterable[str] = ALL_GROUPS, printings: Iterable[Field] = ()) -> 'Query':
+        """
+        Full-text search through the shared card index: every word of text must be the
+        prefix of a word in one of the card's token groups (name, text, printings).
+        If no card matches that way, the cards with the most similar names are used.
+        For rows standing for a single printing, printings lists the row fields (set code,
+        set name) searched instead of all printings of the card.
+        The candidate ids are resolved against the index when the query runs.
+        """
+        if text and text.strip():
+            self._search = (text, tuple(groups), tuple(printings))
+        return self
+
+    def _resolve_search(self, rows: Sequence[Any], columns: Optional[CardColumns] = None):
+        """Turns the pending search into filters: card id membership (also as a column mask)
+        and, for printing rows, a check of the row's own printing fields."""
+        if self._search is None:
+            return
+        text, groups, printings = self._search
+        self._search = None
+
+        index = search_index.get()
+        if columns is None or columns.search_index is not index:
+            card = self._card
+            index.ensure(rows if not card else (attrgetter(card)(r) for r in rows))
+            if columns is not None:
+                columns.search_index = index
+
+        match = index.match(text, groups, row_printings=bool(printings))
+        if match is None:
+            return
+        spec = (('search', groups, printings), 'prefix', tuple(match.terms))
+        if not match.candidates and GROUP_NAME in groups:
+            # Nothing matches word by word: fall back to the names closest to a mistyped one
+            match = TextMatch.of_ids(index.similar_names(text))
+            spec = None  # depends on every indexed name, so results using it are not reused
+        ids = match.candidates
+        selectivity = min(1.0, len(ids) / max(1, len(index)))
+        id_array = np.fromiter(ids, dtype=np.int64, count=len(ids))
+        c = _path(self._card)
+        self._add(f"{c}.id in {self._bind(ids)}", COST_FLAG, selectivity,
+                  lambda cols: np.isin(cols.ids, id_array), spec)
+        if printings:
+            fields = ", ".join(self._access(f) for f in printings)
+            self._add(f"{self._bind(match.row_accepts)}({c}.id, ({fields},))", COST_TEXT, 0.5,
+                      (('search_rows', groups, printings), 'prefix', tuple(match.terms)) if spec else None)
+
+    def equals(self, field: Field, value: Any, selectivity: float = 0.2) -> 'Query':
+        if value:
+            self._add(f"{self._access(field)} == {self._bind(value)}", COST_EQUALS, selectivity,
+                      spec=self._field_spec('eq', field, value))
+        return self
+
+    def one_of(self, field: Field, values: Iterable[Any], selectivity: float = 0.5) -> 'Query':
+        if isinstance(values, str):
+            values = [values]
+        allowed = frozenset(values or ())
+        if allowed:
+            self._add(f"{self._access(field)} in {self._bind(allowed)}", COST_EQUALS, selectivity,
+                      spec=self._field_spec('in', field, allowed))
+        return self
+
+    def value_range(self, field: Field, low: float, high: float,
+                    cost: float = COST_RANGE, selectivity: float = 0.5, column: Optional[str] = None,
+                    key: Optional[Any] = None) -> 'Query':
+        """
+        low <= value <= high; rows without a value never match.
+        column names the CardColumns array holding the same value, if there is one.
+        key identifies a callable field that captures state (see where()).
+        """
+        t = self._temp()
+        vector = None
+        spec = self._field_spec('range', field, (low, high), key)
+        if column:
+            vector = lambda cols: cols.in_range(column, low, high)
+            spec = (column, 'range', (low, high))
+        return self._add(f"({t} := {self._access(field)}) is not None and {self._bind(low)} <= {t} <= {self._bind(high)}",
+                         cost, selectivity, vector, spec)
+
+    def printings(self, value: str, sets: Callable[[Any], Iterable[Tuple[str, str]]]) -> 'Query':
+        """
+        Set filter. "Name | CODE" (a dropdown entry) matches printings whose code prefix is CODE;
+        free text matches any printing whose code or name contains it.
+        """
+        if not value:
+            return self
+        if '|' in value:
+            prefix = value.split('|')[-1].strip().lower()
+
+            def match(x):
+                for code, _ in sets(x):
+                    if code and code.split('-')[0].lower() == prefix:
+                        return True
+                return False
+            self.where(match, COST_SETS, 0.01, self._callable_key('printings', sets, prefix))
+        else:
+            txt = value.strip().lower()
+
+            def match(x):
+                for code, name in sets(x):
+                    if (code and txt in code.lower()) or (name and txt in name.lower()):
+                        return True
+                return False
+            self.where(match, COST_SETS, 0.02, self._callable_key('printings_text', sets, txt))
+        return self
+
+    @staticmethod
+    def _callable_key(name: str, func: Callable, value: Any) -> Optional[Tuple]:
+        key = _field_key(func)
+        return (name, key, value) if key is not None else None
+
+    def rarity(self, value: str, rarities: Callable[[Any], Iterable[str]]) -> 'Query':
+        if value:
+            target = value.lower()
+            self.where(lambda x: any(r and r.lower() == target for r in rarities(x)), COST_SETS, 0.15,
+                       self._callable_key('rarity', rarities, target))
+        return self
+
+    def card_filters(self, state: dict, all_categories: bool = True) -> 'Query':
+        """
+        The card-level filters every page shares (attribute, card type, races, archetype,
+        monster category, level, ATK, DEF), read from the standard FilterPane state keys.
+        all_categories selects whether every chosen monster category must match or any of them.
+        """
+        card = self._card
+        c = _path(card)
+        b = self._bind
+
+        attr = state.get('filter_attr')
+        if attr:
+            self._add(f"{c}.attribute == {b(attr)}", COST_EQUALS, 0.15,
+                      lambda cols: cols.attribute.equals(attr), ('attribute', 'eq', attr))
+
+        archetype = state.get('filter_archetype')
+        if archetype:
+            self._add(f"{c}.archetype == {b(archetype)}", COST_EQUALS, 0.01,
+                      lambda cols: cols.archetype.equals(archetype), ('archetype', 'eq', archetype))
+
+        race = state.get('filter_monster_race')
+        if race:
+            self._add(f"{c}.race == {b(race)} and 'Monster' in {c}.type", COST_EQUALS, 0.05,
+                      lambda cols: cols.race.equals(race) & cols.type_contains('Monster'), ('monster_race', 'eq', race))
+
+        st_race = state.get('filter_st_race')
+        if st_race:
+            self._add(f"{c}.race == {b(st_race)} and ('Spell' in {c}.type or 'Trap' in {c}.type)", COST_EQUALS, 0.05,
+                      lambda cols: cols.race.equals(st_race) & cols.type.matching(lambda t: 'Spell' in t or 'Trap' in t),
+                      ('st_race', 'eq', st_race))
+
+        level = state.get('filter_level')
+        if level not in (None, ''):
+            level = int(level)
+            self._add(f"{c}.level == {b(level)}", COST_RANGE, 0.1, lambda cols: cols.level == level, ('level', 'eq', level))
+
+        atk_min, atk_max = state.get('filter_atk_min', 0), state.get('filter_atk_max', STAT_MAX)
+        if atk_min > 0 or atk_max < STAT_MAX:
+            self.value_range(f"{card}.atk" if card else "atk", atk_min, atk_max, column='atk')
+
+        def_min, def_max = state.get('filter_def_min', 0), state.get('filter_def_max', STAT_MAX)
+        if def_min > 0 or def_max < STAT_MAX:
+            self.value_range(f"{card}.def_" if card else "def_", def_min, def_max, column='def_')
+
+        ctypes = state.get('filter_card_type')
+        if ctypes:
+            if isinstance(ctypes, str):
+                ctypes = [ctypes]
+            ctypes = tuple(ctypes)
+            t = self._temp()
+            self._add(f"({t} := {c}.type) is not None and (" + " or ".join(f"{b(ct)} in {t}" for ct in ctypes) + ")",
+                      COST_CONTAINS, 0.9,
+                      lambda cols: cols.type.matching(lambda value: any(ct in value for ct in ctypes)),
+                      ('card_type', 'any', frozenset(ctypes)))
+
+        categories = state.get('filter_monster_category')
+        if categories:
+            if isinstance(categories, str):
+                categories = [categories]
+            categories = tuple(categories)
+            combine = 'all' if all_categories else 'any'
+            if all(cat in MONSTER_CATEGORIES for cat in categories):
+                # One AND against the bitmask derived for each card at load
+                mask = category_mask(categories)
+                test = f"({c}.categories & {mask}) == {mask}" if all_categories else f"{c}.categories & {mask}"
+                self._add(test, COST_RANGE, 0.3, lambda cols: cols.with_categories(mask, all_categories),
+                          ('category', combine, frozenset(categories)))
+            else:
+                self._add(f"{combine}({c}.matches_category(k) for k in {b(categories)})", COST_CATEGORY, 0.3,
+                          spec=('category', combine, frozenset(categories)))
+
+        return self
+
+def card_sort_key(sort_by: str, card: str = 'api_card',
+                  price: Optional[Field] = None,
+                  quantity: Optional[Field] = None,
+                  set_code: Optional[Field] = None,
+                  rarity: Optional[Field] = None) -> Optional[Callable[[Any], Any]]:
+    """Sort key for the standard sort options; page-specific fields are passed as fields."""
+    prefix = f"{card}." if card else ""
+    if sort_by == 'Name':
+        return attrgetter(prefix + 'name')
+    if sort_by == 'Newest':
+        return attrgetter(prefix + 'id')
+    if sort_by in ('ATK', 'DEF', 'Level'):
+        get = attrgetter(prefix + {'ATK': 'atk', 'DEF': 'def_', 'Level': 'level'}[sort_by])
+        return lambda x: get(x) or -1
+    field = {'Price': price, 'Quantity': quantity, 'Set Code': set_code, 'Rarity': rarity}.get(sort_by)
+    return field_getter(field) if field is not None else None
+
+def first_set_code(card) -> str:
+    return card.card_sets[0].set_code if card.card_sets else ""
+
+def card_printings(card) -> Iterable[Tuple[str, str]]:
+    return ((s.set_code, s.set_name) for s in card.card_sets)
+
+def card_rarities(card) -> Iterable[str]:
+    return (s.set_rarity for s in card.card_sets)
@@ -36,6 +36,7 @@ else:
     class ScanDebugReport: pass
 
 from src.services.ygo_api import ygo_service
+from src.services.name_index import name_indexes
 from src.services.image_manager import image_manager
 from src.core.utils import normalize_set_code, extract_language_code
 from nicegui import run
@@ -68,6 +69,9 @@ class ScannerManager:
         self.status_message = "Stopped"
 
         self.art_index = {}
+        # Images backing the art index must survive cache eviction
+        image_manager.register_protected_paths(
+            lambda: [os.path.join(image_manager.images_dir, f) for f in self.get_art_index_files()])
 
         # Debug State (using Model)
         self.debug_state = ScanDebugReport() if SCANNER_AVAILABLE else None
@@ -258,6 +262,20 @@ class ScannerManager:
         # Run in a separate thread to avoid blocking if called from UI main thread
         threading.Thread(target=self._build_art_index, args=(force,), daemon=True).start()
 
+    def get_art_index_files(self) -> List[str]:
+        """Returns the image filenames in the art index, loading the cached index if needed."""
+        if not self.art_index:
+            index_path = os.path.join(self.debug_dir, "art_index_yolo.pkl")
+            if os.path.exists(index_path):
+                try:
+                    with open(index_path, "rb") as f:
+                        loaded_index = pickle.load(f)
+                    if loaded_index:
+                        self.art_index = loaded_index
+                except Exception as e:
+                    logger.error(f"Failed to load cache: {e}")
+        return list(self.art_index)
+
     def _build_art_index(self, force=False):
         """Builds or loads the Art Match index from data/images."""
         if not self.scanner: return
@@ -815,6 +833,12 @@ class ScannerManager:
 
         ocr_norm_name = norm(ocr_res.card_name)
 
+        # Typo-tolerant name candidates (OCR misreads letters); exact matches are scored separately
+        fuzzy_names = {}
+        if ocr_norm_name:
+            for card, similarity in name_indexes.get(cards).search(ocr_res.card_name, limit=5, min_score=0.7):
+                fuzzy_names[card.id] = similarity
+
         # 0. Filter Potential Database Entries
         # Scanning 12k cards * variants is expensive if we do full scoring.
         # Filter first by: Set Code OR Name Match OR Art Match ID
@@ -850,7 +874,7 @@ class ScannerManager:
 
             # Check Name (if Set Code didn't match or missing)
             if not is_candidate and ocr_norm_name:
-                 if norm(card.name) == ocr_norm_name:
+                 if card.id in fuzzy_names or norm(card.name) == ocr_norm_name:
                      is_candidate = True
 
             # Check Art ID
@@ -895,6 +919,8 @@ class ScannerManager:
                     score += 50.0
                 elif ocr_norm_name and ocr_norm_name in norm(card.name): # Partial
                     score += 25.0
+                elif card.id in fuzzy_names: # Misread name (below the 50 of an exact match)
+                    score += 45.0 * fuzzy_names[card.id]
 
                 # C. Art Match (40+)
                 if art_id:
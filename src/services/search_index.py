@@ -0,0 +1,200 @@
+import re
+import bisect
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.services.ygo_api import ygo_service
+from src.services.name_index import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# Token groups of a card. Pages choose which groups their search box covers.
+GROUP_NAME = 'name'
+GROUP_TEXT = 'text'          # type line and card text
+GROUP_PRINTINGS = 'printings' # set codes and set names
+ALL_GROUPS = (GROUP_NAME, GROUP_TEXT, GROUP_PRINTINGS)
+CARD_GROUPS = (GROUP_NAME, GROUP_TEXT)
+
+LOOKUP_CACHE_SIZE = 512
+FUZZY_LIMIT = 20       # typo fallback: most similar names considered
+FUZZY_MIN_SCORE = 0.6  # and the trigram similarity they need
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric words; set codes split at '-' ("LOB-EN001" -> lob, en001)."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+def _card_tokens(card) -> Dict[str, Set[str]]:
+    printings: Set[str] = set()
+    for s in card.card_sets:
+        printings.update(tokenize(s.set_code))
+        printings.update(tokenize(s.set_name))
+    return {
+        GROUP_NAME: set(tokenize(card.name)),
+        GROUP_TEXT: set(tokenize(card.type)) | set(tokenize(card.desc)),
+        GROUP_PRINTINGS: printings,
+    }
+
+class TextMatch:
+    """
+    The cards matching a search: every term must be a prefix of a token of the card.
+    candidates holds the matching card ids. For rows that stand for a single printing,
+    row_accepts() checks the row's own set code/name instead of all printings of the card.
+    """
+
+    def __init__(self, terms: List[str], card_ids: List[FrozenSet[int]], printing_ids: List[FrozenSet[int]]):
+        self.terms = terms
+        self._card_ids = card_ids
+        candidates: Optional[Set[int]] = None
+        # Rarest term first, so the running intersection stays small
+        for ids in sorted((own | printed if printed else own for own, printed in zip(card_ids, printing_ids)), key=len):
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                break
+        self.candidates: Set[int] = candidates or set()
+
+    @classmethod
+    def of_ids(cls, ids: Iterable[int]) -> 'TextMatch':
+        """A match of fixed card ids, accepted regardless of the row's printing."""
+        match = cls([], [], [])
+        match.candidates = set(ids)
+        return match
+
+    def row_accepts(self, card_id: int, printing_texts: Iterable[Optional[str]]) -> bool:
+        if card_id not in self.candidates:
+            return False
+        tokens = None
+        for term, own in zip(self.terms, self._card_ids):
+            if card_id in own:
+                continue
+            if tokens is None:
+                tokens = [t for text in printing_texts for t in tokenize(text)]
+            if not any(t.startswith(term) for t in tokens):
+                return False
+        return True
+
+class CardSearchIndex:
+    """
+    Inverted index token -> card ids for each token group, with prefix lookups over the
+    sorted vocabulary. Cards are added on demand by ensure(); a card is re-indexed when a
+    different object with its id shows up.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, Set[int]]] = {g: {} for g in ALL_GROUPS}
+        self._vocab: Dict[str, Optional[List[str]]] = {g: None for g in ALL_GROUPS}
+        self._docs: Dict[int, Tuple[Any, Dict[str, Set[str]]]] = {}
+        self._lookups: 'OrderedDict[Tuple[str, str], FrozenSet[int]]' = OrderedDict()
+        self._names: Optional[NameIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def ensure(self, cards: Iterable[Any]) -> int:
+        """Indexes cards not yet indexed (or replaced by a new object). Returns the number indexed."""
+        added = 0
+        docs = self._docs
+        for card in cards:
+            doc = docs.get(card.id)
+            if doc is None or doc[0] is not card:
+                self._index(card)
+                added += 1
+        if added:
+            self._lookups.clear()
+            self._names = None
+            for g in ALL_GROUPS:
+                self._vocab[g] = None
+        return added
+
+    def _index(self, card):
+        old = self._docs.get(card.id)
+        if old is not None:
+            for group, tokens in old[1].items():
+                postings = self._postings[group]
+                for t in tokens:
+                    ids = postings.get(t)
+                    if ids is not None:
+                        ids.discard(card.id)
+                        if not ids:
+                            del postings[t]
+
+        groups = _card_tokens(card)
+        for group, tokens in groups.items():
+            postings = self._postings[group]
+            for t in tokens:
+                ids = postings.get(t)
+                if ids is None:
+                    postings[t] = {card.id}
+                else:
+                    ids.add(card.id)
+        self._docs[card.id] = (card, groups)
+
+    def lookup(self, groups: Tuple[str, ...], prefix: str) -> FrozenSet[int]:
+        """Ids of cards with a token starting with prefix in any of the groups."""
+        key = (groups, prefix)
+        cached = self._lookups.get(key)
+        if cached is not None:
+            self._lookups.move_to_end(key)
+            return cached
+
+        ids: Set[int] = set()
+        for group in groups:
+            vocab = self._vocab[group]
+            if vocab is None:
+                vocab = self._vocab[group] = sorted(self._postings[group])
+            postings = self._postings[group]
+            i = bisect.bisect_left(vocab, prefix)
+            while i < len(vocab) and vocab[i].startswith(prefix):
+                ids |= postings[vocab[i]]
+                i += 1
+
+        result = frozenset(ids)
+        self._lookups[key] = result
+        if len(self._lookups) > LOOKUP_CACHE_SIZE:
+            self._lookups.popitem(last=False)
+        return result
+
+    def match(self, text: str, groups: Iterable[str] = ALL_GROUPS, row_printings: bool = False) -> Optional[TextMatch]:
+        """
+        Matches text (multi-term AND, each term a token prefix) against the groups.
+        With row_printings the printings group is only used to pre-select cards, the
+        final decision is TextMatch.row_accepts. Returns None for a blank search.
+        """
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms:
+            return None
+        groups = tuple(groups)
+        if row_printings:
+            own_groups = tuple(g for g in groups if g != GROUP_PRINTINGS)
+            card_ids = [self.lookup(own_groups, term) for term in terms]
+            printing_ids = [self.lookup((GROUP_PRINTINGS,), term) for term in terms]
+        else:
+            card_ids = [self.lookup(groups, term) for term in terms]
+            printing_ids = [frozenset()] * len(terms)
+        return TextMatch(terms, card_ids, printing_ids)
+
+    def similar_names(self, text: str, limit: int = FUZZY_LIMIT, min_score: float = FUZZY_MIN_SCORE) -> List[int]:
+        """Ids of the cards whose names are most similar to text, best first (typo tolerant)."""
+        if self._names is None:
+            self._names = NameIndex((card_id, doc[0].name) for card_id, doc in self._docs.items())
+        return [card_id for card_id, _ in self._names.search(text, limit, min_score)]
+
+class SearchIndexManager:
+    """One CardSearchIndex per card database version."""
+
+    def __init__(self):
+        self._index: Optional[CardSearchIndex] = None
+        self._version = None
+
+    def get(self) -> CardSearchIndex:
+        version = ygo_service.db_version
+        if self._index is None or self._version != version:
+            self._index = CardSearchIndex()
+            self._version = version
+        return self._index
+
+search_index = SearchIndexManager()
@@ -103,6 +103,14 @@ class StorageService:
 
         return True
 
+    def get_image_url(self, filename: str) -> str:
+        """Returns the URL of an uploaded storage image, versioned by mtime so re-uploads bypass browser caches."""
+        try:
+            version = int(os.path.getmtime(os.path.join(STORAGE_IMG_DIR, filename)))
+        except OSError:
+            return f"/storage/{filename}"
+        return f"/storage/{filename}?v={version}"
+
     async def save_uploaded_image(self, file_obj, filename: str) -> str:
         """
         Saves an uploaded file to data/storage/ and returns the filename.
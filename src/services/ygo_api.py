@@ -12,6 +12,7 @@ import logging
 from typing import List, Optional, Callable, Dict, Any, Tuple
 from src.core.models import ApiCard, ApiCardSet
 from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
 from src.services.yugipedia_service import yugipedia_service
 from src.core.persistence import persistence
 from src.core.utils import generate_variant_id
@@ -32,6 +33,8 @@ def parse_cards_data(data: List[dict]) -> List[ApiCard]:
 class YugiohService:
     def __init__(self):
         self._cards_cache: Dict[str, List[ApiCard]] = {}
+        # Bumped whenever a card database is (re)loaded or saved; derived indexes key on it
+        self.db_version = 0
         self._sets_cache: Dict[str, Dict[str, Any]] = {} # set_code_prefix -> {name, code, image, date, count}
         self._migrate_old_db_files()
 
@@ -236,6 +239,7 @@ class YugiohService:
     async def save_card_database(self, cards: List[ApiCard], language: str = "en"):
         """Saves the card database to disk."""
         self._cards_cache[language] = cards
+        self.db_version += 1
 
         if not cards:
             return
@@ -517,6 +521,7 @@ class YugiohService:
                  parsed_cards = parse_cards_data(data)
 
              self._cards_cache[language] = parsed_cards
+             self.db_version += 1
              logger.info(f"Loaded {len(parsed_cards)} cards.")
 
         return self._cards_cache.get(language, [])
@@ -553,8 +558,9 @@ class YugiohService:
 
     def search_by_name(self, name: str, language: str = "en") -> Optional[ApiCard]:
         cards = self._cards_cache.get(language, [])
+        name = name.lower()
         for c in cards:
-            if c.name.lower() == name.lower():
+            if c.name_lower == name:
                 return c
         return None
 
@@ -584,7 +590,7 @@ class YugiohService:
                  url_map[card.id] = card.card_images[0].image_url_small
 
         logger.info(f"Queueing download for {len(url_map)} images.")
-        await image_manager.download_batch(url_map, progress_callback=progress_callback)
+        await download_scheduler.download(url_map, DownloadPriority.BULK, progress_callback=progress_callback)
 
     async def download_all_images_high_res(self, progress_callback: Optional[Callable[[float], None]] = None, language: str = "en"):
         """Downloads high-resolution images for all cards in the database."""
@@ -597,7 +603,50 @@ class YugiohService:
                  url_map[card.id] = card.card_images[0].image_url
 
         logger.info(f"Queueing download for {len(url_map)} high-res images.")
-        await image_manager.download_batch(url_map, progress_callback=progress_callback, high_res=True)
+        await download_scheduler.download(url_map, DownloadPriority.BULK, high_res=True, progress_callback=progress_callback)
+
+    async def verify_and_repair_images(self, progress_callback: Optional[Callable[[float], None]] = None, language: str = "en") -> int:
+        """
+        Verifies every cached card image and downloads broken ones again.
+        Verification reports the first 90% of progress, re-downloading the rest.
+        Returns the number of broken images found.
+        """
+        def verify_progress(val):
+            if progress_callback: progress_callback(val * 0.9)
+
+        broken = await image_manager.verify_images(progress_callback=verify_progress)
+        if not broken:
+            if progress_callback: progress_callback(1.0)
+            return 0
+
+        # Image files are keyed by image id, which may be an alternate artwork of a card
+        cards = await self.load_card_database(language)
+        urls = {}
+        for card in cards:
+            for img in card.card_images:
+                urls[img.id] = (img.image_url_small, img.image_url)
+
+        small_map = {}
+        high_map = {}
+        for image_id, high_res in broken:
+            if image_id not in urls:
+                continue
+            small_url, high_url = urls[image_id]
+            if high_res:
+                high_map[image_id] = high_url
+            else:
+                small_map[image_id] = small_url
+
+        def download_progress(val):
+            if progress_callback: progress_callback(0.9 + val * 0.1)
+
+        logger.info(f"Re-downloading {len(small_map) + len(high_map)} broken images.")
+        if small_map:
+            await download_scheduler.download(small_map, DownloadPriority.BULK, progress_callback=download_progress if not high_map else None)
+        if high_map:
+            await download_scheduler.download(high_map, DownloadPriority.BULK, high_res=True, progress_callback=download_progress)
+        if progress_callback: progress_callback(1.0)
+        return len(broken)
 
     async def ensure_images_for_cards(self, cards: List[ApiCard]):
         """Ensures images exist for the specified list of cards (using default artwork)."""
@@ -839,10 +888,7 @@ class YugiohService:
                             # Force replacement: delete existing file
                             local_path = image_manager.get_set_image_path(set_code)
                             if os.path.exists(local_path):
-                                try:
-                                    os.remove(local_path)
-                                except OSError:
-                                    pass
+                                image_manager.delete_image_file(local_path)
 
                             # Download (ensure_set_image will download since file is gone)
                             await image_manager.ensure_set_image(set_code, url)
@@ -1101,7 +1147,7 @@ class YugiohService:
             skipped_count = 0
 
             # Map cards by name for faster lookup
-            name_map = {c.name.lower(): c for c in cards}
+            name_map = {c.name_lower: c for c in cards}
 
             # 1. Identify missing cards
             missing_cards_names = set()
@@ -1134,7 +1180,7 @@ class YugiohService:
                         # Create card
                         new_card = self._create_card_from_yugipedia_data(card_data, cards)
                         cards.append(new_card)
-                        name_map[new_card.name.lower()] = new_card
+                        name_map[new_card.name_lower] = new_card
                         created_count += 1
 
                         if new_card.card_images:
@@ -1277,7 +1323,8 @@ class YugiohService:
 
             # Check Name
             if not target_card and card_data.get("name"):
-                 target_card = next((c for c in cards if c.name.lower() == card_data["name"].lower()), None)
+                 target_name = card_data["name"].lower()
+                 target_card = next((c for c in cards if c.name_lower == target_name), None)
 
             is_new = False
 
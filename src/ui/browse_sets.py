@@ -1,15 +1,21 @@
 from nicegui import ui, run
 from src.services.ygo_api import ygo_service, ApiCard
 from src.services.image_manager import image_manager
+from src.services.query_engine import Query, card_rarities, COST_EQUALS, COST_CONTAINS
+from src.services.search_index import GROUP_NAME
 from src.core.constants import RARITY_RANKING
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView
+from src.ui.components.virtual_grid import VirtualGrid, GridCell
 from src.ui.collection import build_collector_rows, CollectorRow, CardViewModel
 from src.core.persistence import persistence
 from src.core.utils import transform_set_code, normalize_set_code
+from src.ui.components.card_tooltip import attach_card_tooltip
 import asyncio
 import logging
 from datetime import datetime
+from typing import Dict
 import re
 
 logger = logging.getLogger(__name__)
@@ -64,7 +70,7 @@ def build_set_rows(api_cards, collection, target_set_code):
                 set_code=s.set_code,
                 set_name=s.set_name,
                 rarity=s.set_rarity,
-                price=float(s.set_price) if s.set_price else 0.0,
+                price=s.price,
                 image_url=img_url,
                 owned_count=owned_count,
                 is_owned=is_owned,
@@ -104,29 +110,115 @@ def build_consolidated_rows(api_cards, collection):
                         owned_langs.add(e.language)
                         owned_conds.add(e.condition)
 
-        # Calculate lowest price
-        lowest = 0.0
-        prices = []
-        if card.card_prices:
-            p = card.card_prices[0]
-            for val in [p.cardmarket_price, p.tcgplayer_price, p.coolstuffinc_price]:
-                 if val:
-                     try: prices.append(float(val))
-                     except: pass
-        if prices: lowest = min(prices)
-
         rows.append(CardViewModel(
             api_card=card,
             owned_quantity=qty,
             is_owned=is_owned,
-            lowest_price=lowest,
+            lowest_price=card.lowest_price,
             owned_languages=owned_langs,
             owned_conditions=owned_conds
         ))
     return rows
 
+def rarity_rank(rarity: str) -> int:
+    """Position of rarity in RARITY_RANKING (rarest first); unknown rarities rank last."""
+    try:
+        return RARITY_RANKING.index(rarity)
+    except ValueError:
+        return len(RARITY_RANKING)
+
+def row_rarity_rank(row) -> int:
+    return rarity_rank(row.rarity)
+
+def card_rarity_rank(vm) -> int:
+    """Consolidated rows rank by the card's rarest printing, as Common if none is ranked."""
+    best = min((rarity_rank(cs.set_rarity) for cs in vm.api_card.card_sets), default=len(RARITY_RANKING))
+    return best if best < len(RARITY_RANKING) else rarity_rank("Common")
+
+def set_code_in_set(card, prefix: str) -> str:
+    """The card's set code in the set with the given (lowercase) prefix, else its first set code."""
+    for cs in card.card_sets:
+        if cs.set_code.split('-')[0].lower() == prefix:
+            return cs.set_code
+    return card.card_sets[0].set_code if card.card_sets else ""
+
+class ConsolidatedSetCell(GridCell):
+    """Grid cell of a set's consolidated view."""
+
+    def build(self):
+        with ui.card() as root:
+            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
+                self.image = ui.image('').classes('w-full h-full object-cover')
+                self.quantity = ui.label().classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
+                self.level = ui.label().classes('absolute bottom-1 right-1 bg-black/70 text-white text-[10px] px-1 rounded')
+
+            with ui.column().classes('p-2 gap-0 w-full'):
+                self.name = ui.label().classes('text-xs font-bold truncate w-full')
+                self.type = ui.label().classes('text-[10px] text-gray-400 truncate w-full')
+        attach_card_tooltip(lambda: (self.item.api_card, None) if self.item else None, element=root)
+        return root
+
+    def bind(self, vm: CardViewModel):
+        card = vm.api_card
+        opacity = "opacity-100" if vm.is_owned else "opacity-60 grayscale"
+        border = "border-accent" if vm.is_owned else "border-gray-700"
+        self.set_classes(self.root, f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform')
+
+        img_id = card.card_images[0].id if card.card_images else card.id
+        img_src = image_manager.get_card_image_url(img_id, 'grid', card.card_images[0].image_url_small if card.card_images else None)
+        self.image.visible = bool(img_src)
+        if img_src: self.image.source = img_src
+
+        self.quantity.text = f"{vm.owned_quantity}"
+        self.quantity.visible = vm.owned_quantity > 0
+        self.level.text = f"Lv {card.level}" if card.level else ""
+        self.level.visible = bool(card.level)
+
+        self.name.text = card.name
+        self.type.text = card.type
+
+class CollectorSetCell(GridCell):
+    """Grid cell of a set's collectors view (one printing per cell)."""
+
+    def build(self):
+        with ui.card() as root:
+            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
+                self.image = ui.image('').classes('w-full h-full object-cover')
+                self.quantity = ui.label().classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
+
+                with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
+                    self.rarity = ui.label().classes('font-bold text-yellow-500 truncate max-w-[100px]')
+
+                self.set_code = ui.label().classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
+
+            with ui.column().classes('p-2 gap-0 w-full'):
+                self.name = ui.label().classes('text-xs font-bold truncate w-full')
+                self.price = ui.label().classes('text-xs text-green-400')
+        attach_card_tooltip(lambda: (self.item.api_card, self.item.image_id) if self.item else None, element=root)
+        return root
+
+    def bind(self, item: CollectorRow):
+        opacity = "opacity-100" if item.is_owned else "opacity-60 grayscale"
+        border = "border-accent" if item.is_owned else "border-gray-700"
+        self.set_classes(self.root, f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform')
+
+        img_src = image_manager.get_card_image_url(item.image_id, 'grid', item.image_url)
+        self.image.visible = bool(img_src)
+        if img_src: self.image.source = img_src
+
+        self.quantity.text = f"{item.owned_count}"
+        self.quantity.visible = item.is_owned and item.owned_count > 0
+        self.rarity.text = item.rarity
+        self.set_code.text = item.set_code
+
+        self.name.text = item.api_card.name
+        self.price.text = f"${item.price:.2f}"
+
 class BrowseSetsPage:
     def __init__(self):
+        self.detail_filter_runner = FilterRunner(self.apply_detail_filters, 'browse_sets')
+        # Pooled card grids of the detail view per view scope, built by render_detail_view
+        self.detail_grids: Dict[str, VirtualGrid] = {}
         self.state = {
             'view': 'gallery', # gallery, detail
             'sets': [],
@@ -292,7 +384,7 @@ class BrowseSetsPage:
             # If we are in detail view, we likely want to reload the set details to update counts
             if self.state['view'] == 'detail' and self.state['selected_set']:
                  await self.load_set_details(self.state['selected_set'])
-                 self.render_detail_grid.refresh()
+                 self.render_detail_grid()
                  # Also refresh header stats
                  if hasattr(self, 'render_set_header'):
                     self.render_set_header.refresh()
@@ -502,143 +594,62 @@ class BrowseSetsPage:
     async def apply_detail_filters(self):
         is_cons = self.state['view_scope'] == 'consolidated'
         source = self.state['detail_rows_consolidated'] if is_cons else self.state['detail_rows_collectors']
-        res = list(source)
-
-        # Filter Logic
-        txt = self.state['detail_search'].lower()
-        if txt:
-             res = [r for r in res if txt in r.api_card.name.lower()]
-
-        if self.state.get('filter_owned_only'):
-             res = [c for c in res if c.is_owned]
-
-        # Reuse state filters
-        if self.state['filter_rarity']:
-             r = self.state['filter_rarity'].lower()
-             if is_cons:
-                 res = [c for c in res if c.api_card.card_sets and any(r == cs.set_rarity.lower() for cs in c.api_card.card_sets)]
-             else:
-                 res = [c for c in res if r == c.rarity.lower()]
-
-        if self.state['filter_attr']:
-            res = [c for c in res if c.api_card.attribute == self.state['filter_attr']]
-
-        if self.state['filter_card_type']:
-             ctypes = self.state['filter_card_type']
-             if isinstance(ctypes, str): ctypes = [ctypes]
-             res = [c for c in res if any(t in c.api_card.type for t in ctypes)]
+        s = self.state
+        query = Query()
+        query.search(s['detail_search'], (GROUP_NAME,))
 
-        if self.state['filter_monster_race']:
-             res = [c for c in res if "Monster" in c.api_card.type and c.api_card.race == self.state['filter_monster_race']]
+        if s.get('filter_owned_only'):
+             query.equals('is_owned', True, 0.3)
 
-        if self.state['filter_st_race']:
-             res = [c for c in res if ("Spell" in c.api_card.type or "Trap" in c.api_card.type) and c.api_card.race == self.state['filter_st_race']]
-
-        if self.state['filter_archetype']:
-             res = [c for c in res if c.api_card.archetype == self.state['filter_archetype']]
-
-        if self.state['filter_monster_category']:
-             categories = self.state['filter_monster_category']
-             if isinstance(categories, list) and categories:
-                 res = [c for c in res if all(c.api_card.matches_category(cat) for cat in categories)]
-
-        if self.state['filter_level']:
-             res = [c for c in res if c.api_card.level == int(self.state['filter_level'])]
-
-        atk_min, atk_max = self.state['filter_atk_min'], self.state['filter_atk_max']
-        if atk_min > 0 or atk_max < 5000:
-             res = [c for c in res if c.api_card.atk is not None and atk_min <= int(c.api_card.atk) <= atk_max]
+        if is_cons:
+             query.rarity(s['filter_rarity'], lambda c: card_rarities(c.api_card))
+        else:
+             query.rarity(s['filter_rarity'], lambda c: (c.rarity,))
 
-        def_min, def_max = self.state['filter_def_min'], self.state['filter_def_max']
-        if def_min > 0 or def_max < 5000:
-             res = [c for c in res if getattr(c.api_card, 'def_', None) is not None and def_min <= getattr(c.api_card, 'def_', -1) <= def_max]
+        query.card_filters(s)
 
         # Ownership & Price
-        min_q = self.state['filter_ownership_min']
-        max_q = self.state['filter_ownership_max']
-
         def get_qty(c):
             return c.owned_quantity if hasattr(c, 'owned_quantity') else c.owned_count
 
-        res = [c for c in res if min_q <= get_qty(c) <= max_q]
-
-        p_min = self.state['filter_price_min']
-        p_max = self.state['filter_price_max']
-
         def get_price(c):
             return c.lowest_price if hasattr(c, 'lowest_price') else c.price
 
-        res = [c for c in res if p_min <= get_price(c) <= p_max]
-
-        if self.state['filter_condition']:
-            conds = self.state['filter_condition']
-            if is_cons:
-                 res = [c for c in res if any(cond in c.owned_conditions for cond in conds)]
-            else:
-                 res = [c for c in res if c.condition in conds]
-
-        if self.state['filter_owned_lang']:
-            target_lang = self.state['filter_owned_lang']
-            if is_cons:
-                 res = [c for c in res if target_lang in c.owned_languages]
-            else:
-                 res = [c for c in res if c.language == target_lang]
+        query.value_range('owned_quantity' if is_cons else 'owned_count', s['filter_ownership_min'], s['filter_ownership_max'])
+        query.value_range('lowest_price' if is_cons else 'price', s['filter_price_min'], s['filter_price_max'], selectivity=0.9,
+                          column='price' if is_cons else None)
+
+        conds = s['filter_condition']
+        target_lang = s['filter_owned_lang']
+        if is_cons:
+            if conds:
+                query.where(lambda c: any(cond in c.owned_conditions for cond in conds), COST_CONTAINS, 0.6,
+                            key=('owned_condition', frozenset(conds)))
+            if target_lang:
+                query.where(lambda c: target_lang in c.owned_languages, COST_EQUALS, 0.5,
+                            key=('owned_language', target_lang))
+        else:
+            query.one_of('condition', conds, 0.6)
+            query.equals('language', target_lang, 0.5)
+
+        # Rarity ranks count from the rarest, so ascending lists the most common printings first
+        key = s['detail_sort']
+        desc = s['detail_sort_desc']
+        if is_cons:
+            prefix = (s.get('selected_set') or '').split('-')[0].lower()
+            set_code = lambda x: set_code_in_set(x.api_card, prefix)
+        else:
+            set_code = 'set_code'
+        query.sort({'Owned': 'Quantity'}.get(key, key), not desc if key == 'Rarity' else desc,
+                   price=get_price, quantity=get_qty, set_code=set_code,
+                   rarity=card_rarity_rank if is_cons else row_rarity_rank, price_column='Price' if is_cons else None)
 
-        # Sort
-        key = self.state['detail_sort']
-        desc = self.state['detail_sort_desc']
+        result = query.run(source, 1, s['detail_page_size'])
+        self.state['detail_filtered_rows'] = result.items
+        self.state['detail_page'] = result.page
+        self.state['detail_total_pages'] = result.total_pages
 
-        if key == 'Name':
-            res.sort(key=lambda x: x.api_card.name, reverse=desc)
-        elif key == 'Rarity':
-            # Use RARITY_RANKING index
-            def rarity_rank(x):
-                if hasattr(x, 'rarity'):
-                     r = x.rarity
-                else:
-                     # For consolidated, use lowest rarity index found? or highest?
-                     # Let's say we sort by "best" rarity available in the set if possible?
-                     # Actually consolidated rows don't have a single rarity.
-                     # We can sort by best rarity index of any set in the card?
-                     r = "Common" # Fallback
-                     if x.api_card.card_sets:
-                         # Find best rarity
-                         best_idx = 999
-                         for cs in x.api_card.card_sets:
-                             try: idx = RARITY_RANKING.index(cs.set_rarity)
-                             except: idx = 999
-                             if idx < best_idx:
-                                 best_idx = idx
-                                 r = cs.set_rarity
-                try: return RARITY_RANKING.index(r)
-                except: return 999
-            res.sort(key=rarity_rank, reverse=not desc)
-        elif key == 'Price':
-             res.sort(key=lambda x: get_price(x), reverse=desc)
-        elif key == 'Owned':
-             res.sort(key=lambda x: get_qty(x), reverse=desc)
-        elif key == 'Set Code':
-             current_set_prefix = self.state.get('selected_set', '').split('-')[0].lower() if is_cons else ""
-             def get_set_code(x):
-                 if is_cons:
-                     # For consolidated, try to find the matching set code for current set
-                     if x.api_card.card_sets:
-                         for s in x.api_card.card_sets:
-                             if s.set_code.split('-')[0].lower() == current_set_prefix:
-                                 return s.set_code
-                         return x.api_card.card_sets[0].set_code
-                     return ""
-                 else:
-                     return x.set_code
-             res.sort(key=get_set_code, reverse=desc)
-
-        self.state['detail_filtered_rows'] = res
-        self.state['detail_page'] = 1
-
-        count = len(res)
-        self.state['detail_total_pages'] = (count + self.state['detail_page_size'] - 1) // self.state['detail_page_size']
-
-        if hasattr(self, 'render_detail_grid'): self.render_detail_grid.refresh()
+        self.render_detail_grid()
         if hasattr(self, 'render_view_scope_toggles'): self.render_view_scope_toggles.refresh()
         if hasattr(self, 'render_detail_pagination_controls'): self.render_detail_pagination_controls.refresh()
 
@@ -666,61 +677,21 @@ class BrowseSetsPage:
             'detail_search': '',
         })
         if self.filter_pane: self.filter_pane.reset_ui_elements()
-        await self.apply_detail_filters()
+        await self.detail_filter_runner.run()
 
     async def back_to_gallery(self):
         self.state['view'] = 'gallery'
         self.state['selected_set'] = None
         self.state['selected_set_info'] = None
+        self.detail_grids = {}
         self.render_content.refresh()
 
     # --- Renderers ---
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-
-        # Default to first image
-        target_img = card.card_images[0] if card.card_images else None
-
-        # If specific ID provided, try to find it
-        if specific_image_id and card.card_images:
-            for img in card.card_images:
-                if img.id == specific_image_id:
-                    target_img = img
-                    break
-
-        if not target_img:
-             return
-
-        img_id = target_img.id
-        high_res_url = target_img.image_url
-        low_res_url = target_img.image_url_small
-
-        # Check local high-res existence immediately
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        # Create tooltip with transparent background and no padding
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none') \
-                         .props('style="max-width: none" delay=1050') as tooltip:
-            # Image at 65vh height and 1000px min width for readability
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl') \
-                                     .props('fit=contain')
-
-            # Trigger download on show if needed
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    # Check again to avoid redundant downloads
-                    if not image_manager.image_exists(img_id, high_res=True):
-                         await image_manager.ensure_image(img_id, high_res_url, high_res=True)
-
-                tooltip.on('show', ensure_high)
-
     def render_set_visual(self, container: ui.element, set_code: str, image_url: str):
         """
         Renders the set image or fallback fan into the provided container.
-        Validates local image resolution.
+        Validates local image resolution via the image metadata index.
         """
 
         def render_fan_spinner():
@@ -812,28 +783,30 @@ class BrowseSetsPage:
                 logger.error(f"Error loading fallback for set {set_code}: {e}")
                 if not container.is_deleted: container.clear()
 
-        # Check Local existence AND resolution
-        path = image_manager.get_set_image_path(set_code)
-        if image_manager.set_image_exists(set_code) and image_manager.check_image_resolution(path):
-             safe_code = "".join(c for c in set_code if c.isalnum() or c in ('-', '_')).strip()
+        # Check Local existence AND resolution (metadata index lookup, no image decoding)
+        has_local = image_manager.set_image_exists(set_code)
+        meets_resolution = image_manager.set_image_meets_resolution(set_code) if has_local else False
+        if meets_resolution:
              with container:
-                ui.image(f"/sets/{safe_code}.jpg").classes('w-full h-full object-contain')
-        elif image_url:
+                ui.image(image_manager.get_set_image_url(set_code)).classes('w-full h-full object-contain')
+        elif image_url or meets_resolution is None:
              # Spinner
              render_fan_spinner()
 
              async def download_and_update():
                  if container.is_deleted: return
                  try:
-                     # ensure_set_image checks resolution
-                     path = await image_manager.ensure_set_image(set_code, image_url)
+                     # ensure_set_image checks resolution; unindexed local files are verified off the event loop
+                     if image_url:
+                         path = await image_manager.ensure_set_image(set_code, image_url)
+                     else:
+                         path = await image_manager.verify_set_image(set_code)
                      if container.is_deleted: return
 
                      if path:
-                         safe_code = "".join(c for c in set_code if c.isalnum() or c in ('-', '_')).strip()
                          container.clear()
                          with container:
-                             ui.image(f"/sets/{safe_code}.jpg").classes('w-full h-full object-contain')
+                             ui.image(image_manager.get_set_image_url(set_code)).classes('w-full h-full object-contain')
                      else:
                          # Download failed or Low Res -> Fan
                          await load_fan()
@@ -1236,6 +1209,11 @@ class BrowseSetsPage:
         with ui.row().classes('w-full gap-4'):
              with ui.column().classes('w-full'):
                   self.render_detail_controls()
+                  # Pooled grids per view scope, rebuilt with the detail view
+                  self.detail_grids = {
+                      'consolidated': VirtualGrid(ConsolidatedSetCell, on_click=self.open_consolidated_view).build(),
+                      'collectors': VirtualGrid(CollectorSetCell, on_click=self.open_single_view).build(),
+                  }
                   self.render_detail_grid()
 
                   # Bottom Pagination
@@ -1258,7 +1236,7 @@ class BrowseSetsPage:
             p = max(1, min(p, self.state['detail_total_pages']))
             if p != self.state['detail_page']:
                 self.state['detail_page'] = p
-                self.render_detail_grid.refresh()
+                self.render_detail_grid()
                 # Controls are no longer refreshable, so no refresh call here needed for inputs
                 # Pagination controls are refreshing themselves via this method being refreshable
                 self.render_detail_pagination_controls.refresh()
@@ -1281,7 +1259,7 @@ class BrowseSetsPage:
         with ui.row().classes('w-full items-center gap-4 bg-gray-800 p-2 rounded mb-4'):
             async def on_detail_search(e):
                 self.state['detail_search'] = e.value
-                await self.apply_detail_filters()
+                await self.detail_filter_runner.run()
 
             ui.input(placeholder='Filter cards...', on_change=on_detail_search) \
                 .bind_value(self.state, 'detail_search') \
@@ -1289,13 +1267,13 @@ class BrowseSetsPage:
 
             async def on_detail_sort(e):
                 self.state['detail_sort'] = e.value
-                await self.apply_detail_filters()
+                await self.detail_filter_runner.run()
 
             ui.select(['Name', 'Rarity', 'Price', 'Owned', 'Set Code'], label='Sort', value=self.state['detail_sort'], on_change=on_detail_sort).props('dark').classes('w-40')
 
             async def toggle_detail_sort():
                 self.state['detail_sort_desc'] = not self.state['detail_sort_desc']
-                await self.apply_detail_filters()
+                await self.detail_filter_runner.run()
 
             ui.button(icon='arrow_downward', on_click=toggle_detail_sort).bind_icon_from(self.state, 'detail_sort_desc', lambda x: 'arrow_downward' if x else 'arrow_upward').props('flat round dense color=white')
 
@@ -1304,7 +1282,7 @@ class BrowseSetsPage:
             # Owned Only Toggle
             async def on_owned_only_change(e):
                  self.state['filter_owned_only'] = e.value
-                 await self.apply_detail_filters()
+                 await self.detail_filter_runner.run()
 
             ui.checkbox('Owned Only', value=self.state.get('filter_owned_only', False), on_change=on_owned_only_change).props('dense dark color=green')
 
@@ -1337,8 +1315,9 @@ class BrowseSetsPage:
              save_callback=self.handle_card_save
          )
 
-    @ui.refreshable
     def render_detail_grid(self):
+        """Re-binds the pooled grid of the current view scope to the current page of rows."""
+        if not self.detail_grids: return
         all_rows = self.state['detail_filtered_rows']
 
         # Pagination Slice
@@ -1359,67 +1338,10 @@ class BrowseSetsPage:
             if to_download:
                 asyncio.create_task(image_manager.download_batch(to_download, high_res=False))
 
-        is_cons = self.state['view_scope'] == 'consolidated'
-
-        with ui.grid(columns='repeat(auto-fill, minmax(160px, 1fr))').classes('w-full gap-4'):
-            for item in rows:
-                if is_cons:
-                     # Consolidated Rendering
-                     card = item.api_card
-                     opacity = "opacity-100" if item.is_owned else "opacity-60 grayscale"
-                     border = "border-accent" if item.is_owned else "border-gray-700"
-
-                     img_src = card.card_images[0].image_url_small if card.card_images else None
-                     img_id = card.card_images[0].id if card.card_images else card.id
-                     if image_manager.image_exists(img_id):
-                         img_src = f"/images/{img_id}.jpg"
-
-                     with ui.card().classes(f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform') \
-                            .on('click', lambda c=item: self.open_consolidated_view(c)):
-
-                         with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
-                             if img_src: ui.image(img_src).classes('w-full h-full object-cover').props('loading="lazy"')
-
-                             if item.owned_quantity > 0:
-                                 ui.label(f"{item.owned_quantity}").classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
-
-                             if card.level:
-                                  ui.label(f"Lv {card.level}").classes('absolute bottom-1 right-1 bg-black/70 text-white text-[10px] px-1 rounded')
-
-                         with ui.column().classes('p-2 gap-0 w-full'):
-                            ui.label(card.name).classes('text-xs font-bold truncate w-full')
-                            ui.label(card.type).classes('text-[10px] text-gray-400 truncate w-full')
-
-                         self._setup_card_tooltip(card)
-
-                else:
-                    # Collectors Rendering
-                    opacity = "opacity-100" if item.is_owned else "opacity-60 grayscale"
-                    border = "border-accent" if item.is_owned else "border-gray-700"
-
-                    img_src = item.image_url
-                    if item.image_id and image_manager.image_exists(item.image_id):
-                        img_src = f"/images/{item.image_id}.jpg"
-
-                    with ui.card().classes(f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform') \
-                            .on('click', lambda c=item: self.open_single_view(c)):
-
-                        with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
-                            if img_src: ui.image(img_src).classes('w-full h-full object-cover').props('loading="lazy"')
-
-                            if item.is_owned and item.owned_count > 0:
-                                 ui.label(f"{item.owned_count}").classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
-
-                            with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
-                                ui.label(item.rarity).classes('font-bold text-yellow-500 truncate max-w-[100px]')
-
-                            ui.label(item.set_code).classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
-
-                        with ui.column().classes('p-2 gap-0 w-full'):
-                            ui.label(item.api_card.name).classes('text-xs font-bold truncate w-full')
-                            ui.label(f"${item.price:.2f}").classes('text-xs text-green-400')
-
-                        self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+        grid = self.detail_grids[self.state['view_scope']]
+        for g in self.detail_grids.values():
+            g.scroll.visible = g is grid and bool(rows)
+        grid.set_items(rows)
 
     async def open_single_view(self, row: CollectorRow):
         # Wrapper for SingleCardView
@@ -1446,7 +1368,7 @@ class BrowseSetsPage:
         with self.filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
                  # Initialize FilterPane with show_set_selector=False
-                 self.filter_pane = FilterPane(self.state, self.apply_detail_filters, self.reset_filters, show_set_selector=False)
+                 self.filter_pane = FilterPane(self.state, self.detail_filter_runner, self.reset_filters, show_set_selector=False)
                  self.filter_pane.build()
 
         self.render_content()
@@ -4,13 +4,19 @@ from src.core.changelog_manager import changelog_manager
 from src.core.config import config_manager
 from src.services.ygo_api import ygo_service, ApiCard
 from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
+from src.services.query_engine import Query
+from src.services.search_index import CARD_GROUPS
+from src.services.facet_catalog import facet_catalog, FacetCatalog
 from src.services.collection_editor import CollectionEditor
 from src.core.utils import generate_variant_id, normalize_set_code, extract_language_code, transform_set_code, LANGUAGE_COUNTRY_MAP
 from src.core.constants import CARD_CONDITIONS, CONDITION_ABBREVIATIONS
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView
 from src.ui.components.structure_deck_dialog import StructureDeckDialog
 from src.core.models import Collection
+from src.ui.components.card_tooltip import attach_card_tooltip
 from dataclasses import dataclass, field
 from typing import List, Optional, Any, Dict
 import logging
@@ -51,7 +57,7 @@ def get_grouping_key_parts(set_code: str):
     # Fallback
     return set_code, 'UNKNOWN', '000'
 
-@dataclass
+@dataclass(slots=True)
 class LibraryEntry:
     id: str # Unique ID for UI (card_id + variant hash)
     api_card: ApiCard
@@ -62,7 +68,7 @@ class LibraryEntry:
     image_id: int
     price: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class BulkCollectionEntry:
     id: str # Unique ID for UI
     api_card: ApiCard
@@ -137,6 +143,13 @@ def _build_collection_entries(col: Collection, api_card_map: Dict[int, ApiCard])
 
 class BulkAddPage:
     def __init__(self):
+        # Tags this page's image downloads in the shared scheduler
+        self.download_group = f"bulk_add:{id(self)}"
+        self.library_filter_runner = FilterRunner(self.apply_library_filters, 'bulk_add:library')
+        self.collection_filter_runner = FilterRunner(self.apply_collection_filters, 'bulk_add:collection')
+        # Image ids of the library page whose atlas is being built (atlas mode only)
+        self._library_atlas_ids: Optional[List[int]] = None
+
         # Global Metadata (shared)
         self.metadata = {
             'available_sets': [],
@@ -225,6 +238,7 @@ class BulkAddPage:
         self.single_card_view = SingleCardView()
         self.structure_deck_dialog = StructureDeckDialog(self.process_structure_deck_add)
         self.library_filter_pane = None
+        self.facets: Optional[FacetCatalog] = None
         self.collection_filter_pane = None
         self.current_collection_obj = None
         self.api_card_map = {} # id -> ApiCard
@@ -317,7 +331,7 @@ class BulkAddPage:
             self.library_filter_pane.reset_ui_elements()
 
         # Apply
-        await self.apply_library_filters()
+        await self.library_filter_runner.run()
 
         # Force update of search input if bound
         # Note: Since we updated s['library_search_text'], if the input is bound, it should update.
@@ -355,7 +369,7 @@ class BulkAddPage:
             self.collection_filter_pane.reset_ui_elements()
 
         # Apply
-        await self.apply_collection_filters()
+        await self.collection_filter_runner.run()
 
     async def _update_collection(self, api_card, set_code, rarity, lang, qty, cond, first, img_id, mode='ADD', variant_id=None, save=True, storage_location=None):
         if not self.current_collection_obj or not self.state['selected_collection']:
@@ -408,6 +422,8 @@ class BulkAddPage:
         unique_id = f"{variant_id}_{lang}_{cond}_{first}_{loc_str}"
 
         cards = self.col_state['collection_cards']
+        # Entries are updated in place below
+        persistence.mark_collections_changed()
 
         target_index = -1
         for i, entry in enumerate(cards):
@@ -864,7 +880,7 @@ class BulkAddPage:
         elif from_id == 'collection-list' and to_id == 'collection-list':
             self.render_collection_content.refresh()
 
-    # ... [Previous methods: on_collection_change, _setup_card_tooltip, load_library_data, apply_library_filters, etc.]
+    # ... [Previous methods: on_collection_change, load_library_data, apply_library_filters, etc.]
     # (I will include the full class content in write_file to ensure consistency)
 
     async def process_batch_update(self, entries: List[BulkCollectionEntry]):
@@ -1337,31 +1353,6 @@ class BulkAddPage:
         self.render_header.refresh()
         await self.load_collection_data()
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-        target_img = card.card_images[0] if card.card_images else None
-        if specific_image_id and card.card_images:
-            for img in card.card_images:
-                if img.id == specific_image_id:
-                    target_img = img
-                    break
-        if not target_img: return
-
-        img_id = target_img.id
-        high_res_url = target_img.image_url
-        low_res_url = target_img.image_url_small
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none').props('style="max-width: none" delay=5000') as tooltip:
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl').props('fit=contain')
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    if not image_manager.image_exists(img_id, high_res=True):
-                         await image_manager.ensure_image(img_id, high_res_url, high_res=True)
-                tooltip.on('show', ensure_high)
-
     async def load_library_data(self):
         try:
             logger.info("Starting load_library_data")
@@ -1379,22 +1370,10 @@ class BulkAddPage:
                         self.set_code_map[s.set_code] = c
 
             entries = []
-            sets = set()
-            m_races = set()
-            st_races = set()
-            archetypes = set()
 
             default_lang = self.state['default_language'].upper()
 
             for c in api_cards:
-                if c.card_sets:
-                    for s in c.card_sets:
-                        sets.add(f"{s.set_name} | {s.set_code.split('-')[0] if '-' in s.set_code else s.set_code}")
-                if c.archetype: archetypes.add(c.archetype)
-                if "Monster" in c.type: m_races.add(c.race)
-                elif "Spell" in c.type or "Trap" in c.type:
-                    if c.race: st_races.add(c.race)
-
                 if c.card_sets:
                     # Group sets by (Prefix, Category, Number, Rarity)
                     grouped_sets = {}
@@ -1416,11 +1395,6 @@ class BulkAddPage:
                                  break
 
                         # Create entry
-                        price = 0.0
-                        if selected.set_price:
-                            try: price = float(selected.set_price)
-                            except: pass
-
                         img_id = selected.image_id if selected.image_id else (c.card_images[0].id if c.card_images else c.id)
                         img_url = c.card_images[0].image_url_small if c.card_images else None
                         if selected.image_id and c.card_images:
@@ -1437,7 +1411,7 @@ class BulkAddPage:
                             rarity=selected.set_rarity,
                             image_url=img_url,
                             image_id=img_id,
-                            price=price
+                            price=selected.price
                         ))
                 else:
                     img_id = c.card_images[0].id if c.card_images else c.id
@@ -1453,10 +1427,9 @@ class BulkAddPage:
                     ))
 
             self.state['library_cards'] = entries
-            self.metadata['available_sets'][:] = sorted(list(sets))
-            self.metadata['available_monster_races'][:] = sorted(list(m_races))
-            self.metadata['available_st_races'][:] = sorted(list(st_races))
-            self.metadata['available_archetypes'][:] = sorted(list(archetypes))
+            self.facets = facet_catalog.get(api_cards)
+            for key, values in self.facets.options().items():
+                self.metadata[key][:] = values
 
             for k, v in self.metadata.items():
                 self.state[k] = v
@@ -1484,60 +1457,22 @@ class BulkAddPage:
 
     async def apply_library_filters(self):
         source = self.state['library_cards']
-        res = list(source)
-        txt = self.state['library_search_text'].lower()
-        if txt:
-            def matches(e: LibraryEntry):
-                return (txt in e.api_card.name.lower() or
-                        txt in e.set_code.lower() or
-                        txt in e.set_name.lower() or
-                        txt in e.api_card.desc.lower())
-            res = [e for e in res if matches(e)]
-
         s = self.state
-        if s['filter_card_type']: res = [e for e in res if any(t in e.api_card.type for t in s['filter_card_type'])]
-        if s['filter_attr']: res = [e for e in res if e.api_card.attribute == s['filter_attr']]
-        if s['filter_monster_race']: res = [e for e in res if "Monster" in e.api_card.type and e.api_card.race == s['filter_monster_race']]
-        if s['filter_st_race']: res = [e for e in res if ("Spell" in e.api_card.type or "Trap" in e.api_card.type) and e.api_card.race == s['filter_st_race']]
-        if s['filter_archetype']: res = [e for e in res if e.api_card.archetype == s['filter_archetype']]
-        if s['filter_set']:
-             parts = s['filter_set'].split('|')
-             name_target = parts[0].strip().lower()
-             code_target = parts[1].strip().lower() if len(parts) > 1 else None
-
-             if code_target:
-                 res = [e for e in res if code_target in e.set_code.lower()]
-             else:
-                 res = [e for e in res if name_target in e.set_name.lower() or name_target in e.set_code.lower()]
-        if s['filter_rarity']:
-             target = s['filter_rarity'].lower()
-             res = [e for e in res if e.rarity.lower() == target]
-        if s['filter_monster_category']:
-             cats = s['filter_monster_category']
-             res = [e for e in res if any(e.api_card.matches_category(cat) for cat in cats)]
-        if s['filter_level'] is not None:
-             res = [e for e in res if e.api_card.level == int(s['filter_level'])]
-        atk_min, atk_max = s['filter_atk_min'], s['filter_atk_max']
-        if atk_min > 0 or atk_max < 5000:
-             res = [e for e in res if e.api_card.atk is not None and atk_min <= int(e.api_card.atk) <= atk_max]
-        def_min, def_max = s['filter_def_min'], s['filter_def_max']
-        if def_min > 0 or def_max < 5000:
-             res = [e for e in res if e.api_card.def_ is not None and def_min <= int(e.api_card.def_) <= def_max]
+        query = Query()
+        query.search(s['library_search_text'], CARD_GROUPS, printings=('set_code', 'set_name'))
+        query.card_filters(s, all_categories=False)
+        query.printings(s['filter_set'], lambda e: ((e.set_code, e.set_name),))
+        query.rarity(s['filter_rarity'], lambda e: (e.rarity,))
         p_min, p_max = s['filter_price_min'], s['filter_price_max']
         if p_min > 0 or p_max < 1000:
-             res = [e for e in res if p_min <= e.price <= p_max]
-
-        key = s['library_sort_by']
-        reverse = s['library_sort_desc']
-        if key == 'Name': res.sort(key=lambda x: x.api_card.name, reverse=reverse)
-        elif key == 'ATK': res.sort(key=lambda x: (x.api_card.atk or -1), reverse=reverse)
-        elif key == 'DEF': res.sort(key=lambda x: (getattr(x.api_card, 'def_', None) or -1), reverse=reverse)
-        elif key == 'Level': res.sort(key=lambda x: (x.api_card.level or -1), reverse=reverse)
-        elif key == 'Price': res.sort(key=lambda x: x.price, reverse=reverse)
-        elif key == 'Set Code': res.sort(key=lambda x: x.set_code, reverse=reverse)
-        elif key == 'Newest': res.sort(key=lambda x: x.api_card.id, reverse=reverse)
-
-        self.state['library_filtered'] = res
+             query.value_range('price', p_min, p_max)
+
+        query.sort(s['library_sort_by'], s['library_sort_desc'], price='price', set_code='set_code')
+
+        result = query.run(source)
+        self.state['library_filtered'] = result.items
+        if self.library_filter_pane and self.facets:
+            self.library_filter_pane.update_counts(self.facets.counts(result.card_ids(), sets=False))
         self.state['library_page'] = 1
         self.update_library_pagination()
         self.render_library_content.refresh()
@@ -1574,59 +1509,20 @@ class BulkAddPage:
 
     async def apply_collection_filters(self, reset_page=True):
         source = self.col_state['collection_cards']
-        res = list(source)
         s = self.col_state
-
-        txt = s['search_text'].lower()
-        if txt:
-            def matches(e: BulkCollectionEntry):
-                return (txt in e.api_card.name.lower() or
-                        txt in e.set_code.lower() or
-                        txt in e.api_card.desc.lower())
-            res = [e for e in res if matches(e)]
-
-        if s['filter_card_type']: res = [e for e in res if any(t in e.api_card.type for t in s['filter_card_type'])]
-        if s['filter_attr']: res = [e for e in res if e.api_card.attribute == s['filter_attr']]
-        if s['filter_monster_race']: res = [e for e in res if "Monster" in e.api_card.type and e.api_card.race == s['filter_monster_race']]
-        if s['filter_st_race']: res = [e for e in res if ("Spell" in e.api_card.type or "Trap" in e.api_card.type) and e.api_card.race == s['filter_st_race']]
-        if s['filter_archetype']: res = [e for e in res if e.api_card.archetype == s['filter_archetype']]
-        if s['filter_set']:
-             parts = s['filter_set'].split('|')
-             name_target = parts[0].strip().lower()
-             code_target = parts[1].strip().lower() if len(parts) > 1 else None
-
-             if code_target:
-                 res = [e for e in res if code_target in e.set_code.lower()]
-             else:
-                 res = [e for e in res if name_target in e.set_name.lower() or name_target in e.set_code.lower()]
-        if s['filter_rarity']:
-             target = s['filter_rarity'].lower()
-             res = [e for e in res if e.rarity.lower() == target]
-        if s['filter_monster_category']:
-             cats = s['filter_monster_category']
-             res = [e for e in res if any(e.api_card.matches_category(cat) for cat in cats)]
-        if s['filter_owned_lang']:
-             res = [e for e in res if e.language == s['filter_owned_lang']]
-        if s['filter_condition']:
-             res = [e for e in res if e.condition in s['filter_condition']]
+        query = Query()
+        query.search(s['search_text'], CARD_GROUPS, printings=('set_code',))
+        query.card_filters(s, all_categories=False)
+        query.printings(s['filter_set'], lambda e: ((e.set_code, e.set_name),))
+        query.rarity(s['filter_rarity'], lambda e: (e.rarity,))
+        query.equals('language', s['filter_owned_lang'], 0.5)
+        query.one_of('condition', s['filter_condition'], 0.6)
         if s['filter_storage']:
-             selected = set(s['filter_storage'])
-             def match_storage(e):
-                 loc = e.storage_location if e.storage_location else 'None'
-                 return loc in selected
-             res = [e for e in res if match_storage(e)]
-
-        key = s['sort_by']
-        reverse = s['sort_desc']
-        if key == 'Name': res.sort(key=lambda x: x.api_card.name, reverse=reverse)
-        elif key == 'ATK': res.sort(key=lambda x: (x.api_card.atk or -1), reverse=reverse)
-        elif key == 'DEF': res.sort(key=lambda x: (getattr(x.api_card, 'def_', None) or -1), reverse=reverse)
-        elif key == 'Level': res.sort(key=lambda x: (x.api_card.level or -1), reverse=reverse)
-        elif key == 'Set Code': res.sort(key=lambda x: x.set_code, reverse=reverse)
-        elif key == 'Quantity': res.sort(key=lambda x: x.quantity, reverse=reverse)
-        elif key == 'Newest': res.sort(key=lambda x: x.api_card.id, reverse=reverse)
-
-        self.col_state['collection_filtered'] = res
+             query.one_of(lambda e: e.storage_location if e.storage_location else 'None', s['filter_storage'], 0.3)
+
+        query.sort(s['sort_by'], s['sort_desc'], quantity='quantity', set_code='set_code')
+
+        self.col_state['collection_filtered'] = query.run(source).items
         if reset_page:
             self.col_state['collection_page'] = 1
         self.update_collection_pagination()
@@ -1863,16 +1759,24 @@ class BulkAddPage:
         url_map = {}
         for item in items:
             if item.image_url: url_map[item.image_id] = item.image_url
-        if url_map:
-            asyncio.create_task(image_manager.download_batch(url_map, concurrency=5))
+        batch = download_scheduler.submit(url_map, DownloadPriority.VISIBLE, group=self.download_group) if url_map else None
 
         if not items:
             ui.label('No cards found.').classes('text-gray-500 italic w-full text-center mt-10')
             return
 
+        atlas = None
+        if config_manager.get_atlas_mode():
+            image_ids = [item.image_id for item in items]
+            atlas = image_manager.get_cached_atlas(image_ids, 'grid')
+            if atlas is None and self._library_atlas_ids != image_ids:
+                self._library_atlas_ids = image_ids
+                asyncio.create_task(self._build_library_atlas(image_ids, batch))
+
         with ui.grid(columns='repeat(auto-fill, minmax(110px, 1fr))').classes('w-full gap-2 p-2').props('id="library-list"'):
             for item in items:
-                img_src = f"/images/{item.image_id}.jpg" if image_manager.image_exists(item.image_id) else item.image_url
+                atlas_style = image_manager.get_atlas_style(atlas, item.image_id)
+                img_src = None if atlas_style else image_manager.get_card_image_url(item.image_id, 'grid', item.image_url)
 
                 with ui.card().classes('p-0 cursor-pointer hover:scale-105 transition-transform border border-gray-800 w-full aspect-[2/3] select-none') \
                         .props(f'data-id="{item.id}"') \
@@ -1880,18 +1784,36 @@ class BulkAddPage:
                         .on('contextmenu.prevent', lambda i=item: self.add_card_to_collection(i, self.state['default_language'], self.state['default_condition'], self.state['default_first_ed'], 1)):
 
                     with ui.element('div').classes('relative w-full h-full'):
-                         ui.image(img_src).classes('w-full h-full object-cover')
+                         if atlas_style:
+                             ui.element('div').classes('w-full h-full').style(atlas_style)
+                         else:
+                             ui.image(img_src).classes('w-full h-full object-cover')
 
                          with ui.column().classes('absolute bottom-0 left-0 w-full bg-black/80 p-0.5 gap-0'):
                              ui.label(item.api_card.name).classes('text-[9px] font-bold text-white leading-none truncate w-full')
                              ui.label(item.set_code).classes('text-[10px] font-mono font-bold text-yellow-500 leading-none truncate')
                              ui.label(item.rarity).classes('text-[8px] text-gray-300 leading-none truncate')
 
-                    self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                    attach_card_tooltip(item.api_card, specific_image_id=item.image_id, delay_ms=5000)
 
         # putMode = true to allow dropping from collection (to remove)
         ui.run_javascript('initSortable("library-list", "shared", "clone", true)')
 
+    async def _build_library_atlas(self, image_ids: List[int], batch=None):
+        """Builds the sprite atlas for a library page once its downloads finish, then re-renders if still shown."""
+        try:
+            if batch:
+                await batch.wait()
+            atlas = await image_manager.get_atlas(image_ids, 'grid')
+        finally:
+            if self._library_atlas_ids == image_ids:
+                self._library_atlas_ids = None
+
+        start = (self.state['library_page'] - 1) * self.state['library_page_size']
+        current_ids = [item.image_id for item in self.state['library_filtered'][start:start + self.state['library_page_size']]]
+        if atlas and current_ids == image_ids:
+            self.render_library_content.refresh()
+
     @ui.refreshable
     def render_collection_content(self):
         start = (self.col_state['collection_page'] - 1) * self.col_state['collection_page_size']
@@ -1902,7 +1824,7 @@ class BulkAddPage:
         for item in items:
             if item.image_url: url_map[item.image_id] = item.image_url
         if url_map:
-            asyncio.create_task(image_manager.download_batch(url_map, concurrency=5))
+            download_scheduler.submit(url_map, DownloadPriority.VISIBLE, group=self.download_group)
 
         if not items:
             ui.label('Collection is empty or no matches.').classes('text-gray-500 italic w-full text-center mt-10')
@@ -1910,7 +1832,7 @@ class BulkAddPage:
 
         with ui.grid(columns='repeat(auto-fill, minmax(110px, 1fr))').classes('w-full gap-2 p-2').props('id="collection-list"'):
             for item in items:
-                img_src = f"/images/{item.image_id}.jpg" if image_manager.image_exists(item.image_id) else item.image_url
+                img_src = image_manager.get_card_image_url(item.image_id, 'grid', item.image_url)
 
                 cond_short = CONDITION_ABBREVIATIONS.get(item.condition, item.condition[:2].upper())
 
@@ -1943,7 +1865,7 @@ class BulkAddPage:
                                  ui.label(item.rarity).classes('text-[8px] text-gray-300 truncate flex-shrink')
                                  ui.label(item.storage_location or "None").classes('text-[8px] text-gray-400 font-mono truncate flex-shrink text-right')
 
-                    self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                    attach_card_tooltip(item.api_card, specific_image_id=item.image_id, delay_ms=5000)
 
         ui.run_javascript('initSortable("collection-list", "shared", true, true)')
 
@@ -2004,13 +1926,13 @@ class BulkAddPage:
         self.library_filter_dialog = ui.dialog().props('position=right')
         with self.library_filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.library_filter_pane = FilterPane(self.state, self.apply_library_filters, self.reset_library_filters)
+                 self.library_filter_pane = FilterPane(self.state, self.library_filter_runner, self.reset_library_filters)
                  self.library_filter_pane.build()
 
         self.collection_filter_dialog = ui.dialog().props('position=right')
         with self.collection_filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.collection_filter_pane = FilterPane(self.col_state, self.apply_collection_filters, self.reset_collection_filters)
+                 self.collection_filter_pane = FilterPane(self.col_state, self.collection_filter_runner, self.reset_collection_filters)
                  self.collection_filter_pane.build()
 
         self.warning_dialog = ui.dialog()
@@ -2028,7 +1950,7 @@ class BulkAddPage:
                         ui.separator().props('vertical')
 
                         ui.input(placeholder='Search...',
-                                 on_change=lambda e: self.apply_library_filters()) \
+                                 on_change=self.library_filter_runner.run) \
                             .bind_value(self.state, 'library_search_text') \
                             .props('dense borderless dark debounce=300') \
                             .classes('w-52 text-sm')
@@ -2052,13 +1974,13 @@ class BulkAddPage:
                         async def on_lib_sort(e):
                             self.state['library_sort_by'] = e.value
                             persistence.save_ui_state({'bulk_library_sort_by': e.value})
-                            await self.apply_library_filters()
+                            await self.library_filter_runner.run()
                         ui.select(lib_sort_opts, value=self.state['library_sort_by'], on_change=on_lib_sort).props('dense options-dense borderless').classes('w-20 text-xs')
 
                         async def toggle_sort():
                             self.state['library_sort_desc'] = not self.state['library_sort_desc']
                             persistence.save_ui_state({'bulk_library_sort_desc': self.state['library_sort_desc']})
-                            await self.apply_library_filters()
+                            await self.library_filter_runner.run()
                         ui.button(on_click=toggle_sort).props('flat dense color=white size=sm').bind_icon_from(self.state, 'library_sort_desc', lambda d: 'arrow_downward' if d else 'arrow_upward')
 
                         ui.button(icon='filter_list', on_click=self.library_filter_dialog.open).props('flat dense color=white size=sm')
@@ -2090,7 +2012,7 @@ class BulkAddPage:
                         ui.separator().props('vertical')
 
                         ui.input(placeholder='Search...',
-                                 on_change=lambda e: self.apply_collection_filters()) \
+                                 on_change=self.collection_filter_runner.run) \
                             .bind_value(self.col_state, 'search_text') \
                             .props('dense borderless dark debounce=300') \
                             .classes('w-52 text-sm')
@@ -2114,13 +2036,13 @@ class BulkAddPage:
                         async def on_col_sort(e):
                             self.col_state['sort_by'] = e.value
                             persistence.save_ui_state({'bulk_collection_sort_by': e.value})
-                            await self.apply_collection_filters()
+                            await self.collection_filter_runner.run()
                         ui.select(col_sort_opts, value=self.col_state['sort_by'], on_change=on_col_sort).props('dense options-dense borderless').classes('w-20 text-xs')
 
                         async def toggle_col_sort():
                             self.col_state['sort_desc'] = not self.col_state['sort_desc']
                             persistence.save_ui_state({'bulk_collection_sort_desc': self.col_state['sort_desc']})
-                            await self.apply_collection_filters()
+                            await self.collection_filter_runner.run()
                         ui.button(on_click=toggle_col_sort).props('flat dense color=white size=sm').bind_icon_from(self.col_state, 'sort_desc', lambda d: 'arrow_downward' if d else 'arrow_upward')
 
                         ui.button(icon='filter_list', on_click=self.collection_filter_dialog.open).props('flat dense color=white size=sm')
@@ -4,31 +4,42 @@ from src.core.changelog_manager import changelog_manager
 from src.core.models import Collection, CollectionCard, CollectionVariant, CollectionEntry, Card, CardMetadata
 from src.services.ygo_api import ygo_service, ApiCard
 from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
+from src.services.query_engine import Query, card_printings, card_rarities, first_set_code, COST_EQUALS, COST_CONTAINS, COST_SETS
+from src.services.search_index import CARD_GROUPS, ALL_GROUPS
+from src.services.facet_catalog import facet_catalog, FacetCatalog
 from src.core.config import config_manager
 from src.core.utils import transform_set_code, generate_variant_id, normalize_set_code, LANGUAGE_COUNTRY_MAP, REGION_TO_LANGUAGE_MAP, is_set_code_compatible, extract_language_code
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView
+from src.ui.components.virtual_grid import VirtualGrid, GridCell
+from src.ui.components.card_tooltip import attach_card_tooltip
 from src.services.collection_editor import CollectionEditor
 from dataclasses import dataclass, field, replace
-from typing import List, Optional, Dict, Set, Callable
+from typing import List, Optional, Dict, Set, Callable, Sequence, AbstractSet
 import asyncio
 import traceback
+import numpy as np
 import re
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+PRICE_FILTER_MAX = 1000.0  # top of the price filter slider
+CARD_SORTS = ('Name', 'Newest', 'ATK', 'DEF', 'Level')  # sort options that only read card fields
+
+@dataclass(slots=True)
 class CardViewModel:
     api_card: ApiCard
     owned_quantity: int
     is_owned: bool
     lowest_price: float = 0.0
-    owned_languages: Set[str] = field(default_factory=set)
-    owned_conditions: Set[str] = field(default_factory=set)
+    owned_languages: AbstractSet[str] = frozenset()  # unowned cards share the empty frozenset
+    owned_conditions: AbstractSet[str] = frozenset()
 
-@dataclass
+@dataclass(slots=True)
 class CollectorRow:
     api_card: ApiCard
     set_code: str
@@ -43,37 +54,32 @@ class CollectorRow:
     first_edition: bool
     image_id: Optional[int] = None
     variant_id: Optional[str] = None
-    entries: List[CollectionEntry] = field(default_factory=list)
+    entries: Sequence[CollectionEntry] = ()  # the owned copies behind this row; shared empty tuple when unowned
 
 def build_consolidated_vms(api_cards: List[ApiCard], owned_details: Dict[int, CollectionCard]) -> List[CardViewModel]:
     vms = []
     for card in api_cards:
         c_card = owned_details.get(card.id)
         qty = c_card.total_quantity if c_card else 0
-        owned_langs = set()
-        owned_conds = set()
+        owned_langs = owned_conds = frozenset()
         if c_card:
+            owned_langs = set()
+            owned_conds = set()
             for v in c_card.variants:
                 for e in v.entries:
                     owned_langs.add(e.language)
                     owned_conds.add(e.condition)
 
-        lowest = 0.0
-        prices = []
-        if card.card_prices:
-            p = card.card_prices[0]
-            for val in [p.cardmarket_price, p.tcgplayer_price, p.coolstuffinc_price]:
-                 if val:
-                     try:
-                         prices.append(float(val))
-                     except:
-                         pass
-        if prices:
-            lowest = min(prices)
-
-        vms.append(CardViewModel(card, qty, qty > 0, lowest, owned_langs, owned_conds))
+        vms.append(CardViewModel(card, qty, qty > 0, card.lowest_price, owned_langs, owned_conds))
     return vms
 
+def group_entries_by_copy(entries: List[CollectionEntry]) -> Dict[tuple, List[CollectionEntry]]:
+    """Groups a variant's entries by (language, condition, first_edition), one list per collector row."""
+    groups = {}
+    for entry in entries:
+        groups.setdefault((entry.language, entry.condition, entry.first_edition), []).append(entry)
+    return groups
+
 def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, CollectionCard], language: str) -> List[CollectorRow]:
     rows = []
 
@@ -108,7 +114,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
                 # Exact variant ID match? (Ideally yes, if API variant ID matches)
                 # Or fuzzy match on normalized code + rarity
 
-                # Note: normalize_set_code is cheap
+                # Note: normalize_set_code is memoized
                 var_norm = normalize_set_code(var.set_code)
                 if var_norm == norm_code and var.rarity == rarity:
                      matched_owned.append(var)
@@ -117,10 +123,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
             if matched_owned:
                 # Create rows for owned variants
                 for cv in matched_owned:
-                    groups = {}
-                    for entry in cv.entries:
-                        k = (entry.language, entry.condition, entry.first_edition)
-                        groups[k] = groups.get(k, 0) + entry.quantity
+                    groups = group_entries_by_copy(cv.entries)
 
                     # Resolve image
                     row_img_url = img_url
@@ -139,13 +142,9 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
                             break
 
                     set_name = best_api_set.set_name
-                    price = 0.0
-                    if best_api_set.set_price:
-                        try: price = float(best_api_set.set_price)
-                        except: pass
+                    price = best_api_set.price
 
-                    for (lang, cond, first), qty in groups.items():
-                        group_entries = [e for e in cv.entries if e.language == lang and e.condition == cond and e.first_edition == first]
+                    for (lang, cond, first), group_entries in groups.items():
                         rows.append(CollectorRow(
                             api_card=card,
                             set_code=cv.set_code,
@@ -153,7 +152,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
                             rarity=rarity,
                             price=price,
                             image_url=row_img_url,
-                            owned_count=qty,
+                            owned_count=sum(e.quantity for e in group_entries),
                             is_owned=True,
                             language=lang,
                             condition=cond,
@@ -193,10 +192,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
 
                 set_name = representative.set_name
                 set_code = representative.set_code
-                price = 0.0
-                if representative.set_price:
-                    try: price = float(representative.set_price)
-                    except: pass
+                price = representative.price
 
                 row_img_url = img_url
                 if representative.image_id:
@@ -237,10 +233,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
         # 3. Handle Custom/Unknown Variants
         for var_id, cv in owned_variants.items():
             if var_id not in processed_variant_ids:
-                groups = {}
-                for entry in cv.entries:
-                    k = (entry.language, entry.condition, entry.first_edition)
-                    groups[k] = groups.get(k, 0) + entry.quantity
+                groups = group_entries_by_copy(cv.entries)
 
                 row_img_url = img_url
                 if cv.image_id:
@@ -249,8 +242,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
                              row_img_url = img.image_url_small
                              break
 
-                for (lang, cond, first), qty in groups.items():
-                     group_entries = [e for e in cv.entries if e.language == lang and e.condition == cond and e.first_edition == first]
+                for (lang, cond, first), group_entries in groups.items():
                      rows.append(CollectorRow(
                         api_card=card,
                         set_code=cv.set_code,
@@ -258,7 +250,7 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
                         rarity=cv.rarity,
                         price=0.0,
                         image_url=row_img_url,
-                        owned_count=qty,
+                        owned_count=sum(e.quantity for e in group_entries),
                         is_owned=True,
                         language=lang,
                         condition=cond,
@@ -288,14 +280,250 @@ def build_collector_rows(api_cards: List[ApiCard], owned_details: Dict[int, Coll
 
     return rows
 
+def unowned_row_count(card: ApiCard) -> int:
+    """How many rows build_collector_rows makes for a card with no owned copies: one per printing group."""
+    if not card.card_sets:
+        return 1
+    return len({(normalize_set_code(s.set_code), s.set_rarity) for s in card.card_sets})
+
+class LazyCollectorRows(Sequence):
+    """
+    The collector rows of an ordered list of cards, expanded only where they are read.
+    Row positions follow from the per-card row counts, so len() is known up front and
+    reading a page only expands the cards on it.
+    """
+
+    def __init__(self, cards: List[ApiCard], counts: np.ndarray, expand: Callable[[ApiCard], List[CollectorRow]]):
+        self.cards = cards
+        self.counts = counts
+        self._ends = np.cumsum(counts)
+        self._expand = expand
+
+    def __len__(self) -> int:
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            items = []
+            k = int(np.searchsorted(self._ends, start, side='right'))
+            while start < stop and k < len(self.cards):
+                rows = self._expand(self.cards[k])
+                offset = start - (int(self._ends[k]) - len(rows))
+                taken = rows[offset:offset + stop - start]
+                items.extend(taken)
+                start += len(taken)
+                k += 1
+            return items
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        k = int(np.searchsorted(self._ends, index, side='right'))
+        rows = self._expand(self.cards[k])
+        return rows[index - (int(self._ends[k]) - len(rows))]
+
+    def card_ids(self) -> np.ndarray:
+        ids = np.fromiter((c.id for c in self.cards), dtype=np.int64, count=len(self.cards))
+        return np.repeat(ids, self.counts)
+
+def _printing_key(card_id: int, variant_id: Optional[str], set_code: str, rarity: str) -> tuple:
+    # Rows without a variant id are matched by set code and rarity
+    return (card_id, variant_id) if variant_id else (card_id, set_code, rarity)
+
+class CollectorRowIndex:
+    """
+    Keyed access to a card's collector rows for in-place updates: per printing (variant),
+    the rows by (language, condition, first edition). Rows are added and removed in O(1);
+    a removed row is swapped with the last one, so the list keeps no holes.
+    """
+
+    def __init__(self, rows: List[CollectorRow]):
+        self.rows = rows
+        self._positions: Dict[int, int] = {}
+        self._printings: Dict[tuple, Dict[tuple, CollectorRow]] = {}
+        for i, row in enumerate(rows):
+            self._positions[id(row)] = i
+            self._link(row)
+
+    def printing(self, card_id: int, variant_id: Optional[str], set_code: str, rarity: str) -> List[CollectorRow]:
+        """The rows of a printing, matched by variant id or (for rows without one) set code and rarity."""
+        rows = list(self._printings.get(_printing_key(card_id, variant_id, set_code, rarity), {}).values())
+        if variant_id:
+            rows.extend(self._printings.get((card_id, set_code, rarity), {}).values())
+        return rows
+
+    def append(self, row: CollectorRow):
+        self._positions[id(row)] = len(self.rows)
+        self.rows.append(row)
+        self._link(row)
+
+    def remove(self, row: CollectorRow):
+        self._unlink(row)
+        pos = self._positions.pop(id(row))
+        last = self.rows.pop()
+        if last is not row:
+            self.rows[pos] = last
+            self._positions[id(last)] = pos
+
+    def update(self, row: CollectorRow, **fields):
+        """Changes a row's fields in place, re-keying it if its printing or copy changed."""
+        self._unlink(row)
+        for name, value in fields.items():
+            setattr(row, name, value)
+        self._link(row)
+
+    def _link(self, row: CollectorRow):
+        group = self._printings.setdefault(_printing_key(row.api_card.id, row.variant_id, row.set_code, row.rarity), {})
+        # The first row of a copy wins, as in a front-to-back scan
+        group.setdefault((row.language, row.condition, row.first_edition), row)
+
+    def _unlink(self, row: CollectorRow):
+        key = _printing_key(row.api_card.id, row.variant_id, row.set_code, row.rarity)
+        group = self._printings.get(key)
+        if group is None:
+            return
+        copy_key = (row.language, row.condition, row.first_edition)
+        if group.get(copy_key) is row:
+            del group[copy_key]
+            if not group:
+                del self._printings[key]
+
+class ConsolidatedCell(GridCell):
+    """Grid cell of the consolidated view."""
+
+    def __init__(self, page: 'CollectionPage'):
+        super().__init__()
+        self.page = page
+
+    def build(self):
+        with ui.card() as root:
+            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
+                self.atlas = ui.element('div').classes('w-full h-full')
+                self.image = ui.image('').classes('w-full h-full object-cover')
+                self.quantity = ui.label().classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
+                self.level = ui.label().classes('absolute bottom-1 right-1 bg-black/70 text-white text-[10px] px-1 rounded')
+
+            with ui.column().classes('p-2 gap-0 w-full'):
+                self.name = ui.label().classes('text-xs font-bold truncate w-full')
+                self.type = ui.label().classes('text-[10px] text-gray-400 truncate w-full')
+        attach_card_tooltip(lambda: (self.item.api_card, None) if self.item else None, element=root)
+        return root
+
+    def bind(self, vm: CardViewModel):
+        card = vm.api_card
+        opacity = "opacity-100" if vm.is_owned else "opacity-60 grayscale"
+        border = "border-accent" if vm.is_owned else "border-gray-700"
+        self.set_classes(self.root, f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform')
+
+        img_id = card.get_best_image_id()
+        atlas_style = image_manager.get_atlas_style(self.page.page_atlas, img_id)
+        img_src = None if atlas_style else image_manager.get_card_image_url(img_id, 'grid', card.card_images[0].image_url_small if card.card_images else None)
+        self.atlas.visible = bool(atlas_style)
+        if atlas_style: self.set_style(self.atlas, atlas_style)
+        self.image.visible = bool(img_src)
+        if img_src: self.image.source = img_src
+
+        self.quantity.text = f"{vm.owned_quantity}"
+        self.quantity.visible = vm.owned_quantity > 0
+        self.level.text = f"Lv {card.level}" if card.level else ""
+        self.level.visible = bool(card.level)
+
+        self.name.text = card.name
+        self.type.text = card.type
+
+class CollectorCell(GridCell):
+    """Grid cell of the collectors view (one printing per cell)."""
+
+    COND_MAP = {'Mint': 'MT', 'Near Mint': 'NM', 'Played': 'PL', 'Damaged': 'DM'}
+
+    def __init__(self, page: 'CollectionPage'):
+        super().__init__()
+        self.page = page
+
+    def build(self):
+        with ui.card() as root:
+            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
+                self.image = ui.image('').classes('w-full h-full object-cover')
+                self.flag = ui.element('img').classes('absolute top-[1px] left-[1px] h-4 w-6 shadow-black drop-shadow-md rounded bg-black/30')
+                self.language = ui.label().classes('absolute top-[1px] left-[1px] text-xs font-bold shadow-black drop-shadow-md bg-black/30 rounded px-1')
+                self.quantity = ui.label().classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
+
+                with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
+                    self.condition = ui.label().classes('font-bold text-yellow-500')
+                    self.edition = ui.label().classes('font-bold text-orange-400')
+
+                self.set_code = ui.label().classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
+
+            with ui.column().classes('p-2 gap-0 w-full'):
+                self.name = ui.label().classes('text-xs font-bold truncate w-full')
+                self.rarity = ui.label().classes('text-[10px] text-gray-400')
+                self.price = ui.label().classes('text-xs text-green-400')
+        attach_card_tooltip(lambda: (self.item.api_card, self.item.image_id) if self.item else None, element=root)
+        return root
+
+    def bind(self, item: CollectorRow):
+        opacity = "opacity-100" if item.is_owned else "opacity-60 grayscale"
+        border = "border-accent" if item.is_owned else "border-gray-700"
+        self.set_classes(self.root, f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform')
+
+        img_id = item.image_id if item.image_id else (item.api_card.card_images[0].id if item.api_card.card_images else item.api_card.id)
+        img_src = image_manager.get_card_image_url(img_id, 'grid', item.image_url)
+        self.image.visible = bool(img_src)
+        if img_src: self.image.source = img_src
+
+        lang_code = item.language.strip().upper()
+        country_code = LANGUAGE_COUNTRY_MAP.get(lang_code)
+        flag_url = image_manager.get_flag_image_url(country_code) if country_code else None
+        self.flag.visible = bool(flag_url)
+        if flag_url and self.changed('flag', flag_url):
+            self.flag.props(f'src="{flag_url}" alt="{lang_code}"')
+        self.language.text = lang_code
+        self.language.visible = not flag_url
+
+        self.quantity.text = f"{item.owned_count}"
+        self.quantity.visible = item.is_owned
+
+        self.condition.text = self.COND_MAP.get(item.condition, item.condition[:2].upper())
+        self.edition.text = "1st" if item.first_edition else ""
+        self.edition.visible = item.first_edition
+        self.set_code.text = item.set_code
+
+        self.name.text = item.api_card.name
+        self.rarity.text = f"{item.rarity}"
+        self.price.text = f"${item.price:.2f}"
+
 class CollectionPage:
     def __init__(self):
+        # Tags this page's image downloads in the shared scheduler
+        self.download_group = f"collection:{id(self)}"
+        self.prefetch_group = f"collection-prefetch:{id(self)}"
+        self.filter_runner = FilterRunner(self.apply_filters, 'collection')
+        # Sprite atlas of the current grid page (atlas mode only)
+        self.page_atlas = None
+        # Pooled card grids per view scope, built once by content_area
+        self.grids: Dict[str, VirtualGrid] = {}
+        # Keyed view-model stores for in-place updates, rebuilt when the lists are replaced
+        self._vm_index: Dict[int, CardViewModel] = {}
+        self._vm_index_source: Optional[List[CardViewModel]] = None
+        # Collectors view: rows per card, expanded on demand from the owned copies.
+        # _owned_details maps card id -> CollectionCard of the current collection, kept in step by _update_in_memory
+        self._owned_details: Dict[int, CollectionCard] = {}
+        self._card_rows: Dict[int, List[CollectorRow]] = {}
+        self._row_counts: Dict[int, int] = {}
+        # View models changed in place since the last render (see _update_in_memory)
+        self._changed_items: Optional[List[object]] = None
+        # Set by _update_in_memory when collector rows were added or removed (or may have been)
+        self._rows_regrouped = False
+
         # Load persisted UI state
         saved_state = persistence.load_ui_state()
 
         self.state = {
             'cards_consolidated': [],
-            'cards_collectors': [],
             'filtered_items': [],
             'current_collection': None,
             'selected_file': None,
@@ -325,7 +553,7 @@ class CollectionPage:
             'filter_ownership_min': 0,
             'filter_ownership_max': 100,
             'filter_price_min': 0.0,
-            'filter_price_max': 1000.0,
+            'filter_price_max': PRICE_FILTER_MAX,
 
             'filter_owned_lang': '',
             'filter_storage': [],
@@ -349,6 +577,7 @@ class CollectionPage:
         else:
             self.state['selected_file'] = files[0] if files else None
         self.filter_pane: Optional[FilterPane] = None
+        self.facets: Optional[FacetCatalog] = None
         self.single_card_view = SingleCardView()
 
         # UI Element references for pagination updates
@@ -393,30 +622,8 @@ class CollectionPage:
             ui.notify(f"Error loading database: {e}", type='negative')
             return
 
-        sets = set()
-        m_races = set()
-        st_races = set()
-        archetypes = set()
-
-        for c in api_cards:
-            if c.card_sets:
-                for s in c.card_sets:
-                    parts = s.set_code.split('-')
-                    prefix = parts[0] if len(parts) > 0 else s.set_code
-                    sets.add(f"{s.set_name} | {prefix}")
-
-            if c.archetype:
-                archetypes.add(c.archetype)
-
-            if "Monster" in c.type:
-                m_races.add(c.race)
-            elif "Spell" in c.type or "Trap" in c.type:
-                if c.race: st_races.add(c.race)
-
-        self.state['available_sets'] = sorted(list(sets))
-        self.state['available_monster_races'] = sorted(list(m_races))
-        self.state['available_st_races'] = sorted(list(st_races))
-        self.state['available_archetypes'] = sorted(list(archetypes))
+        self.facets = facet_catalog.get(api_cards)
+        self.state.update(self.facets.options())
 
         collection = None
         if self.state['selected_file']:
@@ -444,9 +651,10 @@ class CollectionPage:
 
         self.state['cards_consolidated'] = await run.io_bound(build_consolidated_vms, api_cards, owned_details)
 
-        self.state['cards_collectors'] = []
-        if self.state['view_scope'] == 'collectors':
-             self.state['cards_collectors'] = await run.io_bound(build_collector_rows, api_cards, owned_details, self.state['language'])
+        # Collector rows are only expanded for the cards a result actually reads
+        self._owned_details = owned_details
+        self._card_rows = {}
+        self._row_counts = {}
 
         await self.apply_filters(reset_page=not keep_page)
         self.update_filter_ui()
@@ -476,7 +684,7 @@ class CollectionPage:
             'filter_ownership_min': 0,
             'filter_ownership_max': self.state['max_owned_quantity'],
             'filter_price_min': 0.0,
-            'filter_price_max': 1000.0,
+            'filter_price_max': PRICE_FILTER_MAX,
             'filter_owned_lang': '',
             'filter_storage': [],
             'only_owned': False
@@ -485,13 +693,12 @@ class CollectionPage:
         if self.filter_pane:
             self.filter_pane.reset_ui_elements()
 
-        await self.apply_filters()
+        await self.filter_runner.run()
 
-    async def prepare_current_page_images(self):
-        start = (self.state['page'] - 1) * self.state['page_size']
+    def _get_page_image_urls(self, page: int) -> Dict[int, str]:
+        start = (page - 1) * self.state['page_size']
         end = min(start + self.state['page_size'], len(self.state['filtered_items']))
         items = self.state['filtered_items'][start:end]
-        if not items: return
 
         url_map = {}
         for item in items:
@@ -524,9 +731,30 @@ class CollectionPage:
                          img_obj = next((img for img in card.card_images if img.id == best_id), None)
                          if img_obj:
                              url_map[best_id] = img_obj.image_url_small
+        return url_map
 
+    def prefetch_adjacent_pages(self):
+        """Queues images of the next and previous page at low priority so paging does not wait on downloads."""
+        url_map = {}
+        for page in (self.state['page'] + 1, self.state['page'] - 1):
+            if 1 <= page <= self.state['total_pages']:
+                url_map.update(self._get_page_image_urls(page))
         if url_map:
-             await image_manager.download_batch(url_map, concurrency=10)
+            download_scheduler.submit(url_map, DownloadPriority.PREFETCH, group=self.prefetch_group)
+
+    async def prepare_current_page_images(self):
+        start = (self.state['page'] - 1) * self.state['page_size']
+        items = self.state['filtered_items'][start:start + self.state['page_size']]
+        if not items: return
+
+        batch = download_scheduler.submit(self._get_page_image_urls(self.state['page']), DownloadPriority.VISIBLE, group=self.download_group)
+        # Neighbours download in the background while (and after) the visible page completes
+        self.prefetch_adjacent_pages()
+        await batch.wait()
+
+        self.page_atlas = None
+        if config_manager.get_atlas_mode() and self.state['view_scope'] == 'consolidated' and self.state['view_mode'] == 'grid':
+            self.page_atlas = await image_manager.get_atlas([item.api_card.get_best_image_id() for item in items], 'grid')
 
         if self.state['view_scope'] == 'collectors':
              unique_codes = set()
@@ -540,214 +768,159 @@ class CollectionPage:
                  await asyncio.gather(*tasks)
 
     async def apply_filters(self, e=None, reset_page=True):
-        if self.state['view_scope'] == 'consolidated':
-            source = self.state['cards_consolidated']
-        else:
-            source = self.state['cards_collectors']
+        # Prefetched neighbours of the old result are no longer useful
+        download_scheduler.cancel(self.prefetch_group)
 
-        if not source:
+        if not self.state['cards_consolidated']:
             self.state['filtered_items'] = []
             if hasattr(self, 'render_card_display'): self.render_card_display.refresh()
             self.update_pagination_labels()
             return
 
-        res = list(source)
-
-        txt = self.state['search_text'].lower()
-        if txt:
-            def matches_search(item):
-                # 1. Check common fields
-                if (txt in item.api_card.name.lower() or
-                    txt in item.api_card.type.lower() or
-                    txt in item.api_card.desc.lower()):
-                    return True
-
-                # 2. Check Set Code
-                if self.state['view_scope'] == 'consolidated':
-                    # In consolidated view, check if ANY of the card's sets match
-                    if item.api_card.card_sets:
-                        for s in item.api_card.card_sets:
-                            if txt in s.set_code.lower():
-                                return True
-                else:
-                    # In collectors view, check the SPECIFIC set code of this row
-                    if hasattr(item, 'set_code') and txt in item.set_code.lower():
-                        return True
+        is_cons = self.state['view_scope'] == 'consolidated'
+        if is_cons:
+            result = self._build_query(is_cons).run(self.state['cards_consolidated'])
+            items, card_ids = result.items, result.card_ids
+        else:
+            cards = self._collector_cards()
+            if self._collectors_need_rows():
+                rows = [row for card in cards for row in self._rows_for(card)]
+                result = self._build_query(is_cons).run(rows)
+                items, card_ids = result.items, result.card_ids
+            else:
+                # The cards already are in row order: only the rows that are read get expanded
+                counts = np.fromiter((self._row_count(c) for c in cards), dtype=np.int64, count=len(cards))
+                items = LazyCollectorRows(cards, counts, self._rows_for)
+                card_ids = items.card_ids
+
+        self.state['filtered_items'] = items
+        if self.filter_pane and self.facets:
+            self.filter_pane.update_counts(self.facets.counts(card_ids(), sets=is_cons))
+        if reset_page:
+            self.state['page'] = 1
+        self.update_pagination()
 
-                return False
+        await self.prepare_current_page_images()
+        if hasattr(self, 'render_card_display'): self.render_card_display.refresh()
+        self.update_pagination_labels()
 
-            res = [c for c in res if matches_search(c)]
+    def _collector_cards(self) -> List[ApiCard]:
+        """
+        Card-level pass of the collectors view over the consolidated view models: the cards
+        that can have matching rows, ordered like their rows when sorting by a card field.
+        Owned cards pass the printing filters unchecked, as their copies may be of custom
+        printings the database does not list.
+        """
+        state = self.state
+        query = Query()
+        query.search(state['search_text'], ALL_GROUPS)
+        query.card_filters(state)
+
+        conds = state.get('filter_condition')
+        if (state['only_owned'] or state.get('filter_storage') or state['filter_ownership_min'] > 0
+                or (conds and 'Near Mint' not in conds)):
+            # Cards without copies only have unowned Near Mint rows
+            query.equals('is_owned', True, 0.1)
+        if state['filter_set']:
+            printed = Query().printings(state['filter_set'], lambda c: card_printings(c.api_card)).compile()
+            query.where(lambda c: c.is_owned or printed(c), COST_SETS, 0.05, key=('collector_set', state['filter_set']))
+        if state['filter_rarity']:
+            rarity = Query().rarity(state['filter_rarity'], lambda c: card_rarities(c.api_card)).compile()
+            query.where(lambda c: c.is_owned or rarity(c), COST_SETS, 0.2, key=('collector_rarity', state['filter_rarity']))
+
+        if state['sort_by'] in CARD_SORTS:
+            query.sort(state['sort_by'], state.get('sort_descending', False))
+        return [vm.api_card for vm in query.run(state['cards_consolidated']).items]
+
+    def _collectors_need_rows(self) -> bool:
+        """Whether the collectors result depends on row fields, so every candidate card's rows are needed."""
+        state = self.state
+        return bool((state['search_text'] or '').strip() or state['only_owned'] or state['filter_owned_lang']
+                    or state.get('filter_condition') or state['filter_set'] or state['filter_rarity']
+                    or state.get('filter_storage')
+                    or state['filter_ownership_min'] > 0 or state['filter_ownership_max'] < state['max_owned_quantity']
+                    or self._price_filtered() or state['sort_by'] not in CARD_SORTS)
+
+    def _edit_changes_result(self) -> bool:
+        """
+        Whether the last in-place update can change the filtered and sorted result: the active
+        filters or sort read the owned copies, or (collectors view) rows were added or removed.
+        Otherwise the result's rows were updated in place and keep their positions.
+        """
+        state = self.state
+        if state['view_scope'] != 'consolidated' and self._rows_regrouped:
+            return True
+        return bool(state['only_owned'] or state['filter_owned_lang'] or state.get('filter_condition')
+                    or state.get('filter_storage')
+                    or state['filter_ownership_min'] > 0 or state['filter_ownership_max'] < state['max_owned_quantity']
+                    or state['sort_by'] == 'Quantity')
+
+    def _price_filtered(self) -> bool:
+        # The slider's full range filters nothing, prices above its top included
+        return self.state['filter_price_min'] > 0 or self.state['filter_price_max'] < PRICE_FILTER_MAX
+
+    def _build_query(self, is_cons: bool) -> Query:
+        query = Query()
+
+        if is_cons:
+            query.search(self.state['search_text'])
+        else:
+            query.search(self.state['search_text'], CARD_GROUPS, printings=('set_code',))
 
         if self.state['only_owned']:
-            res = [c for c in res if c.is_owned]
-
-        min_q = self.state['filter_ownership_min']
-        max_q = self.state['filter_ownership_max']
+            query.equals('is_owned', True, 0.1)
 
         def get_qty(item):
             if hasattr(item, 'owned_quantity'): return item.owned_quantity
             return getattr(item, 'owned_count', 0)
 
-        res = [c for c in res if min_q <= get_qty(c) <= max_q]
-
-        p_min = self.state['filter_price_min']
-        p_max = self.state['filter_price_max']
-
         def get_price(item):
              if hasattr(item, 'lowest_price'): return item.lowest_price
              return getattr(item, 'price', 0.0)
 
-        res = [c for c in res if p_min <= get_price(c) <= p_max]
-
-        if self.state['filter_owned_lang']:
-            target_lang = self.state['filter_owned_lang']
-            if self.state['view_scope'] == 'consolidated':
-                res = [c for c in res if target_lang in c.owned_languages]
-            else:
-                 res = [c for c in res if c.language == target_lang]
-
-        if self.state.get('filter_condition'):
-            conds = self.state['filter_condition']
-            if self.state['view_scope'] == 'consolidated':
-                res = [c for c in res if any(cond in c.owned_conditions for cond in conds)]
-            else:
-                res = [c for c in res if c.condition in conds]
+        query.value_range('owned_quantity' if is_cons else 'owned_count',
+                          self.state['filter_ownership_min'], self.state['filter_ownership_max'])
+        if self._price_filtered():
+            query.value_range('lowest_price' if is_cons else 'price',
+                              self.state['filter_price_min'], self.state['filter_price_max'], selectivity=0.9,
+                              column='price' if is_cons else None)
+
+        target_lang = self.state['filter_owned_lang']
+        conds = self.state.get('filter_condition')
+        if is_cons:
+            if target_lang:
+                query.where(lambda c: target_lang in c.owned_languages, COST_EQUALS, 0.5,
+                            key=('owned_language', target_lang))
+            if conds:
+                query.where(lambda c: any(cond in c.owned_conditions for cond in conds), COST_CONTAINS, 0.6,
+                            key=('owned_condition', frozenset(conds)))
+            query.printings(self.state['filter_set'], lambda c: card_printings(c.api_card))
+            query.rarity(self.state['filter_rarity'], lambda c: card_rarities(c.api_card))
+        else:
+            query.equals('language', target_lang, 0.5)
+            query.one_of('condition', conds, 0.6)
+            query.printings(self.state['filter_set'], lambda c: ((c.set_code, c.set_name),))
+            query.rarity(self.state['filter_rarity'], lambda c: (c.rarity,))
 
-        if self.state.get('filter_storage'):
-            selected_storage = set(self.state['filter_storage'])
+            if self.state.get('filter_storage'):
+                selected_storage = set(self.state['filter_storage'])
 
-            new_res = []
-            for item in res:
-                if self.state['view_scope'] == 'collectors':
+                def in_storage(item):
+                    # Only the copies kept in the selected storages count
                     visible_qty = 0
                     for e in item.entries:
                         loc = e.storage_location if e.storage_location else 'None'
                         if loc in selected_storage:
                             visible_qty += e.quantity
+                    return replace(item, owned_count=visible_qty) if visible_qty > 0 else None
+                query.transform(in_storage, key=('storage', frozenset(selected_storage)))
 
-                    if visible_qty > 0:
-                        new_item = replace(item, owned_count=visible_qty)
-                        new_res.append(new_item)
-                else:
-                    new_res.append(item)
-
-            if self.state['view_scope'] == 'collectors':
-                res = new_res
-
-        if self.state['filter_attr']:
-            res = [c for c in res if c.api_card.attribute == self.state['filter_attr']]
-
-        if self.state['filter_card_type']:
-             ctypes = self.state['filter_card_type']
-             if isinstance(ctypes, str): ctypes = [ctypes]
-             res = [c for c in res if any(t in c.api_card.type for t in ctypes)]
-
-        if self.state['filter_monster_race']:
-             res = [c for c in res if "Monster" in c.api_card.type and c.api_card.race == self.state['filter_monster_race']]
-
-        if self.state['filter_st_race']:
-             res = [c for c in res if ("Spell" in c.api_card.type or "Trap" in c.api_card.type) and c.api_card.race == self.state['filter_st_race']]
-
-        if self.state['filter_archetype']:
-             res = [c for c in res if c.api_card.archetype == self.state['filter_archetype']]
-
-        if self.state['filter_monster_category']:
-             categories = self.state['filter_monster_category']
-             if isinstance(categories, list) and categories:
-                 res = [c for c in res if all(c.api_card.matches_category(cat) for cat in categories)]
-
-        if self.state['filter_level']:
-             res = [c for c in res if c.api_card.level == int(self.state['filter_level'])]
-
-        atk_min, atk_max = self.state['filter_atk_min'], self.state['filter_atk_max']
-        if atk_min > 0 or atk_max < 5000:
-             res = [c for c in res if c.api_card.atk is not None and atk_min <= int(c.api_card.atk) <= atk_max]
-
-        def_min, def_max = self.state['filter_def_min'], self.state['filter_def_max']
-        if def_min > 0 or def_max < 5000:
-             res = [c for c in res if getattr(c.api_card, 'def_', None) is not None and def_min <= getattr(c.api_card, 'def_', -1) <= def_max]
-
-        if self.state['filter_set']:
-            s_val = self.state['filter_set']
-            is_strict = '|' in s_val
-
-            if is_strict:
-                target_prefix = s_val.split('|')[-1].strip().lower()
-
-                if self.state['view_scope'] == 'consolidated':
-                    def match_set_strict(c):
-                        if not c.api_card.card_sets: return False
-                        for cs in c.api_card.card_sets:
-                             parts = cs.set_code.split('-')
-                             c_prefix = parts[0].lower() if parts else cs.set_code.lower()
-                             if c_prefix == target_prefix:
-                                 return True
-                        return False
-                    res = [c for c in res if match_set_strict(c)]
-                else:
-                    def match_row_strict(c):
-                        parts = c.set_code.split('-')
-                        c_prefix = parts[0].lower() if parts else c.set_code.lower()
-                        return c_prefix == target_prefix
-
-                    res = [c for c in res if match_row_strict(c)]
-
-            else:
-                txt = s_val.strip().lower()
-                if self.state['view_scope'] == 'consolidated':
-                    def match_set_loose(c):
-                        if not c.api_card.card_sets: return False
-                        for cs in c.api_card.card_sets:
-                            if txt in cs.set_code.lower() or txt in cs.set_name.lower():
-                                return True
-                        return False
-                    res = [c for c in res if match_set_loose(c)]
-                else:
-                    res = [c for c in res if txt in c.set_code.lower() or txt in c.set_name.lower()]
-
-        if self.state['filter_rarity']:
-            r = self.state['filter_rarity'].lower()
-            if self.state['view_scope'] == 'consolidated':
-                 res = [c for c in res if c.api_card.card_sets and any(r == cs.set_rarity.lower() for cs in c.api_card.card_sets)]
-            else:
-                 res = [c for c in res if r == c.rarity.lower()]
-
-        key = self.state['sort_by']
-        reverse = self.state.get('sort_descending', False)
-
-        if key == 'Name':
-            res.sort(key=lambda x: x.api_card.name, reverse=reverse)
-        elif key == 'ATK':
-            res.sort(key=lambda x: (x.api_card.atk or -1), reverse=reverse)
-        elif key == 'DEF':
-            res.sort(key=lambda x: (getattr(x.api_card, 'def_', None) or -1), reverse=reverse)
-        elif key == 'Level':
-            res.sort(key=lambda x: (x.api_card.level or -1), reverse=reverse)
-        elif key == 'Newest':
-            res.sort(key=lambda x: x.api_card.id, reverse=reverse)
-        elif key == 'Price':
-             res.sort(key=lambda x: get_price(x), reverse=reverse)
-        elif key == 'Quantity':
-             res.sort(key=lambda x: get_qty(x), reverse=reverse)
-        elif key == 'Set Code':
-            if self.state['view_scope'] == 'consolidated':
-                # Sort by the first set code found
-                def get_set_code(x):
-                    if x.api_card.card_sets:
-                         return x.api_card.card_sets[0].set_code
-                    return ""
-                res.sort(key=get_set_code, reverse=reverse)
-            else:
-                res.sort(key=lambda x: x.set_code, reverse=reverse)
-
-        self.state['filtered_items'] = res
-        if reset_page:
-            self.state['page'] = 1
-        self.update_pagination()
+        query.card_filters(self.state)
 
-        await self.prepare_current_page_images()
-        if hasattr(self, 'render_card_display'): self.render_card_display.refresh()
-        self.update_pagination_labels()
+        set_code = (lambda x: first_set_code(x.api_card)) if is_cons else 'set_code'
+        query.sort(self.state['sort_by'], self.state.get('sort_descending', False),
+                   price=get_price, quantity=get_qty, set_code=set_code, price_column='Price' if is_cons else None)
+        return query
 
     def update_pagination(self):
         count = len(self.state['filtered_items'])
@@ -762,202 +935,146 @@ class CollectionPage:
         if self.pagination_total_label:
             self.pagination_total_label.text = f"/ {max(1, self.state['total_pages'])}"
 
-    def _update_in_memory(self, api_card: ApiCard, set_code: str, rarity: str, language: str, quantity: int, condition: str, first_edition: bool, image_id: Optional[int], variant_id: Optional[str], mode: str = 'ADD'):
+    def _consolidated_index(self) -> Dict[int, CardViewModel]:
+        vms = self.state['cards_consolidated']
+        if self._vm_index_source is not vms:
+            self._vm_index = {vm.api_card.id: vm for vm in vms}
+            self._vm_index_source = vms
+        return self._vm_index
+
+    def _rows_for(self, card: ApiCard) -> List[CollectorRow]:
+        """The collector rows of one card, expanded on first use."""
+        rows = self._card_rows.get(card.id)
+        if rows is None:
+            rows = self._card_rows[card.id] = build_collector_rows([card], self._owned_details, self.state['language'])
+        return rows
+
+    def _row_count(self, card: ApiCard) -> int:
+        rows = self._card_rows.get(card.id)
+        if rows is not None:
+            return len(rows)
+        if card.id in self._owned_details:
+            return len(self._rows_for(card))
+        count = self._row_counts.get(card.id)
+        if count is None:
+            count = self._row_counts[card.id] = unowned_row_count(card)
+        return count
+
+    def _update_in_memory(self, api_card: ApiCard, set_code: str, rarity: str, language: str, quantity: int, condition: str, first_edition: bool, image_id: Optional[int], variant_id: Optional[str], mode: str = 'ADD') -> List[object]:
         """
         Updates the in-memory view models (consolidated and collectors) to reflect changes immediately
-        without reloading from disk.
+        without reloading from disk. Returns the view models that changed in place.
         """
-        # 1. Update Consolidated View
-        vm_index = -1
-        for i, vm in enumerate(self.state['cards_consolidated']):
-             if vm.api_card.id == api_card.id:
-                 vm_index = i
-                 break
-
-        if vm_index != -1:
-            # We found the VM. Since the collection object is updated, we can re-scan it for this card.
+        persistence.mark_collections_changed()
+        changed = []
+
+        c_card = self._owned_details.get(api_card.id)
+        collection = self.state['current_collection']
+        if c_card is None and collection and collection.cards and collection.cards[-1].card_id == api_card.id:
+            # The first copy of a card: CollectionEditor appended its entry
+            c_card = collection.cards[-1]
+        if c_card is not None and not c_card.variants:
+            # The last copy is gone: CollectionEditor dropped the entry
             c_card = None
-            if self.state['current_collection']:
-                 for c in self.state['current_collection'].cards:
-                     if c.card_id == api_card.id:
-                         c_card = c
-                         break
 
+        # 1. Update Consolidated View
+        vm = self._consolidated_index().get(api_card.id)
+        if vm:
+            owned_langs = owned_conds = frozenset()
             if c_card:
-                total_qty = c_card.total_quantity
                 owned_langs = set()
                 owned_conds = set()
                 for v in c_card.variants:
                     for e in v.entries:
                         owned_langs.add(e.language)
                         owned_conds.add(e.condition)
-
-                vm = self.state['cards_consolidated'][vm_index]
-                vm.owned_quantity = total_qty
-                vm.is_owned = total_qty > 0
-                vm.owned_languages = owned_langs
-                vm.owned_conditions = owned_conds
-            else:
-                vm = self.state['cards_consolidated'][vm_index]
-                vm.owned_quantity = 0
-                vm.is_owned = False
-                vm.owned_languages = set()
-                vm.owned_conditions = set()
+            vm.owned_quantity = c_card.total_quantity if c_card else 0
+            vm.is_owned = vm.owned_quantity > 0
+            vm.owned_languages = owned_langs
+            vm.owned_conditions = owned_conds
+            changed.append(vm)
 
         # 2. Update Collectors View
-        if not variant_id:
-             if self.state['current_collection']:
-                 for c in self.state['current_collection'].cards:
-                     if c.card_id == api_card.id:
-                         for v in c.variants:
-                             if v.set_code == set_code and v.rarity == rarity and (v.image_id == image_id if image_id else True):
-                                 variant_id = v.variant_id
-                                 break
-                         if variant_id: break
+        if c_card:
+            self._owned_details[api_card.id] = c_card
+        else:
+            self._owned_details.pop(api_card.id, None)
+        rows = self._card_rows.get(api_card.id)
+        if rows is None:
+            # Not expanded yet: the rows will be built from the updated copies when read,
+            # so the row count a lazy result holds for the card may be stale
+            self._rows_regrouped = True
+            return changed
+
+        if not variant_id and c_card:
+            for v in c_card.variants:
+                if v.set_code == set_code and v.rarity == rarity and (v.image_id == image_id if image_id else True):
+                    variant_id = v.variant_id
+                    break
 
         if not variant_id:
-             variant_id = generate_variant_id(api_card.id, set_code, rarity, image_id)
-
-        target_row_index = -1
-        empty_placeholder_index = -1
-
-        for i, row in enumerate(self.state['cards_collectors']):
-            if row.api_card.id != api_card.id:
-                continue
-
-            match_variant = False
-            if row.variant_id and variant_id:
-                if row.variant_id == variant_id:
-                    match_variant = True
-            elif row.set_code == set_code and row.rarity == rarity:
-                 match_variant = True
-
-            if match_variant:
-                if (row.language == language and
-                    row.condition == condition and
-                    row.first_edition == first_edition):
-                    target_row_index = i
-                    break
+            variant_id = generate_variant_id(api_card.id, set_code, rarity, image_id)
 
-                if not row.is_owned:
-                    empty_placeholder_index = i
-
-        new_qty = 0
-        if self.state['current_collection']:
-             qty = CollectionEditor.get_total_quantity(
-                 self.state['current_collection'],
-                 api_card.id,
-                 variant_id=variant_id,
-                 language=language,
-                 condition=condition,
-                 first_edition=first_edition
-             )
-             new_qty = qty
+        index = CollectorRowIndex(rows)
+        target = None
+        empty_placeholder = None
+        for row in index.printing(api_card.id, variant_id, set_code, rarity):
+            if row.language == language and row.condition == condition and row.first_edition == first_edition:
+                target = row
+            elif not row.is_owned:
+                empty_placeholder = row
 
         # Refresh entries from collection to support storage filtering
         row_entries = []
-        if self.state['current_collection']:
-             for c in self.state['current_collection'].cards:
-                 if c.card_id == api_card.id:
-                     for v in c.variants:
-                         if v.variant_id == variant_id:
-                             row_entries = [e for e in v.entries
-                                            if e.language == language
-                                            and e.condition == condition
-                                            and e.first_edition == first_edition]
-                             break
-                     break
-
-        if target_row_index != -1:
-            row = self.state['cards_collectors'][target_row_index]
-            row.owned_count = new_qty
-            row.is_owned = new_qty > 0
-            row.entries = row_entries
-        else:
+        if c_card:
+            variant = next((v for v in c_card.variants if v.variant_id == variant_id), None)
+            if variant:
+                row_entries = [e for e in variant.entries
+                               if e.language == language
+                               and e.condition == condition
+                               and e.first_edition == first_edition]
+        new_qty = sum(e.quantity for e in row_entries)
+
+        api_set = next((s for s in api_card.card_sets or [] if s.set_code == set_code), None)
+        set_name = api_set.set_name if api_set else "Unknown Set"
+        price = api_set.price if api_set else 0.0
+        default_img_url = api_card.card_images[0].image_url_small if api_card.card_images else None
+
+        if target:
             if new_qty > 0:
-                set_name = "Unknown Set"
-                price = 0.0
-                if api_card.card_sets:
-                    for s in api_card.card_sets:
-                        if s.set_code == set_code:
-                            set_name = s.set_name
-                            try: price = float(s.set_price)
-                            except: pass
-                            break
-
-                img_url = api_card.card_images[0].image_url_small if api_card.card_images else None
-                if image_id and api_card.card_images:
-                    for img in api_card.card_images:
-                        if img.id == image_id:
-                            img_url = img.image_url_small
-                            break
-
-                new_row = CollectorRow(
-                    api_card=api_card,
-                    set_code=set_code,
-                    set_name=set_name,
-                    rarity=rarity,
-                    price=price,
-                    image_url=img_url,
-                    owned_count=new_qty,
-                    is_owned=True,
-                    language=language,
-                    condition=condition,
-                    first_edition=first_edition,
-                    image_id=image_id,
-                    variant_id=variant_id,
-                    entries=row_entries
-                )
-                self.state['cards_collectors'].append(new_row)
-
-        if new_qty > 0 and empty_placeholder_index != -1:
-             self.state['cards_collectors'].pop(empty_placeholder_index)
-
-        if new_qty == 0 and target_row_index != -1:
-             self.state['cards_collectors'].pop(target_row_index)
-
-             has_siblings = False
-             for row in self.state['cards_collectors']:
-                 if row.api_card.id == api_card.id and row.variant_id == variant_id:
-                     has_siblings = True
-                     break
-
-             if not has_siblings:
-                 is_standard = False
-                 if api_card.card_sets:
-                     for s in api_card.card_sets:
-                         if s.set_code == set_code:
-                             is_standard = True
-                             break
+                index.update(target, owned_count=new_qty, is_owned=True, entries=row_entries)
+                changed.append(target)
+                if empty_placeholder:
+                    index.remove(empty_placeholder)
+                    self._rows_regrouped = True
+            elif not any(r is not target and r.variant_id == variant_id for r in index.printing(api_card.id, variant_id, set_code, rarity)) \
+                    and api_set:
+                # The last copy of a standard printing: the row turns back into its placeholder
+                index.update(target, set_code=set_code, set_name=set_name, rarity=rarity, price=price,
+                             image_url=default_img_url, owned_count=0, is_owned=False, language="EN",
+                             condition="Near Mint", first_edition=False, image_id=image_id,
+                             variant_id=variant_id, entries=())
+                changed.append(target)
+            else:
+                index.remove(target)
+                self._rows_regrouped = True
+        elif new_qty > 0:
+            img_url = default_img_url
+            if image_id and api_card.card_images:
+                img_url = next((img.image_url_small for img in api_card.card_images if img.id == image_id), img_url)
+
+            fields = dict(set_code=set_code, set_name=set_name, rarity=rarity, price=price, image_url=img_url,
+                          owned_count=new_qty, is_owned=True, language=language, condition=condition,
+                          first_edition=first_edition, image_id=image_id, variant_id=variant_id, entries=row_entries)
+            if empty_placeholder:
+                # The first copy of a printing takes over its placeholder row
+                index.update(empty_placeholder, **fields)
+                changed.append(empty_placeholder)
+            else:
+                index.append(CollectorRow(api_card=api_card, **fields))
+                self._rows_regrouped = True
 
-                 if is_standard:
-                     set_name = "Unknown Set"
-                     price = 0.0
-                     if api_card.card_sets:
-                        for s in api_card.card_sets:
-                            if s.set_code == set_code:
-                                set_name = s.set_name
-                                try: price = float(s.set_price)
-                                except: pass
-                                break
-                     img_url = api_card.card_images[0].image_url_small if api_card.card_images else None
-
-                     ph_row = CollectorRow(
-                        api_card=api_card,
-                        set_code=set_code,
-                        set_name=set_name,
-                        rarity=rarity,
-                        price=price,
-                        image_url=img_url,
-                        owned_count=0,
-                        is_owned=False,
-                        language="EN",
-                        condition="Near Mint",
-                        first_edition=False,
-                        image_id=image_id,
-                        variant_id=variant_id
-                     )
-                     self.state['cards_collectors'].append(ph_row)
+        return changed
 
     async def undo_last_action(self):
         col_name = self.state['selected_file']
@@ -1037,6 +1154,8 @@ class CollectionPage:
 
         try:
             modified = False
+            changed = []
+            self._rows_regrouped = False
 
             if mode == 'MOVE':
                 src_var_id = kwargs.get('source_variant_id')
@@ -1053,7 +1172,7 @@ class CollectionPage:
                         language=src_lang, quantity=-src_qty, condition=src_cond, first_edition=src_first,
                         variant_id=src_var_id, mode='ADD'
                     )
-                    self._update_in_memory(api_card, "", "", src_lang, -src_qty, src_cond, src_first, None, src_var_id, mode='ADD')
+                    changed += self._update_in_memory(api_card, "", "", src_lang, -src_qty, src_cond, src_first, None, src_var_id, mode='ADD')
 
                     # 2. Add to Target
                     # Ensure target variant exists
@@ -1073,7 +1192,7 @@ class CollectionPage:
                         storage_location=storage_location
                     )
                     # Note: _update_in_memory does not currently track storage location, but that's fine for totals.
-                    self._update_in_memory(api_card, set_code, rarity, language, src_qty, condition, first_edition, image_id, variant_id, mode='ADD')
+                    changed += self._update_in_memory(api_card, set_code, rarity, language, src_qty, condition, first_edition, image_id, variant_id, mode='ADD')
 
                     modified = True
 
@@ -1115,7 +1234,7 @@ class CollectionPage:
                 )
 
                 if modified:
-                    self._update_in_memory(api_card, set_code, rarity, language, quantity, condition, first_edition, image_id, variant_id, mode)
+                    changed += self._update_in_memory(api_card, set_code, rarity, language, quantity, condition, first_edition, image_id, variant_id, mode)
 
                 if modified and not skip_log:
                     card_data = {
@@ -1133,7 +1252,13 @@ class CollectionPage:
                     changelog_manager.log_change(self.state['selected_file'], mode, card_data, quantity)
 
             if modified:
-                await self.apply_filters(reset_page=False)
+                self._changed_items = changed
+                if self._edit_changes_result():
+                    await self.apply_filters(reset_page=False)
+                else:
+                    # Same rows in the same order: only the updated cells are re-bound
+                    await self.prepare_current_page_images()
+                    self.render_card_display.refresh()
                 self._schedule_save()
                 ui.notify('Collection updated.', type='positive')
                 self.render_header.refresh()
@@ -1152,17 +1277,15 @@ class CollectionPage:
         if self.state['view_scope'] == 'consolidated':
             owned_breakdown = {}
             total_owned = 0
-            if self.state['current_collection']:
-                 for c in self.state['current_collection'].cards:
-                     if c.card_id == card.id:
-                         for v in c.variants:
-                             qty = v.total_quantity
-                             if qty > 0:
-                                 # Format: "SetCode (Rarity)"
-                                 key = f"{v.set_code} ({v.rarity})"
-                                 owned_breakdown[key] = owned_breakdown.get(key, 0) + qty
-                                 total_owned += qty
-                         break
+            c = self._owned_details.get(card.id)
+            if c:
+                 for v in c.variants:
+                     qty = v.total_quantity
+                     if qty > 0:
+                         # Format: "SetCode (Rarity)"
+                         key = f"{v.set_code} ({v.rarity})"
+                         owned_breakdown[key] = owned_breakdown.get(key, 0) + qty
+                         total_owned += qty
 
             # Sort breakdown by key (Set Code)
             sorted_breakdown = dict(sorted(owned_breakdown.items()))
@@ -1176,98 +1299,6 @@ class CollectionPage:
 
         # Fallback removed
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-
-        # Determine target ID
-        if specific_image_id:
-            img_id = specific_image_id
-        else:
-            img_id = card.get_best_image_id()
-
-        high_res_url = None
-        low_res_url = None
-
-        # Try to find URL for this ID
-        if card.card_images:
-            target_img = next((img for img in card.card_images if img.id == img_id), None)
-            if target_img:
-                high_res_url = target_img.image_url
-                low_res_url = target_img.image_url_small
-            else:
-                 # Fallback to default if specific/best ID has no URL (e.g. custom) but we need a fallback for non-local
-                 high_res_url = card.card_images[0].image_url
-                 low_res_url = card.card_images[0].image_url_small
-
-        # Check local high-res existence immediately
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        if not initial_src:
-             return
-
-        # Create tooltip with transparent background and no padding
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none') \
-                         .props('style="max-width: none" delay=1050') as tooltip:
-            # Image at 65vh height and 1000px min width for readability
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl') \
-                                     .props('fit=contain')
-
-            # Trigger download on show if needed
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    # Check again to avoid redundant downloads
-                    # Only download if we are not using a fallback URL for a custom ID
-
-                    real_target_id = img_id
-
-                    # Check if img_id corresponds to the URL
-                    is_exact_match = False
-                    if card.card_images:
-                        for img in card.card_images:
-                            if img.id == img_id:
-                                is_exact_match = True
-                                break
-
-                    if not is_exact_match and card.card_images:
-                        # We are using fallback. Download to default ID instead.
-                        real_target_id = card.card_images[0].id
-
-                    if not image_manager.image_exists(real_target_id, high_res=True):
-                         await image_manager.ensure_image(real_target_id, high_res_url, high_res=True)
-
-                tooltip.on('show', ensure_high)
-
-    # --- Renderers ---
-
-    def render_consolidated_grid(self, items: List[CardViewModel]):
-        with ui.grid(columns='repeat(auto-fill, minmax(160px, 1fr))').classes('w-full gap-4'):
-            for vm in items:
-                card = vm.api_card
-                opacity = "opacity-100" if vm.is_owned else "opacity-60 grayscale"
-                border = "border-accent" if vm.is_owned else "border-gray-700"
-
-                with ui.card().classes(f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform') \
-                        .on('click', lambda c=vm: self.open_single_view(c.api_card, c.is_owned, c.owned_quantity, owned_languages=c.owned_languages)):
-
-                    img_id = card.get_best_image_id()
-                    img_src = f"/images/{img_id}.jpg" if image_manager.image_exists(img_id) else (card.card_images[0].image_url_small if card.card_images else None)
-
-                    with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
-                        if img_src: ui.image(img_src).classes('w-full h-full object-cover')
-                        if vm.owned_quantity > 0:
-                            ui.label(f"{vm.owned_quantity}").classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
-
-                        if card.level:
-                             ui.label(f"Lv {card.level}").classes('absolute bottom-1 right-1 bg-black/70 text-white text-[10px] px-1 rounded')
-
-                    with ui.column().classes('p-2 gap-0 w-full'):
-                        ui.label(card.name).classes('text-xs font-bold truncate w-full')
-                        ui.label(card.type).classes('text-[10px] text-gray-400 truncate w-full')
-
-                    self._setup_card_tooltip(card)
-
     def render_consolidated_list(self, items: List[CardViewModel]):
          headers = ['Image', 'Name', 'Type', 'Card Type', 'Owned']
          cols = '60px 4fr 2fr 2fr 1fr'
@@ -1279,12 +1310,12 @@ class CollectionPage:
                 card = vm.api_card
                 bg = 'bg-gray-900' if not vm.is_owned else 'bg-gray-800 border border-accent'
                 img_id = card.get_best_image_id()
-                img_src = f"/images/{img_id}.jpg" if image_manager.image_exists(img_id) else (card.card_images[0].image_url_small if card.card_images else None)
+                img_src = image_manager.get_card_image_url(img_id, 'list', card.card_images[0].image_url_small if card.card_images else None)
 
                 with ui.grid(columns=cols).classes(f'w-full {bg} p-1 items-center rounded hover:bg-gray-700 transition cursor-pointer') \
                         .on('click', lambda c=vm: self.open_single_view(c.api_card, c.is_owned, c.owned_quantity, owned_languages=c.owned_languages)):
                     with ui.image(img_src).classes('h-10 w-8 object-cover'):
-                         self._setup_card_tooltip(card)
+                         attach_card_tooltip(card)
                     with ui.column().classes('gap-0'):
                         ui.label(card.name).classes('truncate text-sm font-bold')
                         if card.level:
@@ -1311,15 +1342,13 @@ class CollectionPage:
             for item in items:
                 bg = 'bg-gray-900' if not item.is_owned else 'bg-gray-800 border border-accent'
 
-                img_src = item.image_url
                 img_id = item.image_id if item.image_id else (item.api_card.card_images[0].id if item.api_card.card_images else item.api_card.id)
-                if image_manager.image_exists(img_id):
-                    img_src = f"/images/{img_id}.jpg"
+                img_src = image_manager.get_card_image_url(img_id, 'list', item.image_url)
 
                 with ui.grid(columns=cols).classes(f'w-full {bg} p-1 items-center rounded hover:bg-gray-700 transition cursor-pointer') \
                         .on('click', lambda c=item: self.open_single_view(c.api_card, c.is_owned, c.owned_count, initial_set=c.set_code, rarity=c.rarity, set_name=c.set_name, language=c.language, condition=c.condition, first_edition=c.first_edition, image_url=c.image_url, image_id=c.image_id, set_price=c.price, variant_id=c.variant_id)):
                     with ui.image(img_src).classes('h-10 w-8 object-cover'):
-                         self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                         attach_card_tooltip(item.api_card, specific_image_id=item.image_id)
                     ui.label(item.api_card.name).classes('truncate text-sm font-bold')
                     with ui.column().classes('gap-0'):
                         ui.label(item.set_code).classes('text-xs font-mono font-bold text-yellow-500')
@@ -1345,57 +1374,11 @@ class CollectionPage:
                          else:
                               ui.label('-').classes('text-gray-600')
 
-    def render_collectors_grid(self, items: List[CollectorRow]):
-        cond_map = {'Mint': 'MT', 'Near Mint': 'NM', 'Played': 'PL', 'Damaged': 'DM'}
-
-        with ui.grid(columns='repeat(auto-fill, minmax(160px, 1fr))').classes('w-full gap-4'):
-            for item in items:
-                opacity = "opacity-100" if item.is_owned else "opacity-60 grayscale"
-                border = "border-accent" if item.is_owned else "border-gray-700"
-
-                img_src = item.image_url
-                img_id = item.image_id if item.image_id else (item.api_card.card_images[0].id if item.api_card.card_images else item.api_card.id)
-                if image_manager.image_exists(img_id):
-                    img_src = f"/images/{img_id}.jpg"
-
-                with ui.card().classes(f'collection-card w-full p-0 cursor-pointer {opacity} border {border} hover:scale-105 transition-transform') \
-                        .on('click', lambda c=item: self.open_single_view(c.api_card, c.is_owned, c.owned_count, initial_set=c.set_code, rarity=c.rarity, set_name=c.set_name, language=c.language, condition=c.condition, first_edition=c.first_edition, image_url=c.image_url, image_id=c.image_id, set_price=c.price, variant_id=c.variant_id)):
-
-                    with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
-                        if img_src: ui.image(img_src).classes('w-full h-full object-cover')
-
-                        lang_code = item.language.strip().upper()
-                        country_code = LANGUAGE_COUNTRY_MAP.get(lang_code)
-                        flag_url = image_manager.get_flag_image_url(country_code) if country_code else None
-                        if flag_url:
-                            ui.element('img').props(f'src="{flag_url}" alt="{lang_code}"').classes('absolute top-[1px] left-[1px] h-4 w-6 shadow-black drop-shadow-md rounded bg-black/30')
-                        else:
-                            ui.label(lang_code).classes('absolute top-[1px] left-[1px] text-xs font-bold shadow-black drop-shadow-md bg-black/30 rounded px-1')
-
-                        if item.is_owned:
-                             ui.label(f"{item.owned_count}").classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
-
-                        cond_short = cond_map.get(item.condition, item.condition[:2].upper())
-                        ed_text = "1st" if item.first_edition else ""
-
-                        with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
-                            ui.label(cond_short).classes('font-bold text-yellow-500')
-                            if ed_text:
-                                ui.label(ed_text).classes('font-bold text-orange-400')
-
-                        ui.label(item.set_code).classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
-
-                    with ui.column().classes('p-2 gap-0 w-full'):
-                        ui.label(item.api_card.name).classes('text-xs font-bold truncate w-full')
-                        ui.label(f"{item.rarity}").classes('text-[10px] text-gray-400')
-                        ui.label(f"${item.price:.2f}").classes('text-xs text-green-400')
-
-                    self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
-
     async def switch_scope(self, scope):
         self.state['view_scope'] = scope
         persistence.save_ui_state({'collection_view_scope': scope})
-        await self.load_data()
+        # Both scopes read the loaded view models; collector rows are expanded as needed
+        await self.filter_runner.run()
         self.render_header.refresh()
 
     def switch_view_mode(self, mode):
@@ -1484,7 +1467,7 @@ class CollectionPage:
                 if self.state['search_text'] == e.value:
                     return
                 self.state['search_text'] = e.value
-                await self.apply_filters()
+                await self.filter_runner.run()
 
             with ui.input(placeholder='Search...', on_change=on_search) \
                 .props('debounce=300 icon=search').classes('w-64') as i:
@@ -1504,7 +1487,7 @@ class CollectionPage:
                     'collection_sort_descending': self.state['sort_descending']
                 })
                 self.render_header.refresh()
-                await self.apply_filters()
+                await self.filter_runner.run()
 
             with ui.row().classes('items-center gap-1'):
                 with ui.select(['Name', 'ATK', 'DEF', 'Level', 'Newest', 'Price', 'Quantity', 'Set Code'], value=self.state['sort_by'], label='Sort',
@@ -1515,7 +1498,7 @@ class CollectionPage:
                     self.state['sort_descending'] = not self.state['sort_descending']
                     persistence.save_ui_state({'collection_sort_descending': self.state['sort_descending']})
                     self.render_header.refresh()
-                    await self.apply_filters()
+                    await self.filter_runner.run()
 
                 icon = 'arrow_downward' if self.state.get('sort_descending') else 'arrow_upward'
                 with ui.button(icon=icon, on_click=toggle_sort_dir).props('flat round dense color=white'):
@@ -1524,7 +1507,7 @@ class CollectionPage:
             async def on_owned_switch(e):
                 self.state['only_owned'] = e.value
                 persistence.save_ui_state({'collection_only_owned': e.value})
-                await self.apply_filters()
+                await self.filter_runner.run()
 
             with ui.row().classes('items-center'):
                 with ui.switch('Owned', on_change=on_owned_switch).bind_value(self.state, 'only_owned'):
@@ -1573,21 +1556,24 @@ class CollectionPage:
         start = (self.state['page'] - 1) * self.state['page_size']
         end = min(start + self.state['page_size'], len(self.state['filtered_items']))
         page_items = self.state['filtered_items'][start:end]
+        # After an in-place update, an unchanged window only re-binds the updated cells
+        changed, self._changed_items = self._changed_items, None
+
+        # Grid views re-bind their pooled cells instead of being rebuilt
+        grid = self.grids.get(self.state['view_scope']) if self.state['view_mode'] == 'grid' else None
+        for g in self.grids.values():
+            g.scroll.visible = g is grid and bool(page_items)
 
         if not page_items:
             ui.label('No items found.').classes('w-full text-center text-xl text-grey italic q-mt-xl')
             return
 
-        if self.state['view_scope'] == 'consolidated':
-            if self.state['view_mode'] == 'grid':
-                self.render_consolidated_grid(page_items)
-            else:
-                self.render_consolidated_list(page_items)
+        if grid:
+            grid.set_items(page_items, changed=changed)
+        elif self.state['view_scope'] == 'consolidated':
+            self.render_consolidated_list(page_items)
         else:
-            if self.state['view_mode'] == 'grid':
-                self.render_collectors_grid(page_items)
-            else:
-                self.render_collectors_list(page_items)
+            self.render_collectors_list(page_items)
 
     def content_area(self):
         # Pagination controls - static
@@ -1627,6 +1613,15 @@ class CollectionPage:
                 with ui.button(icon='chevron_right', on_click=lambda: change_page(1)).props('flat dense'):
                     ui.tooltip('Go to next page')
 
+        self.grids = {
+            'consolidated': VirtualGrid(lambda: ConsolidatedCell(self), on_click=lambda c: self.open_single_view(
+                c.api_card, c.is_owned, c.owned_quantity, owned_languages=c.owned_languages)).build(),
+            'collectors': VirtualGrid(lambda: CollectorCell(self), on_click=lambda c: self.open_single_view(
+                c.api_card, c.is_owned, c.owned_count, initial_set=c.set_code, rarity=c.rarity, set_name=c.set_name,
+                language=c.language, condition=c.condition, first_edition=c.first_edition, image_url=c.image_url,
+                image_id=c.image_id, set_price=c.price, variant_id=c.variant_id)).build(),
+        }
+
         # Render the refreshable card display
         self.render_card_display()
 
@@ -1637,7 +1632,7 @@ class CollectionPage:
         self.filter_dialog = ui.dialog().props('position=right')
         with self.filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.filter_pane = FilterPane(self.state, self.apply_filters, self.reset_filters)
+                 self.filter_pane = FilterPane(self.state, self.filter_runner, self.reset_filters)
                  self.filter_pane.build()
 
         self.render_header()
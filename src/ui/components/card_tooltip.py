@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple, Union
+
+from nicegui import ui, Client
+
+from src.services.ygo_api import ygo_service, ApiCard
+from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
+
+logger = logging.getLogger(__name__)
+
+TOOLTIP_DELAY_MS = 1050   # hover time before the tooltip opens
+HIGH_RES_DEBOUNCE = 0.3   # seconds a tooltip must stay open before its high-res image is fetched
+PAYLOAD_CACHE_SIZE = 1024
+
+# A card, or a callable returning (card, specific image id) at hover time (for pooled grid cells)
+TooltipSource = Union[ApiCard, Callable[[], Optional[Tuple[ApiCard, Optional[int]]]]]
+
+@dataclass(frozen=True)
+class TooltipPayload:
+    image_id: int              # the artwork shown
+    download_id: int           # the id its high-res file is stored under
+    high_res_url: Optional[str]
+    fallback_url: Optional[str]
+
+_payloads: 'OrderedDict[Tuple[int, Optional[int]], Tuple[Any, Optional[TooltipPayload]]]' = OrderedDict()
+
+def tooltip_payload(card: ApiCard, specific_image_id: Optional[int] = None) -> Optional[TooltipPayload]:
+    """Which image a card's tooltip shows and where to fetch it, cached per database version."""
+    key = (card.id, specific_image_id)
+    version = ygo_service.db_version
+    entry = _payloads.get(key)
+    if entry is not None and entry[0] == version:
+        _payloads.move_to_end(key)
+        return entry[1]
+
+    img_id = specific_image_id or card.get_best_image_id()
+    target = next((img for img in card.card_images if img.id == img_id), None) if card.card_images else None
+    if target:
+        payload = TooltipPayload(img_id, img_id, target.image_url, target.image_url_small)
+    elif card.card_images:
+        # No URL for this id (e.g. a custom artwork): fall back to the default image
+        first = card.card_images[0]
+        payload = TooltipPayload(img_id, first.id, first.image_url, first.image_url_small)
+    else:
+        payload = None
+
+    _payloads[key] = (version, payload)
+    while len(_payloads) > PAYLOAD_CACHE_SIZE:
+        _payloads.popitem(last=False)
+    return payload
+
+class CardTooltip:
+    """
+    The single floating high-res card preview of a client. Card elements only carry two
+    event listeners; the preview element is shared and filled in when a hover lasts
+    long enough, on the side of the screen away from the pointer.
+    """
+
+    def __init__(self, client: Client):
+        with client.content:
+            self.panel = ui.element('div').classes('fixed top-1/2 -translate-y-1/2 z-[9999] pointer-events-none')
+            with self.panel:
+                self.image = ui.image('').classes('h-[65vh] w-[45vh] object-contain rounded-lg shadow-2xl') \
+                                         .props('fit=contain')
+        self.panel.visible = False
+        self.current: Optional[Tuple[int, Optional[int]]] = None
+        self._fetch_task: Optional[asyncio.Task] = None  # high-res fetch of the current card
+
+    def show(self, card: ApiCard, specific_image_id: Optional[int], pointer_x: float, viewport_width: float):
+        payload = tooltip_payload(card, specific_image_id)
+        if payload is None:
+            return
+        src = image_manager.get_card_image_url(payload.image_id, 'tooltip', payload.high_res_url or payload.fallback_url)
+        if not src:
+            return
+
+        key = (card.id, specific_image_id)
+        if key != self.current:
+            self._cancel_fetch()
+        self.current = key
+        self.image.source = src
+        side = 'right' if pointer_x < viewport_width / 2 else 'left'
+        self.panel.style(replace=f'{side}: 2rem')
+        self.panel.visible = True
+
+        if payload.high_res_url and not image_manager.image_exists(payload.download_id, high_res=True) \
+                and (self._fetch_task is None or self._fetch_task.done()):
+            self._fetch_task = asyncio.create_task(self._fetch_high_res(payload))
+
+    def hide(self):
+        self._cancel_fetch()
+        self.current = None
+        self.panel.visible = False
+
+    def _cancel_fetch(self):
+        if self._fetch_task is not None:
+            self._fetch_task.cancel()
+            self._fetch_task = None
+
+    async def _fetch_high_res(self, payload: TooltipPayload):
+        # Only tooltips that stay open fetch; sweeping the pointer across a grid cancels the task during the sleep
+        await asyncio.sleep(HIGH_RES_DEBOUNCE)
+        try:
+            await download_scheduler.download({payload.download_id: payload.high_res_url}, DownloadPriority.TOOLTIP, high_res=True)
+        except Exception as e:
+            logger.warning(f"Tooltip image {payload.download_id} failed: {e}")
+            return
+        self.image.source = image_manager.get_card_image_url(payload.image_id, 'tooltip', payload.high_res_url)
+
+_tooltips: 'weakref.WeakKeyDictionary[Client, CardTooltip]' = weakref.WeakKeyDictionary()
+
+def _client_tooltip(client: Client) -> CardTooltip:
+    tooltip = _tooltips.get(client)
+    if tooltip is None:
+        tooltip = _tooltips[client] = CardTooltip(client)
+    return tooltip
+
+def attach_card_tooltip(source: TooltipSource, specific_image_id: Optional[int] = None,
+                        element: Optional[ui.element] = None, delay_ms: int = TOOLTIP_DELAY_MS):
+    """
+    Shows the shared card preview while the pointer rests on element (by default the
+    element currently being built into). The hover delay runs in the browser; the
+    server only hears about hovers that last delay_ms.
+    """
+    if source is None:
+        return
+    if element is None:
+        element = ui.context.slot.parent
+
+    def resolve() -> Optional[Tuple[ApiCard, Optional[int]]]:
+        if callable(source):
+            return source()
+        return source, specific_image_id
+
+    def on_show(e):
+        resolved = resolve()
+        if resolved is None or resolved[0] is None:
+            return
+        pointer_x, viewport_width = e.args
+        _client_tooltip(element.client).show(resolved[0], resolved[1], pointer_x, viewport_width)
+
+    def on_hide(_):
+        tooltip = _tooltips.get(element.client)
+        if tooltip:
+            tooltip.hide()
+
+    element.on('mouseenter', on_show, js_handler=f'''(e) => {{
+        clearTimeout(window.cardTooltipTimer);
+        const x = e.clientX, w = window.innerWidth;
+        window.cardTooltipTimer = setTimeout(() => {{ window.cardTooltipShown = true; emit(x, w); }}, {delay_ms});
+    }}''')
+    hide_js = '''() => {
+        clearTimeout(window.cardTooltipTimer);
+        if (window.cardTooltipShown) { window.cardTooltipShown = false; emit(); }
+    }'''
+    element.on('mouseleave', on_hide, js_handler=hide_js)
+    element.on('mousedown', on_hide, js_handler=hide_js)
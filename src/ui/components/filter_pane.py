@@ -1,11 +1,14 @@
 from nicegui import ui
 from typing import Callable, Dict, Any, List
-from src.core.constants import CARD_CONDITIONS
+from src.core.constants import CARD_CONDITIONS, MONSTER_CATEGORIES
+from src.ui.components.filter_runner import FilterRunner
 
 class FilterPane:
     def __init__(self, state: Dict[str, Any], on_change: Callable, on_reset: Callable, show_set_selector: bool = True):
         self.state = state
-        self.on_change = on_change
+        # Every control evaluates through one runner, so rapid changes render once
+        self.runner = on_change if isinstance(on_change, FilterRunner) else FilterRunner(on_change)
+        self.on_change = self.runner.schedule
         self.on_reset = on_reset
         self.show_set_selector = show_set_selector
         self.filter_inputs = {}
@@ -64,8 +67,7 @@ class FilterPane:
             ).bind_value(self.state, 'filter_archetype').classes('w-full')
 
             # Monster Category
-            categories = ['Effect', 'Normal', 'Synchro', 'Xyz', 'Ritual', 'Fusion', 'Link', 'Pendulum', 'Toon', 'Spirit', 'Union', 'Gemini', 'Flip']
-            ui.select(categories, label='Monster Category', multiple=True, clearable=True,
+            ui.select(MONSTER_CATEGORIES, label='Monster Category', multiple=True, clearable=True,
                       on_change=self.on_change).bind_value(self.state, 'filter_monster_category').classes('w-full').props('use-chips')
 
             # Level
@@ -139,6 +141,8 @@ class FilterPane:
                 val = _get_event_val(e)
                 if isinstance(val, dict):
                     update_from_val(val)
+                    # Live results while dragging; the runner drops all but the latest
+                    await self.on_change()
 
             async def on_slider_change(e):
                 val = _get_event_val(e)
@@ -224,6 +228,21 @@ class FilterPane:
              max_inp.max = max_qty
              max_inp.update()
 
+    def update_counts(self, counts: Dict[str, Dict[str, int]]):
+        """Shows the matches per option of the current result, e.g. 'Legend of Blue Eyes White Dragon | LOB (126)'."""
+        selectors = (('set_selector', 'sets', 'available_sets'),
+                     ('m_race_selector', 'monster_races', 'available_monster_races'),
+                     ('st_race_selector', 'st_races', 'available_st_races'),
+                     ('archetype_selector', 'archetypes', 'available_archetypes'))
+        for attr, facet, key in selectors:
+            selector = getattr(self, attr, None)
+            if selector is None:
+                continue
+            values = self.state.get(key, [])
+            hits = counts.get(facet)
+            selector.options = {v: f"{v} ({hits.get(v, 0)})" for v in values} if hits is not None else values
+            selector.update()
+
     def reset_ui_elements(self):
         for key, components in self.filter_inputs.items():
             slider, min_inp, max_inp = components
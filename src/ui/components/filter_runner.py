@@ -0,0 +1,75 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from nicegui import slot as nicegui_slot
+
+logger = logging.getLogger(__name__)
+
+FILTER_DEBOUNCE = 0.15  # seconds of quiet before a scheduled evaluation starts
+
+class FilterRunner:
+    """
+    Runs a page's filter evaluation for the latest filter state only. Each request
+    supersedes the previous one: an evaluation still waiting out its debounce is dropped,
+    and one already running is cancelled at its next await, so a burst of slider or
+    select events renders once. Completed evaluations log their duration.
+    """
+
+    def __init__(self, apply: Callable[[], Awaitable[Any]], name: str = 'filters', delay: float = FILTER_DEBOUNCE):
+        self.apply = apply
+        self.name = name
+        self.delay = delay
+        self.last_ms: Optional[float] = None   # duration of the last completed evaluation
+        self.superseded = 0                    # running evaluations cancelled since the last completed one
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+    async def __call__(self, *_):
+        # Usable directly as an on_change handler
+        await self.schedule()
+
+    async def schedule(self, *_):
+        """Evaluates once the filter state has been left alone for the debounce delay."""
+        self._start(self.delay)
+
+    async def run(self, *_):
+        """Evaluates now; returns when done, or when a newer request superseded this one."""
+        await asyncio.wait({self._start(0)})
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            if self._running:
+                self.superseded += 1
+            self._task.cancel()
+        self._task = None
+        self._running = False
+
+    def _start(self, delay: float) -> asyncio.Task:
+        self.cancel()
+        # Keep building into the caller's slot (for notifications and refreshables)
+        stack = nicegui_slot.Slot.get_stack()
+        slot = stack[-1] if stack else None
+        self._task = asyncio.create_task(self._evaluate(delay, slot))
+        return self._task
+
+    async def _evaluate(self, delay: float, slot: Optional['nicegui_slot.Slot']):
+        if delay:
+            await asyncio.sleep(delay)
+        self._running = True
+        start = time.perf_counter()
+        try:
+            with slot if slot is not None else contextlib.nullcontext():
+                await self.apply()
+        except Exception as e:
+            logger.error(f"Error applying filters ({self.name}): {e}", exc_info=True)
+            return
+        finally:
+            if self._task is asyncio.current_task():
+                self._running = False
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Filters applied ({self.name}) in {self.last_ms:.1f} ms, {self.superseded} superseded")
+        self.superseded = 0
@@ -1172,17 +1172,9 @@ class SingleCardView:
 
                     # Save Files
                     try:
-                        # Ensure data dir exists
-                        # get_local_path returns full path including filename
-                        path_low = image_manager.get_local_path(new_id, high_res=False)
-                        os.makedirs(os.path.dirname(path_low), exist_ok=True)
-
-                        with open(path_low, 'wb') as f:
-                            f.write(new_art_state['low_res'])
-
-                        path_high = image_manager.get_local_path(new_id, high_res=True)
-                        with open(path_high, 'wb') as f:
-                            f.write(new_art_state['high_res'])
+                        # Writes both files and generates their thumbnails
+                        await image_manager.store_image(new_id, new_art_state['low_res'], high_res=False)
+                        await image_manager.store_image(new_id, new_art_state['high_res'], high_res=True)
 
                         # Success
                         ui.notify('New artwork saved!', type='positive')
@@ -0,0 +1,194 @@
+import math
+from abc import ABC, abstractmethod
+import logging
+import operator
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence
+
+from nicegui import ui
+
+logger = logging.getLogger(__name__)
+
+SCROLL_THROTTLE = 0.1  # seconds between scroll events sent to the server
+OVERSCAN_ROWS = 1      # rows kept bound above and below the viewport
+
+_UNSET = object()
+
+class GridCell(ABC):
+    """
+    One pooled cell of a VirtualGrid. build() creates the cell's elements once; bind()
+    points them at another item. Elements only send an update when a value actually
+    changes, so re-binding an unchanged cell costs nothing on the wire.
+    """
+
+    def __init__(self):
+        self.item: Any = None
+        self.root: Optional[ui.element] = None
+        self._values: Dict[Any, Any] = {}
+
+    @abstractmethod
+    def build(self) -> ui.element:
+        """Creates the cell's elements and returns its root."""
+
+    @abstractmethod
+    def bind(self, item: Any):
+        """Points the cell's elements at item."""
+
+    def show(self, item: Any, force: bool = False):
+        if item is self.item and not force:
+            return
+        self.item = item
+        self.root.visible = True
+        self.bind(item)
+
+    def clear(self):
+        self.item = None
+        self.root.visible = False
+
+    def changed(self, key: Any, value: Any) -> bool:
+        """True (and remembered) if value differs from the one last recorded under key."""
+        if self._values.get(key, _UNSET) == value:
+            return False
+        self._values[key] = value
+        return True
+
+    def set_classes(self, element: ui.element, classes: str):
+        """Swaps the classes last set this way for classes, keeping the element's defaults."""
+        key = (id(element), 'classes')
+        previous = self._values.get(key)
+        if self.changed(key, classes):
+            element.classes(remove=previous, add=classes)
+
+    def set_style(self, element: ui.element, style: str):
+        if self.changed((id(element), 'style'), style):
+            element.style(replace=style)
+
+class VirtualGrid:
+    """
+    A card grid that keeps a fixed pool of cells inside a scroll area. Only the rows in
+    (and just around) the viewport are bound to items; spacers above and below stand in
+    for the rest, and scrolling re-binds the pool to the new window from the server side.
+    Cells have a fixed size, so the window follows from the scroll position alone.
+    """
+
+    def __init__(self, make_cell: Callable[[], GridCell], cell_width: int = 160, cell_height: int = 320,
+                 gap: int = 16, height: str = '75vh', on_click: Optional[Callable[[Any], Any]] = None,
+                 overscan_rows: int = OVERSCAN_ROWS):
+        self.make_cell = make_cell
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.gap = gap
+        self.height = height
+        self.on_click = on_click
+        self.overscan_rows = overscan_rows
+
+        self.items: Sequence[Any] = []
+        self.pool: List[GridCell] = []
+        # Until the first scroll event reports the viewport size
+        self.columns = 6
+        self.visible_rows = 3
+        self.first_row = 0
+        self._spacers = (0, 0)
+
+    @property
+    def row_pitch(self) -> int:
+        return self.cell_height + self.gap
+
+    def build(self) -> 'VirtualGrid':
+        self.scroll = ui.scroll_area().classes('w-full').style(f'height: {self.height}')
+        self.scroll.on('scroll', self._on_scroll, args=['verticalPosition', 'verticalContainerSize',
+                                                        'horizontalContainerSize'], throttle=SCROLL_THROTTLE)
+        with self.scroll:
+            self.top = ui.element('div').style('height: 0px')
+            self.grid = ui.element('div').classes('w-full')
+            self.bottom = ui.element('div').style('height: 0px')
+        self._layout_grid()
+        return self
+
+    def set_items(self, items: Sequence[Any], reset_scroll: bool = True, changed: Optional[Collection[Any]] = None):
+        """
+        Shows a new item sequence. Every bound cell is re-bound, so items changed in place
+        show their new values; only the cells whose values differ send an update. Given the
+        items that changed in place, a window still showing the same items keeps its scroll
+        position and only re-binds their cells.
+        """
+        if changed is not None and self._same_window(items):
+            self.items = items
+            changed_ids = {id(item) for item in changed}
+            for cell in self.pool:
+                if cell.item is not None and id(cell.item) in changed_ids:
+                    cell.show(cell.item, force=True)
+            return
+
+        self.items = items
+        if reset_scroll and self.first_row:
+            self.first_row = 0
+            self.scroll.scroll_to(pixels=0)
+        self._render(force=True)
+
+    def window(self) -> range:
+        """Positions of the items currently bound to cells."""
+        start = self.first_row * self.columns
+        return range(start, min(len(self.items), start + self._window_rows() * self.columns))
+
+    def _same_window(self, items: Sequence[Any]) -> bool:
+        if len(items) != len(self.items):
+            return False
+        bound = [cell.item for cell in self.pool if cell.item is not None]
+        window = self.window()
+        return len(bound) == len(window) and all(map(operator.is_, bound, (items[i] for i in window)))
+
+    def _window_rows(self) -> int:
+        return self.visible_rows + 2 * self.overscan_rows
+
+    def _layout_grid(self):
+        self.grid.style(replace=f'display: grid; gap: {self.gap}px; justify-content: center; '
+                                f'grid-template-columns: repeat({self.columns}, {self.cell_width}px); '
+                                f'grid-auto-rows: {self.cell_height}px')
+
+    def _on_scroll(self, e):
+        args = e.args or {}
+        width = args.get('horizontalContainerSize') or 0
+        height = args.get('verticalContainerSize') or 0
+        columns = max(1, int((width + self.gap) // (self.cell_width + self.gap))) if width else self.columns
+        visible_rows = max(1, math.ceil(height / self.row_pitch) + 1) if height else self.visible_rows
+        first_row = max(0, int((args.get('verticalPosition') or 0) // self.row_pitch) - self.overscan_rows)
+
+        if (columns, visible_rows, first_row) == (self.columns, self.visible_rows, self.first_row):
+            return
+        if columns != self.columns:
+            self.columns = columns
+            self._layout_grid()
+        self.visible_rows = visible_rows
+        self.first_row = first_row
+        self._render()
+
+    def _grow_pool(self, size: int):
+        with self.grid:
+            while len(self.pool) < size:
+                cell = self.make_cell()
+                cell.root = cell.build()
+                cell.root.style(f'height: {self.cell_height}px')
+                cell.root.visible = False
+                if self.on_click:
+                    cell.root.on('click', lambda c=cell: self.on_click(c.item) if c.item is not None else None)
+                self.pool.append(cell)
+
+    def _render(self, force: bool = False):
+        rows_total = math.ceil(len(self.items) / self.columns)
+        window_rows = self._window_rows()
+        self.first_row = max(0, min(self.first_row, rows_total - window_rows))
+        self._grow_pool(window_rows * self.columns)
+
+        start = self.first_row * self.columns
+        for i, cell in enumerate(self.pool):
+            index = start + i
+            if i < window_rows * self.columns and index < len(self.items):
+                cell.show(self.items[index], force)
+            elif cell.item is not None:
+                cell.clear()
+
+        spacers = (self.first_row * self.row_pitch, max(0, rows_total - self.first_row - window_rows) * self.row_pitch)
+        if spacers != self._spacers:
+            self._spacers = spacers
+            self.top.style(replace=f'height: {spacers[0]}px')
+            self.bottom.style(replace=f'height: {spacers[1]}px')
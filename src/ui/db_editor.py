@@ -3,19 +3,24 @@ from src.core.persistence import persistence
 from src.core.models import ApiCard
 from src.services.ygo_api import ygo_service
 from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
+from src.services.query_engine import Query
+from src.services.search_index import CARD_GROUPS
 from src.core.config import config_manager
 from src.core.utils import generate_variant_id, normalize_set_code
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView, STANDARD_RARITIES
+from src.ui.components.card_tooltip import attach_card_tooltip
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Dict
 import logging
 import re
 import asyncio
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class DbEditorRow:
     api_card: ApiCard
     set_code: str
@@ -41,11 +46,6 @@ def build_db_rows(api_cards: List[ApiCard]) -> List[DbEditorRow]:
                              row_img_url = img.image_url_small
                              break
 
-                price = 0.0
-                if cset.set_price:
-                    try: price = float(cset.set_price)
-                    except: pass
-
                 rows.append(DbEditorRow(
                     api_card=card,
                     set_code=cset.set_code,
@@ -54,7 +54,7 @@ def build_db_rows(api_cards: List[ApiCard]) -> List[DbEditorRow]:
                     image_url=row_img_url,
                     image_id=cset.image_id or default_image_id,
                     variant_id=cset.variant_id,
-                    set_price=price
+                    set_price=cset.price
                 ))
         else:
              # Card with no sets
@@ -72,6 +72,11 @@ def build_db_rows(api_cards: List[ApiCard]) -> List[DbEditorRow]:
 
 class DbEditorPage:
     def __init__(self):
+        # Tags this page's image downloads in the shared scheduler
+        self.download_group = f"db_editor:{id(self)}"
+        self.prefetch_group = f"db_editor-prefetch:{id(self)}"
+        self.filter_runner = FilterRunner(self.apply_filters, 'db_editor')
+
         saved_state = persistence.load_ui_state()
         self.state = {
             'cards_rows': [],
@@ -188,6 +193,7 @@ class DbEditorPage:
         logger.info(f"Loading detail for set: {set_code}")
         cards = await ygo_service.get_set_cards(set_code, self.state['language'])
         self.state['set_detail_cards'] = cards
+        download_scheduler.cancel(self.prefetch_group)
 
         all_rows = await run.io_bound(build_db_rows, cards)
         prefix = set_code.split('-')[0]
@@ -223,10 +229,10 @@ class DbEditorPage:
             'filter_price_max': 1000.0,
         })
         if self.filter_pane: self.filter_pane.reset_ui_elements()
-        await self.apply_filters()
+        await self.filter_runner.run()
 
-    async def prepare_current_page_images(self):
-        start = (self.state['page'] - 1) * self.state['page_size']
+    def _get_page_image_urls(self, page: int) -> Dict[int, str]:
+        start = (page - 1) * self.state['page_size']
 
         if self.state['main_view'] == 'set_detail':
             all_items = self.state.get('set_detail_rows', [])
@@ -236,99 +242,44 @@ class DbEditorPage:
             all_items = self.state['filtered_items']
 
         end = min(start + self.state['page_size'], len(all_items))
-        items = all_items[start:end]
-        if not items: return
-        url_map = {item.image_id: item.image_url for item in items if item.image_id and item.image_url}
+        return {item.image_id: item.image_url for item in all_items[start:end] if item.image_id and item.image_url}
+
+    def prefetch_adjacent_pages(self):
+        """Queues images of the next and previous page at low priority so paging does not wait on downloads."""
+        url_map = {}
+        for page in (self.state['page'] + 1, self.state['page'] - 1):
+            if 1 <= page <= self.state['total_pages']:
+                url_map.update(self._get_page_image_urls(page))
         if url_map:
-             await image_manager.download_batch(url_map, concurrency=10)
+            download_scheduler.submit(url_map, DownloadPriority.PREFETCH, group=self.prefetch_group)
+
+    async def prepare_current_page_images(self):
+        url_map = self._get_page_image_urls(self.state['page'])
+        if not url_map: return
+
+        batch = download_scheduler.submit(url_map, DownloadPriority.VISIBLE, group=self.download_group)
+        # Neighbours download in the background while (and after) the visible page completes
+        self.prefetch_adjacent_pages()
+        await batch.wait()
 
     async def apply_filters(self):
-        res = list(self.state['cards_rows'])
-        txt = self.state['search_text'].lower()
-        if txt:
-            def matches(item):
-                if (txt in item.api_card.name.lower() or
-                    txt in item.api_card.type.lower() or
-                    txt in item.api_card.desc.lower() or
-                    txt in item.set_code.lower()):
-                    return True
-                return False
-            res = [c for c in res if matches(c)]
-
-        # Price Filter
-        p_min = self.state['filter_price_min']
-        p_max = self.state['filter_price_max']
-        res = [c for c in res if p_min <= c.set_price <= p_max]
-
-        if self.state['filter_attr']:
-            res = [c for c in res if c.api_card.attribute == self.state['filter_attr']]
-
-        if self.state['filter_card_type']:
-             ctypes = self.state['filter_card_type']
-             if isinstance(ctypes, str): ctypes = [ctypes]
-             res = [c for c in res if any(t in c.api_card.type for t in ctypes)]
-
-        if self.state['filter_monster_race']:
-             res = [c for c in res if "Monster" in c.api_card.type and c.api_card.race == self.state['filter_monster_race']]
-        if self.state['filter_st_race']:
-             res = [c for c in res if ("Spell" in c.api_card.type or "Trap" in c.api_card.type) and c.api_card.race == self.state['filter_st_race']]
-        if self.state['filter_archetype']:
-             res = [c for c in res if c.api_card.archetype == self.state['filter_archetype']]
-
-        if self.state['filter_monster_category']:
-             categories = self.state['filter_monster_category']
-             if isinstance(categories, list) and categories:
-                 res = [c for c in res if all(c.api_card.matches_category(cat) for cat in categories)]
-
-        if self.state['filter_level']:
-             res = [c for c in res if c.api_card.level == int(self.state['filter_level'])]
-
-        atk_min, atk_max = self.state['filter_atk_min'], self.state['filter_atk_max']
-        if atk_min > 0 or atk_max < 5000:
-             res = [c for c in res if c.api_card.atk is not None and atk_min <= int(c.api_card.atk) <= atk_max]
-
-        def_min, def_max = self.state['filter_def_min'], self.state['filter_def_max']
-        if def_min > 0 or def_max < 5000:
-             res = [c for c in res if getattr(c.api_card, 'def_', None) is not None and def_min <= getattr(c.api_card, 'def_', -1) <= def_max]
-
-        if self.state['filter_set']:
-            s_val = self.state['filter_set']
-            is_strict = '|' in s_val
-            if is_strict:
-                target_prefix = s_val.split('|')[-1].strip().lower()
-                def match_strict(c):
-                    parts = c.set_code.split('-')
-                    c_prefix = parts[0].lower() if parts else c.set_code.lower()
-                    return c_prefix == target_prefix
-                res = [c for c in res if match_strict(c)]
-            else:
-                s_txt = s_val.strip().lower()
-                res = [c for c in res if s_txt in c.set_code.lower() or s_txt in c.set_name.lower()]
-
-        if self.state['filter_rarity']:
-            r = self.state['filter_rarity'].lower()
-            res = [c for c in res if r == c.rarity.lower()]
-
-        key = self.state['sort_by']
-        reverse = self.state.get('sort_descending', False)
-
-        if key == 'Name':
-            res.sort(key=lambda x: x.api_card.name, reverse=reverse)
-        elif key == 'ATK':
-            res.sort(key=lambda x: (x.api_card.atk or -1), reverse=reverse)
-        elif key == 'DEF':
-            res.sort(key=lambda x: (getattr(x.api_card, 'def_', None) or -1), reverse=reverse)
-        elif key == 'Level':
-            res.sort(key=lambda x: (x.api_card.level or -1), reverse=reverse)
-        elif key == 'Newest':
-            res.sort(key=lambda x: x.api_card.id, reverse=reverse)
-        elif key == 'Price':
-             res.sort(key=lambda x: x.set_price, reverse=reverse)
-        elif key == 'Set Code':
-             res.sort(key=lambda x: x.set_code, reverse=reverse)
+        # Prefetched neighbours of the old result are no longer useful
+        download_scheduler.cancel(self.prefetch_group)
+
+        s = self.state
+        query = Query()
+        query.search(s['search_text'], CARD_GROUPS, printings=('set_code',))
+        query.value_range('set_price', s['filter_price_min'], s['filter_price_max'], selectivity=0.9)
+        query.card_filters(s)
+        query.printings(s['filter_set'], lambda c: ((c.set_code, c.set_name),))
+        query.rarity(s['filter_rarity'], lambda c: (c.rarity,))
 
+        query.sort(s['sort_by'], s.get('sort_descending', False), price='set_price', set_code='set_code')
+
+        res = query.run(s['cards_rows']).items
         self.state['filtered_items'] = res
 
+
         # Build consolidated items (unique cards from the filtered results)
         seen_ids = set()
         cons_items = []
@@ -496,29 +447,10 @@ class DbEditorPage:
             on_add_variant=on_add_variant
         )
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-        target_img = card.card_images[0] if card.card_images else None
-        if specific_image_id and card.card_images:
-            for img in card.card_images:
-                if img.id == specific_image_id:
-                    target_img = img
-                    break
-        if not target_img: return
-        img_id = target_img.id
-        high_res_url = target_img.image_url
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else high_res_url
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none') \
-                         .props('style="max-width: none" delay=1050') as tooltip:
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl').props('fit=contain')
-
     def render_grid(self, items: List[DbEditorRow]):
         with ui.grid(columns='repeat(auto-fill, minmax(160px, 1fr))').classes('w-full gap-4'):
             for item in items:
-                img_src = item.image_url
-                if image_manager.image_exists(item.image_id): img_src = f"/images/{item.image_id}.jpg"
+                img_src = image_manager.get_card_image_url(item.image_id, 'grid', item.image_url)
 
                 click_handler = lambda c=item: self.open_edit_view(c)
                 if self.state['main_view'] == 'consolidated':
@@ -539,7 +471,7 @@ class DbEditorPage:
                         else:
                             ui.label(item.api_card.type).classes('text-[10px] text-gray-400 truncate')
 
-                    self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                    attach_card_tooltip(item.api_card, specific_image_id=item.image_id)
 
     def render_list(self, items: List[DbEditorRow]):
         is_consolidated = self.state['main_view'] == 'consolidated'
@@ -555,8 +487,7 @@ class DbEditorPage:
             with ui.grid(columns=cols).classes('w-full bg-gray-800 p-2 font-bold rounded'):
                 for h in headers: ui.label(h)
             for item in items:
-                img_src = item.image_url
-                if image_manager.image_exists(item.image_id): img_src = f"/images/{item.image_id}.jpg"
+                img_src = image_manager.get_card_image_url(item.image_id, 'list', item.image_url)
 
                 click_handler = lambda c=item: self.open_edit_view(c)
                 if is_consolidated:
@@ -565,7 +496,7 @@ class DbEditorPage:
                 with ui.grid(columns=cols).classes('w-full bg-gray-900 p-1 items-center rounded hover:bg-gray-700 transition cursor-pointer') \
                         .on('click', click_handler):
                     with ui.image(img_src).classes('h-10 w-8 object-cover'):
-                         self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                         attach_card_tooltip(item.api_card, specific_image_id=item.image_id)
 
                     ui.label(item.api_card.name).classes('truncate text-sm font-bold')
 
@@ -784,7 +715,7 @@ class DbEditorPage:
             if self.state['main_view'] in ['cards', 'consolidated']:
                 async def on_search(e):
                     self.state['search_text'] = e.value
-                    await self.apply_filters()
+                    await self.filter_runner.run()
 
                 with ui.input(placeholder='Search Cards...', on_change=on_search) \
                     .props('debounce=300 icon=search').classes('w-64') as i:
@@ -797,7 +728,7 @@ class DbEditorPage:
                     else: self.state['sort_descending'] = False
                     persistence.save_ui_state({'db_editor_sort_by': e.value, 'db_editor_sort_descending': self.state['sort_descending']})
                     self.render_header.refresh()
-                    await self.apply_filters()
+                    await self.filter_runner.run()
 
                 with ui.row().classes('items-center gap-1'):
                     with ui.select(['Name', 'ATK', 'DEF', 'Level', 'Newest', 'Price', 'Set Code'], value=self.state['sort_by'], label='Sort',
@@ -807,7 +738,7 @@ class DbEditorPage:
                         self.state['sort_descending'] = not self.state['sort_descending']
                         persistence.save_ui_state({'db_editor_sort_descending': self.state['sort_descending']})
                         self.render_header.refresh()
-                        await self.apply_filters()
+                        await self.filter_runner.run()
 
                     icon = 'arrow_downward' if self.state.get('sort_descending') else 'arrow_upward'
                     ui.button(icon=icon, on_click=toggle_sort).props('flat round dense color=white')
@@ -982,7 +913,7 @@ class DbEditorPage:
         self.filter_dialog = ui.dialog().props('position=right')
         with self.filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.filter_pane = FilterPane(self.state, self.apply_filters, self.reset_filters)
+                 self.filter_pane = FilterPane(self.state, self.filter_runner, self.reset_filters)
                  self.filter_pane.build()
 
         self.render_header()
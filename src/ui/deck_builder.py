@@ -6,9 +6,14 @@ from src.services.ygo_api import ygo_service, ApiCard
 from src.services.deck_import_service import fetch_ygoprodeck_deck
 from src.services.banlist_service import banlist_service
 from src.services.image_manager import image_manager
+from src.services.download_scheduler import download_scheduler, DownloadPriority
+from src.services.facet_catalog import facet_catalog, FacetCatalog
+from src.services.query_engine import Query, card_printings, card_rarities, first_set_code, COST_FLAG, COST_SETS
 from src.core.config import config_manager
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView
+from src.ui.components.card_tooltip import attach_card_tooltip
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Set
 import logging
@@ -32,6 +37,11 @@ class DeckCardViewModel:
 
 class DeckBuilderPage:
     def __init__(self):
+        # Tags this page's image downloads in the shared scheduler
+        self.download_group = f"deck_builder:{id(self)}"
+        self.prefetch_group = f"deck_builder-prefetch:{id(self)}"
+        self.filter_runner = FilterRunner(self.apply_filters, 'deck_builder')
+
         ui.add_head_html('<script src="https://cdnjs.cloudflare.com/ajax/libs/Sortable/1.15.0/Sortable.min.js"></script>')
         ui.add_head_html('<style>.sortable-ghost-custom { opacity: 0.5; }</style>')
         ui.add_body_html('''
@@ -148,6 +158,7 @@ class DeckBuilderPage:
 
         self.single_card_view = SingleCardView()
         self.filter_pane: Optional[FilterPane] = None
+        self.facets: Optional[FacetCatalog] = None
         self.api_card_map = {} # ID -> ApiCard
         self.alt_art_map = {} # Alt Art Image ID -> Base Card ID
         self.dragged_item = None
@@ -451,26 +462,8 @@ class DeckBuilderPage:
                  self.state['current_banlist_type'] = 'classical'
 
             # Setup Filters Metadata
-            sets = set()
-            m_races = set()
-            st_races = set()
-            archetypes = set()
-
-            for c in api_cards:
-                if c.card_sets:
-                    for s in c.card_sets:
-                        parts = s.set_code.split('-')
-                        prefix = parts[0] if len(parts) > 0 else s.set_code
-                        sets.add(f"{s.set_name} | {prefix}")
-                if c.archetype: archetypes.add(c.archetype)
-                if "Monster" in c.type: m_races.add(c.race)
-                elif "Spell" in c.type or "Trap" in c.type:
-                    if c.race: st_races.add(c.race)
-
-            self.state['available_sets'] = sorted(list(sets))
-            self.state['available_monster_races'] = sorted(list(m_races))
-            self.state['available_st_races'] = sorted(list(st_races))
-            self.state['available_archetypes'] = sorted(list(archetypes))
+            self.facets = facet_catalog.get(api_cards)
+            self.state.update(self.facets.options())
             self.state['available_card_types'] = ['Monster', 'Spell', 'Trap', 'Skill']
 
             # Load Decks List
@@ -633,8 +626,10 @@ class DeckBuilderPage:
             self.update_zone_headers()
 
     async def apply_filters(self):
+        # Prefetched neighbours of the old result are no longer useful
+        download_scheduler.cancel(self.prefetch_group)
+
         source = self.state['all_api_cards']
-        res = list(source)
 
         # Helpers for sorting/filtering
         ref_col = self.state['reference_collection']
@@ -647,130 +642,53 @@ class DeckBuilderPage:
              found = owned_map.get(c.id)
              return found.total_quantity if found else 0
 
-        def get_price(c):
-             if not c.card_prices: return 0.0
-             try:
-                 return float(c.card_prices[0].tcgplayer_price or 0)
-             except: return 0.0
-
-        txt = self.state['search_text'].lower()
-        if txt:
-             def matches(c):
-                 if txt in c.name.lower() or txt in c.type.lower() or txt in c.desc.lower():
-                     return True
-                 if c.card_sets:
-                     for s in c.card_sets:
-                         if txt in s.set_code.lower():
-                             return True
-                 return False
-             res = [c for c in res if matches(c)]
-
-        if self.state['filter_card_type']:
-             ctypes = self.state['filter_card_type']
-             if isinstance(ctypes, str): ctypes = [ctypes]
-             res = [c for c in res if any(t in c.type for t in ctypes)]
-
-        if self.state['filter_attr']:
-             res = [c for c in res if c.attribute == self.state['filter_attr']]
-
-        if self.state['filter_monster_race']:
-             res = [c for c in res if "Monster" in c.type and c.race == self.state['filter_monster_race']]
-        if self.state['filter_st_race']:
-             res = [c for c in res if ("Spell" in c.type or "Trap" in c.type) and c.race == self.state['filter_st_race']]
-        if self.state['filter_archetype']:
-             res = [c for c in res if c.archetype == self.state['filter_archetype']]
-
-        if self.state['filter_set']:
-             # Format: "Set Name | Code"
-             target = self.state['filter_set'].split('|')[0].strip().lower()
-             res = [c for c in res if any(target in (s.set_name or '').lower() or target in (s.set_code or '').lower() for s in c.card_sets)]
-
-        if self.state['filter_rarity']:
-             target = self.state['filter_rarity'].lower()
-             res = [c for c in res if any(target == (s.set_rarity or '').lower() for s in c.card_sets)]
-
-        if self.state['filter_monster_category']:
-             # Check if card matches ANY of the selected categories
-             cats = self.state['filter_monster_category']
-             res = [c for c in res if any(c.matches_category(cat) for cat in cats)]
-
-        if self.state['filter_level'] is not None:
-             res = [c for c in res if c.level == int(self.state['filter_level'])]
-
-        atk_min, atk_max = self.state['filter_atk_min'], self.state['filter_atk_max']
-        if atk_min > 0 or atk_max < 5000:
-             res = [c for c in res if c.atk is not None and atk_min <= int(c.atk) <= atk_max]
-
-        def_min, def_max = self.state['filter_def_min'], self.state['filter_def_max']
-        if def_min > 0 or def_max < 5000:
-             res = [c for c in res if c.def_ is not None and def_min <= int(c.def_) <= def_max]
-
-        # Ownership Filters - (Helper map already created at top)
+        query = Query(card='')
+        query.search(self.state['search_text'])
+        query.card_filters(self.state, all_categories=False)
+        query.printings(self.state['filter_set'], card_printings)
+        query.rarity(self.state['filter_rarity'], card_rarities)
+
+        if self.state['only_owned'] and ref_col:
+             query.where(lambda c: c.id in owned_map, COST_FLAG, 0.1, key=('owned', id(ref_col)))
 
         # Quantity Range
         own_min, own_max = self.state['filter_ownership_min'], self.state['filter_ownership_max']
         if own_min > 0 or own_max < 100:
-             res = [c for c in res if own_min <= get_qty(c) <= own_max]
+             query.value_range(get_qty, own_min, own_max, key=('owned_quantity', id(ref_col)))
+
+        def owns_entry(c, match):
+             found = owned_map.get(c.id)
+             if not found: return False
+             for v in found.variants:
+                 for e in v.entries:
+                     if e.quantity > 0 and match(e):
+                         return True
+             return False
 
         # Condition
         if self.state['filter_condition'] and ref_col:
              conds = set(self.state['filter_condition'])
-             def has_condition(c):
-                 found = owned_map.get(c.id)
-                 if not found: return False
-                 for v in found.variants:
-                     for e in v.entries:
-                         if e.condition in conds and e.quantity > 0:
-                             return True
-                 return False
-             res = [c for c in res if has_condition(c)]
+             query.where(lambda c: owns_entry(c, lambda e: e.condition in conds), COST_SETS, 0.1,
+                         key=('owned_condition', id(ref_col), frozenset(conds)))
 
         # Owned Language
         if self.state['filter_owned_lang'] and ref_col:
              lang = self.state['filter_owned_lang']
-             def has_lang(c):
-                 found = owned_map.get(c.id)
-                 if not found: return False
-                 for v in found.variants:
-                     for e in v.entries:
-                         if e.language == lang and e.quantity > 0:
-                             return True
-                 return False
-             res = [c for c in res if has_lang(c)]
+             query.where(lambda c: owns_entry(c, lambda e: e.language == lang), COST_SETS, 0.1,
+                         key=('owned_language', id(ref_col), lang))
 
         # Price Range
         p_min, p_max = self.state['filter_price_min'], self.state['filter_price_max']
         if p_min > 0 or p_max < 1000:
-             res = [c for c in res if p_min <= get_price(c) <= p_max]
-
-        key = self.state['sort_by']
-        reverse = self.state['sort_descending']
-
-        if key == 'Name':
-            res.sort(key=lambda x: x.name, reverse=reverse)
-        elif key == 'ATK':
-            res.sort(key=lambda x: (x.atk or -1), reverse=reverse)
-        elif key == 'DEF':
-            res.sort(key=lambda x: (getattr(x, 'def_', None) or -1), reverse=reverse)
-        elif key == 'Level':
-            res.sort(key=lambda x: (x.level or -1), reverse=reverse)
-        elif key == 'Newest':
-            res.sort(key=lambda x: x.id, reverse=reverse)
-        elif key == 'Price':
-             res.sort(key=lambda x: get_price(x), reverse=reverse)
-        elif key == 'Quantity':
-             res.sort(key=lambda x: get_qty(x), reverse=reverse)
-        elif key == 'Set Code':
-             def get_set_code(x):
-                 if x.card_sets: return x.card_sets[0].set_code
-                 return ""
-             res.sort(key=get_set_code, reverse=reverse)
-
-        if self.state['only_owned'] and self.state['reference_collection']:
-             owned_ids = set(c.card_id for c in self.state['reference_collection'].cards)
-             res = [c for c in res if c.id in owned_ids]
-
-        self.state['filtered_items'] = res
+             query.value_range('tcg_price', p_min, p_max, column='tcg_price')
+
+        query.sort(self.state['sort_by'], self.state['sort_descending'], price='tcg_price',
+                   quantity=get_qty, set_code=first_set_code, price_column='TCG Price')
+
+        result = query.run(source)
+        self.state['filtered_items'] = result.items
+        if self.filter_pane and self.facets:
+            self.filter_pane.update_counts(self.facets.counts(result.card_ids()))
         self.state['page'] = 1
         self.update_pagination()
         await self.prepare_current_page_images()
@@ -780,19 +698,33 @@ class DeckBuilderPage:
         count = len(self.state['filtered_items'])
         self.state['total_pages'] = (count + self.state['page_size'] - 1) // self.state['page_size']
 
-    async def prepare_current_page_images(self):
-        start = (self.state['page'] - 1) * self.state['page_size']
+    def _get_page_image_urls(self, page: int) -> Dict[int, str]:
+        start = (page - 1) * self.state['page_size']
         end = min(start + self.state['page_size'], len(self.state['filtered_items']))
-        items = self.state['filtered_items'][start:end]
-        if not items: return
 
         url_map = {}
-        for card in items:
+        for card in self.state['filtered_items'][start:end]:
              if card.card_images:
                  url_map[card.card_images[0].id] = card.card_images[0].image_url_small
+        return url_map
 
+    def prefetch_adjacent_pages(self):
+        """Queues images of the next and previous page at low priority so paging does not wait on downloads."""
+        url_map = {}
+        for page in (self.state['page'] + 1, self.state['page'] - 1):
+            if 1 <= page <= self.state['total_pages']:
+                url_map.update(self._get_page_image_urls(page))
         if url_map:
-             await image_manager.download_batch(url_map, concurrency=5)
+            download_scheduler.submit(url_map, DownloadPriority.PREFETCH, group=self.prefetch_group)
+
+    async def prepare_current_page_images(self):
+        url_map = self._get_page_image_urls(self.state['page'])
+        if not url_map: return
+
+        batch = download_scheduler.submit(url_map, DownloadPriority.VISIBLE, group=self.download_group)
+        # Neighbours download in the background while (and after) the visible page completes
+        self.prefetch_adjacent_pages()
+        await batch.wait()
 
     async def reset_filters(self):
         self.state.update({
@@ -815,7 +747,7 @@ class DeckBuilderPage:
             'only_owned': False
         })
         if self.filter_pane: self.filter_pane.reset_ui_elements()
-        await self.apply_filters()
+        await self.filter_runner.run()
 
     def open_new_deck_dialog(self):
         with ui.dialog() as d, ui.card().classes('w-[600px] max-w-full'):
@@ -1098,46 +1030,6 @@ class DeckBuilderPage:
                      with ui.element('div').classes('w-5 h-5 rounded-full bg-yellow-500 text-black flex items-center justify-center font-bold text-xs border border-white shadow-sm'):
                          ui.label('2')
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-
-        if specific_image_id:
-            img_id = specific_image_id
-        else:
-            img_id = card.get_best_image_id()
-
-        # Determine URL for this specific image ID
-        # Note: If specific_image_id is provided, we assume it's one of the images in card_images
-        # We need to find the matching image object to get the remote URL in case it's not local
-        target_img = next((i for i in card.card_images if i.id == img_id), None)
-        if not target_img and card.card_images:
-             target_img = card.card_images[0]
-
-        high_res_url = target_img.image_url if target_img else None
-        low_res_url = target_img.image_url_small if target_img else None
-
-        # Check local high-res existence immediately
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        # Create tooltip with transparent background and no padding
-        # anchor/self props can be adjusted if needed, but default behavior is usually acceptable
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none') \
-                         .props('style="max-width: none" delay=1050') as tooltip:
-            # Image at 65vh height and 1000px min width for readability
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl') \
-                                     .props('fit=contain')
-
-            # Trigger download on show if needed
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    # Check again to avoid redundant downloads
-                    if not image_manager.image_exists(img_id, high_res=True):
-                         await image_manager.ensure_image(img_id, high_res_url, high_res=True)
-
-                tooltip.on('show', ensure_high)
-
     def refresh_search_results(self):
         if not self.search_results_container: return
         self.search_results_container.clear()
@@ -1174,7 +1066,7 @@ class DeckBuilderPage:
                 with ui.grid(columns='repeat(auto-fill, minmax(120px, 1fr))').classes('w-full gap-2').props('id="gallery-list"'):
                     for card in items:
                          img_id = card.get_best_image_id()
-                         img_src = f"/images/{img_id}.jpg" if image_manager.image_exists(img_id) else (card.card_images[0].image_url_small if card.card_images else None)
+                         img_src = image_manager.get_card_image_url(img_id, 'grid', card.card_images[0].image_url_small if card.card_images else None)
 
                          owned_qty = owned_map.get(card.id, 0)
 
@@ -1193,7 +1085,7 @@ class DeckBuilderPage:
                                  ui.label(card.name).classes('text-[10px] font-bold w-full leading-tight line-clamp-2 text-wrap h-6 select-none')
                                  ui.label(card.type).classes('text-[9px] text-gray-400 truncate w-full select-none')
 
-                             self._setup_card_tooltip(card)
+                             attach_card_tooltip(card)
 
                 ui.run_javascript('initSortable("gallery-list", "deck", "clone", false)')
 
@@ -1234,7 +1126,7 @@ class DeckBuilderPage:
 
         url_small = target_img.image_url_small if target_img else None
 
-        img_src = f"/images/{img_id}.jpg" if image_manager.image_exists(img_id) else url_small
+        img_src = image_manager.get_card_image_url(img_id, 'grid', url_small)
 
         # Ownership
         # We need to check ownership using Base ID because Collection aggregates by Base ID
@@ -1313,7 +1205,7 @@ class DeckBuilderPage:
                     with ui.icon('warning', color='red').classes('text-xl bg-white rounded-full shadow-sm cursor-help'):
                         ui.tooltip("\n".join(warnings))
 
-            self._setup_card_tooltip(card, specific_image_id=img_id)
+            attach_card_tooltip(card, specific_image_id=img_id)
 
         card_el.on('click', lambda: self.open_deck_builder_wrapper(card))
         card_el.on('contextmenu.prevent', lambda _, c=card_id, t=target, el=card_el, u=uid: self.remove_card_from_deck(c, t, el, u))
@@ -1742,7 +1634,7 @@ class DeckBuilderPage:
         self.filter_dialog = ui.dialog().props('position=right')
         with self.filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.filter_pane = FilterPane(self.state, self.apply_filters, self.reset_filters)
+                 self.filter_pane = FilterPane(self.state, self.filter_runner, self.reset_filters)
                  self.filter_pane.build()
 
         self.render_header()
@@ -1762,7 +1654,7 @@ class DeckBuilderPage:
                              async def on_owned_toggle(e):
                                 self.state['only_owned'] = e.value
                                 persistence.save_ui_state({'deck_builder_only_owned': e.value})
-                                await self.apply_filters()
+                                await self.filter_runner.run()
                              ui.switch('Owned Only', value=self.state['only_owned'], on_change=on_owned_toggle).props('dense').classes('text-white text-xs')
 
                              ui.separator().props('vertical').classes('mx-2 h-6 bg-gray-800')
@@ -1783,7 +1675,7 @@ class DeckBuilderPage:
 
                                  if sort_btn:
                                      sort_btn.props(f'icon={"arrow_downward" if self.state["sort_descending"] else "arrow_upward"}')
-                                 await self.apply_filters()
+                                 await self.filter_runner.run()
 
                              ui.select(['Name', 'ATK', 'DEF', 'Level', 'Newest', 'Price', 'Quantity', 'Set Code'],
                                        value=self.state['sort_by'], on_change=on_sort_change) \
@@ -1794,7 +1686,7 @@ class DeckBuilderPage:
                                  persistence.save_ui_state({'deck_builder_sort_desc': self.state['sort_descending']})
                                  if sort_btn:
                                      sort_btn.props(f'icon={"arrow_downward" if self.state["sort_descending"] else "arrow_upward"}')
-                                 await self.apply_filters()
+                                 await self.filter_runner.run()
 
                              sort_icon = 'arrow_downward' if self.state['sort_descending'] else 'arrow_upward'
                              with ui.button(icon=sort_icon, on_click=toggle_sort).props('flat dense size=sm color=white') as b:
@@ -1806,7 +1698,7 @@ class DeckBuilderPage:
 
                      async def on_search(e):
                         self.state['search_text'] = e.value
-                        await self.apply_filters()
+                        await self.filter_runner.run()
                      ui.input(placeholder='Search...', value=self.state['search_text'], on_change=on_search) \
                         .props('debounce=300 icon=search dense outlined dark input-class=text-white').classes('w-full')
 
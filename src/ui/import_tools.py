@@ -13,6 +13,7 @@ from src.core.models import Collection, ApiCard, ApiCardSet
 from src.core.utils import LANGUAGE_TO_LEGACY_REGION_MAP, normalize_set_code, is_set_code_compatible, get_legacy_code
 from src.core.constants import RARITY_ABBREVIATIONS
 from src.services.ygo_api import ygo_service
+from src.services.name_index import name_indexes
 from src.services.collection_editor import CollectionEditor
 from src.services.cardmarket_parser import CardmarketParser, ParsedRow
 
@@ -355,22 +356,22 @@ class UnifiedImportController:
                      cards = await ygo_service.load_card_database(lang)
                      if not cards: continue
 
-                     # Simple scan (Optimization: ygo_service could have a name index, but iteration is acceptable for error recovery)
                      # Note: row.name might be in DE ("Hinotama Seele"). Searching in EN DB ("Hinotama Soul") requires fuzzy match.
                      # Searching in DE DB ("Hinotama Seele") requires exact/fuzzy.
+                     names = name_indexes.get(cards)
 
                      # Exact Match first
-                     for c in cards:
-                         if c.name.lower() == row.name.lower():
-                             found_by_name = (c, lang)
-                             break
-                     if found_by_name: break
+                     exact = names.exact(row.name)
+                     if exact:
+                         found_by_name = (exact, lang)
+                         break
 
                      # Fuzzy Match (if exact failed)
                      # Only if we are desperate. Let's try high threshold.
+                     # The trigram index preselects the closest names; SequenceMatcher keeps the acceptance threshold.
                      best_ratio = 0
                      best_card = None
-                     for c in cards:
+                     for c, _ in names.search(row.name, limit=10, min_score=0.4):
                          r = difflib.SequenceMatcher(None, row.name, c.name).ratio()
                          if r > 0.85 and r > best_ratio:
                              best_ratio = r
@@ -2,6 +2,7 @@ from nicegui import ui
 from src.ui.theme import apply_theme
 from src.core.config import config_manager
 from src.services.ygo_api import ygo_service
+from src.services.image_manager import image_manager
 from src.services.sample_generator import generate_sample_collection
 
 def create_layout(content_function):
@@ -56,6 +57,44 @@ def create_layout(content_function):
                       min=1, max=100,
                       on_change=change_bulk_page_size).classes('w-full')
 
+            def change_atlas_mode(e):
+                config_manager.set_atlas_mode(bool(e.value))
+                ui.notify('Atlas mode saved. Reload the page to apply.')
+
+            with ui.switch('Sprite Atlas Mode', value=config_manager.get_atlas_mode(), on_change=change_atlas_mode):
+                ui.tooltip('Load each card grid page as one combined image instead of one request per card')
+
+            ui.separator().classes('q-my-md')
+            ui.label('Image Cache Budget (MB, 0 = unlimited)').classes('text-subtitle2 text-grey')
+
+            def change_budget(cache_class, e):
+                try:
+                    val = int(e.value)
+                    if val >= 0:
+                        config_manager.set_image_cache_budget_mb(cache_class, val)
+                except (ValueError, TypeError):
+                    pass
+
+            with ui.grid(columns=2).classes('w-full gap-2'):
+                for cache_class, label in [('small', 'Card Images'), ('high_res', 'High Res Images'), ('sets', 'Set Images'), ('flags', 'Flags')]:
+                    ui.number(label,
+                              value=config_manager.get_image_cache_budget_mb(cache_class),
+                              min=0, step=256,
+                              on_change=lambda e, c=cache_class: change_budget(c, e)).classes('w-full')
+
+            async def free_space():
+                n = ui.notification('Freeing image cache space...', type='info', spinner=True, timeout=None)
+                try:
+                    freed = await image_manager.enforce_cache_budget()
+                    n.dismiss()
+                    ui.notify(f'Freed {freed / (1024 * 1024):.1f} MB.', type='positive')
+                except Exception as e:
+                    n.dismiss()
+                    ui.notify(f"Error: {e}", type='negative')
+
+            with ui.button('Apply Cache Budget Now', on_click=free_space, icon='cleaning_services').classes('w-full q-mt-sm').props('color=grey-8'):
+                ui.tooltip('Remove least recently viewed images until each class fits its budget. Owned cards are kept.')
+
             ui.separator().classes('q-my-md')
             ui.label('Data Management').classes('text-subtitle2 text-grey')
 
@@ -168,6 +207,10 @@ def create_layout(content_function):
                 with prog_dialog, ui.card().classes('w-96'):
                     ui.label('Downloading All High Res Images').classes('text-h6')
                     ui.label('This may take a while and use significant disk space...').classes('text-sm text-grey')
+                    high_res_budget = config_manager.get_image_cache_budget_mb('high_res')
+                    if high_res_budget:
+                        ui.label(f'The High Res Images budget ({high_res_budget} MB) still applies: '
+                                 'set it to 0 to keep every image.').classes('text-sm text-warning')
                     p_bar = ui.linear_progress(0).classes('w-full q-my-md')
                     status_lbl = ui.label('Starting...')
                 prog_dialog.open()
@@ -187,6 +230,56 @@ def create_layout(content_function):
             with ui.button('Download All High Res Images', on_click=download_all_imgs_high, icon='download_for_offline').classes('w-full q-mt-sm').props('color=purple'):
                 ui.tooltip('Download high-quality images for all cards (requires disk space)')
 
+            async def verify_imgs():
+                # Dialog for progress
+                prog_dialog = ui.dialog().props('persistent')
+                with prog_dialog, ui.card().classes('w-96'):
+                    ui.label('Verifying Images').classes('text-h6')
+                    ui.label('Checking cached images and re-downloading broken ones...').classes('text-sm text-grey')
+                    p_bar = ui.linear_progress(0).classes('w-full q-my-md')
+                    status_lbl = ui.label('Starting...')
+                prog_dialog.open()
+
+                def on_progress(val):
+                    p_bar.value = val
+                    status_lbl.set_text(f"{int(val * 100)}%")
+
+                try:
+                    count = await ygo_service.verify_and_repair_images(progress_callback=on_progress, language=config_manager.get_language())
+                    prog_dialog.close()
+                    ui.notify(f'Verification complete. {count} broken images repaired.', type='positive')
+                except Exception as e:
+                    prog_dialog.close()
+                    ui.notify(f"Error: {e}", type='negative')
+
+            with ui.button('Verify & Repair Images', on_click=verify_imgs, icon='healing').classes('w-full q-mt-sm').props('color=orange'):
+                ui.tooltip('Find truncated or corrupt cached images and download them again')
+
+            async def gen_thumbnails():
+                # Dialog for progress
+                prog_dialog = ui.dialog().props('persistent')
+                with prog_dialog, ui.card().classes('w-96'):
+                    ui.label('Generating Thumbnails').classes('text-h6')
+                    ui.label('Creating WebP thumbnails for all downloaded images...').classes('text-sm text-grey')
+                    p_bar = ui.linear_progress(0).classes('w-full q-my-md')
+                    status_lbl = ui.label('Starting...')
+                prog_dialog.open()
+
+                def on_progress(val):
+                    p_bar.value = val
+                    status_lbl.set_text(f"{int(val * 100)}%")
+
+                try:
+                    count = await image_manager.backfill_thumbnails(progress_callback=on_progress)
+                    prog_dialog.close()
+                    ui.notify(f'{count} thumbnails generated.', type='positive')
+                except Exception as e:
+                    prog_dialog.close()
+                    ui.notify(f"Error: {e}", type='negative')
+
+            with ui.button('Generate Thumbnails', on_click=gen_thumbnails, icon='photo_size_select_large').classes('w-full q-mt-sm').props('color=teal'):
+                ui.tooltip('Create small WebP thumbnails for images downloaded before thumbnails existed')
+
             async def gen_sample_coll():
                 n = ui.notification('Generating Sample Collection...', type='info', spinner=True, timeout=None)
                 try:
@@ -25,17 +25,19 @@ from src.services.ygo_api import ygo_service
 from src.services.image_manager import image_manager
 from src.ui.components.ambiguity_dialog import AmbiguityDialog
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
 from src.ui.components.single_card_view import SingleCardView
 from src.core import config_manager
 from src.core.config import config_manager as app_config
 from src.core.changelog_manager import changelog_manager
 from src.core.constants import CARD_CONDITIONS, CONDITION_ABBREVIATIONS
 from src.core.utils import generate_variant_id, normalize_set_code, extract_language_code, LANGUAGE_COUNTRY_MAP
+from src.ui.components.card_tooltip import attach_card_tooltip
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class BulkCollectionEntry:
     id: str # Unique ID for UI
     api_card: ApiCard
@@ -351,6 +353,7 @@ document.addEventListener('keydown', (e) => {
 class ScanPage:
     def __init__(self):
         # ScanPage manages the scanning session
+        self.scan_filter_runner = FilterRunner(self.apply_scan_filters, 'scan')
         self.recent_collection: Collection = Collection(name="Recent Scans")
         self.target_collection_file = None
         self.collections = persistence.list_collections()
@@ -543,7 +546,7 @@ class ScanPage:
 
                 # Search
                 ui.input(placeholder='Search...',
-                         on_change=lambda e: self.apply_scan_filters()) \
+                         on_change=self.scan_filter_runner.run) \
                     .bind_value(self.col_state, 'search_text') \
                     .props('dense borderless dark debounce=300') \
                     .classes('w-32 text-sm')
@@ -569,14 +572,14 @@ class ScanPage:
                 async def on_sort(e):
                     self.col_state['sort_by'] = e.value
                     persistence.save_ui_state({'scan_sort_by': e.value})
-                    await self.apply_scan_filters()
+                    await self.scan_filter_runner.run()
 
                 ui.select(col_sort_opts, value=self.col_state['sort_by'], on_change=on_sort).props('dense options-dense borderless').classes('w-24 text-xs')
 
                 async def toggle_sort():
                     self.col_state['sort_desc'] = not self.col_state['sort_desc']
                     persistence.save_ui_state({'scan_sort_desc': self.col_state['sort_desc']})
-                    await self.apply_scan_filters()
+                    await self.scan_filter_runner.run()
 
                 ui.button(on_click=toggle_sort).props('flat dense color=white size=sm').bind_icon_from(self.col_state, 'sort_desc', lambda d: 'arrow_downward' if d else 'arrow_upward')
 
@@ -637,31 +640,6 @@ class ScanPage:
         self.col_state['collection_cards'] = entries
         await self.apply_scan_filters()
 
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-        target_img = card.card_images[0] if card.card_images else None
-        if specific_image_id and card.card_images:
-            for img in card.card_images:
-                if img.id == specific_image_id:
-                    target_img = img
-                    break
-        if not target_img: return
-
-        img_id = target_img.id
-        high_res_url = target_img.image_url
-        low_res_url = target_img.image_url_small
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none').props('style="max-width: none" delay=5000') as tooltip:
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl').props('fit=contain')
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    if not image_manager.image_exists(img_id, high_res=True):
-                         await image_manager.ensure_image(img_id, high_res_url, high_res=True)
-                tooltip.on('show', ensure_high)
-
     async def open_single_view_collection(self, entry: BulkCollectionEntry):
         async def on_save(card, set_code, rarity, language, quantity, condition, first_edition, image_id, variant_id, mode, **kwargs):
              success = CollectionEditor.apply_change(
@@ -759,7 +737,7 @@ class ScanPage:
         txt = s['search_text'].lower()
         if txt:
             def matches(e: BulkCollectionEntry):
-                return (txt in e.api_card.name.lower() or
+                return (txt in e.api_card.name_lower or
                         txt in e.set_code.lower() or
                         txt in e.api_card.desc.lower())
             res = [e for e in res if matches(e)]
@@ -829,13 +807,13 @@ class ScanPage:
         if self.collection_filter_pane:
             self.collection_filter_pane.reset_ui_elements()
 
-        await self.apply_scan_filters()
+        await self.scan_filter_runner.run()
 
     def build_filter_dialog(self):
         self.collection_filter_dialog = ui.dialog().props('position=right')
         with self.collection_filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.collection_filter_pane = FilterPane(self.col_state, self.apply_scan_filters, self.reset_scan_filters)
+                 self.collection_filter_pane = FilterPane(self.col_state, self.scan_filter_runner, self.reset_scan_filters)
                  self.collection_filter_pane.build()
 
     def open_filter_dialog(self):
@@ -1806,7 +1784,7 @@ class ScanPage:
 
         with ui.grid(columns='repeat(auto-fill, minmax(110px, 1fr))').classes('w-full gap-2 p-2').props('id="scan-list"'):
             for item in items:
-                img_src = f"/images/{item.image_id}.jpg" if image_manager.image_exists(item.image_id) else item.image_url
+                img_src = image_manager.get_card_image_url(item.image_id, 'grid', item.image_url)
 
                 cond_short = CONDITION_ABBREVIATIONS.get(item.condition, item.condition[:2].upper())
 
@@ -1838,7 +1816,7 @@ class ScanPage:
                                  ui.label(item.rarity).classes('text-[8px] text-gray-300 truncate flex-shrink')
                                  ui.label(item.storage_location or "None").classes('text-[8px] text-gray-400 font-mono truncate flex-shrink text-right')
 
-                    self._setup_card_tooltip(item.api_card, specific_image_id=item.image_id)
+                    attach_card_tooltip(item.api_card, specific_image_id=item.image_id, delay_ms=5000)
 
     @ui.refreshable
     def render_debug_results(self):
@@ -2,13 +2,19 @@ from nicegui import ui, run
 from src.services.storage import storage_service
 from src.services.ygo_api import ygo_service, ApiCard
 from src.services.image_manager import image_manager
+from src.services.query_engine import Query
+from src.services.facet_catalog import facet_catalog, FacetCatalog
+from src.services.search_index import GROUP_NAME
 from src.services.collection_editor import CollectionEditor
 from src.core.persistence import persistence
 from src.core.changelog_manager import changelog_manager
 from src.core.config import config_manager
 from src.ui.components.filter_pane import FilterPane
+from src.ui.components.filter_runner import FilterRunner
+from src.ui.components.virtual_grid import VirtualGrid, GridCell
 from src.ui.components.single_card_view import SingleCardView
 from src.core.utils import LANGUAGE_COUNTRY_MAP
+from src.ui.components.card_tooltip import attach_card_tooltip
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Callable
 import logging
@@ -16,7 +22,7 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class StorageRow:
     api_card: ApiCard
     set_code: str
@@ -102,8 +108,7 @@ class StorageDialog:
                                       url = s_info.get('image')
                                       path = await ygo_service.download_set_image(set_code, url)
                                       if path:
-                                           safe_code = "".join(c for c in set_code if c.isalnum() or c in ('-', '_')).strip()
-                                           self.image_preview.set_source(f"/sets/{safe_code}.jpg")
+                                           self.image_preview.set_source(image_manager.get_set_image_url(set_code))
                          except Exception as ex:
                              logger.error(f"Error handling set change: {ex}")
                              ui.notify(f"Error loading set info: {ex}", type='warning')
@@ -138,7 +143,7 @@ class StorageDialog:
                     path = await storage_service.save_uploaded_image(e.file, e.file.name)
                     if path:
                         self.uploaded_image_path = path
-                        self.image_preview.set_source(f"/storage/{path}")
+                        self.image_preview.set_source(storage_service.get_image_url(path))
                         ui.notify('Image uploaded', type='positive')
 
                 self.upload_element = ui.upload(on_upload=handle_upload, auto_upload=True).props('accept=".jpg, .jpeg, .png" flat dense').classes('w-full')
@@ -171,10 +176,9 @@ class StorageDialog:
 
         # Image
         if self.uploaded_image_path:
-            self.image_preview.set_source(f"/storage/{self.uploaded_image_path}")
+            self.image_preview.set_source(storage_service.get_image_url(self.uploaded_image_path))
         elif self.current_data.get('set_code'):
-             safe_code = "".join(c for c in self.current_data.get('set_code') if c.isalnum() or c in ('-', '_')).strip()
-             self.image_preview.set_source(f"/sets/{safe_code}.jpg")
+             self.image_preview.set_source(image_manager.get_set_image_url(self.current_data.get('set_code')))
         else:
             self.image_preview.set_source(None)
 
@@ -204,8 +208,60 @@ class StorageDialog:
         self.dialog.close()
 
 
+class StorageCell(GridCell):
+    """Grid cell of a storage's detail view; right-click moves the copies in or out."""
+
+    def __init__(self, page: 'StoragePage'):
+        super().__init__()
+        self.page = page
+
+    def build(self):
+        with ui.card().on('contextmenu.prevent', lambda e: self.page.handle_right_click(e, self.item) if self.item else None) as root:
+            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
+                self.image = ui.image('').classes('w-full h-full object-cover')
+                self.flag = ui.image('').classes('absolute top-[1px] left-[1px] h-4 w-6 shadow-black drop-shadow-md rounded bg-black/30')
+                self.language = ui.label().classes('absolute top-[1px] left-[1px] text-xs font-bold shadow-black drop-shadow-md bg-black/30 rounded px-1')
+                self.quantity = ui.label().classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
+
+                with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
+                    self.condition = ui.label().classes('font-bold text-yellow-500')
+                    self.edition = ui.label("1st").classes('font-bold text-orange-400')
+
+                self.set_code = ui.label().classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
+
+            with ui.column().classes('p-2 gap-0 w-full'):
+                self.name = ui.label().classes('text-xs font-bold truncate w-full')
+                self.rarity = ui.label().classes('text-[10px] text-gray-400')
+        attach_card_tooltip(lambda: (self.item.api_card, self.item.image_id) if self.item else None, element=root)
+        return root
+
+    def bind(self, row: StorageRow):
+        border_color = "border-accent" if self.page.state['in_storage_only'] else "border-gray-700"
+        self.set_classes(self.root, f'collection-card w-full p-0 cursor-pointer opacity-100 border {border_color} hover:scale-105 transition-transform')
+
+        self.image.visible = bool(row.image_url)
+        if row.image_url: self.image.source = row.image_url
+
+        lang_code = row.language.strip().upper()
+        country_code = LANGUAGE_COUNTRY_MAP.get(lang_code)
+        flag_url = image_manager.get_flag_image_url(country_code) if country_code else None
+        self.flag.visible = bool(flag_url)
+        if flag_url: self.flag.source = flag_url
+        self.language.text = lang_code
+        self.language.visible = not flag_url
+
+        self.quantity.text = f"{row.quantity}"
+        self.condition.text = row.condition
+        self.edition.visible = row.first_edition
+        self.set_code.text = row.set_code
+
+        self.name.text = row.api_card.name
+        self.rarity.text = row.rarity
+
 class StoragePage:
     def __init__(self):
+        self.filter_runner = FilterRunner(self.apply_filters, 'storage')
+
         # Load persisted UI state
         saved_state = persistence.load_ui_state()
 
@@ -275,6 +331,8 @@ class StoragePage:
 
         self.single_card_view = SingleCardView()
         self.filter_pane = None
+        self.detail_grid: Optional[VirtualGrid] = None
+        self.facets: Optional[FacetCatalog] = None
         self.filter_dialog = None
 
         self.storage_dialog = StorageDialog(self.on_storage_save)
@@ -405,22 +463,16 @@ class StoragePage:
         lang = config_manager.get_language()
         await ygo_service.load_card_database(lang)
 
-        api_card_map = {c.id: c for c in ygo_service._cards_cache.get(lang, [])}
+        api_cards = ygo_service._cards_cache.get(lang, [])
+        api_card_map = {c.id: c for c in api_cards}
+        self.facets = facet_catalog.get(api_cards)
 
         sets = set()
-        m_races = set()
-        st_races = set()
-        archetypes = set()
 
         for c_card in self.state['current_collection'].cards:
             api_card = api_card_map.get(c_card.card_id)
             if not api_card: continue
 
-            if api_card.archetype: archetypes.add(api_card.archetype)
-            if "Monster" in api_card.type: m_races.add(api_card.race)
-            elif "Spell" in api_card.type or "Trap" in api_card.type:
-                 if api_card.race: st_races.add(api_card.race)
-
             for v in c_card.variants:
                 set_name = "Unknown"
                 if api_card.card_sets:
@@ -463,14 +515,13 @@ class StoragePage:
                         storage_location=e.storage_location
                     ))
 
+        # Types and archetypes of the cards in the collection; sets of its printings only
+        self.state.update(self.facets.present(c.card_id for c in self.state['current_collection'].cards))
         self.state['available_sets'] = sorted(list(sets))
-        self.state['available_monster_races'] = sorted(list(m_races))
 
         # Ensure standard Spell/Trap types are always available
         standard_st_races = {"Normal", "Continuous", "Equip", "Field", "Quick-Play", "Ritual", "Counter"}
-        self.state['available_st_races'] = sorted(list(st_races.union(standard_st_races)))
-
-        self.state['available_archetypes'] = sorted(list(archetypes))
+        self.state['available_st_races'] = sorted(set(self.state['available_st_races']).union(standard_st_races))
 
         if self.filter_pane: self.filter_pane.update_options()
 
@@ -490,114 +541,31 @@ class StoragePage:
         await self.apply_filters(reset_page=reset_page)
 
     async def apply_filters(self, reset_page: bool = True):
-        res = list(self.state['rows'])
-
-        txt = self.state['search_text'].lower()
-        if txt:
-            res = [r for r in res if txt in r.api_card.name.lower() or txt in r.set_code.lower()]
-
-        if self.state['filter_rarity']:
-             res = [r for r in res if r.rarity.lower() == self.state['filter_rarity'].lower()]
-
-        if self.state['filter_attr']:
-             res = [r for r in res if r.api_card.attribute == self.state['filter_attr']]
-
-        if self.state['filter_card_type']:
-             ctypes = self.state['filter_card_type']
-             if isinstance(ctypes, str): ctypes = [ctypes]
-             res = [r for r in res if any(t in r.api_card.type for t in ctypes)]
-
-        # Set
-        if self.state['filter_set']:
-            target = self.state['filter_set']
-            res = [r for r in res if f"{r.set_name} | {r.set_code.split('-')[0]}" == target]
-
-        # Monster Type (Race)
-        if self.state['filter_monster_race']:
-            res = [r for r in res if r.api_card.race == self.state['filter_monster_race']]
-
-        # Spell/Trap Type (Race)
-        if self.state['filter_st_race']:
-            res = [r for r in res if r.api_card.race == self.state['filter_st_race']]
-
-        # Archetype
-        if self.state['filter_archetype']:
-            res = [r for r in res if r.api_card.archetype == self.state['filter_archetype']]
-
-        # Monster Category
-        if self.state['filter_monster_category']:
-            cats = self.state['filter_monster_category']
-            if isinstance(cats, str): cats = [cats]
-            if cats:
-                res = [r for r in res if any(r.api_card.matches_category(c) for c in cats)]
-
-        # Level/Rank
-        if self.state['filter_level'] is not None:
-             res = [r for r in res if r.api_card.level == self.state['filter_level']]
-
-        # ATK
-        if self.state['filter_atk_min'] > 0 or self.state['filter_atk_max'] < 5000:
-            min_v = self.state['filter_atk_min']
-            max_v = self.state['filter_atk_max']
-            res = [r for r in res if r.api_card.atk is not None and min_v <= r.api_card.atk <= max_v]
-
-        # DEF
-        if self.state['filter_def_min'] > 0 or self.state['filter_def_max'] < 5000:
-            min_v = self.state['filter_def_min']
-            max_v = self.state['filter_def_max']
-            res = [r for r in res if r.api_card.def_ is not None and min_v <= r.api_card.def_ <= max_v]
+        s = self.state
+        query = Query()
+        query.search(s['search_text'], (GROUP_NAME,), printings=('set_code',))
+        query.card_filters(s, all_categories=False)
+        query.printings(s['filter_set'], lambda r: ((r.set_code, r.set_name),))
+        query.rarity(s['filter_rarity'], lambda r: (r.rarity,))
+        query.equals('language', s['filter_owned_lang'], 0.5)
+        query.one_of('condition', s['filter_condition'], 0.6)
 
         # Ownership Quantity
-        if self.state['filter_ownership_min'] > 0 or self.state['filter_ownership_max'] < self.state['max_owned_quantity']:
-            min_v = self.state['filter_ownership_min']
-            max_v = self.state['filter_ownership_max']
-            res = [r for r in res if min_v <= r.quantity <= max_v]
+        if s['filter_ownership_min'] > 0 or s['filter_ownership_max'] < s['max_owned_quantity']:
+            query.value_range('quantity', s['filter_ownership_min'], s['filter_ownership_max'])
 
         # Price
-        def get_price(card):
-            if not card.card_prices: return 0.0
-            try:
-                p = card.card_prices[0].tcgplayer_price
-                return float(p) if p else 0.0
-            except: return 0.0
-
-        if self.state['filter_price_min'] > 0 or self.state['filter_price_max'] < 1000:
-            min_v = self.state['filter_price_min']
-            max_v = self.state['filter_price_max']
-            res = [r for r in res if min_v <= get_price(r.api_card) <= max_v]
-
-        # Owned Language
-        if self.state['filter_owned_lang']:
-             res = [r for r in res if r.language == self.state['filter_owned_lang']]
-
-        # Condition
-        if self.state['filter_condition']:
-             conds = self.state['filter_condition']
-             if isinstance(conds, str): conds = [conds]
-             if conds:
-                res = [r for r in res if r.condition in conds]
-
-        key = self.state['storage_detail_sort_by']
-        desc = self.state['storage_detail_sort_desc']
-
-        if key == 'Name':
-            res.sort(key=lambda x: x.api_card.name, reverse=desc)
-        elif key == 'ATK':
-            res.sort(key=lambda x: (x.api_card.atk or -1), reverse=desc)
-        elif key == 'DEF':
-            res.sort(key=lambda x: (getattr(x.api_card, 'def_', None) or -1), reverse=desc)
-        elif key == 'Level':
-            res.sort(key=lambda x: (x.api_card.level or -1), reverse=desc)
-        elif key == 'Newest':
-            res.sort(key=lambda x: x.api_card.id, reverse=desc)
-        elif key == 'Price':
-             res.sort(key=lambda x: get_price(x.api_card), reverse=desc)
-        elif key == 'Quantity':
-             res.sort(key=lambda x: x.quantity, reverse=desc)
-        elif key == 'Set Code':
-            res.sort(key=lambda x: x.set_code, reverse=desc)
-
-        self.state['filtered_rows'] = res
+        if s['filter_price_min'] > 0 or s['filter_price_max'] < 1000:
+            query.value_range('api_card.tcg_price', s['filter_price_min'], s['filter_price_max'],
+                              column='tcg_price')
+
+        query.sort(s['storage_detail_sort_by'], s['storage_detail_sort_desc'], price='api_card.tcg_price',
+                   quantity='quantity', set_code='set_code', price_column='TCG Price')
+
+        result = query.run(self.state['rows'])
+        self.state['filtered_rows'] = result.items
+        if self.filter_pane and self.facets:
+            self.filter_pane.update_counts(self.facets.counts(result.card_ids(), sets=False))
         self.update_pagination()
 
         if reset_page:
@@ -605,7 +573,7 @@ class StoragePage:
         elif self.state['page'] > self.state['total_pages']:
             self.state['page'] = max(1, self.state['total_pages'])
 
-        if hasattr(self, 'render_detail_grid'): self.render_detail_grid.refresh()
+        self.render_detail_grid()
         if hasattr(self, 'render_pagination_controls'): self.render_pagination_controls.refresh()
 
     def update_pagination(self):
@@ -711,11 +679,10 @@ class StoragePage:
 
             with ui.element('div').classes('relative w-full h-48 bg-black overflow-hidden'):
                 if storage.get('image_path'):
-                    src = f"/storage/{storage['image_path']}"
+                    src = storage_service.get_image_url(storage['image_path'])
                     ui.image(src).classes('w-full h-full object-cover')
                 elif storage.get('set_code'):
-                    safe_code = "".join(c for c in storage['set_code'] if c.isalnum() or c in ('-', '_')).strip()
-                    src = f"/sets/{safe_code}.jpg"
+                    src = image_manager.get_set_image_url(storage['set_code'])
                     ui.image(src).classes('w-full h-full object-contain')
                 else:
                     ui.icon('inventory_2', size='4xl', color='grey').classes('absolute top-1/2 left-1/2 transform -translate-x-1/2 -translate-y-1/2')
@@ -737,10 +704,9 @@ class StoragePage:
         with ui.row().classes('w-full items-start gap-6 mb-4 p-4 bg-gray-900 rounded-lg border border-gray-800'):
             with ui.element('div').classes('w-24 h-24 relative bg-black rounded shadow-lg overflow-hidden'):
                  if s.get('image_path'):
-                     ui.image(f"/storage/{s['image_path']}").classes('w-full h-full object-cover')
+                     ui.image(storage_service.get_image_url(s['image_path'])).classes('w-full h-full object-cover')
                  elif s.get('set_code'):
-                     safe_code = "".join(c for c in s['set_code'] if c.isalnum() or c in ('-', '_')).strip()
-                     ui.image(f"/sets/{safe_code}.jpg").classes('w-full h-full object-contain')
+                     ui.image(image_manager.get_set_image_url(s['set_code'])).classes('w-full h-full object-contain')
                  else:
                      ui.icon('inventory_2', size='xl', color='grey').classes('absolute top-1/2 left-1/2 transform -translate-x-1/2 -translate-y-1/2')
 
@@ -756,14 +722,14 @@ class StoragePage:
         with ui.row().classes('w-full items-center gap-4 bg-gray-800 p-2 rounded mb-4'):
             async def on_search(e):
                 self.state['search_text'] = e.value
-                await self.apply_filters()
+                await self.filter_runner.run()
             ui.input(placeholder='Search cards...', on_change=on_search).props('dark icon=search debounce=300').classes('w-64')
 
             async def on_sort_change(e):
                 self.state['storage_detail_sort_by'] = e.value
                 persistence.save_ui_state({'storage_detail_sort_by': self.state['storage_detail_sort_by']})
                 self.render_content.refresh()
-                await self.apply_filters()
+                await self.filter_runner.run()
 
             with ui.row().classes('items-center gap-1'):
                 with ui.select(['Name', 'ATK', 'DEF', 'Level', 'Newest', 'Price', 'Quantity', 'Set Code'], value=self.state['storage_detail_sort_by'], label='Sort',
@@ -774,7 +740,7 @@ class StoragePage:
                     self.state['storage_detail_sort_desc'] = not self.state['storage_detail_sort_desc']
                     persistence.save_ui_state({'storage_detail_sort_desc': self.state['storage_detail_sort_desc']})
                     self.render_content.refresh()
-                    await self.apply_filters()
+                    await self.filter_runner.run()
 
                 icon = 'arrow_downward' if self.state.get('storage_detail_sort_desc') else 'arrow_upward'
                 with ui.button(icon=icon, on_click=toggle_sort_dir).props('flat round dense color=white'):
@@ -797,7 +763,7 @@ class StoragePage:
                 self.state['in_storage_only'] = e.value
                 update_action_label()
                 await self.load_detail_rows()
-                self.render_detail_grid.refresh()
+                self.render_detail_grid()
                 self.render_pagination_controls.refresh()
 
             ui.switch('In Storage', value=self.state['in_storage_only'], on_change=toggle_storage).props('color=secondary').classes('mr-4')
@@ -813,121 +779,19 @@ class StoragePage:
             self.render_undo_button()
             ui.button('Filters', icon='filter_list', on_click=self.filter_dialog.open).props('color=primary')
 
+        self.detail_grid = VirtualGrid(lambda: StorageCell(self)).build()
         self.render_detail_grid()
 
         with ui.row().classes('w-full justify-center mt-4'):
              self.render_pagination_controls()
 
-    @ui.refreshable
     def render_detail_grid(self):
+        """Re-binds the pooled detail grid to the current page of rows."""
+        if not self.detail_grid: return
         rows = self.state['filtered_rows']
         start = (self.state['page'] - 1) * self.state['page_size']
         end = min(start + self.state['page_size'], len(rows))
-        visible_rows = rows[start:end]
-
-        with ui.grid(columns='repeat(auto-fill, minmax(160px, 1fr))').classes('w-full gap-4'):
-            for row in visible_rows:
-                self.render_card(row)
-
-    def _setup_card_tooltip(self, card: ApiCard, specific_image_id: int = None):
-        if not card: return
-
-        # Determine target ID
-        if specific_image_id:
-            img_id = specific_image_id
-        else:
-            img_id = card.get_best_image_id()
-
-        high_res_url = None
-        low_res_url = None
-
-        # Try to find URL for this ID
-        if card.card_images:
-            target_img = next((img for img in card.card_images if img.id == img_id), None)
-            if target_img:
-                high_res_url = target_img.image_url
-                low_res_url = target_img.image_url_small
-            else:
-                 # Fallback to default if specific/best ID has no URL (e.g. custom) but we need a fallback for non-local
-                 high_res_url = card.card_images[0].image_url
-                 low_res_url = card.card_images[0].image_url_small
-
-        # Check local high-res existence immediately
-        is_local = image_manager.image_exists(img_id, high_res=True)
-        initial_src = f"/images/{img_id}_high.jpg" if is_local else (high_res_url or low_res_url)
-
-        if not initial_src:
-             return
-
-        # Create tooltip with transparent background and no padding
-        with ui.tooltip().classes('bg-transparent shadow-none border-none p-0 overflow-visible z-[9999] max-w-none') \
-                         .props('style="max-width: none" delay=1050') as tooltip:
-            # Image at 65vh height and 1000px min width for readability
-            if initial_src:
-                ui.image(initial_src).classes('w-auto h-[65vh] min-w-[1000px] object-contain rounded-lg shadow-2xl') \
-                                     .props('fit=contain')
-
-            # Trigger download on show if needed
-            if not is_local and high_res_url:
-                async def ensure_high():
-                    # Check again to avoid redundant downloads
-                    # Only download if we are not using a fallback URL for a custom ID
-
-                    real_target_id = img_id
-
-                    # Check if img_id corresponds to the URL
-                    is_exact_match = False
-                    if card.card_images:
-                        for img in card.card_images:
-                            if img.id == img_id:
-                                is_exact_match = True
-                                break
-
-                    if not is_exact_match and card.card_images:
-                        # We are using fallback. Download to default ID instead.
-                        real_target_id = card.card_images[0].id
-
-                    if not image_manager.image_exists(real_target_id, high_res=True):
-                         await image_manager.ensure_image(real_target_id, high_res_url, high_res=True)
-
-                tooltip.on('show', ensure_high)
-
-    def render_card(self, row: StorageRow):
-        opacity = "opacity-100"
-        border_color = "border-gray-700"
-        if self.state['in_storage_only']:
-            border_color = "border-accent"
-
-        with ui.card().classes(f'collection-card w-full p-0 cursor-pointer {opacity} border {border_color} hover:scale-105 transition-transform') \
-                .on('contextmenu.prevent', lambda e, r=row: self.handle_right_click(e, r)):
-
-            with ui.element('div').classes('relative w-full aspect-[2/3] bg-black'):
-                if row.image_url:
-                    ui.image(row.image_url).classes('w-full h-full object-cover')
-
-                self._setup_card_tooltip(row.api_card, specific_image_id=row.image_id)
-
-                lang_code = row.language.strip().upper()
-                country_code = LANGUAGE_COUNTRY_MAP.get(lang_code)
-                flag_url = image_manager.get_flag_image_url(country_code) if country_code else None
-
-                if flag_url:
-                     ui.image(flag_url).classes('absolute top-[1px] left-[1px] h-4 w-6 shadow-black drop-shadow-md rounded bg-black/30')
-                else:
-                     ui.label(lang_code).classes('absolute top-[1px] left-[1px] text-xs font-bold shadow-black drop-shadow-md bg-black/30 rounded px-1')
-
-                ui.label(f"{row.quantity}").classes('absolute top-1 right-1 bg-accent text-dark font-bold px-2 rounded-full text-xs')
-
-                with ui.row().classes('absolute bottom-0 left-0 bg-black/80 text-white text-[10px] px-1 gap-1 items-center rounded-tr'):
-                    ui.label(row.condition).classes('font-bold text-yellow-500')
-                    if row.first_edition:
-                         ui.label("1st").classes('font-bold text-orange-400')
-
-                ui.label(row.set_code).classes('absolute bottom-0 right-0 bg-black/80 text-white text-[10px] px-1 font-mono rounded-tl')
-
-            with ui.column().classes('p-2 gap-0 w-full'):
-                ui.label(row.api_card.name).classes('text-xs font-bold truncate w-full')
-                ui.label(row.rarity).classes('text-[10px] text-gray-400')
+        self.detail_grid.set_items(rows[start:end])
 
     async def _update_view_model(self, card_id, variant_id, set_code, rarity, language, condition, first_edition, image_id, quantity_change, storage_location=None):
         """Updates the in-memory rows and refreshes the grid without full reload."""
@@ -1000,7 +864,7 @@ class StoragePage:
                 rows.append(new_row)
 
         await self.apply_filters(reset_page=False)
-        self.render_detail_grid.refresh()
+        self.render_detail_grid()
         if hasattr(self, 'render_undo_button'): self.render_undo_button.refresh()
 
     async def undo_last_action(self):
@@ -1182,7 +1046,7 @@ class StoragePage:
         if self.state['total_pages'] <= 1: return
         async def change_p(delta):
             self.state['page'] += delta
-            self.render_detail_grid.refresh()
+            self.render_detail_grid()
             self.render_pagination_controls.refresh()
         with ui.row().classes('items-center gap-2'):
             ui.button(icon='chevron_left', on_click=lambda: change_p(-1)).props('flat dense color=white').set_enabled(self.state['page'] > 1)
@@ -1199,7 +1063,7 @@ class StoragePage:
         self.filter_dialog = ui.dialog().props('position=right')
         with self.filter_dialog, ui.card().classes('h-full w-96 bg-gray-900 border-l border-gray-700 p-0 flex flex-col'):
              with ui.scroll_area().classes('flex-grow w-full'):
-                 self.filter_pane = FilterPane(self.state, self.apply_filters, self.reset_filters, show_set_selector=False)
+                 self.filter_pane = FilterPane(self.state, self.filter_runner, self.reset_filters, show_set_selector=False)
                  self.filter_pane.build()
 
         self.render_content()
@@ -1209,7 +1073,7 @@ class StoragePage:
         self.state['search_text'] = ''
         self.state['filter_rarity'] = ''
         if self.filter_pane: self.filter_pane.reset_ui_elements()
-        await self.apply_filters()
+        await self.filter_runner.run()
 
 def storage_page():
     page = StoragePage()
@@ -0,0 +1,34 @@
+"""Shared fixtures of the image cache tests: encoded test images and an ImageManager in a temporary directory."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from src.services.image_manager import ImageManager
+
+
+def jpeg_bytes(width: int = 270, height: int = 395, color: str = 'blue', noise: bool = False) -> bytes:
+    """A JPEG of the given size, in one color or (noise=True) as noise that does not compress away."""
+    buf = io.BytesIO()
+    if noise:
+        Image.effect_noise((width, height), 64).convert('RGB').save(buf, format='JPEG', quality=95)
+    else:
+        Image.new('RGB', (width, height), color=color).save(buf, format='JPEG')
+    return buf.getvalue()
+
+
+class ImageManagerTestCase(unittest.TestCase):
+    """Runs each test against an ImageManager whose images, sets, flags and index live in self.tmp."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.index_file = os.path.join(self.tmp, "image_index.json")
+        self.manager = ImageManager(images_dir=os.path.join(self.tmp, "images"), index_file=self.index_file)
+        self.manager.sets_dir = os.path.join(self.tmp, "sets")
+        self.manager.flags_dir = os.path.join(self.tmp, "flags")
+        os.makedirs(self.manager.sets_dir, exist_ok=True)
+        os.makedirs(self.manager.flags_dir, exist_ok=True)
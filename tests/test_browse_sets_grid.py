@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+
+from nicegui import Client
+from nicegui.page import page
+
+from src.core.models import ApiCard, ApiCardSet, ApiCardImage, Collection, CollectionCard, CollectionVariant, CollectionEntry
+from src.ui.browse_sets import BrowseSetsPage, ConsolidatedSetCell, CollectorSetCell, build_set_rows, build_consolidated_rows
+from src.ui.components.virtual_grid import VirtualGrid
+
+
+def _card(card_id, rarities):
+    return ApiCard(id=card_id, name=f"Card {card_id}", type="Effect Monster", frameType="effect", desc="", level=4,
+                   card_images=[ApiCardImage(id=card_id, image_url="u", image_url_small="s")],
+                   card_sets=[ApiCardSet(set_name="Legend of Blue Eyes", set_code=f"LOB-EN{card_id:03}",
+                                         set_rarity=r, set_price="1.50") for r in rarities])
+
+
+class TestBrowseSetsGrid(unittest.TestCase):
+    def setUp(self):
+        self.download = patch('src.ui.browse_sets.image_manager.download_batch', MagicMock()).start()
+        patch('src.ui.browse_sets.asyncio.create_task', MagicMock()).start()
+        self.addCleanup(patch.stopall)
+
+        cards = [_card(i, ["Common"] if i % 2 else ["Common", "Ultra Rare"]) for i in range(1, 31)]
+        collection = Collection(name="Test", cards=[CollectionCard(card_id=2, name="Card 2", variants=[
+            CollectionVariant(variant_id="v2", set_code="LOB-EN002", rarity="Ultra Rare",
+                              entries=[CollectionEntry(language="EN", condition="Near Mint", quantity=3)])])])
+
+        self.client = Client(page('/'), request=None)
+        self.page = BrowseSetsPage()
+        self.page.state.update({
+            'detail_rows_collectors': build_set_rows(cards, collection, "LOB"),
+            'detail_rows_consolidated': build_consolidated_rows(cards, collection),
+        })
+        with self.client:
+            self.page.detail_grids = {
+                'consolidated': VirtualGrid(ConsolidatedSetCell).build(),
+                'collectors': VirtualGrid(CollectorSetCell).build(),
+            }
+
+    def show(self, scope):
+        self.page.state['view_scope'] = scope
+        rows = self.page.state[f'detail_rows_{scope}']
+        self.page.state['detail_filtered_rows'] = rows
+        with self.client:
+            self.page.render_detail_grid()
+        return rows
+
+    def test_pages_bind_the_pooled_cells(self):
+        rows = self.show('collectors')
+        grid = self.page.detail_grids['collectors']
+        self.assertTrue(grid.scroll.visible)
+        self.assertFalse(self.page.detail_grids['consolidated'].scroll.visible)
+        cells = [c for c in grid.pool if c.item is not None]
+        self.assertEqual([c.item for c in cells], [rows[i] for i in grid.window()])
+
+        owned = next(c for c in cells if c.item.is_owned)
+        self.assertEqual((owned.quantity.text, owned.rarity.text, owned.set_code.text), ("3", "Ultra Rare", "LOB-EN002"))
+        self.assertTrue(owned.quantity.visible)
+
+        pool = list(grid.pool)
+        self.page.state['detail_page'] = 2
+        self.page.state['detail_page_size'] = 10
+        with self.client:
+            self.page.render_detail_grid()
+        self.assertEqual(grid.pool, pool)  # the next page re-binds the same cells
+        self.assertIs(grid.items[0], rows[10])
+
+    def test_detail_filters_sort_and_page(self):
+        self.page.render_view_scope_toggles = self.page.render_detail_pagination_controls = MagicMock()
+        self.page.state.update({'view_scope': 'collectors', 'selected_set': 'LOB', 'detail_page_size': 20,
+                                'detail_sort': 'Rarity', 'detail_sort_desc': True})
+        with self.client:
+            asyncio.run(self.page.apply_detail_filters())
+        rows = self.page.state['detail_filtered_rows']
+        self.assertEqual((len(rows), self.page.state['detail_total_pages']), (45, 3))
+        self.assertEqual([r.rarity for r in rows[:15]], ["Ultra Rare"] * 15)  # rarest first when descending
+        self.assertEqual([c.item for c in self.page.detail_grids['collectors'].pool if c.item is not None], rows[:20])
+
+        self.page.state.update({'view_scope': 'consolidated', 'detail_sort': 'Set Code', 'detail_sort_desc': False})
+        with self.client:
+            asyncio.run(self.page.apply_detail_filters())
+        self.assertEqual([vm.api_card.id for vm in self.page.state['detail_filtered_rows']], list(range(1, 31)))
+
+        self.page.state.update({'detail_sort': 'Owned', 'detail_sort_desc': True})
+        with self.client:
+            asyncio.run(self.page.apply_detail_filters())
+        self.assertEqual(self.page.state['detail_filtered_rows'][0].api_card.id, 2)
+
+    def test_consolidated_scope(self):
+        vms = self.show('consolidated')
+        grid = self.page.detail_grids['consolidated']
+        self.assertFalse(self.page.detail_grids['collectors'].scroll.visible)
+        cell = next(c for c in grid.pool if c.item is vms[1])
+        self.assertEqual((cell.name.text, cell.quantity.text, cell.level.text), ("Card 2", "3", "Lv 4"))
+        self.assertEqual(len(self.download.call_args.args[0]), len(vms))  # the page's images are fetched
+
+
+if __name__ == '__main__':
+    unittest.main()
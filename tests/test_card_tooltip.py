@@ -0,0 +1,76 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from nicegui import ui, Client
+from nicegui.page import page
+
+from src.core.models import ApiCard, ApiCardImage
+from src.ui.components import card_tooltip
+from src.ui.components.card_tooltip import attach_card_tooltip, tooltip_payload, CardTooltip
+
+
+def _card(card_id, image_ids):
+    return ApiCard(id=card_id, name=f"Card {card_id}", type="Effect Monster", frameType="effect", desc="",
+                   card_images=[ApiCardImage(id=i, image_url=f"https://img/{i}.jpg", image_url_small=f"https://img/s/{i}.jpg")
+                                for i in image_ids])
+
+
+class TestCardTooltip(unittest.TestCase):
+    def setUp(self):
+        card_tooltip._payloads.clear()
+        self.card = _card(10, [10, 11])
+
+    def test_payload(self):
+        payload = tooltip_payload(self.card, 11)
+        self.assertEqual((payload.image_id, payload.download_id, payload.high_res_url), (11, 11, "https://img/11.jpg"))
+        self.assertIs(tooltip_payload(self.card, 11), payload)
+
+        # A custom artwork without a URL downloads the default image
+        custom = tooltip_payload(self.card, 999)
+        self.assertEqual((custom.image_id, custom.download_id), (999, 10))
+        self.assertIsNone(tooltip_payload(_card(20, []), None))
+
+    def test_one_shared_preview_per_client(self):
+        client = Client(page('/'), request=None)
+        with client:
+            with ui.card() as first:
+                attach_card_tooltip(self.card)
+            second = ui.card()
+            attach_card_tooltip(lambda: (self.card, 11), element=second)
+        self.assertFalse(any(isinstance(e, ui.tooltip) for e in client.elements.values()))
+        before = len(client.elements)
+
+        def hover(element, event, *args):
+            for listener in element._event_listeners.values():
+                if listener.type == event:
+                    listener.handler(SimpleNamespace(args=list(args)))
+
+        with patch.object(CardTooltip, '_fetch_high_res', new=MagicMock()), \
+                patch('src.ui.components.card_tooltip.asyncio.create_task',
+                      side_effect=lambda _: MagicMock(done=MagicMock(return_value=False))) as create_task:
+            hover(first, 'mouseenter', 100, 1000)
+            tooltip = card_tooltip._tooltips[client]
+            fetch = tooltip._fetch_task
+            hover(first, 'mouseenter', 100, 1000)
+            self.assertIs(tooltip._fetch_task, fetch)  # the same card keeps its pending fetch
+            self.assertTrue(tooltip.panel.visible)
+            self.assertEqual(tooltip.current, (10, None))
+            self.assertIn('right', tooltip.panel._style)
+            created = len(client.elements) - before
+
+            hover(second, 'mouseenter', 900, 1000)
+            fetch.cancel.assert_called_once()  # a different card cancels it
+            self.assertEqual(create_task.call_count, 2)
+            self.assertEqual(tooltip.current, (10, 11))
+            self.assertIn('left', tooltip.panel._style)
+            self.assertEqual(len(client.elements) - before, created)  # the preview is reused
+
+            second_fetch = tooltip._fetch_task
+            hover(second, 'mouseleave')
+            self.assertFalse(tooltip.panel.visible)
+            second_fetch.cancel.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
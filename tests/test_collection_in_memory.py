@@ -0,0 +1,168 @@
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from src.core.models import ApiCard, ApiCardSet, ApiCardImage, Collection
+from src.core.utils import generate_variant_id
+from src.services.collection_editor import CollectionEditor
+from src.ui.collection import CollectionPage, LazyCollectorRows, build_collector_rows, build_consolidated_vms
+
+
+def _card(card_id, sets):
+    return ApiCard(id=card_id, name=f"Card {card_id}", type="Effect Monster", frameType="effect", desc="",
+                   card_images=[ApiCardImage(id=card_id, image_url="u", image_url_small="s")],
+                   card_sets=[ApiCardSet(variant_id=generate_variant_id(card_id, c, r, None), set_name=f"Set {c[:3]}",
+                                         set_code=c, set_rarity=r, set_price="1.50")
+                              for c, r in sets])
+
+
+def _rows(rows):
+    return sorted((r.api_card.id, r.set_code, r.rarity, r.language, r.condition, r.first_edition, r.owned_count,
+                   r.is_owned, r.variant_id) for r in rows)
+
+
+class TestCollectionInMemory(unittest.TestCase):
+    def setUp(self):
+        self.persistence = patch('src.ui.collection.persistence').start()
+        self.persistence.load_ui_state.return_value = {}
+        self.persistence.list_collections.return_value = []
+        self.addCleanup(patch.stopall)
+
+        self.cards = [_card(1, [("LOB-EN001", "Ultra Rare"), ("SDK-EN001", "Common")]),
+                      _card(2, [("MRD-EN002", "Common")])]
+        self.page = CollectionPage()
+        self.page.state['current_collection'] = self.collection = Collection(name="Test")
+        self.page.state['cards_consolidated'] = build_consolidated_vms(self.cards, {})
+
+    def change(self, card, set_code, rarity, quantity, language='EN', condition='Near Mint'):
+        CollectionEditor.apply_change(self.collection, card, set_code, rarity, language, quantity, condition,
+                                      False, mode='ADD')
+        return self.page._update_in_memory(card, set_code, rarity, language, quantity, condition, False, None, None)
+
+    def rows(self):
+        return [row for card in self.cards for row in self.page._rows_for(card)]
+
+    def rebuilt(self):
+        owned = {c.card_id: c for c in self.collection.cards}
+        return _rows(build_collector_rows(self.cards, owned, 'EN'))
+
+    def test_matches_a_full_rebuild(self):
+        card = self.cards[0]
+        rows = self.rows
+
+        placeholder = next(r for r in rows() if r.set_code == "LOB-EN001")
+        changed = self.change(card, "LOB-EN001", "Ultra Rare", 2)
+        self.assertIs(changed[1], placeholder)  # the placeholder row became the owned copy
+        self.assertEqual(_rows(rows()), self.rebuilt())
+
+        self.change(card, "LOB-EN001", "Ultra Rare", 1, language='DE')
+        self.change(card, "LOB-EN001", "Ultra Rare", 3, condition='Played')
+        self.assertEqual(_rows(rows()), self.rebuilt())
+
+        self.change(card, "LOB-EN001", "Ultra Rare", -1, language='DE')
+        self.change(card, "LOB-EN001", "Ultra Rare", -3, condition='Played')
+        self.assertEqual(_rows(rows()), self.rebuilt())
+        self.change(card, "LOB-EN001", "Ultra Rare", -2)
+        self.assertEqual(_rows(rows()), self.rebuilt())  # back to the unowned placeholder
+        self.assertEqual(len(rows()), 3)
+
+        vm = self.page.state['cards_consolidated'][0]
+        self.assertEqual((vm.owned_quantity, vm.is_owned), (0, False))
+        self.change(card, "SDK-EN001", "Common", 4, language='FR')
+        self.assertEqual((vm.owned_quantity, vm.owned_languages), (4, {'FR'}))
+        self.assertEqual(_rows(rows()), self.rebuilt())
+
+    def test_rows_of_unexpanded_cards_follow_the_collection(self):
+        self.change(self.cards[1], "MRD-EN002", "Common", 1)  # card 2 was never read
+        self.assertNotIn(2, self.page._card_rows)
+        self.assertEqual(_rows(self.rows()), self.rebuilt())
+
+        self.page.state['cards_consolidated'] = build_consolidated_vms(self.cards, {})
+        changed = self.change(self.cards[1], "MRD-EN002", "Common", 1)
+        self.assertIs(changed[0], self.page.state['cards_consolidated'][1])
+        self.assertEqual(self.page._rows_for(self.cards[1])[0].owned_count, 2)
+
+    def test_edit_rebinds_cells_unless_the_result_changes(self):
+        page = self.page
+        page.state.update({'view_scope': 'collectors', 'page_size': 10, 'sort_by': 'Name'})
+        page.prepare_current_page_images = AsyncMock()
+        page.render_card_display = MagicMock()
+        page.render_header = MagicMock()
+        page._schedule_save = MagicMock()
+        page.apply_filters = AsyncMock()
+        page._rows_for(self.cards[0])
+
+        async def save(set_code, rarity, quantity, **kwargs):
+            with patch('src.ui.collection.ygo_service.ensure_card_variant', AsyncMock()), \
+                    patch('src.ui.collection.changelog_manager'), patch('src.ui.collection.ui'):
+                await page.save_card_change(self.cards[0], set_code, rarity, kwargs.get('language', 'EN'), quantity,
+                                            'Near Mint', False, mode='ADD')
+
+        # The placeholder row takes the copy in place: only its cell is re-bound
+        asyncio.run(save("LOB-EN001", "Ultra Rare", 1))
+        page.apply_filters.assert_not_called()
+        page.render_card_display.refresh.assert_called_once()
+        self.assertIs(page._owned_details[1], self.collection.cards[0])
+        self.assertEqual([r.set_code for r in page._changed_items if hasattr(r, 'set_code')], ["LOB-EN001"])
+
+        asyncio.run(save("LOB-EN001", "Ultra Rare", 1, language='DE'))  # a new row
+        page.apply_filters.assert_awaited_once()
+
+        page.apply_filters.reset_mock()
+        page.state['only_owned'] = True  # the filter reads the owned copies
+        asyncio.run(save("SDK-EN001", "Common", 1))
+        page.apply_filters.assert_awaited_once()
+
+        page.state['only_owned'] = False
+        asyncio.run(save("LOB-EN001", "Ultra Rare", -1, language='DE'))
+        asyncio.run(save("LOB-EN001", "Ultra Rare", -2))
+        asyncio.run(save("SDK-EN001", "Common", -1))
+        self.assertNotIn(1, page._owned_details)  # the last copy is gone
+        self.assertEqual(_rows(self.rows()), self.rebuilt())
+
+
+    def test_rows_are_compact(self):
+        self.change(self.cards[0], "LOB-EN001", "Ultra Rare", 2)
+        self.change(self.cards[0], "LOB-EN001", "Ultra Rare", 1, language='DE')
+        owned = {c.card_id: c for c in self.collection.cards}
+        rows = build_collector_rows(self.cards, owned, 'EN')
+        self.assertFalse(any(hasattr(r, '__dict__') for r in rows))
+        self.assertEqual(sorted((r.language, [e.quantity for e in r.entries]) for r in rows if r.is_owned),
+                         [('DE', [1]), ('EN', [2])])
+        self.assertTrue(all(r.entries == () for r in rows if not r.is_owned))  # no per-row empty lists
+
+        vms = build_consolidated_vms(self.cards, owned)
+        self.assertIs(vms[1].owned_languages, vms[1].owned_conditions)  # the shared empty frozenset
+
+    def test_lazy_collector_rows(self):
+        self.cards = [_card(i, [(f"S{i % 7}-EN{i:03}", "Common"), (f"S{i % 7}-DE{i:03}", "Common"),
+                                (f"T{i % 3}-EN{i:03}", "Rare")][:1 + i % 3])
+                      for i in range(1, 60)]
+        self.page.state['cards_consolidated'] = build_consolidated_vms(self.cards, {})
+        self.page.state.update({'view_scope': 'collectors', 'page_size': 10, 'sort_by': 'Name'})
+        self.page.prepare_current_page_images = AsyncMock()
+        self.page.render_card_display = MagicMock()
+        self.change(self.cards[4], "S5-EN005", "Common", 2, language='FR')
+        self.page._card_rows.clear()
+
+        asyncio.run(self.page.apply_filters())
+        items = self.page.state['filtered_items']
+        self.assertIsInstance(items, LazyCollectorRows)
+        self.assertEqual(len(items[10:20]), 10)
+        self.assertLess(len(self.page._card_rows), 20)  # the owned card and the cards read
+
+        owned = {c.card_id: c for c in self.collection.cards}
+        eager = self.page._build_query(False).run(build_collector_rows(self.cards, owned, 'EN')).items
+        self.assertEqual(len(items), len(eager))
+        self.assertEqual([_rows([r]) for r in items[:]], [_rows([r]) for r in eager])
+        self.assertEqual(items.card_ids().tolist(), [r.api_card.id for r in eager])
+
+        self.page.state['filter_rarity'] = 'Rare'  # a row filter expands the candidate cards
+        asyncio.run(self.page.apply_filters())
+        eager = self.page._build_query(False).run(build_collector_rows(self.cards, owned, 'EN')).items
+        self.assertEqual([_rows([r]) for r in self.page.state['filtered_items']], [_rows([r]) for r in eager])
+        self.assertEqual(len(eager), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
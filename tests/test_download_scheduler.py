@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.services.image_manager import ImageManager, DownloadError
+from src.services.download_scheduler import DownloadScheduler, DownloadPriority
+
+
+class _FakeManager(ImageManager):
+    """Records fetch order and fails according to a script instead of hitting the network."""
+
+    def __init__(self, tmp):
+        super().__init__(images_dir=os.path.join(tmp, "images"), index_file=os.path.join(tmp, "index.json"))
+        self.fetched = []
+        self.failures = {}
+
+    async def fetch_image(self, session, card_id, url, local_path):
+        await asyncio.sleep(0)
+        remaining = self.failures.get(card_id, 0)
+        if remaining:
+            self.failures[card_id] = remaining - 1
+            raise DownloadError("HTTP 503", retryable=True)
+        if card_id < 0:
+            raise DownloadError("HTTP 404", retryable=False)
+        self.fetched.append(card_id)
+        with open(local_path, 'wb') as f:
+            f.write(b'x')
+        return local_path
+
+
+class TestDownloadScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.manager = _FakeManager(self.tmp)
+        self.patcher = patch('src.services.download_scheduler.image_manager', self.manager)
+        self.patcher.start()
+        self.queue_file = os.path.join(self.tmp, "queue.json")
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _scheduler(self, **kwargs):
+        kwargs.setdefault('host_rate', 0)
+        kwargs.setdefault('backoff_base', 0.001)
+        return DownloadScheduler(queue_file=self.queue_file, **kwargs)
+
+    def test_priority_order(self):
+        async def scenario():
+            scheduler = self._scheduler(concurrency=1)
+            bulk = scheduler.submit({1: 'http://a/1', 2: 'http://a/2'}, DownloadPriority.BULK)
+            visible = scheduler.submit({3: 'http://a/3'}, DownloadPriority.VISIBLE)
+            # Re-submitting a bulk job as visible promotes it
+            promoted = scheduler.submit({2: 'http://a/2'}, DownloadPriority.VISIBLE)
+            await asyncio.gather(bulk.wait(), visible.wait(), promoted.wait())
+            await scheduler.shutdown()
+            return bulk.succeeded
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+        self.assertEqual(self.manager.fetched, [3, 2, 1])
+
+    def test_retry_with_backoff(self):
+        self.manager.failures = {5: 2}
+
+        async def scenario():
+            scheduler = self._scheduler()
+            count = await scheduler.download({5: 'http://a/5', -1: 'http://a/missing'})
+            await scheduler.shutdown()
+            return count
+
+        self.assertEqual(asyncio.run(scenario()), 1)
+        self.assertEqual(self.manager.fetched, [5])
+
+    def test_cancel_group(self):
+        async def scenario():
+            scheduler = self._scheduler(concurrency=1)
+            blocker = scheduler.submit({1: 'http://a/1'}, DownloadPriority.VISIBLE)
+            page = scheduler.submit({2: 'http://a/2', 3: 'http://a/3'}, DownloadPriority.PREFETCH, group='page')
+            other = scheduler.submit({3: 'http://a/3'}, DownloadPriority.PREFETCH, group='other')
+            cancelled = scheduler.cancel('page')
+            await asyncio.gather(blocker.wait(), page.wait(), other.wait())
+            await scheduler.shutdown()
+            return cancelled
+
+        self.assertEqual(asyncio.run(scenario()), 1)
+        self.assertEqual(self.manager.fetched, [1, 3])
+
+    def test_queue_persists_and_resumes(self):
+        async def interrupted():
+            scheduler = self._scheduler(concurrency=1)
+            scheduler.submit({7: 'http://a/7', 8: 'http://a/8'}, DownloadPriority.BULK, high_res=True)
+            scheduler.submit({9: 'http://a/9'}, DownloadPriority.TOOLTIP, high_res=True)
+            await scheduler.shutdown()
+
+        asyncio.run(interrupted())
+        with open(self.queue_file) as f:
+            saved = json.load(f)
+        self.assertEqual({item['id'] for item in saved}, {7, 8})  # only bulk jobs outlive the session
+
+        async def resumed():
+            scheduler = self._scheduler()
+            await scheduler.resume()
+            while scheduler.pending_count():
+                await asyncio.sleep(0.01)
+            await scheduler.shutdown()
+
+        asyncio.run(resumed())
+        self.assertTrue(self.manager.image_exists(7, high_res=True))
+        self.assertTrue(self.manager.image_exists(8, high_res=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
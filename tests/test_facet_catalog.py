@@ -0,0 +1,69 @@
+import unittest
+from dataclasses import dataclass
+
+from src.core.models import ApiCard, ApiCardSet
+from src.services.facet_catalog import FacetCatalog, facet_catalog
+from src.services.query_engine import Query, VECTOR_MIN_ROWS
+
+
+def _card(card_id, name, card_type, race, archetype=None, sets=()):
+    return ApiCard(id=card_id, name=name, type=card_type, frameType="effect", desc="", race=race, archetype=archetype,
+                   card_sets=[ApiCardSet(set_name=n, set_code=c, set_rarity="Common") for c, n in sets])
+
+
+@dataclass
+class Row:
+    api_card: ApiCard
+
+
+class TestFacetCatalog(unittest.TestCase):
+    def setUp(self):
+        self.cards = [
+            _card(10, "Blue-Eyes White Dragon", "Normal Monster", "Dragon", "Blue-Eyes",
+                  [("LOB-EN001", "Legend of Blue Eyes White Dragon"), ("SDK-E001", "Starter Deck: Kaiba"),
+                   ("LOB-DE001", "Legend of Blue Eyes White Dragon")]),
+            _card(20, "Dark Magician", "Normal Monster", "Spellcaster", "Dark Magician",
+                  [("LOB-EN005", "Legend of Blue Eyes White Dragon")]),
+            _card(30, "Pot of Greed", "Spell Card", "Normal", sets=[("SRL-EN050", "Magic Ruler")]),
+            _card(40, "Skill", "Skill Card", "Kaiba"),
+        ]
+        self.catalog = FacetCatalog(self.cards)
+
+    def test_options(self):
+        options = self.catalog.options()
+        self.assertEqual(options['available_sets'], ["Legend of Blue Eyes White Dragon | LOB", "Magic Ruler | SRL",
+                                                     "Starter Deck: Kaiba | SDK"])
+        self.assertEqual(options['available_monster_races'], ["Dragon", "Spellcaster"])
+        self.assertEqual(options['available_st_races'], ["Normal"])
+        self.assertEqual(options['available_archetypes'], ["Blue-Eyes", "Dark Magician"])
+
+        present = self.catalog.present([30, 99])
+        self.assertEqual(present['available_monster_races'], [])
+        self.assertEqual(present['available_sets'], ["Magic Ruler | SRL"])
+
+    def test_counts(self):
+        counts = self.catalog.counts([10, 20, 10, 99])  # rows repeat cards; unknown ids are skipped
+        self.assertEqual(counts['sets'], {"Legend of Blue Eyes White Dragon | LOB": 3, "Starter Deck: Kaiba | SDK": 2})
+        self.assertEqual(counts['monster_races'], {"Dragon": 2, "Spellcaster": 1})
+        self.assertEqual(counts['st_races'], {})
+        self.assertNotIn('sets', self.catalog.counts([10], sets=False))
+        self.assertEqual(self.catalog.counts([])['archetypes'], {})
+
+    def test_counts_of_query_results(self):
+        cards = [_card(i, f"Card {i}", "Effect Monster" if i % 3 else "Trap Card", ["Dragon", "Warrior"][i % 2],
+                       sets=[(f"S{i % 5}-EN001", f"Set {i % 5}")])
+                 for i in range(VECTOR_MIN_ROWS + 10)]
+        catalog = facet_catalog.get(cards)
+        self.assertIs(facet_catalog.get(cards), catalog)
+
+        for rows in ([Row(c) for c in cards], [Row(c) for c in cards[:20]]):  # columnar and row-by-row
+            result = Query().card_filters({'filter_monster_race': 'Dragon'}).run(rows)
+            expected = [r.api_card.id for r in result.items]
+            self.assertEqual(result.card_ids().tolist(), expected)
+            counts = catalog.counts(result.card_ids())
+            self.assertEqual(counts['monster_races'], {"Dragon": len(expected)})
+            self.assertEqual(sum(counts['sets'].values()), len(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+
+from src.ui.components.filter_runner import FilterRunner
+
+
+class TestFilterRunner(unittest.TestCase):
+    def setUp(self):
+        self.state = {'atk': 0}
+        self.rendered = []
+        self.started = []
+
+    async def apply(self):
+        atk = self.state['atk']
+        self.started.append(atk)
+        await asyncio.sleep(0.05)  # e.g. waiting on image downloads
+        self.rendered.append(atk)
+
+    def test_burst_of_changes_renders_once(self):
+        async def drag():
+            runner = FilterRunner(self.apply, 'test', delay=0.02)
+            for atk in range(0, 1000, 50):
+                self.state['atk'] = atk
+                await runner.schedule()
+            await asyncio.sleep(0.15)
+            return runner
+
+        runner = asyncio.run(drag())
+        self.assertEqual(self.started, [950])
+        self.assertEqual(self.rendered, [950])
+        self.assertIsNotNone(runner.last_ms)
+
+    def test_newer_state_cancels_running_evaluation(self):
+        async def type_ahead():
+            runner = FilterRunner(self.apply, 'test')
+            first = asyncio.create_task(runner.run())
+            await asyncio.sleep(0.01)  # the first evaluation is now waiting mid-way
+            self.state['atk'] = 2000
+            second = asyncio.create_task(runner.run())
+            await asyncio.sleep(0.01)
+            superseded_while_running = runner.superseded
+            await asyncio.gather(first, second)
+            return superseded_while_running, runner
+
+        superseded, runner = asyncio.run(type_ahead())
+        self.assertEqual(self.started, [0, 2000])
+        self.assertEqual(self.rendered, [2000])
+        self.assertEqual(superseded, 1)
+        self.assertEqual(runner.superseded, 0)  # reset once the latest evaluation rendered
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import unittest
+
+from PIL import Image
+
+from image_fixtures import ImageManagerTestCase, jpeg_bytes
+
+
+class TestImageAtlas(ImageManagerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.colors = {1: 'red', 2: 'green', 3: 'blue'}
+        for image_id, color in self.colors.items():
+            self.manager._write_file(self.manager.get_local_path(image_id), jpeg_bytes(color=color))
+
+    def test_atlas_contains_available_images(self):
+        atlas = asyncio.run(self.manager.get_atlas([1, 2, 3, 99], 'grid'))
+
+        self.assertEqual(set(atlas['map']), {'1', '2', '3'})
+        self.assertTrue(atlas['url'].startswith('/images/atlas/'))
+
+        sprite = os.path.join(self.manager.images_dir, atlas['url'][len('/images/'):])
+        with Image.open(sprite) as img:
+            self.assertEqual(img.size, (atlas['width'], atlas['height']))
+            col, row = atlas['map']['2']
+            x = col * atlas['cell_width'] + atlas['cell_width'] // 2
+            y = row * atlas['cell_height'] + atlas['cell_height'] // 2
+            r, g, b = img.convert('RGB').getpixel((x, y))
+            self.assertGreater(g, 100)
+            self.assertLess(r, 60)
+
+    def test_atlas_is_keyed_by_ids_and_cached(self):
+        first = asyncio.run(self.manager.get_atlas([3, 1, 2], 'grid'))
+        second = asyncio.run(self.manager.get_atlas([1, 2, 3], 'grid'))
+        self.assertIs(first, second)
+        self.assertIs(self.manager.get_cached_atlas([2, 3, 1], 'grid'), first)
+        self.assertIsNone(self.manager.get_cached_atlas([1, 2], 'grid'))
+
+        other_size = asyncio.run(self.manager.get_atlas([1, 2, 3], 'list'))
+        self.assertNotEqual(other_size['url'], first['url'])
+
+    def test_atlas_style(self):
+        atlas = asyncio.run(self.manager.get_atlas([1, 2, 3], 'grid'))
+        style = self.manager.get_atlas_style(atlas, 1)
+        self.assertIn(atlas['url'], style)
+        self.assertIn('background-size: 300% 100%', style)
+        self.assertIsNone(self.manager.get_atlas_style(atlas, 99))
+        self.assertIsNone(self.manager.get_atlas_style(None, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.core.config import ConfigManager
+from src.core.models import Collection, CollectionCard, CollectionVariant, CollectionEntry
+from src.services.image_manager import owned_collection_image_paths
+
+from image_fixtures import ImageManagerTestCase, jpeg_bytes
+
+
+class TestImageCacheBudget(ImageManagerTestCase):
+    def _add_card(self, card_id: int, atime: int, high_res: bool = False):
+        path = self.manager.get_local_path(card_id, high_res)
+        self.manager._write_file(path, jpeg_bytes(168, 246, noise=True))
+        self.manager.index.get(path)['atime'] = atime
+        return os.path.getsize(path)
+
+    def _evict(self, budget_bytes: int, protected=()):
+        budget_mb = budget_bytes / (1024 * 1024)
+        with patch('src.services.image_manager.config_manager') as config:
+            config.get_image_cache_budget_mb.side_effect = lambda cls: budget_mb if cls == 'small' else 0
+            return self.manager._evict({self.manager.index._key(p) for p in protected})
+
+    def test_classify(self):
+        self.assertEqual(self.manager._classify(self.manager.index._key(self.manager.get_local_path(1))), 'small')
+        self.assertEqual(self.manager._classify(self.manager.index._key(self.manager.get_local_path(1, True))), 'high_res')
+        self.assertEqual(self.manager._classify(self.manager.index._key(self.manager.get_thumbnail_path(1, 400))), 'high_res')
+        self.assertEqual(self.manager._classify(self.manager.index._key(self.manager.get_set_image_path('LOB'))), 'sets')
+
+    def test_evicts_least_recently_used_first(self):
+        size = self._add_card(1, atime=100)
+        self._add_card(2, atime=300)
+        self._add_card(3, atime=200)
+        asyncio.run(self.manager.generate_card_thumbnails(1))
+
+        freed = self._evict(budget_bytes=int(size * 2.5))
+
+        self.assertGreater(freed, 0)
+        self.assertFalse(self.manager.image_exists(1))
+        self.assertFalse(self.manager.thumbnail_exists(1, 168))
+        self.assertTrue(self.manager.image_exists(2))
+        self.assertTrue(self.manager.image_exists(3))
+        self.assertLessEqual(self.manager.get_cache_usage()['small'], size * 2.5)
+
+    def test_protected_images_are_kept(self):
+        size = self._add_card(1, atime=100)
+        self._add_card(2, atime=200)
+
+        self._evict(budget_bytes=int(size * 1.5), protected=[self.manager.get_local_path(1)])
+
+        self.assertTrue(self.manager.image_exists(1))
+        self.assertFalse(self.manager.image_exists(2))
+
+    def test_touch_refreshes_access_time(self):
+        self._add_card(1, atime=100)
+        self.manager.get_card_image_url(1, 'grid')
+        self.assertGreater(self.manager.index.get(self.manager.get_local_path(1))['atime'], 100)
+
+    def test_high_res_budget_is_opt_in(self):
+        config = ConfigManager(config_file=os.path.join(self.tmp, "missing.json"))
+        self.assertEqual(config.get_image_cache_budget_mb('high_res'), 0)
+        self.assertGreater(config.get_image_cache_budget_mb('small'), 0)
+
+    def test_owned_paths_are_cached_per_collection_version(self):
+        persistence = MagicMock(collection_version=0)
+        persistence.list_collections.return_value = ['a.json']
+
+        def load(filename, mark=True):
+            return Collection(name="A", cards=[CollectionCard(card_id=7, name="Card", variants=[
+                CollectionVariant(variant_id="v", set_code="LOB-EN001", rarity="Common",
+                                  entries=[CollectionEntry(language="EN", condition="Near Mint", quantity=1)])])])
+        persistence.load_collection.side_effect = load
+
+        with patch('src.services.image_manager.persistence', persistence), \
+                patch('src.services.image_manager._owned_paths_cache', (-1, [])):
+            paths = owned_collection_image_paths()
+            self.assertEqual(len(paths), 2)  # both resolutions of card 7
+            self.assertIs(owned_collection_image_paths(), paths)
+            self.assertEqual(persistence.load_collection.call_count, 1)
+            persistence.load_collection.assert_called_with('a.json', mark=False)  # reading leaves the version alone
+
+            persistence.collection_version += 1  # a collection changed
+            self.assertEqual(owned_collection_image_paths(), paths)
+            self.assertEqual(persistence.load_collection.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
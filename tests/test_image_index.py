@@ -0,0 +1,79 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.services.image_manager import ImageMetadataIndex
+
+from image_fixtures import ImageManagerTestCase, jpeg_bytes
+
+
+class TestImageMetadataIndex(ImageManagerTestCase):
+    def test_write_fills_index(self):
+        path = self.manager.get_local_path(123)
+        data = jpeg_bytes(100, 150)
+        self.manager._write_file(path, data)
+
+        meta = self.manager.get_image_metadata(path)
+        self.assertEqual(meta['width'], 100)
+        self.assertEqual(meta['height'], 150)
+        self.assertEqual(meta['size'], len(data))
+        self.assertEqual(len(meta['hash']), 40)
+
+    def test_index_persists(self):
+        path = self.manager.get_local_path(5)
+        self.manager._write_file(path, jpeg_bytes(10, 20))
+        self.manager.index.save()
+
+        reloaded = ImageMetadataIndex(self.index_file)
+        self.assertEqual(reloaded.get(path)['height'], 20)
+
+    def test_resolution_check_uses_index_without_decoding(self):
+        path = self.manager.get_set_image_path("LOB")
+        self.manager._write_file(path, jpeg_bytes(200, 300))
+
+        with patch('src.services.image_manager.Image.open', side_effect=AssertionError("decoded")):
+            self.assertTrue(self.manager.set_image_meets_resolution("LOB"))
+            self.assertTrue(self.manager.check_image_resolution(path))
+
+    def test_set_image_url_changes_when_replaced(self):
+        path = self.manager.get_set_image_path("LOB")
+        self.manager._write_file(path, jpeg_bytes(200, 300))
+        first = self.manager.get_set_image_url("LOB")
+        self.assertTrue(first.startswith("/sets/LOB.jpg?v="))
+
+        self.manager._write_file(path, jpeg_bytes(300, 450))
+        self.assertNotEqual(self.manager.get_set_image_url("LOB"), first)
+
+    def test_low_resolution_and_unindexed(self):
+        self.manager._write_file(self.manager.get_set_image_path("LOW"), jpeg_bytes(50, 100))
+        self.assertFalse(self.manager.set_image_meets_resolution("LOW"))
+        self.assertIsNone(self.manager.set_image_meets_resolution("MISSING"))
+
+    def test_legacy_file_indexed_on_check(self):
+        path = self.manager.get_set_image_path("OLD")
+        with open(path, 'wb') as f:
+            f.write(jpeg_bytes(300, 400))
+        self.assertIsNone(self.manager.get_image_metadata(path))
+
+        self.assertTrue(self.manager.check_image_resolution(path))
+        self.assertEqual(self.manager.get_image_metadata(path)['height'], 400)
+
+    def test_delete_removes_entry(self):
+        path = self.manager.get_local_path(7)
+        self.manager._write_file(path, jpeg_bytes(10, 10))
+        self.manager.delete_image_file(path)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(self.manager.get_image_metadata(path))
+
+    def test_stale_entry_detected(self):
+        path = self.manager.get_local_path(8)
+        self.manager._write_file(path, jpeg_bytes(10, 10))
+        with open(path, 'wb') as f:
+            f.write(jpeg_bytes(10, 300))
+        meta = self.manager.get_image_metadata(path)
+        self.assertFalse(self.manager.index.is_current(path, meta))
+        self.assertTrue(self.manager.check_image_resolution(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
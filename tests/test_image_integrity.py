@@ -0,0 +1,72 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from src.services.image_manager import find_broken_images
+
+from image_fixtures import ImageManagerTestCase, jpeg_bytes
+
+
+class _FakeResponse:
+    def __init__(self, data: bytes, content_length=None, headers=None):
+        self._data = data
+        self.content_length = content_length
+        self.headers = headers or {}
+
+    async def read(self):
+        return self._data
+
+
+class TestImageIntegrity(ImageManagerTestCase):
+    def test_write_rejects_truncated_data(self):
+        path = self.manager.get_local_path(1)
+        data = jpeg_bytes(100, 150)
+
+        self.assertFalse(self.manager._write_file(path, data[:len(data) // 2]))
+        self.assertFalse(os.path.exists(path))
+
+        self.assertTrue(self.manager._write_file(path, data))
+        self.assertTrue(os.path.exists(path))
+        # No temp files left behind
+        self.assertEqual(os.listdir(self.manager.images_dir), ["1.jpg"])
+
+    def test_content_length_mismatch(self):
+        data = jpeg_bytes(10, 10)
+        short = asyncio.run(self.manager._read_verified(_FakeResponse(data, len(data) + 10), 1))
+        self.assertIsNone(short)
+        ok = asyncio.run(self.manager._read_verified(_FakeResponse(data, len(data)), 1))
+        self.assertEqual(ok, data)
+        # Compressed bodies cannot be compared to Content-Length
+        gz = asyncio.run(self.manager._read_verified(_FakeResponse(data, 5, {'Content-Encoding': 'gzip'}), 1))
+        self.assertEqual(gz, data)
+
+    def test_find_broken_images(self):
+        good = os.path.join(self.tmp, "good.jpg")
+        bad = os.path.join(self.tmp, "bad.jpg")
+        data = jpeg_bytes(50, 50)
+        with open(good, 'wb') as f:
+            f.write(data)
+        with open(bad, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        self.assertEqual(find_broken_images([good, bad, os.path.join(self.tmp, "missing.jpg")]),
+                         [bad, os.path.join(self.tmp, "missing.jpg")])
+
+    def test_verify_images_removes_broken_files(self):
+        self.manager._write_file(self.manager.get_local_path(10), jpeg_bytes(270, 395))
+        data = jpeg_bytes(600, 875)
+        with open(self.manager.get_local_path(11, high_res=True), 'wb') as f:
+            f.write(data[:100])
+
+        progress = MagicMock()
+        broken = asyncio.run(self.manager.verify_images(progress_callback=progress))
+
+        self.assertEqual(broken, [(11, True)])
+        self.assertFalse(self.manager.image_exists(11, high_res=True))
+        self.assertTrue(self.manager.image_exists(10))
+        progress.assert_called_with(1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
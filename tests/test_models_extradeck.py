@@ -1,5 +1,5 @@
 import pytest
-from src.core.models import ApiCard
+from src.core.models import ApiCard, ApiCardImage, category_mask
 
 class TestApiCardExtraDeck:
     def create_card(self, type_str: str) -> ApiCard:
@@ -44,3 +44,19 @@ class TestApiCardExtraDeck:
         assert self.create_card("Fusion Pendulum Effect Monster").is_extra_deck is True
         # XYZ Pendulum
         assert self.create_card("XYZ Pendulum Effect Monster").is_extra_deck is True
+
+    def test_derived_attributes(self):
+        card = ApiCard(id=7, name="Stardust DRAGON", type="Synchro Monster", frameType="synchro", desc="",
+                       typeline=["Dragon", "Synchro", "Effect"])
+        assert card.categories & category_mask(["Synchro", "Effect"]) == category_mask(["Synchro", "Effect"])
+        assert not card.categories & category_mask(["Normal", "Fusion"])
+        assert card.matches_category("Synchro") and not card.matches_category("Normal")
+        assert card.name_lower == "stardust dragon"
+        assert card.get_best_image_id() == 7
+
+        # Replaced or extended fields are derived again
+        card.type = "Fusion Monster"
+        card.typeline = ["Dragon", "Fusion"]
+        assert card.matches_category("Fusion") and card.matches_category("Normal")
+        card.card_images.append(ApiCardImage(id=70, image_url="", image_url_small=""))
+        assert card.get_best_image_id() == 70
@@ -0,0 +1,37 @@
+from src.core.models import ApiCard, ApiCardPrice, ApiCardSet
+
+class TestApiCardPrices:
+    def create_card(self, **prices) -> ApiCard:
+        return ApiCard(
+            id=123,
+            name="Test Card",
+            type="Effect Monster",
+            frameType="effect",
+            desc="desc",
+            card_prices=[ApiCardPrice(**prices)] if prices else []
+        )
+
+    def test_lowest_and_tcg_price(self):
+        card = self.create_card(cardmarket_price="2.50", tcgplayer_price="1.75", coolstuffinc_price="3.00")
+        assert card.lowest_price == 1.75
+        assert card.tcg_price == 1.75
+
+        # Missing and malformed prices are skipped
+        card = self.create_card(cardmarket_price="4.10", tcgplayer_price="n/a")
+        assert card.lowest_price == 4.10
+        assert card.tcg_price == 0.0
+        assert self.create_card().lowest_price == 0.0
+
+    def test_replaced_prices_are_reparsed(self):
+        card = self.create_card(cardmarket_price="2.50")
+        card.card_prices = [ApiCardPrice(cardmarket_price="0.90")]
+        assert card.lowest_price == 0.90
+        assert card.model_copy().lowest_price == 0.90
+
+    def test_set_price(self):
+        s = ApiCardSet(set_name="Legend of Blue Eyes White Dragon", set_code="LOB-EN001",
+                       set_rarity="Ultra Rare", set_price="12.34")
+        assert s.price == 12.34
+        s.set_price = "bad"
+        assert s.price == 0.0
+        assert "price" not in s.model_dump()
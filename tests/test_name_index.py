@@ -0,0 +1,51 @@
+import unittest
+
+from src.core.models import ApiCard
+from src.services.name_index import NameIndex, normalize_name, name_similarity
+from src.services.search_index import CardSearchIndex
+from src.services.query_engine import Query
+
+
+def _card(card_id, name):
+    return ApiCard(id=card_id, name=name, type="Normal Monster", frameType="normal", desc="")
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.cards = [_card(1, "Blue-Eyes White Dragon"), _card(2, "Blue-Eyes Ultimate Dragon"),
+                      _card(3, "Dark Magician"), _card(4, "Dark Magician Girl"), _card(5, "Pot of Greed")]
+        self.index = NameIndex((c, c.name) for c in self.cards)
+
+    def test_normalize(self):
+        self.assertEqual(normalize_name("Blue-Eyes White Dragon"), "blueeyeswhitedragon")
+        self.assertEqual(normalize_name("Élégant Égérie"), "elegantegerie")
+        self.assertEqual(normalize_name(None), "")
+
+    def test_typos_rank_best_first(self):
+        found = self.index.search("Blue-Eyes Whtie Dragon")
+        self.assertEqual(found[0][0].id, 1)
+        self.assertGreater(found[0][1], found[1][1])
+
+        self.assertEqual(self.index.best("dark magican")[0].id, 3)
+        self.assertIsNone(self.index.best("Mirror Force"))
+        self.assertEqual(self.index.search(""), [])
+
+    def test_exact_and_similarity(self):
+        self.assertEqual(self.index.exact("pot of greed").id, 5)
+        self.assertIsNone(self.index.exact("pot of"))
+        self.assertEqual(name_similarity("Dark Magician", "dark-magician"), 1.0)
+        self.assertLess(name_similarity("Raigeki", "Hinotama"), 0.2)
+
+    def test_search_box_falls_back_to_similar_names(self):
+        index = CardSearchIndex()
+        index.ensure(self.cards)
+        self.assertEqual(index.similar_names("Blue-Eyes Whtie Dragon")[0], 1)
+
+        res = Query(card='').search("Blue-Eyes Whtie Dragon").run(self.cards)
+        self.assertIn(1, [c.id for c in res.items])
+        res = Query(card='').search("Blue-Eyes White").run(self.cards)
+        self.assertEqual([c.id for c in res.items], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
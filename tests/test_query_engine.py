@@ -0,0 +1,215 @@
+import unittest
+from dataclasses import dataclass
+
+from src.core.models import ApiCard, ApiCardSet
+from src.core.persistence import persistence
+from src.services.card_columns import RowView, card_columns
+from src.services.search_index import GROUP_NAME, GROUP_TEXT
+from src.services.query_engine import Query, spec_narrows, card_sort_key, card_printings, card_rarities, COST_TEXT, COST_FLAG, VECTOR_MIN_ROWS
+
+
+@dataclass
+class Row:
+    api_card: ApiCard
+    quantity: int
+    set_code: str = ""
+
+
+def _card(card_id, name, card_type="Effect Monster", **kwargs):
+    return ApiCard(id=card_id, name=name, type=card_type, frameType="effect", desc=kwargs.pop('desc', ''), **kwargs)
+
+
+class TestQueryEngine(unittest.TestCase):
+    def setUp(self):
+        self.cards = [
+            _card(1, "Blue-Eyes White Dragon", "Normal Monster", attribute="LIGHT", race="Dragon", level=8, atk=3000,
+                  card_sets=[ApiCardSet(set_name="Legend of Blue Eyes White Dragon", set_code="LOB-EN001", set_rarity="Ultra Rare")]),
+            _card(2, "Dark Magician", "Normal Monster", attribute="DARK", race="Spellcaster", level=7, atk=2500,
+                  card_sets=[ApiCardSet(set_name="Starter Deck Yugi", set_code="SDY-006", set_rarity="Ultra Rare")]),
+            _card(3, "Pot of Greed", "Spell Card", race="Normal", desc="Draw 2 cards.",
+                  card_sets=[ApiCardSet(set_name="Legend of Blue Eyes White Dragon", set_code="LOB-EN119", set_rarity="Rare")]),
+        ]
+        self.rows = [Row(c, q) for c, q in zip(self.cards, (3, 0, 1))]
+
+    def test_card_filters(self):
+        state = {'filter_attr': 'DARK', 'filter_card_type': ['Monster']}
+        res = Query().card_filters(state).run(self.rows)
+        self.assertEqual([r.api_card.id for r in res.items], [2])
+
+        state = {'filter_atk_min': 2600, 'filter_atk_max': 5000}
+        self.assertEqual([r.api_card.id for r in Query().card_filters(state).run(self.rows).items], [1])
+
+        state = {'filter_st_race': 'Normal'}
+        self.assertEqual([c.id for c in Query(card='').card_filters(state).run(self.cards).items], [3])
+
+    def test_search_and_printings(self):
+        res = Query().search("draw", (GROUP_NAME, GROUP_TEXT)).run(self.rows)
+        self.assertEqual([r.api_card.id for r in res.items], [3])
+
+        res = Query().printings("Legend of Blue Eyes White Dragon | LOB", lambda r: card_printings(r.api_card)).run(self.rows)
+        self.assertEqual([r.api_card.id for r in res.items], [1, 3])
+
+        res = Query().rarity("ultra rare", lambda r: card_rarities(r.api_card)).run(self.rows)
+        self.assertEqual([r.api_card.id for r in res.items], [1, 2])
+
+    def test_sort_and_window(self):
+        query = Query().order_by(card_sort_key('ATK'), reverse=True)
+        res = query.run(self.rows, page=2, page_size=2)
+        self.assertEqual(res.total, 3)
+        self.assertEqual(res.total_pages, 2)
+        self.assertEqual([r.api_card.id for r in res.page_items], [3])
+
+        res = Query().order_by(card_sort_key('Quantity', quantity='quantity')).run(self.rows)
+        self.assertEqual([r.quantity for r in res.items], [0, 1, 3])
+
+    def test_cheap_predicates_run_first_and_short_circuit(self):
+        calls = []
+
+        def expensive(row):
+            calls.append(row.api_card.id)
+            return True
+
+        query = Query()
+        query.where(expensive, COST_TEXT, 0.5)
+        query.where(lambda r: r.quantity > 0, COST_FLAG, 0.5)
+        res = query.run(self.rows)
+
+        self.assertEqual(res.total, 2)
+        self.assertEqual(calls, [1, 3])  # never evaluated for the row rejected by the cheap test
+
+    def test_transform_drops_rows(self):
+        res = Query().transform(lambda r: r if r.quantity else None).run(self.rows)
+        self.assertEqual([r.api_card.id for r in res.items], [1, 3])
+
+
+class TestColumnarQuery(unittest.TestCase):
+    """Large sources go through the card columns; results must match row-by-row evaluation."""
+
+    def setUp(self):
+        types = ["Normal Monster", "Effect Monster", "Synchro Monster", "XYZ Monster", "Spell Card", "Trap Card"]
+        attributes = ["DARK", "LIGHT", "FIRE", None]
+        self.rows = []
+        for i in range(VECTOR_MIN_ROWS + 100):
+            card_type = types[i % len(types)]
+            monster = "Monster" in card_type
+            card = _card(i, f"Card {i % 50}", card_type,
+                         attribute=attributes[i % 4] if monster else None,
+                         race=["Dragon", "Warrior"][i % 2] if monster else "Continuous",
+                         archetype=f"Arch {i % 7}",
+                         level=(i % 12) + 1 if monster else None,
+                         atk=(i * 37) % 4000 if monster and i % 9 else None,
+                         **{'def': (i * 53) % 4000 if monster else None})
+            self.rows.append(Row(card, i % 5, f"S{i % 13:02d}-EN{i % 7:03d}"))
+
+    def _both(self, build):
+        columnar = build(Query()).run(self.rows).items
+        query = build(Query())
+        query._resolve_search(self.rows)
+        python = query._run_rows(self.rows)
+        return [r.api_card.id for r in columnar], [r.api_card.id for r in python], columnar
+
+    def test_filters_match(self):
+        states = [
+            {'filter_attr': 'DARK'},
+            {'filter_monster_race': 'Dragon', 'filter_level': 4},
+            {'filter_st_race': 'Continuous'},
+            {'filter_archetype': 'Arch 3', 'filter_card_type': ['Spell', 'Trap']},
+            {'filter_atk_min': 1000, 'filter_atk_max': 2500, 'filter_def_min': 0, 'filter_def_max': 3000},
+            {'filter_monster_category': ['Effect']},
+            {'filter_monster_category': ['Synchro', 'Effect']},
+        ]
+        for state in states:
+            for all_categories in (True, False):
+                columnar, python, _ = self._both(lambda q: q.card_filters(state, all_categories=all_categories))
+                self.assertEqual(columnar, python, state)
+
+    def test_search_matches(self):
+        for text in ("card 1", "card 4 monster"):
+            columnar, python, items = self._both(lambda q: q.search(text).card_filters({'filter_attr': 'DARK'}))
+            self.assertEqual(columnar, python, text)
+            self.assertTrue(columnar)
+            self.assertTrue(all(r.api_card.name.split()[1].startswith(text.split()[1]) for r in items))
+
+    def test_refinement_reuses_earlier_results(self):
+        columns = card_columns.get(self.rows)[1]
+        columns.results.clear()
+        steps = [
+            {'search': "card 1", 'filter_atk_min': 0},
+            {'search': "card 12", 'filter_atk_min': 0},                       # longer term
+            {'search': "card 12", 'filter_atk_min': 1000},                    # tighter range
+            {'search': "card 12", 'filter_atk_min': 1000, 'filter_attr': 'DARK'},  # extra filter
+            {'search': "card 1", 'filter_atk_min': 0},                        # back to the start
+            {'search': "card", 'filter_atk_min': 0},                          # wider than anything seen
+        ]
+        for step in steps:
+            state = dict(step, filter_atk_max=5000)
+            columnar, python, _ = self._both(lambda q: q.search(state['search']).card_filters(state).value_range('quantity', 1, 4))
+            self.assertEqual(columnar, python, step)
+        self.assertEqual(len(columns.results), len(steps) - 1)
+
+        old = {('s',): ('prefix', ('card', '1'))}
+        self.assertTrue(spec_narrows({('s',): ('prefix', ('card', '12'))}, old))
+        self.assertFalse(spec_narrows({('s',): ('prefix', ('card',))}, old))
+        self.assertTrue(spec_narrows({('s',): ('prefix', ('card', '1')), 'atk': ('range', (0, 10))}, old))
+        self.assertFalse(spec_narrows({'atk': ('range', (0, 10))}, old))
+
+    def test_result_cache(self):
+        columns = card_columns.get(self.rows)[1]
+        columns.query_results.clear()
+
+        def run(low=1):
+            return Query().card_filters({'filter_attr': 'DARK'}).value_range('quantity', low, 4).sort('ATK', True).run(self.rows).items
+
+        first = run()
+        self.assertIs(run(), first)
+        self.assertIsNot(run(2), first)
+
+        # Rows changed in place: the collection version keys row-level results
+        first[0].quantity = 0
+        persistence.mark_collections_changed()
+        self.assertIsNot(run(), first)
+        self.assertEqual([r.api_card.id for r in run()],
+                         [r.api_card.id for r in Query().card_filters({'filter_attr': 'DARK'}).value_range('quantity', 1, 4)
+                          .sort('ATK', True)._run_rows(self.rows)])
+
+        # Card-level results survive collection changes
+        card_level = Query().card_filters({'filter_attr': 'DARK'}).sort('Name').run(self.rows).items
+        persistence.mark_collections_changed()
+        self.assertIs(Query().card_filters({'filter_attr': 'DARK'}).sort('Name').run(self.rows).items, card_level)
+
+        # A predicate capturing state without a key is never cached
+        limit = 2
+        opaque = Query().where(lambda r: r.quantity < limit)
+        self.assertIsNone(opaque._cache_key())
+        self.assertIsNotNone(Query().where(lambda r: r.quantity < limit, key=('below', limit))._cache_key())
+
+    def test_sorts_match_and_map_lazily(self):
+        for sort_by in ('Name', 'ATK', 'DEF', 'Level', 'Newest'):
+            for reverse in (False, True):
+                columnar, python, items = self._both(
+                    lambda q: q.card_filters({'filter_card_type': ['Monster']}).sort(sort_by, reverse))
+                self.assertEqual(columnar, python, (sort_by, reverse))
+                self.assertIsInstance(items, RowView)
+
+        # Row fields: Price, Set Code and Rarity use precomputed permutations, Quantity is sorted per query
+        fields = {'price': lambda r: r.api_card.id % 17, 'quantity': 'quantity', 'set_code': 'set_code',
+                  'rarity': lambda r: r.api_card.id % 5}
+        for sort_by in ('Price', 'Set Code', 'Rarity', 'Quantity'):
+            for reverse in (False, True):
+                columnar, python, _ = self._both(lambda q: q.card_filters({'filter_attr': 'DARK'}).sort(sort_by, reverse, **fields))
+                self.assertEqual(columnar, python, (sort_by, reverse))
+        self.assertIn((('Set Code', 'set_code'), True), card_columns.get(self.rows)[1]._permutations)
+
+    def test_row_predicates_and_transforms(self):
+        def build(q):
+            q.card_filters({'filter_attr': 'LIGHT'})
+            q.value_range('quantity', 1, 3)
+            q.transform(lambda r: Row(r.api_card, r.quantity * 10) if r.quantity != 2 else None)
+            return q.sort('ATK', True)
+        columnar, python, items = self._both(build)
+        self.assertEqual(columnar, python)
+        self.assertTrue(all(r.quantity in (10, 30) for r in items))
+
+
+if __name__ == '__main__':
+    unittest.main()
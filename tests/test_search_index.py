@@ -0,0 +1,66 @@
+import unittest
+
+from src.core.models import ApiCard, ApiCardSet
+from src.services.search_index import CardSearchIndex, tokenize, CARD_GROUPS, GROUP_NAME
+
+
+def _card(card_id, name, desc="", sets=()):
+    return ApiCard(id=card_id, name=name, type="Effect Monster", frameType="effect", desc=desc,
+                   card_sets=[ApiCardSet(set_name=n, set_code=c, set_rarity="Common") for c, n in sets])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.cards = [
+            _card(1, "Blue-Eyes White Dragon", "This legendary dragon is a powerful engine of destruction.",
+                  [("LOB-EN001", "Legend of Blue Eyes White Dragon"), ("SDK-E001", "Starter Deck: Kaiba")]),
+            _card(2, "Dark Magician", "The ultimate wizard in terms of attack and defense.",
+                  [("LOB-EN005", "Legend of Blue Eyes White Dragon")]),
+            _card(3, "Pot of Greed", "Draw 2 cards.", [("SRL-EN050", "Magic Ruler")]),
+        ]
+        self.index = CardSearchIndex()
+        self.assertEqual(self.index.ensure(self.cards), 3)
+
+    def ids(self, text, groups=None):
+        match = self.index.match(text) if groups is None else self.index.match(text, groups)
+        return sorted(match.candidates)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Blue-Eyes White Dragon"), ["blue", "eyes", "white", "dragon"])
+        self.assertEqual(tokenize("LOB-EN001"), ["lob", "en001"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_prefix_and_multi_term(self):
+        self.assertEqual(self.ids("drag"), [1, 2])  # card 2 through its set name
+        self.assertEqual(self.ids("drag", CARD_GROUPS), [1])
+        self.assertEqual(self.ids("dark mag"), [2])
+        self.assertEqual(self.ids("magic"), [2, 3])
+        self.assertEqual(self.ids("magic draw"), [3])
+        self.assertEqual(self.ids("ragon"), [])
+        self.assertIsNone(self.index.match("  - "))
+
+    def test_set_codes(self):
+        self.assertEqual(self.ids("LOB"), [1, 2])
+        self.assertEqual(self.ids("lob-en005"), [2])
+        self.assertEqual(self.ids("pot", (GROUP_NAME,)), [3])
+
+    def test_row_printings(self):
+        match = self.index.match("lob dragon", CARD_GROUPS, row_printings=True)
+        # Candidates are pre-selected with all printings; the row decides
+        self.assertEqual(sorted(match.candidates), [1, 2])
+        self.assertTrue(match.row_accepts(1, ("LOB-EN001",)))
+        self.assertFalse(match.row_accepts(1, ("SDK-E001",)))
+        self.assertFalse(match.row_accepts(2, ("LOB-EN005",)))
+
+    def test_reindex_replaced_card(self):
+        self.assertEqual(self.index.ensure(self.cards), 0)
+        self.assertEqual(self.ids("greed"), [3])
+
+        renamed = _card(3, "Pot of Desires", "Banish 10 cards.")
+        self.assertEqual(self.index.ensure([renamed]), 1)
+        self.assertEqual(self.ids("greed"), [])
+        self.assertEqual(self.ids("desires"), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.static_files import add_cached_static_files, IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+
+class TestCachedStaticFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for sub in ("images", "sets"):
+            os.makedirs(os.path.join(self.tmp, sub))
+            with open(os.path.join(self.tmp, sub, "1.jpg"), 'wb') as f:
+                f.write(b'data')
+
+        app = FastAPI()
+        add_cached_static_files(app, '/images', os.path.join(self.tmp, "images"))
+        add_cached_static_files(app, '/sets', os.path.join(self.tmp, "sets"))
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_card_images_are_immutable_only_when_versioned(self):
+        response = self.client.get('/images/1.jpg?v=0123456789ab')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['cache-control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(self.client.get('/images/1.jpg').headers['cache-control'], REVALIDATE_CACHE_CONTROL)
+
+    def test_set_images_revalidate_with_etag(self):
+        response = self.client.get('/sets/1.jpg')
+        self.assertEqual(response.headers['cache-control'], REVALIDATE_CACHE_CONTROL)
+        etag = response.headers['etag']
+
+        cached = self.client.get('/sets/1.jpg', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_versioned_urls_are_immutable(self):
+        response = self.client.get('/sets/1.jpg?v=abc123')
+        self.assertEqual(response.headers['cache-control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_missing_file(self):
+        self.assertEqual(self.client.get('/sets/missing.jpg').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
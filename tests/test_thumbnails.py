@@ -0,0 +1,85 @@
+import asyncio
+import os
+import unittest
+
+from PIL import Image
+
+from src.services.image_manager import generate_thumbnails, VIEW_THUMBNAIL_WIDTHS
+
+from image_fixtures import ImageManagerTestCase, jpeg_bytes
+
+
+class TestThumbnails(ImageManagerTestCase):
+    def url(self, card_id, view):
+        """The card image URL without its content version."""
+        return self.manager.get_card_image_url(card_id, view).split('?v=')[0]
+
+    def test_generate_thumbnails_keeps_aspect_and_skips_upscaling(self):
+        src = os.path.join(self.tmp, "src.jpg")
+        with open(src, 'wb') as f:
+            f.write(jpeg_bytes(270, 395))
+
+        targets = [(w, os.path.join(self.tmp, str(w), "1.webp")) for w in (100, 200, 400)]
+        written = generate_thumbnails(src, targets)
+
+        self.assertEqual(set(written), {targets[0][1], targets[1][1]})
+        self.assertFalse(os.path.exists(targets[2][1]))
+        with Image.open(targets[1][1]) as img:
+            self.assertEqual(img.format, 'WEBP')
+            self.assertEqual(img.size, (200, 293))
+        self.assertEqual(written[targets[0][1]]['width'], 100)
+
+    def test_api_sized_sources_produce_every_view_size(self):
+        # The API's image_url_small files are 168x246, its high-res files 421x614
+        self.manager._write_file(self.manager.get_local_path(3), jpeg_bytes(168, 246))
+        self.manager._write_file(self.manager.get_local_path(3, high_res=True), jpeg_bytes(421, 614))
+        asyncio.run(self.manager.generate_card_thumbnails(3))
+        asyncio.run(self.manager.generate_card_thumbnails(3, high_res=True))
+
+        for view, width in VIEW_THUMBNAIL_WIDTHS.items():
+            self.assertEqual(self.url(3, view), f'/images/thumbs/{width}/3.webp')
+        with Image.open(self.manager.get_thumbnail_path(3, VIEW_THUMBNAIL_WIDTHS['grid'])) as img:
+            self.assertEqual(img.size, (168, 246))
+        self.assertEqual(self.url(3, 'single'), '/images/3_high.jpg')
+
+    def test_card_image_urls_carry_the_content_version(self):
+        path = self.manager.get_local_path(9)
+        self.manager._write_file(path, jpeg_bytes(168, 246))
+        url = self.manager.get_card_image_url(9, 'grid')
+        self.assertEqual(url, f"/images/9.jpg?v={self.manager.get_image_version(path)}")
+
+        # A rewritten file gets a new URL, so an immutable cached copy is never served stale
+        self.manager._write_file(path, jpeg_bytes(168, 246, color='red'))
+        self.assertNotEqual(self.manager.get_card_image_url(9, 'grid'), url)
+
+    def test_generate_card_thumbnails_indexes_results(self):
+        self.manager._write_file(self.manager.get_local_path(5), jpeg_bytes(168, 246))
+        self.manager._write_file(self.manager.get_local_path(5, high_res=True), jpeg_bytes(421, 614))
+
+        self.assertEqual(asyncio.run(self.manager.generate_card_thumbnails(5)), 2)
+        self.assertEqual(asyncio.run(self.manager.generate_card_thumbnails(5, high_res=True)), 1)
+        # Already generated thumbnails are skipped
+        self.assertEqual(asyncio.run(self.manager.generate_card_thumbnails(5)), 0)
+
+        for w in (100, 168, 400):
+            self.assertTrue(self.manager.thumbnail_exists(5, w))
+
+    def test_card_image_url_prefers_view_size(self):
+        self.assertEqual(self.manager.get_card_image_url(7, 'grid', 'http://remote/7.jpg'), 'http://remote/7.jpg')
+
+        self.manager._write_file(self.manager.get_local_path(7), jpeg_bytes(168, 246))
+        self.assertEqual(self.url(7, 'grid'), '/images/7.jpg')
+
+        asyncio.run(self.manager.generate_card_thumbnails(7))
+        self.assertEqual(self.url(7, 'grid'), '/images/thumbs/168/7.webp')
+        self.assertEqual(self.url(7, 'list'), '/images/thumbs/100/7.webp')
+
+        # Until its 400px thumbnail exists, the tooltip shows the high-res original
+        self.manager._write_file(self.manager.get_local_path(7, high_res=True), jpeg_bytes(421, 614))
+        self.assertEqual(self.url(7, 'tooltip'), '/images/7_high.jpg')
+        asyncio.run(self.manager.generate_card_thumbnails(7, high_res=True))
+        self.assertEqual(self.url(7, 'tooltip'), '/images/thumbs/400/7.webp')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from src.core.utils import transform_set_code
+from src.core.utils import transform_set_code, normalize_set_code, extract_language_code, _parse_set_code
 
 class TestTransformSetCode(unittest.TestCase):
     def test_no_region_change(self):
@@ -50,5 +50,14 @@ class TestTransformSetCode(unittest.TestCase):
         # Returns G.
         self.assertEqual(transform_set_code('LOB-E001', 'DE'), 'LOB-G001')
 
+    def test_parse_set_code(self):
+        self.assertEqual(_parse_set_code('SGX2-END16'), ('SGX2', 'EN', 'D16'))  # longest region first
+        self.assertEqual(_parse_set_code('LOB-EN'), ('LOB', None, 'EN'))       # a region needs a suffix
+        self.assertEqual(_parse_set_code('SDY-006'), ('SDY', None, '006'))
+        self.assertEqual(_parse_set_code('MP21-EN-001'), ('MP21', 'EN', '-001'))
+        self.assertIsNone(_parse_set_code('LOB'))
+        self.assertEqual(normalize_set_code('SDY-G006'), 'SDY-006')
+        self.assertEqual(extract_language_code('BLMR-TC001'), 'ZH')
+
 if __name__ == '__main__':
     unittest.main()
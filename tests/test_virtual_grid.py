@@ -0,0 +1,102 @@
+import unittest
+from types import SimpleNamespace
+
+from nicegui import ui, Client
+from nicegui.page import page
+
+from src.ui.components.virtual_grid import VirtualGrid, GridCell
+
+
+class NumberCell(GridCell):
+    binds = 0
+
+    def build(self):
+        with ui.card() as root:
+            self.label = ui.label()
+        return root
+
+    def bind(self, item):
+        NumberCell.binds += 1
+        self.label.text = str(item['n'])
+        self.set_classes(self.root, 'odd' if item['n'] % 2 else 'even')
+
+
+class TestVirtualGrid(unittest.TestCase):
+    def setUp(self):
+        self.client = Client(page('/'), request=None)
+        self.items = [{'n': i} for i in range(1000)]
+        with self.client:
+            self.grid = VirtualGrid(NumberCell, cell_width=100, cell_height=150, gap=10).build()
+            self.grid.set_items(self.items)
+
+    def scroll(self, position, width=550, height=480):
+        args = {'verticalPosition': position, 'verticalContainerSize': height, 'horizontalContainerSize': width}
+        with self.client:
+            self.grid._on_scroll(SimpleNamespace(args=args))
+
+    def shown(self):
+        return [c.item['n'] for c in self.grid.pool if c.item is not None]
+
+    def test_window_follows_scroll(self):
+        self.scroll(0)
+        self.assertEqual(self.grid.columns, 5)
+        pool = len(self.grid.pool)
+        self.assertEqual(self.shown(), list(self.grid.window()))
+        self.assertEqual(pool, 5 * self.grid._window_rows())
+
+        self.scroll(160 * 40)  # row 40, minus the overscan row
+        self.assertEqual(self.grid.first_row, 39)
+        self.assertEqual(sorted(self.shown()), list(range(195, 195 + pool)))
+        self.assertEqual(len(self.grid.pool), pool)  # the pool is reused, not rebuilt
+        self.assertEqual(self.grid._spacers[0], 39 * 160)
+
+    def test_only_changed_cells_rebind_on_scroll(self):
+        self.scroll(0)
+        NumberCell.binds = 0
+        self.scroll(160 * 1)  # still within the overscan: same window
+        self.assertEqual(NumberCell.binds, 0)
+
+        cell = self.grid.pool[0]
+        first = cell.item
+        self.items[0]['n'] = 7
+        with self.client:
+            self.grid.set_items(self.items)
+        self.assertIs(cell.item, first)
+        self.assertEqual(cell.label.text, '7')
+        self.assertIn('odd', cell.root._classes)
+        self.assertNotIn('even', cell.root._classes)
+
+    def test_in_place_change_rebinds_only_its_cell(self):
+        self.scroll(160 * 10)
+        first_row = self.grid.first_row
+        NumberCell.binds = 0
+        item = self.items[self.grid.window()[3]]
+        item['n'] += 1
+        with self.client:
+            self.grid.set_items(self.items, changed=[item])
+        self.assertEqual(NumberCell.binds, 1)
+        self.assertEqual(self.grid.first_row, first_row)  # the scroll position is kept
+
+        with self.client:
+            self.grid.set_items(self.items[1:], changed=[item])  # a different window renders in full
+        self.assertEqual(self.grid.first_row, 0)
+        self.assertGreater(NumberCell.binds, 1)
+
+    def test_short_list_hides_spare_cells(self):
+        with self.client:
+            self.grid.set_items(self.items[:3])
+        self.assertEqual(self.shown(), [0, 1, 2])
+        self.assertEqual(self.grid._spacers, (0, 0))
+        self.assertFalse(any(c.root.visible for c in self.grid.pool[3:]))
+
+    def test_cells_must_implement_build_and_bind(self):
+        class UnboundCell(GridCell):
+            def build(self):
+                return ui.card()
+
+        with self.assertRaises(TypeError):
+            UnboundCell()
+
+
+if __name__ == '__main__':
+    unittest.main()